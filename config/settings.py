@@ -53,6 +53,35 @@ class Settings:
             "llm_temperature": 0.7,
             "llm_max_tokens": 4096,
             "llm_provider": "openrouter",  # "openrouter", "ollama", "gemini", "groq"
+            "llm_http2": False,  # 'h2' paketi kuruluysa HTTP/2 kullan
+            # Hedged istekler (yavaş kuyruk gecikmesine karşı yedek sağlayıcı)
+            "llm_hedging_enabled": False,
+            "llm_hedge_provider": "",  # "" = kapalı; "openrouter", "groq", "gemini", "ollama"
+            "llm_hedge_model": "",  # "" = ikincil sağlayıcının varsayılan modeli
+            "llm_hedge_percentile": 90.0,  # ilk token süresinin hangi yüzdeliğinde hedge edilir
+            "llm_hedge_delay": 2.0,  # yeterli ölçüm yokken kullanılan gecikme (saniye)
+            "llm_hedge_auto_primary": True,  # ölçümlere göre birincili otomatik seç
+            # İstemci tarafı hız sınırlama (RPM/TPM token kovaları)
+            "llm_rate_limit_enabled": True,
+            "llm_rate_limits": {},  # ör. {"groq": {"rpm": 30, "tpm": 6000}, "gemini/gemini-1.5-pro": {"rpm": 2}}
+            # Bağlam bütçesi (token); 0 = sağlayıcıya göre varsayılan
+            "llm_context_budget": 0,
+            # İstek başına ilgili araç alt kümesi gönder (şema token tasarrufu)
+            "llm_tool_routing_enabled": True,
+            # Akış sürerken tamamlanan okuma araçlarını erken yürüt: "off" veya "read".
+            # Yazma araçları akış bitmeden hiçbir zaman yürütülmez.
+            "llm_early_tool_execution": "read",
+            # Basit komutları ("A1'e 5 yaz", "B sütununu topla") LLM'e gitmeden yürüt
+            "fast_commands_enabled": True,
+            # Çok adımlı işlemleri tek execute_plan çağrısıyla planlayıp yerelde yürüt
+            "llm_plan_mode": False,
+            # Aynı düzendeki sayfalarda tekrarlanan istekler için planları sakla ve yeniden oynat.
+            # Yazmalar modele sorulmadan yürütüldüğü için varsayılan olarak kapalı;
+            # açıkken "!" ile başlayan mesajlar önbelleği atlar.
+            "plan_cache_enabled": False,
+            # Sayfa okumalarını ~/.config/libre_calc_ai/cache altında şifrelenmemiş
+            # anlık görüntüler olarak sakla; kapatıldığında mevcutlar silinir
+            "snapshot_cache_enabled": False,
             # LibreOffice
             "libreoffice_host": "localhost",
             "libreoffice_port": 2002,
@@ -196,6 +225,34 @@ class Settings:
     def max_tokens(self) -> int:
         return self._settings["llm_max_tokens"]
 
+    @property
+    def http2(self) -> bool:
+        return bool(self._settings.get("llm_http2", False))
+
+    @property
+    def hedging_enabled(self) -> bool:
+        return bool(self._settings.get("llm_hedging_enabled", False))
+
+    @property
+    def hedge_provider(self) -> str:
+        return self._settings.get("llm_hedge_provider", "") or ""
+
+    @property
+    def hedge_model(self) -> str:
+        return self._settings.get("llm_hedge_model", "") or ""
+
+    @property
+    def hedge_percentile(self) -> float:
+        return float(self._settings.get("llm_hedge_percentile", 90.0))
+
+    @property
+    def hedge_delay(self) -> float:
+        return float(self._settings.get("llm_hedge_delay", 2.0))
+
+    @property
+    def hedge_auto_primary(self) -> bool:
+        return bool(self._settings.get("llm_hedge_auto_primary", True))
+
     @property
     def provider(self) -> str:
         return self._settings["llm_provider"]
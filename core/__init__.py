@@ -1,8 +1,12 @@
 from .uno_bridge import LibreOfficeBridge
+from .cell_block import CellBlock
 from .cell_inspector import CellInspector
 from .cell_manipulator import CellManipulator
 from .sheet_analyzer import SheetAnalyzer
 from .error_detector import ErrorDetector
+from .sheet_context import SheetContextCache
+from .range_fingerprint import RangeFingerprinter
+from .snapshot_cache import SnapshotCache
 from .address_utils import (
     parse_address,
     parse_range_string,
@@ -13,10 +17,14 @@ from .address_utils import (
 
 __all__ = [
     "LibreOfficeBridge",
+    "CellBlock",
     "CellInspector",
     "CellManipulator",
     "SheetAnalyzer",
     "ErrorDetector",
+    "SheetContextCache",
+    "RangeFingerprinter",
+    "SnapshotCache",
     "parse_address",
     "parse_range_string",
     "column_to_index",
@@ -0,0 +1,368 @@
+"""Hücre bloğu - Aralık okumalarını sütunsal ve kompakt biçimde tutar.
+
+Her hücre için {address, value, formula, type} sözlüğü tutmak hücre başına
+yüzlerce bayt harcar. ``CellBlock`` yalnızca sol üst köşe ve boyutu, hücre
+türlerini ve sayısal değerleri tipli ``array`` dizilerinde, metinleri ve
+formülleri ise seyrek sözlüklerde (``sys.intern`` ile paylaşılan dizeler)
+tutar. Adresler gerektiğinde hesaplanır; eski sözlük biçimi yalnızca
+``to_dicts`` ile istendiğinde üretilir. ``to_compact`` bloğu doğrudan araç
+sonuçlarının kompakt tablo biçimine çevirir.
+"""
+
+import json
+import re
+import sys
+from array import array
+
+from .address_utils import column_to_index, index_to_column, parse_address
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Hücre türü kodları
+EMPTY, VALUE, TEXT, FORMULA = 0, 1, 2, 3
+_TYPE_NAMES = ("empty", "value", "text", "formula")
+_TYPE_CODES = {name: code for code, name in enumerate(_TYPE_NAMES)}
+
+# Formül içindeki hücre başvuruları (fonksiyon adlarını ve sayfa adlarını dışlar)
+_REF_RE = re.compile(r"(?<![A-Za-z_.\d])(\$?)([A-Z]{1,3})(\$?)(\d+)(?![\d(A-Za-z_])")
+
+
+def _relative_pattern(formula: str, col: int, row: int) -> str:
+    """Formülü hücreye göre göreli desene çevirir (aşağı kopyalama tespiti için)."""
+
+    def _sub(match):
+        col_abs, col_letters, row_abs, row_digits = match.groups()
+        ref_col = column_to_index(col_letters)
+        ref_row = int(row_digits) - 1
+        c = f"C{ref_col}" if col_abs else f"C[{ref_col - col}]"
+        r = f"R{ref_row}" if row_abs else f"R[{ref_row - row}]"
+        return r + c
+
+    return _REF_RE.sub(_sub, formula)
+
+
+def _compact_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class CellBlock:
+    """Dikdörtgen bir hücre aralığının sütunsal gösterimi.
+
+    Hücreler satır öncelikli düz dizinle (``row * n_cols + col``) saklanır.
+    Satır dilimleme (``block[10:20]``) yeni bir blok döndürür; böylece
+    sayfalama ve kesme kodu bloğu liste gibi kullanabilir.
+    """
+
+    __slots__ = ("origin_col", "origin_row", "n_rows", "n_cols", "_kinds", "_numbers", "_texts", "_formulas")
+
+    def __init__(self, origin_col: int, origin_row: int, n_rows: int, n_cols: int,
+                 kinds: array, numbers: array, texts: dict[int, str], formulas: dict[int, str]):
+        """
+        CellBlock başlatıcı. Bloklar genellikle ``from_arrays`` ile oluşturulur.
+
+        Args:
+            origin_col: Sol üst hücrenin sütun indeksi (0 tabanlı).
+            origin_row: Sol üst hücrenin satır indeksi (0 tabanlı).
+            n_rows: Satır sayısı.
+            n_cols: Sütun sayısı.
+            kinds: Hücre türü kodları (``array('B')``).
+            numbers: Sayısal değerler (``array('d')``); sayısal olmayanlarda 0.
+            texts: Düz dizin -> metin değeri.
+            formulas: Düz dizin -> formül.
+        """
+        self.origin_col = origin_col
+        self.origin_row = origin_row
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self._kinds = kinds
+        self._numbers = numbers
+        self._texts = texts
+        self._formulas = formulas
+
+    @classmethod
+    def from_arrays(cls, origin_col: int, origin_row: int, data_rows, formula_rows) -> "CellBlock":
+        """``getDataArray`` ve ``getFormulaArray`` sonuçlarından blok oluşturur.
+
+        Args:
+            origin_col: Sol üst hücrenin sütun indeksi.
+            origin_row: Sol üst hücrenin satır indeksi.
+            data_rows: Değer matrisi (sayılar float, diğerleri str).
+            formula_rows: Formül matrisi.
+        """
+        n_rows = len(data_rows)
+        n_cols = len(data_rows[0]) if n_rows else 0
+        kinds = array("B", bytes(n_rows * n_cols))
+        numbers = array("d", bytes(8 * n_rows * n_cols))
+        texts: dict[int, str] = {}
+        formulas: dict[int, str] = {}
+        intern = sys.intern
+
+        index = 0
+        for data_row, formula_row in zip(data_rows, formula_rows):
+            for data, formula in zip(data_row, formula_row):
+                is_number = isinstance(data, (int, float)) and not isinstance(data, bool)
+                if formula.startswith("=") and len(formula) > 1:
+                    kinds[index] = FORMULA
+                    formulas[index] = intern(formula)
+                elif formula == "" and data == "":
+                    index += 1
+                    continue
+                else:
+                    kinds[index] = VALUE if is_number else TEXT
+                if is_number:
+                    numbers[index] = data
+                else:
+                    texts[index] = intern(str(data))
+                index += 1
+        return cls(origin_col, origin_row, n_rows, n_cols, kinds, numbers, texts, formulas)
+
+    @classmethod
+    def from_dicts(cls, rows: list[list[dict]]) -> "CellBlock":
+        """Eski {address, value, formula, type} sözlük matrisinden blok oluşturur."""
+        first = rows[0][0].get("address", "") if rows and rows[0] else ""
+        try:
+            origin_col, origin_row = parse_address(first)
+        except ValueError:
+            origin_col, origin_row = 0, 0
+        n_rows = len(rows)
+        n_cols = max((len(row) for row in rows), default=0)
+        kinds = array("B", bytes(n_rows * n_cols))
+        numbers = array("d", bytes(8 * n_rows * n_cols))
+        texts: dict[int, str] = {}
+        formulas: dict[int, str] = {}
+
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                index = r * n_cols + c
+                kind = _TYPE_CODES.get(cell.get("type"), TEXT)
+                value = cell.get("value")
+                if kind == EMPTY or (kind != FORMULA and value is None):
+                    continue
+                kinds[index] = kind
+                if cell.get("formula"):
+                    formulas[index] = sys.intern(cell["formula"])
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers[index] = value
+                elif value is not None:
+                    texts[index] = sys.intern(str(value))
+        return cls(origin_col, origin_row, n_rows, n_cols, kinds, numbers, texts, formulas)
+
+    # --- Liste benzeri erişim -------------------------------------------
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, rows: slice) -> "CellBlock":
+        """Satır dilimini yeni blok olarak döndürür (yalnızca adım 1)."""
+        if not isinstance(rows, slice):
+            raise TypeError("CellBlock yalnızca satır dilimlemeyi destekler")
+        start, stop, _step = rows.indices(self.n_rows)
+        stop = max(start, stop)
+        lo, hi = start * self.n_cols, stop * self.n_cols
+        return CellBlock(
+            self.origin_col,
+            self.origin_row + start,
+            stop - start,
+            self.n_cols,
+            self._kinds[lo:hi],
+            self._numbers[lo:hi],
+            {i - lo: v for i, v in self._texts.items() if lo <= i < hi},
+            {i - lo: v for i, v in self._formulas.items() if lo <= i < hi},
+        )
+
+    def copy(self) -> "CellBlock":
+        """Dizileri kopyalanmış, eşlenmiş bellekten bağımsız bir blok döndürür."""
+        kinds, numbers = array("B"), array("d")
+        kinds.frombytes(memoryview(self._kinds).cast("B"))
+        numbers.frombytes(memoryview(self._numbers).cast("B"))
+        return CellBlock(
+            self.origin_col, self.origin_row, self.n_rows, self.n_cols,
+            kinds, numbers, dict(self._texts), dict(self._formulas),
+        )
+
+    def __iter__(self):
+        """Satırları eski sözlük biçiminde üretir."""
+        for r in range(self.n_rows):
+            yield self.row_dicts(r)
+
+    # --- Hücre erişimi ---------------------------------------------------
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(satır sayısı, sütun sayısı)."""
+        return self.n_rows, self.n_cols
+
+    @property
+    def range_name(self) -> str:
+        """Bloğun kapladığı aralık (ör. "A1:D10")."""
+        if not self.n_rows or not self.n_cols:
+            return ""
+        return f"{self.address(0, 0)}:{self.address(self.n_rows - 1, self.n_cols - 1)}"
+
+    def address(self, r: int, c: int) -> str:
+        """Bloğa göre (satır, sütun) konumundaki hücrenin adresi."""
+        return f"{index_to_column(self.origin_col + c)}{self.origin_row + r + 1}"
+
+    def kind(self, r: int, c: int) -> str:
+        """Hücre türü: empty, value, text veya formula."""
+        return _TYPE_NAMES[self._kinds[r * self.n_cols + c]]
+
+    def value(self, r: int, c: int):
+        """Hücre değeri; boş hücrede None."""
+        index = r * self.n_cols + c
+        if self._kinds[index] == EMPTY:
+            return None
+        text = self._texts.get(index)
+        return text if text is not None else self._numbers[index]
+
+    def formula(self, r: int, c: int) -> str | None:
+        """Hücre formülü; formül yoksa None."""
+        return self._formulas.get(r * self.n_cols + c)
+
+    def row_dicts(self, r: int) -> list[dict]:
+        """Bir satırı eski {address, value, formula, type} biçiminde döndürür."""
+        return [
+            {
+                "address": self.address(r, c),
+                "value": self.value(r, c),
+                "formula": self.formula(r, c),
+                "type": self.kind(r, c),
+            }
+            for c in range(self.n_cols)
+        ]
+
+    def to_dicts(self) -> list[list[dict]]:
+        """Bloğu eski 2B sözlük listesi biçimine çevirir."""
+        return [self.row_dicts(r) for r in range(self.n_rows)]
+
+    def formula_cells(self):
+        """Formül içeren hücreler için (adres, formül, değer) üretir."""
+        for index in sorted(self._formulas):
+            r, c = divmod(index, self.n_cols)
+            yield self.address(r, c), self._formulas[index], self.value(r, c)
+
+    def numeric_column(self, c: int):
+        """Sütunun sayısal değerleri; NumPy varsa kopyasız ``ndarray`` görünümü.
+
+        Sayısal olmayan hücrelerde 0 bulunur; ayırt etmek için ``kind`` kullanılır.
+        """
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._numbers, dtype=np.float64)[c::self.n_cols]
+        return self._numbers[c::self.n_cols]
+
+    def kind_counts(self, c: int) -> list[int]:
+        """Sütundaki [empty, value, text, formula] hücre sayıları."""
+        column = bytes(self._kinds[c::self.n_cols])
+        return [column.count(code) for code in (EMPTY, VALUE, TEXT, FORMULA)]
+
+    def column_numbers(self, c: int) -> list[float]:
+        """Sütundaki değer ve formül hücrelerinin sayısal değerleri.
+
+        Metin sonuçlu formüller LibreOffice'teki ``getValue`` gibi 0 sayılır.
+        """
+        kinds = self._kinds[c::self.n_cols]
+        numbers = self._numbers[c::self.n_cols]
+        return [float(n) for k, n in zip(kinds, numbers) if k == VALUE or k == FORMULA]
+
+    def write_rows(self, r: int, block: "CellBlock") -> None:
+        """``block`` satırlarını bu bloğun ``r``. satırından itibaren yerinde yazar.
+
+        Diske eşlenmiş bloklarda eski karoları yenilemek için kullanılır.
+
+        Raises:
+            ValueError: Sütun sayıları farklıysa veya satırlar bloğa sığmıyorsa.
+        """
+        if block.n_cols != self.n_cols or r < 0 or r + block.n_rows > self.n_rows:
+            raise ValueError("Yazılan blok hedef bloğa sığmıyor")
+        lo = r * self.n_cols
+        hi = lo + block.n_rows * self.n_cols
+        self._kinds[lo:hi] = block._kinds
+        self._numbers[lo:hi] = block._numbers
+        for target, source in ((self._texts, block._texts), (self._formulas, block._formulas)):
+            for index in [i for i in target if lo <= i < hi]:
+                del target[index]
+            for index, text in source.items():
+                target[lo + index] = text
+
+    # --- Serileştirme ----------------------------------------------------
+
+    def to_compact(self) -> dict:
+        """Bloğu kompakt tablo biçimine çevirir.
+
+        Değerler satır matrisi olarak, formüller ayrı bir haritada verilir;
+        aşağı kopyalanmış aynı göreli formüller tek aralık girdisine
+        ("D2:D100": "=B2*C2"), ardışık aynı satırlar {"repeat": n} girdisine
+        indirgenir.
+        """
+        columns = [index_to_column(self.origin_col + c) for c in range(self.n_cols)]
+        encoded_rows = []
+        previous = None
+        formulas: dict[str, str] = {}
+        # Sütun başına açık formül koşusu: col -> [ilk satır, son satır, desen, formül]
+        runs: dict[int, list] = {}
+
+        def _close_run(c: int):
+            run = runs.pop(c, None)
+            if not run:
+                return
+            first_row, last_row, _pattern, formula = run
+            key = f"{columns[c]}{first_row + 1}"
+            if last_row > first_row:
+                key += f":{columns[c]}{last_row + 1}"
+            formulas[key] = formula
+
+        for r in range(self.n_rows):
+            row_index = self.origin_row + r
+            values = []
+            for c in range(self.n_cols):
+                index = r * self.n_cols + c
+                values.append(_compact_value(self.value(r, c)))
+                formula = self._formulas.get(index)
+                if not formula:
+                    _close_run(c)
+                    continue
+                pattern = _relative_pattern(formula, self.origin_col + c, row_index)
+                run = runs.get(c)
+                if run and run[2] == pattern and run[1] == row_index - 1:
+                    run[1] = row_index
+                else:
+                    _close_run(c)
+                    runs[c] = [row_index, row_index, pattern, formula]
+
+            if values == previous and encoded_rows:
+                last = encoded_rows[-1]
+                if isinstance(last, dict):
+                    last["repeat"] += 1
+                else:
+                    encoded_rows.append({"repeat": 1})
+            else:
+                encoded_rows.append(values)
+                previous = values
+
+        for c in list(runs):
+            _close_run(c)
+
+        encoded = {
+            "format": "table",
+            "range": f"{columns[0]}{self.origin_row + 1}:{columns[-1]}{self.origin_row + self.n_rows}" if columns else "",
+            "columns": columns,
+            "first_row": self.origin_row + 1,
+            "rows": encoded_rows,
+        }
+        if formulas:
+            encoded["formulas"] = formulas
+        return encoded
+
+    def to_json(self) -> str:
+        """Kompakt tabloyu boşluksuz JSON olarak döndürür."""
+        return json.dumps(self.to_compact(), ensure_ascii=False, separators=(",", ":"))
+
+    def __repr__(self) -> str:
+        return f"CellBlock({self.range_name or 'boş'}, {self.n_rows}x{self.n_cols})"
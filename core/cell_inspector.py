@@ -4,6 +4,7 @@ import logging
 import re
 
 from .address_utils import parse_address
+from .cell_block import CellBlock
 
 try:
     from com.sun.star.table.CellContentType import EMPTY, VALUE, TEXT, FORMULA
@@ -67,6 +68,27 @@ class CellInspector:
         sheet = self.bridge.get_active_sheet()
         return self.bridge.get_cell(sheet, col, row)
 
+    def _read_block(self, cell_range) -> CellBlock:
+        """Aralığı iki toplu UNO çağrısıyla (değerler + formüller) okur.
+
+        Hücre hücre getCellByPosition yerine ``getDataArray`` ve
+        ``getFormulaArray`` kullanılır; büyük aralıklarda köprü geçişi sayısı
+        hücre sayısından bağımsız hale gelir.
+
+        Args:
+            cell_range: UNO hücre aralığı nesnesi.
+
+        Returns:
+            Aralığın sütunsal ``CellBlock`` gösterimi.
+        """
+        addr = cell_range.getRangeAddress()
+        return CellBlock.from_arrays(
+            addr.StartColumn,
+            addr.StartRow,
+            cell_range.getDataArray(),
+            cell_range.getFormulaArray(),
+        )
+
     def read_cell(self, address: str) -> dict:
         """
         Hücrenin temel bilgilerini okur.
@@ -250,7 +272,7 @@ class CellInspector:
             )
             raise
 
-    def read_range(self, range_name: str) -> list[list[dict]]:
+    def read_range(self, range_name: str) -> CellBlock:
         """
         Hücre aralığındaki değerleri ve formülleri okur.
 
@@ -258,55 +280,30 @@ class CellInspector:
             range_name: Hücre aralığı (ör. "A1:D10", "B2").
 
         Returns:
-            2D liste: Her hücre için {address, value, formula, type} içeren dict.
+            ``CellBlock``; eski {address, value, formula, type} sözlük
+            matrisi gerekiyorsa ``to_dicts()`` ile alınır.
         """
         try:
             sheet = self.bridge.get_active_sheet()
-
-            # Tek hücre mi kontrol et
-            if ":" not in range_name:
-                cell_info = self.read_cell(range_name)
-                return [[cell_info]]
-
             cell_range = self.bridge.get_cell_range(sheet, range_name)
-            addr = cell_range.getRangeAddress()
-
-            result = []
-            for row in range(addr.StartRow, addr.EndRow + 1):
-                row_data = []
-                for col in range(addr.StartColumn, addr.EndColumn + 1):
-                    cell = sheet.getCellByPosition(col, row)
-                    cell_type_name = self._cell_type_name(cell.getType())
-
-                    if cell_type_name == "empty":
-                        value = None
-                    elif cell_type_name == "value":
-                        value = cell.getValue()
-                    elif cell_type_name == "text":
-                        value = cell.getString()
-                    elif cell_type_name == "formula":
-                        value = cell.getValue() if cell.getValue() != 0 else cell.getString()
-                    else:
-                        value = cell.getString()
-
-                    col_letter = self.bridge._index_to_column(col)
-                    address = f"{col_letter}{row + 1}"
-                    formula = cell.getFormula() if cell_type_name == "formula" else None
-
-                    row_data.append({
-                        "address": address,
-                        "value": value,
-                        "formula": formula,
-                        "type": cell_type_name,
-                    })
-                result.append(row_data)
-
-            return result
+            return self._read_block(cell_range)
 
         except Exception as e:
             logger.error("Aralık okuma hatası (%s): %s", range_name, str(e))
             raise
 
+    def get_range_digest(self, range_name: str) -> str:
+        """
+        Aralığın içerik özetini döndürür; içerik değişmedikçe aynı kalır.
+
+        Args:
+            range_name: Hücre aralığı (ör. "A1:D500").
+
+        Returns:
+            Hex özet.
+        """
+        return self.bridge.fingerprints.range_digest(range_name)
+
     def get_all_formulas(self, sheet_name: str = None) -> list[dict]:
         """
         Sayfadaki tüm formülleri listeler.
@@ -318,40 +315,22 @@ class CellInspector:
             Formül listesi: [{address, formula, value, precedents}, ...]
         """
         try:
-            if sheet_name:
-                doc = self.bridge.get_active_document()
-                sheets = doc.getSheets()
-                sheet = sheets.getByName(sheet_name)
-            else:
-                sheet = self.bridge.get_active_sheet()
+            # Kullanılan alan diskteki anlık görüntüden okunur; yalnızca
+            # değişen karolar LibreOffice'ten yeniden okunur
+            block = self.bridge.snapshots.load(sheet_name)
 
-            # Kullanılan alanı bul
-            cursor = sheet.createCursor()
-            cursor.gotoStartOfUsedArea(False)
-            cursor.gotoEndOfUsedArea(True)
-
-            addr = cursor.getRangeAddress()
             formulas = []
-
-            for row in range(addr.StartRow, addr.EndRow + 1):
-                for col in range(addr.StartColumn, addr.EndColumn + 1):
-                    cell = sheet.getCellByPosition(col, row)
-                    if self._cell_type_name(cell.getType()) == "formula":
-                        col_letter = self.bridge._index_to_column(col)
-                        address = f"{col_letter}{row + 1}"
-                        formula = cell.getFormula()
-                        value = cell.getValue() if cell.getValue() != 0 else cell.getString()
-
-                        # Referans edilen hücreleri bul
-                        refs = re.findall(r'\$?([A-Z]+)\$?(\d+)', formula.upper())
-                        precedents = [f"{c}{r}" for c, r in refs]
-
-                        formulas.append({
-                            "address": address,
-                            "formula": formula,
-                            "value": value,
-                            "precedents": precedents,
-                        })
+            for address, formula, value in block.formula_cells():
+                # Referans edilen hücreleri bul
+                refs = re.findall(r'\$?([A-Z]+)\$?(\d+)', formula.upper())
+                precedents = [f"{c}{r}" for c, r in refs]
+
+                formulas.append({
+                    "address": address,
+                    "formula": formula,
+                    "value": value,
+                    "precedents": precedents,
+                })
 
             return formulas
 
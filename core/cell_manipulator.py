@@ -2,10 +2,14 @@
 
 import logging
 
-from .address_utils import parse_address
+from .address_utils import index_to_column, parse_address, parse_range_string
+from .table_utils import group_aggregate, normalize_key, resolve_columns
 
 logger = logging.getLogger(__name__)
 
+# group_aggregate pivot modunda DataPilot veri alanı fonksiyonları (GeneralFunction adları)
+PIVOT_FUNCTIONS = {"sum": "SUM", "count": "COUNT", "mean": "AVERAGE", "min": "MIN", "max": "MAX"}
+
 
 class CellManipulator:
     """Hücrelere veri yazma ve stil uygulama islemlerini yöneten sınıf."""
@@ -178,6 +182,53 @@ class CellManipulator:
             )
             raise
 
+    def set_ranges_style(self, range_strs: list[str], **style) -> int:
+        """
+        Birden çok aralığa tek bir SheetCellRanges üzerinden tek seferde stil uygular.
+
+        Aralık başına ayrı UNO çağrısı yapılmaz; binlerce aralık tek bir
+        özellik yazımıyla biçimlendirilir.
+
+        Args:
+            range_strs: Hücre aralıkları (ör. ["A5:D5", "A9:D11"]).
+            **style: ``set_range_style`` ile aynı stil argümanları.
+
+        Returns:
+            Stil uygulanan aralık sayısı.
+        """
+        try:
+            import uno
+
+            doc = self.bridge.get_active_document()
+            sheet = self.bridge.get_active_sheet()
+            sheet_index = sheet.getRangeAddress().Sheet
+
+            addresses = []
+            for range_str in range_strs:
+                start, end = parse_range_string(range_str)
+                addr = uno.createUnoStruct("com.sun.star.table.CellRangeAddress")
+                addr.Sheet = sheet_index
+                addr.StartColumn, addr.StartRow = start
+                addr.EndColumn, addr.EndRow = end
+                addresses.append(addr)
+            if not addresses:
+                return 0
+
+            container = doc.createInstance("com.sun.star.sheet.SheetCellRanges")
+            container.addRangeAddresses(tuple(addresses), False)
+            params = dict.fromkeys((
+                "bold", "italic", "bg_color", "font_color", "font_size",
+                "h_align", "v_align", "wrap_text", "border_color",
+            ))
+            params.update(style)
+            self._apply_style_properties(container, **params)
+            logger.info("%d aralığa toplu stil uygulandı.", len(addresses))
+            return len(addresses)
+
+        except Exception as e:
+            logger.error("Toplu stil uygulama hatası: %s", str(e))
+            raise
+
     def set_number_format(self, address: str, format_str: str):
         """
         Hücrenin sayı formatını ayarlar.
@@ -946,6 +997,294 @@ class CellManipulator:
             logger.error("Kopyalama hatası: %s", str(e))
             raise
 
+    @staticmethod
+    def _absolute_ref(sheet_name: str | None, col: int, first_row: int, last_row: int) -> str:
+        """Tek sütunluk mutlak aralık başvurusu (ör. $'Ürünler'.$B$2:$B$500)."""
+        letter = index_to_column(col)
+        ref = f"${letter}${first_row + 1}:${letter}${last_row + 1}"
+        if sheet_name:
+            quoted = sheet_name.replace("'", "''")
+            ref = f"$'{quoted}'.{ref}"
+        return ref
+
+    def join_ranges(
+        self,
+        source_range: str,
+        source_key: str,
+        lookup_range: str,
+        lookup_key: str,
+        return_columns: list | None = None,
+        target_cell: str | None = None,
+        lookup_sheet: str | None = None,
+        has_header: bool = True,
+        mode: str = "values",
+        ignore_case: bool = False,
+        default="",
+    ) -> dict:
+        """
+        Kaynak tabloya arama tablosundan sütunları karma birleştirmesiyle ekler.
+
+        Binlerce DÜŞEYARA/VLOOKUP formülü yerine iki tablo toplu okunur,
+        arama tablosunun anahtarları bellekte karma tablosuna yerleştirilir ve
+        sonuç tek ``setDataArray`` ile yazılır. Anahtar arama tablosunda
+        birden çok kez geçiyorsa DÜŞEYARA gibi ilk satır kullanılır.
+
+        Args:
+            source_range: Kaynak tablo aralığı (ör: A1:D50000).
+            source_key: Kaynak anahtar sütunu (harf veya başlık adı).
+            lookup_range: Arama tablosu aralığı (ör: A1:C800).
+            lookup_key: Arama tablosundaki anahtar sütunu (harf veya başlık adı).
+            return_columns: Getirilecek arama sütunları; None ise anahtar
+                dışındaki tüm sütunlar.
+            target_cell: Sonucun sol üst hücresi; None ise kaynak tablonun
+                hemen sağı.
+            lookup_sheet: Arama tablosunun sayfası (None ise aktif sayfa).
+            has_header: Tabloların ilk satırı başlık mı? Başlıklar hedefe de yazılır.
+            mode: "values" statik değer yazar; "formula" her getirilen sütun
+                için tek bir dizi formülü (INDEX/MATCH) yazar.
+            ignore_case: Metin anahtarlarında büyük/küçük harf ve baş/son
+                boşluk yok sayılsın mı?
+            default: Eşleşmeyen satırlara yazılacak değer.
+
+        Returns:
+            target, rows, matched, unmatched, unmatched_keys (ilk 10) ve mode
+            alanlarını içeren sonuç sözlüğü.
+        """
+        try:
+            if mode not in ("values", "formula"):
+                raise ValueError(f"Geçersiz birleştirme modu: {mode}")
+            if mode == "formula":
+                # MATCH büyük/küçük harf duyarsızdır; eşleşme sayıları da öyle hesaplanır
+                ignore_case = True
+            doc = self.bridge.get_active_document()
+            sheet = self.bridge.get_active_sheet()
+            lookup_sheet_obj = doc.getSheets().getByName(lookup_sheet) if lookup_sheet else sheet
+
+            source = self.bridge.get_cell_range(sheet, source_range)
+            src_addr = source.getRangeAddress()
+            src_data = source.getDataArray()
+            lookup = self.bridge.get_cell_range(lookup_sheet_obj, lookup_range)
+            lk_addr = lookup.getRangeAddress()
+            lk_data = lookup.getDataArray()
+
+            first = 1 if has_header else 0
+            src_headers = src_data[0] if src_data else ()
+            lk_headers = lk_data[0] if lk_data else ()
+            # Başlıksız tablolarda ilk satır değerleri sütun adı sayılmaz
+            src_names = src_headers if has_header else [""] * len(src_headers)
+            lk_names = lk_headers if has_header else [""] * len(lk_headers)
+            src_key = resolve_columns([source_key], src_addr.StartColumn, src_names)[0]
+            lk_key = resolve_columns([lookup_key], lk_addr.StartColumn, lk_names)[0]
+            if return_columns:
+                returned = resolve_columns(return_columns, lk_addr.StartColumn, lk_names)
+            else:
+                returned = [p for p in range(len(lk_headers)) if p != lk_key]
+            if not returned:
+                raise ValueError("Getirilecek sütun yok")
+
+            # Arama tablosu karma tablosu: anahtar -> ilk satır
+            index: dict[tuple, tuple] = {}
+            for row in lk_data[first:]:
+                key = normalize_key([row[lk_key]], ignore_case)
+                if key[0] != "" and key not in index:
+                    index[key] = row
+
+            missing = tuple(default for _ in returned)
+            rows = []
+            if has_header:
+                rows.append(tuple(lk_headers[p] for p in returned))
+            matched = 0
+            unmatched_keys = []
+            for row in src_data[first:]:
+                key = normalize_key([row[src_key]], ignore_case)
+                found = index.get(key)
+                if found is not None:
+                    matched += 1
+                    rows.append(tuple(found[p] for p in returned))
+                else:
+                    if key[0] != "" and len(unmatched_keys) < 10:
+                        unmatched_keys.append(row[src_key])
+                    rows.append(missing)
+
+            if target_cell:
+                target_col, target_row = parse_address(target_cell)
+            else:
+                target_col, target_row = src_addr.EndColumn + 1, src_addr.StartRow
+            last_col = target_col + len(returned) - 1
+            last_row = target_row + len(rows) - 1
+            target = f"{index_to_column(target_col)}{target_row + 1}:{index_to_column(last_col)}{last_row + 1}"
+
+            with self.bridge.bulk_edit("ArasAI birleştirme"):
+                if mode == "values":
+                    sheet.getCellRangeByPosition(target_col, target_row, last_col, last_row).setDataArray(tuple(rows))
+                else:
+                    if has_header:
+                        sheet.getCellRangeByPosition(target_col, target_row, last_col, target_row).setDataArray((rows[0],))
+                    data_first, data_last = target_row + first, last_row
+                    src_keys = self._absolute_ref(
+                        None, src_addr.StartColumn + src_key,
+                        src_addr.StartRow + first, src_addr.EndRow,
+                    )
+                    lk_first, lk_last = lk_addr.StartRow + first, lk_addr.EndRow
+                    lk_keys = self._absolute_ref(lookup_sheet, lk_addr.StartColumn + lk_key, lk_first, lk_last)
+                    fallback = default if isinstance(default, (int, float)) else '"{}"'.format(str(default).replace('"', '""'))
+                    for j, p in enumerate(returned if data_last >= data_first else ()):
+                        values = self._absolute_ref(lookup_sheet, lk_addr.StartColumn + p, lk_first, lk_last)
+                        formula = f"=IFERROR(INDEX({values};MATCH({src_keys};{lk_keys};0));{fallback})"
+                        sheet.getCellRangeByPosition(
+                            target_col + j, data_first, target_col + j, data_last
+                        ).setArrayFormula(formula)
+
+            total = len(src_data) - first
+            logger.info(
+                "Birleştirme: %s <- %s, %d/%d satır eşleşti (%s)",
+                target, lookup_range, matched, total, mode,
+            )
+            result = {
+                "target": target,
+                "rows": total,
+                "matched": matched,
+                "unmatched": total - matched,
+                "mode": mode,
+            }
+            if unmatched_keys:
+                result["unmatched_keys"] = unmatched_keys
+            return result
+
+        except Exception as e:
+            logger.error("Birleştirme hatası: %s", str(e))
+            raise
+
+    def group_aggregate(
+        self,
+        source_range: str,
+        group_by: list,
+        aggregations: list[dict],
+        target_cell: str | None = None,
+        has_header: bool = True,
+        mode: str = "values",
+        preview_rows: int = 10,
+    ) -> dict:
+        """
+        Tabloyu anahtar sütunlarına göre gruplayıp özet tablosu oluşturur.
+
+        Kaynak tek ``getDataArray`` ile okunur, gruplama ve toplamalar
+        bellekte yapılır ve özet tek ``setDataArray`` ile yazılır; binlerce
+        ETOPLA/SUMIFS formülünden oluşan bir ızgaraya gerek kalmaz. "pivot"
+        modunda aynı özet yerel bir DataPilot (pivot tablo) olarak oluşturulur.
+
+        Args:
+            source_range: Kaynak tablo aralığı (ör: A1:F200000).
+            group_by: Grup anahtarı sütunları (harf veya başlık adı).
+            aggregations: {"column": ..., "func": ...} öğeleri; func sum,
+                count, mean, min, max veya distinct olabilir.
+            target_cell: Özetin sol üst hücresi; None ise kaynak tablonun
+                bir boş sütun sağı.
+            has_header: Kaynağın ilk satırı başlık mı?
+            mode: "values" statik özet yazar; "pivot" DataPilot oluşturur.
+            preview_rows: Sonuçta döndürülecek özet satırı sayısı.
+
+        Returns:
+            target, rows, groups, mode ve preview (ilk özet satırları)
+            alanlarını içeren sonuç sözlüğü.
+        """
+        try:
+            if mode not in ("values", "pivot"):
+                raise ValueError(f"Geçersiz özet modu: {mode}")
+            if not group_by or not aggregations:
+                raise ValueError("Grup sütunu ve en az bir toplama gerekli")
+            sheet = self.bridge.get_active_sheet()
+            source = self.bridge.get_cell_range(sheet, source_range)
+            src_addr = source.getRangeAddress()
+            src_data = source.getDataArray()
+
+            first = 1 if has_header else 0
+            n_cols = len(src_data[0]) if src_data else 0
+            headers = src_data[0] if has_header and src_data else [""] * n_cols
+            keys = resolve_columns(group_by, src_addr.StartColumn, headers)
+            funcs = [str(item.get("func", "sum")).lower() for item in aggregations]
+            values = resolve_columns([item["column"] for item in aggregations], src_addr.StartColumn, headers)
+            measures = list(zip(values, funcs))
+
+            def _label(p: int) -> str:
+                header = headers[p]
+                return str(header) if header != "" else index_to_column(src_addr.StartColumn + p)
+
+            if target_cell:
+                target_col, target_row = parse_address(target_cell)
+            else:
+                target_col, target_row = src_addr.EndColumn + 2, src_addr.StartRow
+
+            if mode == "pivot":
+                return self._create_pivot(sheet, source, keys, measures, target_col, target_row, has_header)
+
+            group_keys, results = group_aggregate(src_data[first:], keys, measures)
+            rows = [tuple(_label(p) for p in keys) + tuple(f"{f}({_label(p)})" for p, f in measures)]
+            rows.extend(key + tuple(result) for key, result in zip(group_keys, results))
+
+            last_col = target_col + len(rows[0]) - 1
+            last_row = target_row + len(rows) - 1
+            target = f"{index_to_column(target_col)}{target_row + 1}:{index_to_column(last_col)}{last_row + 1}"
+            with self.bridge.bulk_edit("ArasAI özet"):
+                sheet.getCellRangeByPosition(target_col, target_row, last_col, last_row).setDataArray(tuple(rows))
+
+            logger.info("Özet: %s -> %s, %d grup", source_range, target, len(group_keys))
+            return {
+                "target": target,
+                "rows": len(src_data) - first,
+                "groups": len(group_keys),
+                "mode": mode,
+                "preview": [list(row) for row in rows[:preview_rows + 1]],
+            }
+
+        except Exception as e:
+            logger.error("Özet hatası: %s", str(e))
+            raise
+
+    def _create_pivot(self, sheet, source, keys: list[int], measures: list[tuple[int, str]],
+                      target_col: int, target_row: int, has_header: bool) -> dict:
+        """group_aggregate için yerel DataPilot tablosu oluşturur."""
+        if not has_header:
+            raise ValueError("Pivot tablo için başlık satırı gerekli")
+        unsupported = [f for _p, f in measures if f not in PIVOT_FUNCTIONS]
+        if unsupported:
+            raise ValueError(f"Pivot tabloda desteklenmeyen fonksiyon: {', '.join(unsupported)}")
+        if len({p for p, _f in measures}) < len(measures):
+            raise ValueError("Pivot tabloda bir sütun yalnızca bir kez toplanabilir")
+
+        import uno
+        from com.sun.star.sheet.DataPilotFieldOrientation import ROW, DATA
+
+        tables = sheet.getDataPilotTables()
+        descriptor = tables.createDataPilotDescriptor()
+        descriptor.setSourceRange(source.getRangeAddress())
+        fields = descriptor.getDataPilotFields()
+        for p in keys:
+            fields.getByIndex(p).setPropertyValue("Orientation", ROW)
+        for p, func in measures:
+            field = fields.getByIndex(p)
+            field.setPropertyValue("Orientation", DATA)
+            field.setPropertyValue(
+                "Function",
+                uno.Enum("com.sun.star.sheet.GeneralFunction", PIVOT_FUNCTIONS[func]),
+            )
+
+        index = 1
+        while tables.hasByName(f"ArasAI_Pivot{index}"):
+            index += 1
+        name = f"ArasAI_Pivot{index}"
+        target = sheet.getCellByPosition(target_col, target_row).getCellAddress()
+        with self.bridge.bulk_edit("ArasAI pivot"):
+            tables.insertNewByName(name, target, descriptor)
+
+        out = tables.getByName(name).getOutputRange()
+        target_range = (
+            f"{index_to_column(out.StartColumn)}{out.StartRow + 1}:"
+            f"{index_to_column(out.EndColumn)}{out.EndRow + 1}"
+        )
+        logger.info("Pivot tablo oluşturuldu: %s (%s)", name, target_range)
+        return {"target": target_range, "pivot": name, "mode": "pivot"}
+
     def create_chart(
         self,
         data_range: str,
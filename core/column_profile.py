@@ -0,0 +1,378 @@
+"""Sütun profili - Büyük tablolar için sınırlı bellekli sütun istatistikleri.
+
+Model formül yazmadan önce sütunların türünü, boş oranını, farklı değer
+sayısını ve değer aralığını bilmek ister. ``ColumnProfile`` sütun değerlerini
+parça parça alır:
+
+- Sayı adedi, ortalama, standart sapma, en küçük/en büyük her zaman kesindir
+  (Welford/Chan birleştirmesi).
+- Farklı değer sayısı, sık değerler ve çeyrekler ``EXACT_LIMIT`` değere kadar
+  kesin hesaplanır; sınır aşılınca birleştirilebilir taslaklara geçilir:
+  HyperLogLog (farklı değer), KLL (çeyrekler) ve Misra-Gries (sık değerler).
+
+Tüm taslaklar ``merge`` ile birleştirilebilir; böylece bir tablonun parçaları
+ayrı ayrı profillenip sonradan tek profile indirgenebilir. Bellek kullanımı
+satır sayısından bağımsızdır.
+"""
+
+import hashlib
+import math
+import random
+from collections import Counter
+
+# Kesin istatistiklerin tutulduğu en fazla değer / farklı değer sayısı
+EXACT_LIMIT = 10_000
+# HyperLogLog kayıt sayısının log2'si (4096 kayıt, ~%1.6 hata)
+HLL_PRECISION = 12
+# KLL en üst seviye kapasitesi (~%1.3 sıra hatası)
+KLL_K = 200
+# Misra-Gries sayaç sayısı
+FREQUENT_CAPACITY = 100
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _round(value):
+    return round(value, 6) if isinstance(value, float) else value
+
+
+class HyperLogLog:
+    """Farklı değer sayısını sabit bellekle tahmin eden taslak."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self._p = precision
+        self._m = 1 << precision
+        self._registers = bytearray(self._m)
+
+    def add(self, key: str) -> None:
+        h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - self._p)
+        rest = h & ((1 << (64 - self._p)) - 1)
+        rank = (64 - self._p) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other._p != self._p:
+            raise ValueError("HyperLogLog hassasiyetleri farklı")
+        self._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+
+    def estimate(self) -> int:
+        m = self._m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Küçük kümelerde doğrusal sayım daha isabetli
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class KLLSketch:
+    """Sıra hatası sınırlı, birleştirilebilir nicel (quantile) taslağı."""
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        self._k = k
+        self._levels: list[list[float]] = [[]]
+        self._size = 0
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self._k * (2 / 3) ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def update_many(self, values) -> None:
+        before = len(self._levels[0])
+        self._levels[0].extend(values)
+        self._size += len(self._levels[0]) - before
+        while self._size >= self._max_size():
+            self._compress()
+
+    def _compress(self) -> None:
+        """Kapasitesi dolan ilk seviyenin yarısını bir üst seviyeye taşır."""
+        for h, items in enumerate(self._levels):
+            if len(items) < self._capacity(h):
+                continue
+            if h + 1 == len(self._levels):
+                self._levels.append([])
+            items.sort()
+            keep = [items.pop()] if len(items) % 2 else []
+            self._levels[h + 1].extend(items[self._rng.randint(0, 1)::2])
+            self._levels[h] = keep
+            self._size = sum(len(level) for level in self._levels)
+            return
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for h, items in enumerate(other._levels):
+            self._levels[h].extend(items)
+        self._size = sum(len(level) for level in self._levels)
+        while self._size >= self._max_size():
+            self._compress()
+
+    def quantiles(self, fractions) -> list[float]:
+        weighted = sorted(
+            (x, 1 << h) for h, items in enumerate(self._levels) for x in items
+        )
+        total = sum(w for _x, w in weighted)
+        results = []
+        for q in fractions:
+            target = q * total
+            cumulative = 0
+            for x, w in weighted:
+                cumulative += w
+                if cumulative >= target:
+                    results.append(x)
+                    break
+            else:
+                results.append(weighted[-1][0])
+        return results
+
+
+class FrequentItems:
+    """Sık değerleri sınırlı sayaçla izleyen Misra-Gries taslağı.
+
+    Sayımlar alt sınırdır; gerçek sayım en fazla ``error`` kadar büyüktür.
+    """
+
+    def __init__(self, capacity: int = FREQUENT_CAPACITY):
+        self._capacity = capacity
+        self._counts: dict = {}
+        self.error = 0
+
+    def update(self, key, weight: int = 1) -> None:
+        self._counts[key] = self._counts.get(key, 0) + weight
+        if len(self._counts) > 2 * self._capacity:
+            self._reduce()
+
+    def _reduce(self) -> None:
+        if len(self._counts) <= self._capacity:
+            return
+        cut = sorted(self._counts.values(), reverse=True)[self._capacity]
+        self.error += cut
+        self._counts = {k: c - cut for k, c in self._counts.items() if c > cut}
+
+    def merge(self, other: "FrequentItems") -> None:
+        for key, count in other._counts.items():
+            self.update(key, count)
+        self.error += other.error
+
+    def top(self, n: int) -> list[tuple]:
+        self._reduce()
+        return sorted(self._counts.items(), key=lambda item: -item[1])[:n]
+
+
+def _hll_key(value) -> str:
+    return f"n{value!r}" if isinstance(value, float) else f"s{value}"
+
+
+def _is_numeric_text(text: str) -> bool:
+    try:
+        float(text.strip().replace(",", "."))
+        return True
+    except ValueError:
+        return False
+
+
+def _exact_quantile(ordered: list[float], q: float) -> float:
+    """Calc'taki PERCENTILE gibi doğrusal aradeğerlemeli nicel."""
+    position = q * (len(ordered) - 1)
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class ColumnProfile:
+    """Tek bir sütunun akış halinde hesaplanan profili."""
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT):
+        """
+        ColumnProfile başlatıcı.
+
+        Args:
+            exact_limit: Kesin farklı değer ve nicel hesabının sınırı.
+        """
+        self._exact_limit = exact_limit
+        self.nulls = 0
+        self.numbers = 0
+        self.texts = 0
+        self.numeric_texts = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = None
+        self._max = None
+        # Kesin mod: değerler ve sayımlar; sınır aşılınca None olur
+        self._values: list[float] | None = []
+        self._counts: Counter | None = Counter()
+        self._kll: KLLSketch | None = None
+        self._hll: HyperLogLog | None = None
+        self._frequent: FrequentItems | None = None
+
+    @property
+    def count(self) -> int:
+        """Boş olmayan hücre sayısı."""
+        return self.numbers + self.texts
+
+    @property
+    def approximate(self) -> bool:
+        """Farklı değer, sık değer veya nicel değerler taslaktan mı geliyor?"""
+        return self._values is None or self._counts is None
+
+    def add_many(self, values) -> None:
+        """``getDataArray`` sütun değerlerini (float veya str) ekler."""
+        numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        texts = [v for v in values if isinstance(v, str) and v != ""]
+        self.nulls += len(values) - len(numbers) - len(texts)
+        if numbers:
+            self._add_numbers(numbers)
+
+        chunk_counts = Counter(numbers)
+        chunk_counts.update(texts)
+        for text in set(texts):
+            if _is_numeric_text(text):
+                self.numeric_texts += chunk_counts[text]
+        self.texts += len(texts)
+        self._add_counts(chunk_counts)
+
+    def _add_numbers(self, numbers: list[float]) -> None:
+        n = len(numbers)
+        mean = sum(numbers) / n
+        m2 = sum((x - mean) ** 2 for x in numbers)
+        self._combine_moments(n, mean, m2, min(numbers), max(numbers))
+
+        if self._values is not None:
+            self._values.extend(numbers)
+            if len(self._values) > self._exact_limit:
+                self._kll = KLLSketch()
+                self._kll.update_many(self._values)
+                self._values = None
+        else:
+            self._kll.update_many(numbers)
+
+    def _combine_moments(self, n: int, mean: float, m2: float, low, high) -> None:
+        total = self.numbers + n
+        delta = mean - self._mean
+        self._m2 += m2 + delta * delta * self.numbers * n / total
+        self._mean += delta * n / total
+        self.numbers = total
+        self._min = low if self._min is None else min(self._min, low)
+        self._max = high if self._max is None else max(self._max, high)
+
+    def _add_counts(self, counts: Counter) -> None:
+        if self._counts is not None:
+            self._counts.update(counts)
+            if len(self._counts) <= self._exact_limit:
+                return
+            counts, self._counts = self._counts, None
+            self._hll = HyperLogLog()
+            self._frequent = FrequentItems()
+        for key, count in counts.items():
+            self._hll.add(_hll_key(key))
+            self._frequent.update(key, count)
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Başka bir parçanın profilini bu profile ekler."""
+        self.nulls += other.nulls
+        self.texts += other.texts
+        self.numeric_texts += other.numeric_texts
+        if other.numbers:
+            self._combine_moments(other.numbers, other._mean, other._m2, other._min, other._max)
+
+        if self._values is not None and other._values is not None:
+            self._values.extend(other._values)
+            if len(self._values) > self._exact_limit:
+                self._kll = KLLSketch()
+                self._kll.update_many(self._values)
+                self._values = None
+        else:
+            if self._values is not None:
+                self._kll = KLLSketch()
+                self._kll.update_many(self._values)
+                self._values = None
+            if other._values is not None:
+                self._kll.update_many(other._values)
+            else:
+                self._kll.merge(other._kll)
+
+        if other._counts is not None:
+            self._add_counts(other._counts)
+        else:
+            if self._counts is not None:
+                counts, self._counts = self._counts, None
+                self._hll = HyperLogLog()
+                self._frequent = FrequentItems()
+                for key, count in counts.items():
+                    self._hll.add(_hll_key(key))
+                    self._frequent.update(key, count)
+            self._hll.merge(other._hll)
+            self._frequent.merge(other._frequent)
+
+    def distinct(self) -> int:
+        """Farklı değer sayısı (taslak modunda tahmini)."""
+        if self._counts is not None:
+            return len(self._counts)
+        return self._hll.estimate()
+
+    def top(self, n: int = 5) -> list[list]:
+        """En sık n değer ve sayımları (taslak modunda alt sınır)."""
+        if self._counts is not None:
+            items = self._counts.most_common(n)
+        else:
+            items = self._frequent.top(n)
+        return [[_round(value), count] for value, count in items if count > 1]
+
+    def quantiles(self) -> dict | None:
+        """Sayısal değerlerin çeyrekleri; sayı yoksa None."""
+        if not self.numbers:
+            return None
+        if self._values is not None:
+            ordered = sorted(self._values)
+            values = [_exact_quantile(ordered, q) for q in QUANTILES]
+        else:
+            values = self._kll.quantiles(QUANTILES)
+        return {f"p{round(q * 100)}": _round(v) for q, v in zip(QUANTILES, values)}
+
+    def dominant_type(self) -> str:
+        """Sütunun baskın türü: number, text, mixed veya empty."""
+        if not self.count:
+            return "empty"
+        if self.numbers and self.texts:
+            return "number" if self.texts <= self.count * 0.05 else (
+                "text" if self.numbers <= self.count * 0.05 else "mixed"
+            )
+        return "number" if self.numbers else "text"
+
+    def to_dict(self, top: int = 5) -> dict:
+        """Profili araç sonucu sözlüğüne çevirir."""
+        total = self.count + self.nulls
+        result = {
+            "type": self.dominant_type(),
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_ratio": round(self.nulls / total, 4) if total else 0.0,
+            "numbers": self.numbers,
+            "texts": self.texts,
+            "distinct": self.distinct(),
+        }
+        if self.numeric_texts:
+            # Metin olarak saklanmış sayılar formüllerde sorun çıkarır
+            result["numeric_texts"] = self.numeric_texts
+        if self.numbers:
+            std = math.sqrt(self._m2 / (self.numbers - 1)) if self.numbers > 1 else 0.0
+            result.update(
+                min=_round(float(self._min)),
+                max=_round(float(self._max)),
+                mean=_round(self._mean),
+                std=_round(std),
+                quantiles=self.quantiles(),
+            )
+        frequent = self.top(top)
+        if frequent:
+            result["top"] = frequent
+        if self.approximate:
+            result["approximate"] = True
+        return result
@@ -1,4 +1,4 @@
-"""LibreOffice olay dinleyicisi - Secim degisikliklerini takip eder."""
+"""LibreOffice olay dinleyicisi - Secim ve icerik degisikliklerini takip eder."""
 
 import logging
 from PyQt5.QtCore import QObject, pyqtSignal
@@ -10,12 +10,15 @@ try:
     import uno
     import unohelper
     from com.sun.star.view import XSelectionChangeListener
+    from com.sun.star.util import XModifyListener, XChangesListener
     from com.sun.star.lang import EventObject
     UNO_AVAILABLE = True
 except ImportError:
     UNO_AVAILABLE = False
     unohelper = None
     XSelectionChangeListener = None
+    XModifyListener = None
+    XChangesListener = None
     EventObject = None
 
 
@@ -48,12 +51,76 @@ if UNO_AVAILABLE:
         def disposing(self, event):
             """Dinlenen nesne yok oldugunda cagrilir."""
             pass
+
+    class ModifyHandler(unohelper.Base, XModifyListener):
+        """Belge icerik degisikliklerini dinleyen UNO sinifi."""
+
+        def __init__(self, callback):
+            """
+            Handler baslatici.
+
+            Args:
+                callback: Belge degistiginde cagrilacak fonksiyon.
+            """
+            self.callback = callback
+
+        def modified(self, event):
+            """
+            Belge icerigi degistiginde LibreOffice tarafindan cagrilir.
+
+            Args:
+                event: Olay nesnesi.
+            """
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.error("Modify olayi hatasi: %s", e)
+
+        def disposing(self, event):
+            """Dinlenen nesne yok oldugunda cagrilir."""
+            pass
+
+    class ChangesHandler(unohelper.Base, XChangesListener):
+        """Degisen hucre araliklarini bildiren UNO sinifi."""
+
+        def __init__(self, callback):
+            """
+            Handler baslatici.
+
+            Args:
+                callback: Degisiklik oldugunda cagrilacak fonksiyon.
+            """
+            self.callback = callback
+
+        def changesOccurred(self, event):
+            """
+            Hucreler degistiginde LibreOffice tarafindan cagrilir.
+
+            Args:
+                event: ChangesEvent nesnesi.
+            """
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.error("Changes olayi hatasi: %s", e)
+
+        def disposing(self, event):
+            """Dinlenen nesne yok oldugunda cagrilir."""
+            pass
 else:
-    # Dummy sinif - UNO yoksa kullanilir
+    # Dummy siniflar - UNO yoksa kullanilir
     class SelectionChangeHandler:
         def __init__(self, callback):
             self.callback = callback
 
+    class ModifyHandler:
+        def __init__(self, callback):
+            self.callback = callback
+
+    class ChangesHandler:
+        def __init__(self, callback):
+            self.callback = callback
+
 
 class LibreOfficeEventListener(QObject):
     """
@@ -63,6 +130,12 @@ class LibreOfficeEventListener(QObject):
 
     # Secim degistiginde tetiklenir (controller nesnesi gonderilir)
     selection_changed = pyqtSignal(object)
+    # Belge icerigi degistiginde tetiklenir (belge nesnesi gonderilir)
+    content_modified = pyqtSignal(object)
+    # Hucreler degistiginde tetiklenir; [(sayfa adi, CellRangeAddress)] listesi
+    # gonderilir. Adres None ise sayfanin, sayfa adi None ise tum belgenin
+    # degismis oldugu kabul edilir.
+    cells_changed = pyqtSignal(object)
 
     def __init__(self, bridge):
         """
@@ -74,9 +147,22 @@ class LibreOfficeEventListener(QObject):
         super().__init__()
         self._bridge = bridge
         self._handler = None
+        self._modify_handler = None
+        self._changes_handler = None
         self._controller = None
+        self._document = None
         self._listening = False
 
+    @property
+    def is_listening(self) -> bool:
+        """Dinleyiciler kayitli mi?"""
+        return self._listening
+
+    @property
+    def has_change_details(self) -> bool:
+        """Degisen araliklar ``cells_changed`` ile bildiriliyor mu?"""
+        return self._listening and self._changes_handler is not None
+
     def start(self):
         """Dinlemeyi baslatir."""
         if not UNO_AVAILABLE:
@@ -98,6 +184,24 @@ class LibreOfficeEventListener(QObject):
             self._listening = True
             logger.info("Selection listener baslatildi.")
 
+            # Icerik degisiklikleri (belge duzeyinde)
+            try:
+                self._modify_handler = ModifyHandler(self._on_modified_uno)
+                doc.addModifyListener(self._modify_handler)
+                self._document = doc
+            except Exception as e:
+                self._modify_handler = None
+                logger.warning("Modify listener baslatilamadi: %s", e)
+
+            # Degisen araliklar (hucre duzeyinde)
+            try:
+                self._changes_handler = ChangesHandler(self._on_changes_uno)
+                doc.addChangesListener(self._changes_handler)
+                self._document = doc
+            except Exception as e:
+                self._changes_handler = None
+                logger.warning("Changes listener baslatilamadi: %s", e)
+
         except Exception as e:
             logger.error("Listener baslatma hatasi: %s", e)
 
@@ -107,6 +211,13 @@ class LibreOfficeEventListener(QObject):
             return
 
         try:
+            if self._document is not None and self._modify_handler is not None:
+                self._document.removeModifyListener(self._modify_handler)
+            if self._document is not None and self._changes_handler is not None:
+                self._document.removeChangesListener(self._changes_handler)
+            self._document = None
+            self._modify_handler = None
+            self._changes_handler = None
             self._controller.removeSelectionChangeListener(self._handler)
             self._handler = None
             self._controller = None
@@ -127,3 +238,37 @@ class LibreOfficeEventListener(QObject):
             self.selection_changed.emit(source)
         except Exception as e:
             logger.error("UNO event isleme hatasi: %s", e)
+
+    def _on_modified_uno(self, event):
+        """
+        UNO thread'inden gelen degisiklik olayini PyQt sinyaline cevirir.
+        Not: Bu metod UNO thread'inde calisir!
+        """
+        try:
+            self.content_modified.emit(event.Source)
+        except Exception as e:
+            logger.error("UNO event isleme hatasi: %s", e)
+
+    def _on_changes_uno(self, event):
+        """
+        UNO thread'inden gelen hucre degisikliklerini PyQt sinyaline cevirir.
+        Not: Bu metod UNO thread'inde calisir!
+        """
+        try:
+            sheets = self._document.getSheets()
+            changes = []
+            for change in event.Changes:
+                ranges = change.ReplacedElement
+                operation = change.Accessor
+                if not hasattr(ranges, "getRangeAddresses"):
+                    # Bolge bilinmiyor: tum sayfalar degismis sayilir
+                    changes.append((None, None))
+                    continue
+                for addr in ranges.getRangeAddresses():
+                    name = sheets.getByIndex(addr.Sheet).getName()
+                    # Satir/sutun ekleme-silme alttaki tum hucreleri kaydirir
+                    changes.append((name, addr if operation == "cell-change" else None))
+            if changes:
+                self.cells_changed.emit(changes)
+        except Exception as e:
+            logger.error("UNO event isleme hatasi: %s", e)
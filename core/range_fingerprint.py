@@ -0,0 +1,203 @@
+"""Aralık parmak izi - Aralıkların değişip değişmediğini ucuz biçimde tespit eder.
+
+Önbellek anahtarları ve değişiklik tespiti için bir aralığın içeriğinin
+özetine ihtiyaç duyulur. ``RangeFingerprinter`` aralığı mutlak satır
+numarasına hizalı ``TILE_ROWS`` satırlık karolara böler; her karo
+``getDataArray`` + ``getFormulaArray`` toplu çağrılarıyla okunup özetlenir ve
+önbellekte tutulur. Değişiklik dinleyicisi yalnızca değişen satırların
+karolarını geçersiz kılar; sonraki özet yalnızca bu karoları yeniden okur.
+
+Dinleyici etkin değilse değişiklikler fark edilemeyeceğinden karolar
+önbelleğe alınmaz ve her özet tüm aralığı yeniden okur. Formül içeren karolar
+da önbelleğe alınmaz: bağımlı formüller yeniden hesaplandığında değişiklik
+olayı yalnızca düzenlenen hücreyi bildirir, başka karolardaki sonuçların
+değiştiği fark edilemez.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from .address_utils import index_to_column, parse_range_string
+
+logger = logging.getLogger(__name__)
+
+# Karo başına satır sayısı
+TILE_ROWS = 256
+# Önbellekte tutulan en fazla karo özeti
+TILE_CAPACITY = 4096
+
+
+class RangeFingerprinter:
+    """Karo tabanlı aralık ve sayfa özeti üreten sınıf."""
+
+    def __init__(self, bridge, tile_rows: int = TILE_ROWS, capacity: int = TILE_CAPACITY):
+        """
+        RangeFingerprinter başlatıcı.
+
+        Args:
+            bridge: LibreOfficeBridge örneği.
+            tile_rows: Karo başına satır sayısı.
+            capacity: Önbellekte tutulan en fazla karo özeti.
+        """
+        self.bridge = bridge
+        self._tile_rows = tile_rows
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        # (belge, sayfa, ilk sütun, son sütun, ilk satır, son satır) -> özet
+        self._tiles: OrderedDict[tuple, str] = OrderedDict()
+        self._listening = False
+
+    @property
+    def listening(self) -> bool:
+        """Değişiklik dinleyicisi etkinse (karo özetleri önbelleğe alınıyorsa) True."""
+        return self._listening
+
+    def set_listening(self, listening: bool) -> None:
+        """Değişiklik dinleyicisinin etkin olup olmadığını bildirir."""
+        self._listening = listening
+        if not listening:
+            self.invalidate()
+
+    def invalidate(self, sheet_name: str | None = None, first_row: int | None = None,
+                   last_row: int | None = None, first_col: int | None = None,
+                   last_col: int | None = None) -> None:
+        """Değişen bölgeyle kesişen karoları geçersiz kılar.
+
+        Argüman verilmeyen boyut tamamen değişmiş sayılır; hiç argüman
+        verilmezse tüm karolar silinir. Satır ve sütunlar 0 tabanlıdır.
+        """
+        with self._lock:
+            if sheet_name is None:
+                self._tiles.clear()
+                return
+            stale = [
+                key for key in self._tiles
+                if key[1] == sheet_name
+                and (first_row is None or key[5] >= first_row)
+                and (last_row is None or key[4] <= last_row)
+                and (first_col is None or key[3] >= first_col)
+                and (last_col is None or key[2] <= last_col)
+            ]
+            for key in stale:
+                del self._tiles[key]
+
+    def invalidate_address(self, sheet_name: str, addr) -> None:
+        """UNO ``CellRangeAddress`` ile verilen bölgeyi geçersiz kılar."""
+        self.invalidate(sheet_name, addr.StartRow, addr.EndRow, addr.StartColumn, addr.EndColumn)
+
+    @staticmethod
+    def hash_block(data, formulas) -> str:
+        """``getDataArray``/``getFormulaArray`` sonuçlarının özetini üretir."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(data).encode("utf-8"))
+        digest.update(repr(formulas).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def has_formulas(formulas) -> bool:
+        """``getFormulaArray`` sonucunda formül hücresi var mı?"""
+        return any(f.startswith("=") and len(f) > 1 for row in formulas for f in row)
+
+    def cached_tile(self, key: tuple) -> str | None:
+        """Karo özetini okuma yapmadan döndürür; bilinmiyorsa None.
+
+        Args:
+            key: (belge, sayfa, ilk sütun, son sütun, ilk satır, son satır).
+        """
+        with self._lock:
+            return self._tiles.get(key)
+
+    def remember_tile(self, key: tuple, tile_hash: str, has_formulas: bool = False) -> None:
+        """Başka bir okuma sırasında hesaplanan karo özetini önbelleğe ekler.
+
+        Formül içeren karoların özeti her seferinde yeniden hesaplanır.
+        """
+        if not self._listening or has_formulas:
+            return
+        with self._lock:
+            self._tiles[key] = tile_hash
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self._capacity:
+                self._tiles.popitem(last=False)
+
+    def tile_bounds(self, start_row: int, end_row: int):
+        """Satır aralığını mutlak satıra hizalı (ilk, son) karo sınırlarına böler."""
+        tile = start_row // self._tile_rows
+        while tile * self._tile_rows <= end_row:
+            first = max(start_row, tile * self._tile_rows)
+            last = min(end_row, (tile + 1) * self._tile_rows - 1)
+            yield first, last
+            tile += 1
+
+    def _digest(self, sheet, doc_id, bounds: tuple[int, int, int, int]) -> str:
+        """(ilk sütun, ilk satır, son sütun, son satır) bölgesinin özetini üretir."""
+        start_col, start_row, end_col, end_row = bounds
+        sheet_name = sheet.getName()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{sheet_name}!{start_col},{start_row}:{end_col},{end_row}".encode("utf-8"))
+
+        read = 0
+        for first, last in self.tile_bounds(start_row, end_row):
+            key = (doc_id, sheet_name, start_col, end_col, first, last)
+            with self._lock:
+                tile_hash = self._tiles.get(key)
+                if tile_hash is not None:
+                    self._tiles.move_to_end(key)
+            if tile_hash is None:
+                block = sheet.getCellRangeByPosition(start_col, first, end_col, last)
+                formulas = block.getFormulaArray()
+                tile_hash = self.hash_block(block.getDataArray(), formulas)
+                read += 1
+                self.remember_tile(key, tile_hash, self.has_formulas(formulas))
+            digest.update(tile_hash.encode("ascii"))
+
+        if read:
+            logger.debug("Parmak izi: %s, %d karo okundu", sheet_name, read)
+        return digest.hexdigest()
+
+    @staticmethod
+    def document_id(doc):
+        """Karo anahtarlarında kullanılan belge kimliği."""
+        return doc.getURL() or id(doc)
+
+    def _document_id(self):
+        return self.document_id(self.bridge.get_active_document())
+
+    def range_digest(self, range_name: str) -> str:
+        """Aktif sayfadaki aralığın içerik özetini döndürür.
+
+        Args:
+            range_name: Hücre aralığı (ör. "A1:D500").
+
+        Returns:
+            Aralığın içeriği değişmedikçe aynı kalan hex özet.
+        """
+        sheet = self.bridge.get_active_sheet()
+        start, end = parse_range_string(range_name)
+        return self._digest(sheet, self._document_id(), (start[0], start[1], end[0], end[1]))
+
+    def sheet_digest(self) -> dict:
+        """Aktif sayfanın kullanılan alanının içerik özetini döndürür.
+
+        Returns:
+            Özet sözlüğü:
+            - sheet_name: Sayfa adı
+            - used_range: Kullanılan aralık
+            - digest: Sayfa içeriği değişmedikçe aynı kalan hex özet
+        """
+        sheet = self.bridge.get_active_sheet()
+        cursor = sheet.createCursor()
+        cursor.gotoStartOfUsedArea(False)
+        cursor.gotoEndOfUsedArea(True)
+        addr = cursor.getRangeAddress()
+        bounds = (addr.StartColumn, addr.StartRow, addr.EndColumn, addr.EndRow)
+        return {
+            "sheet_name": sheet.getName(),
+            "used_range": (
+                f"{index_to_column(addr.StartColumn)}{addr.StartRow + 1}:"
+                f"{index_to_column(addr.EndColumn)}{addr.EndRow + 1}"
+            ),
+            "digest": self._digest(sheet, self._document_id(), bounds),
+        }
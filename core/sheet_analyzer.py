@@ -1,9 +1,16 @@
 """Sayfa analizci - LibreOffice Calc sayfalarının yapısını ve istatistiklerini analiz eder."""
 
+import hashlib
+import json
 import logging
 import math
 import re
 
+from .cell_block import CellBlock
+from .column_profile import ColumnProfile
+from .sheet_preview import PREVIEW_MAX_CHARS, build_preview
+from .table_utils import normalize_key, resolve_columns, row_runs
+
 try:
     from com.sun.star.table.CellContentType import EMPTY, VALUE, TEXT, FORMULA
     UNO_AVAILABLE = True
@@ -13,6 +20,11 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# profile_table'ın tek UNO çağrısında okuduğu satır sayısı
+PROFILE_CHUNK_ROWS = 5000
+# find_duplicates sonucunda ayrıntılı listelenen en fazla yinelenen grup
+DUPLICATE_MAX_GROUPS = 50
+
 
 class SheetAnalyzer:
     """Çalışma sayfasının yapısını ve verilerini analiz eden sınıf."""
@@ -93,6 +105,62 @@ class SheetAnalyzer:
             logger.error("Sayfa özeti oluşturma hatası: %s", str(e))
             raise
 
+    @staticmethod
+    def _value_kind(value) -> str:
+        if value == "" or value is None:
+            return "empty"
+        if isinstance(value, (int, float)):
+            return "number"
+        return "text"
+
+    def get_schema_fingerprint(self) -> dict:
+        """
+        Aktif sayfanın düzenini (şemasını) özetleyen parmak izini döndürür.
+
+        Parmak izi başlıklardan, kullanılan alanın boyutundan ve ilk veri
+        satırındaki sütun türlerinden üretilir; aynı düzendeki sayfalar, veri
+        farklı olsa ve tablo başka bir hücreden başlasa da aynı parmak izini
+        verir.
+
+        Returns:
+            Parmak izi sözlüğü:
+            - fingerprint: Şema özeti (hex)
+            - origin: Kullanılan alanın sol üst köşesi (sütun, satır), 0 tabanlı
+            - shape: (satır sayısı, sütun sayısı)
+        """
+        sheet = self.bridge.get_active_sheet()
+        cursor = sheet.createCursor()
+        cursor.gotoStartOfUsedArea(False)
+        cursor.gotoEndOfUsedArea(True)
+        addr = cursor.getRangeAddress()
+        shape = (addr.EndRow - addr.StartRow + 1, addr.EndColumn - addr.StartColumn + 1)
+
+        # Başlık satırı ve ilk veri satırı tek toplu çağrıyla okunur
+        head = sheet.getCellRangeByPosition(
+            addr.StartColumn, addr.StartRow, addr.EndColumn, min(addr.StartRow + 1, addr.EndRow)
+        ).getDataArray()
+        headers = [str(v).strip().casefold() for v in head[0]]
+        types = [self._value_kind(v) for v in head[1]] if len(head) > 1 else []
+
+        schema = json.dumps(
+            {"headers": headers, "shape": shape, "types": types},
+            ensure_ascii=False,
+        )
+        return {
+            "fingerprint": hashlib.sha1(schema.encode("utf-8")).hexdigest(),
+            "origin": (addr.StartColumn, addr.StartRow),
+            "shape": shape,
+        }
+
+    def get_sheet_digest(self) -> dict:
+        """
+        Aktif sayfanın içerik özetini döndürür (önbellek anahtarı olarak).
+
+        Returns:
+            sheet_name, used_range ve digest alanlarını içeren sözlük.
+        """
+        return self.bridge.fingerprints.sheet_digest()
+
     def detect_data_regions(self) -> list:
         """
         Sayfadaki veri bölgelerini tespit eder.
@@ -242,29 +310,13 @@ class SheetAnalyzer:
             - std: Standart sapma
         """
         try:
-            sheet = self.bridge.get_active_sheet()
             col_index = self.bridge._column_to_index(col_letter.upper())
 
-            cursor = sheet.createCursor()
-            cursor.gotoStartOfUsedArea(False)
-            cursor.gotoEndOfUsedArea(True)
-            end_row = cursor.getRangeAddress().EndRow
-
-            values = []
-            for row in range(end_row + 1):
-                cell = sheet.getCellByPosition(col_index, row)
-                cell_type_name = self._cell_type_name(cell.getType())
-                if cell_type_name == "value" or (
-                    cell_type_name == "formula" and cell.getValue() != 0
-                ):
-                    values.append(cell.getValue())
-                elif cell_type_name == "formula":
-                    # Formül sonucu 0 olabilir, kontrol et
-                    try:
-                        val = cell.getValue()
-                        values.append(val)
-                    except Exception:
-                        pass
+            # Kullanılan alan diskteki anlık görüntüden okunur; hücre hücre
+            # UNO çağrısı yapılmaz
+            block = self.bridge.snapshots.load()
+            col = col_index - block.origin_col
+            values = block.column_numbers(col) if 0 <= col < block.n_cols else []
 
             if not values:
                 return {
@@ -305,3 +357,208 @@ class SheetAnalyzer:
                 "Sütun istatistik hatası (%s): %s", col_letter, str(e)
             )
             raise
+
+    def _used_area(self, sheet):
+        cursor = sheet.createCursor()
+        cursor.gotoStartOfUsedArea(False)
+        cursor.gotoEndOfUsedArea(True)
+        addr = cursor.getRangeAddress()
+        return addr.StartColumn, addr.StartRow, addr.EndColumn, addr.EndRow
+
+    def profile_table(self, range_name: str | None = None, has_header: bool = True,
+                      chunk_rows: int = PROFILE_CHUNK_ROWS) -> dict:
+        """
+        Tablonun her sütunu için tür, boş oranı, farklı değer ve dağılım profili çıkarır.
+
+        Tablo ``chunk_rows`` satırlık parçalarla okunur; bellek kullanımı
+        satır sayısından bağımsızdır. Büyük sütunlarda farklı değer, sık
+        değerler ve çeyrekler tahmini olabilir ("approximate": true).
+
+        Args:
+            range_name: Tablo aralığı (None ise kullanılan alan).
+            has_header: İlk satır başlık mı?
+            chunk_rows: Tek seferde okunacak satır sayısı.
+
+        Returns:
+            Profil sözlüğü:
+            - range: Profillenen aralık
+            - rows: Veri satırı sayısı
+            - columns: Sütun profilleri listesi (column, header, type, count,
+              nulls, null_ratio, distinct, min/max/mean/std/quantiles, top)
+        """
+        try:
+            sheet = self.bridge.get_active_sheet()
+            if range_name:
+                start, end = self.bridge.parse_range_string(range_name)
+                start_col, start_row, end_col, end_row = start[0], start[1], end[0], end[1]
+            else:
+                start_col, start_row, end_col, end_row = self._used_area(sheet)
+
+            table_range = (
+                f"{self.bridge._index_to_column(start_col)}{start_row + 1}:"
+                f"{self.bridge._index_to_column(end_col)}{end_row + 1}"
+            )
+            n_cols = end_col - start_col + 1
+            headers = [None] * n_cols
+            if has_header:
+                head = sheet.getCellRangeByPosition(start_col, start_row, end_col, start_row).getDataArray()[0]
+                headers = [str(v) if v != "" else None for v in head]
+                start_row += 1
+
+            profiles = [ColumnProfile() for _ in range(n_cols)]
+            for first in range(start_row, end_row + 1, chunk_rows):
+                last = min(first + chunk_rows - 1, end_row)
+                rows = sheet.getCellRangeByPosition(start_col, first, end_col, last).getDataArray()
+                for c, profile in enumerate(profiles):
+                    profile.add_many([row[c] for row in rows])
+
+            columns = []
+            for c, (header, profile) in enumerate(zip(headers, profiles)):
+                entry = {"column": self.bridge._index_to_column(start_col + c), "header": header}
+                entry.update(profile.to_dict())
+                columns.append(entry)
+
+            return {
+                "range": table_range,
+                "rows": max(0, end_row - start_row + 1),
+                "columns": columns,
+            }
+
+        except Exception as e:
+            logger.error("Tablo profili hatası: %s", str(e))
+            raise
+
+    def preview_sheet(self, range_name: str | None = None, has_header: bool = True,
+                      max_chars: int = PREVIEW_MAX_CHARS) -> dict:
+        """
+        Sayfanın bütçeli önizlemesini döndürür.
+
+        Başlıklar, sütun tür ipuçları, ilk/son satırlar ve aradaki satırlardan
+        belirlenimci katmanlı örnek tek bir toplu okumadan üretilir. Kullanılan
+        alan diskteki anlık görüntüden okunur.
+
+        Args:
+            range_name: Önizlenecek aralık (None ise kullanılan alan).
+            has_header: İlk satır başlık mı?
+            max_chars: Sonucun JSON olarak en fazla karakter sayısı.
+
+        Returns:
+            ``build_preview`` sözlüğü ve sheet_name alanı.
+        """
+        try:
+            sheet = self.bridge.get_active_sheet()
+            if range_name:
+                cell_range = self.bridge.get_cell_range(sheet, range_name)
+                addr = cell_range.getRangeAddress()
+                block = CellBlock.from_arrays(
+                    addr.StartColumn, addr.StartRow,
+                    cell_range.getDataArray(), cell_range.getFormulaArray(),
+                )
+            else:
+                block = self.bridge.snapshots.load()
+
+            preview = {"sheet_name": sheet.getName()}
+            preview.update(build_preview(block, has_header, max_chars))
+            return preview
+
+        except Exception as e:
+            logger.error("Sayfa önizleme hatası: %s", str(e))
+            raise
+
+    def _table_block(self, sheet, range_name: str | None):
+        """Aralığı (None ise kullanılan alanı) tek toplu okumayla döndürür.
+
+        Returns:
+            (ilk sütun, ilk satır, değer matrisi) üçlüsü.
+        """
+        if range_name:
+            cell_range = self.bridge.get_cell_range(sheet, range_name)
+        else:
+            cell_range = sheet.createCursor()
+            cell_range.gotoStartOfUsedArea(False)
+            cell_range.gotoEndOfUsedArea(True)
+        addr = cell_range.getRangeAddress()
+        return addr.StartColumn, addr.StartRow, cell_range.getDataArray()
+
+    def find_duplicates(self, range_name: str | None = None, key_columns: list | None = None,
+                        has_header: bool = True, ignore_case: bool = False,
+                        max_groups: int = DUPLICATE_MAX_GROUPS) -> dict:
+        """
+        Tablodaki yinelenen satırları veya yinelenen anahtarları bulur.
+
+        Tablo tek toplu okumayla alınır ve her satırın anahtarı tek geçişte
+        karma tablosuna yerleştirilir; sayfaya yardımcı formül yazılmaz.
+        Anahtar hücrelerinin hepsi boş olan satırlar yok sayılır.
+
+        Args:
+            range_name: Tablo aralığı (None ise kullanılan alan).
+            key_columns: Anahtar sütunları (harf veya başlık adı); None ise
+                tüm sütunlar (tam satır yinelenmesi).
+            has_header: İlk satır başlık mı?
+            ignore_case: Metinler büyük/küçük harf ve baş/son boşluk
+                farkı gözetmeden karşılaştırılsın mı?
+            max_groups: Ayrıntılı listelenecek en fazla grup.
+
+        Returns:
+            Sonuç sözlüğü:
+            - range, rows, key_columns
+            - unique: Yinelenen yoksa True
+            - duplicate_groups, duplicate_rows, redundant_rows
+            - groups: [{key, count, rows ("5,9-11")}, ...] ilk görülme sırasıyla
+            - duplicate_ranges: Yinelenen satırların aralık listesi (vurgulama için)
+        """
+        try:
+            sheet = self.bridge.get_active_sheet()
+            start_col, start_row, data = self._table_block(sheet, range_name)
+            n_cols = len(data[0]) if data else 0
+            headers = list(data[0]) if has_header and data else [""] * n_cols
+            first_data = 1 if has_header else 0
+            positions = resolve_columns(key_columns, start_col, headers) if key_columns else list(range(n_cols))
+
+            groups: dict[tuple, list[int]] = {}
+            for r in range(first_data, len(data)):
+                row = data[r]
+                key = normalize_key([row[p] for p in positions], ignore_case)
+                if all(v == "" for v in key):
+                    continue
+                groups.setdefault(key, []).append(start_row + r + 1)
+
+            duplicates = [(key, rows) for key, rows in groups.items() if len(rows) > 1]
+            duplicate_rows = sorted(row for _key, rows in duplicates for row in rows)
+
+            first_col = self.bridge._index_to_column(start_col)
+            last_col = self.bridge._index_to_column(start_col + n_cols - 1) if n_cols else first_col
+            result = {
+                "range": f"{first_col}{start_row + 1}:{last_col}{start_row + len(data)}",
+                "rows": len(data) - first_data,
+                "key_columns": [self.bridge._index_to_column(start_col + p) for p in positions],
+                "unique": not duplicates,
+                "duplicate_groups": len(duplicates),
+                "duplicate_rows": len(duplicate_rows),
+                "redundant_rows": len(duplicate_rows) - len(duplicates),
+            }
+            if not duplicates:
+                return result
+
+            listed = []
+            for key, rows in duplicates[:max_groups]:
+                runs = row_runs(rows)
+                listed.append({
+                    "key": [
+                        (int(v) if v.is_integer() else round(v, 6)) if isinstance(v, float) else v
+                        for v in key
+                    ],
+                    "count": len(rows),
+                    "rows": ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in runs),
+                })
+            result["groups"] = listed
+            if len(duplicates) > max_groups:
+                result["groups_omitted"] = len(duplicates) - max_groups
+            result["duplicate_ranges"] = [
+                f"{first_col}{a}:{last_col}{b}" for a, b in row_runs(duplicate_rows)
+            ]
+            return result
+
+        except Exception as e:
+            logger.error("Yinelenen satır arama hatası: %s", str(e))
+            raise
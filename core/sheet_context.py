@@ -0,0 +1,222 @@
+"""Sayfa bağlamı önbelleği - LLM'e giden "MEVCUT DURUM" bölümünü önbellekte tutar.
+
+Bağlam her istekte (araç çağrılarından sonraki turlar dahil) yeniden
+üretildiğinde kullanılan alan, başlıklar ve seçim için çok sayıda UNO çağrısı
+yapılır. ``SheetContextCache`` bağlamı (belge, sayfa, seçim) anahtarıyla
+saklar; değişiklik ve seçim dinleyicileri önbelleği geçersiz kılar ve yeniden
+oluşturma arka plan iş parçacığında yapılır. Gönderim hiçbir zaman yeniden
+oluşturmayı beklemez: taze bağlam yoksa bir önceki bağlam kullanılır.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .uno_bridge import LibreOfficeBridge
+
+logger = logging.getLogger(__name__)
+
+# Bağlamda gösterilen en fazla başlık sayısı
+MAX_HEADERS = 10
+
+NO_CONNECTION_CONTEXT = "\n\n## MEVCUT DURUM\nLibreOffice bağlantısı yok."
+
+
+class SheetContextCache:
+    """Dinamik sayfa bağlamını önbellekte tutan ve arka planda yenileyen sınıf."""
+
+    def __init__(self, bridge):
+        """
+        SheetContextCache başlatıcı.
+
+        Args:
+            bridge: LibreOfficeBridge örneği.
+        """
+        self.bridge = bridge
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-context")
+        self._context: str | None = None
+        self._key: tuple | None = None
+        self._dirty = True
+        # Her geçersiz kılmada artar; yarışan bir yenileme eski sonucu taze saymaz
+        self._generation = 0
+        self._pending = None
+        self._rerun = False
+        self._listening = False
+
+    def set_listening(self, listening: bool) -> None:
+        """Dinleyicilerin etkin olup olmadığını bildirir.
+
+        Dinleyici yoksa değişiklikler fark edilemeyeceğinden her ``get``
+        çağrısında bağlam eşzamanlı olarak yeniden oluşturulur.
+        """
+        self._listening = listening
+
+    @property
+    def key(self) -> tuple | None:
+        """Son oluşturulan bağlamın (belge, sayfa, seçim, içerik özeti) anahtarı."""
+        return self._key
+
+    def invalidate(self, *_args) -> None:
+        """Önbelleği geçersiz kılar ve arka planda yeniden oluşturmayı başlatır.
+
+        Dinleyici sinyallerine doğrudan bağlanabilmesi için argümanları yok sayar.
+        """
+        with self._lock:
+            self._generation += 1
+            self._dirty = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                self._rerun = True
+                return
+            self._rerun = False
+            try:
+                self._pending = self._executor.submit(self._rebuild)
+            except RuntimeError:
+                # Yürütücü kapatıldı
+                self._pending = None
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            generation = self._generation
+        try:
+            context, key = self._build()
+        except Exception as e:
+            logger.debug("Sayfa bağlamı yenilenemedi: %s", e)
+            return
+        with self._lock:
+            self._context, self._key = context, key
+            if generation == self._generation:
+                self._dirty = False
+            rerun = self._rerun
+        if rerun:
+            self._schedule()
+
+    def get(self) -> str:
+        """LLM isteğine eklenecek bağlamı döndürür.
+
+        Taze bağlam varsa hemen döner. Geçersiz kılınmışsa önceki bağlam
+        döner ve yenileme arka planda sürer. Hiç bağlam yoksa (ilk istek),
+        etkin belge veya sayfa değiştiyse ya da dinleyiciler etkin değilse
+        bağlam eşzamanlı oluşturulur.
+        """
+        if not self.bridge or not self.bridge.is_connected:
+            return NO_CONNECTION_CONTEXT
+
+        with self._lock:
+            context, dirty, key = self._context, self._dirty, self._key
+        if context is not None and self._listening and self._same_sheet(key):
+            if dirty:
+                self._schedule()
+            return context
+
+        context, key = self._build()
+        with self._lock:
+            self._context, self._key = context, key
+            self._dirty = False
+        return context
+
+    def _same_sheet(self, key: tuple | None) -> bool:
+        """Önbellekteki bağlam hâlâ etkin belge ve sayfaya mı ait?
+
+        Başka sayfanın bağlamı gönderilmesin diye her istekte ucuz biçimde
+        (belge URL'si ve sayfa adı) denetlenir.
+        """
+        if key is None:
+            return False
+        try:
+            doc = self.bridge.get_active_document()
+            sheet_name = self.bridge.get_active_sheet().getName()
+        except Exception as e:
+            logger.debug("Etkin sayfa okunamadı: %s", e)
+            return False
+        return key[:2] == ((doc.getURL() or id(doc)), sheet_name)
+
+    def close(self) -> None:
+        """Arka plan yürütücüsünü kapatır."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _header_text(value) -> str | None:
+        if value == "" or value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def _build(self) -> tuple[str, tuple]:
+        """Bağlam metnini ve anahtarını UNO'dan okuyarak oluşturur."""
+        context_parts = ["\n\n## MEVCUT DURUM"]
+        doc_id = None
+        sheet_name = None
+        address = None
+        digest = None
+
+        try:
+            doc = self.bridge.get_active_document()
+            doc_id = doc.getURL() or id(doc)
+            sheet = self.bridge.get_active_sheet()
+            sheet_name = sheet.getName()
+
+            cursor = sheet.createCursor()
+            cursor.gotoStartOfUsedArea(False)
+            cursor.gotoEndOfUsedArea(True)
+            addr = cursor.getRangeAddress()
+            row_count = addr.EndRow - addr.StartRow + 1
+            col_count = addr.EndColumn - addr.StartColumn + 1
+            used_range = (
+                f"{LibreOfficeBridge._index_to_column(addr.StartColumn)}{addr.StartRow + 1}:"
+                f"{LibreOfficeBridge._index_to_column(addr.EndColumn)}{addr.EndRow + 1}"
+            )
+
+            context_parts.append(f"Sayfa: {sheet_name}")
+            context_parts.append(f"Kullanılan Aralık: {used_range}")
+            context_parts.append(f"Boyut: {row_count} satır x {col_count} sütun")
+
+            # Geniş sayfalarda tüm başlık satırı yerine yalnızca gösterilecek
+            # başlıklar tek toplu çağrıyla okunur
+            last_col = min(addr.EndColumn, addr.StartColumn + MAX_HEADERS - 1)
+            header_range = sheet.getCellRangeByPosition(
+                addr.StartColumn, addr.StartRow, last_col, addr.StartRow
+            )
+            headers = [self._header_text(v) for v in header_range.getDataArray()[0]]
+            if any(headers):
+                header_str = ", ".join([h or "(boş)" for h in headers])
+                if col_count > MAX_HEADERS:
+                    header_str += f"... (+{col_count - MAX_HEADERS} sütun)"
+                context_parts.append(f"Başlıklar: {header_str}")
+
+        except Exception as e:
+            logger.debug("Sayfa özeti alınamadı: %s", e)
+            context_parts.append("Sayfa bilgisi alınamadı.")
+
+        if self._listening:
+            # Dinleyici yokken karo özetleri önbelleğe alınmaz; her istekte
+            # tüm sayfayı okumamak için özet yalnızca dinleyiciyle hesaplanır
+            try:
+                digest = self.bridge.fingerprints.sheet_digest()["digest"]
+            except Exception as e:
+                logger.debug("Sayfa özeti hesaplanamadı: %s", e)
+
+        try:
+            doc = self.bridge.get_active_document()
+            controller = doc.getCurrentController()
+            selection = controller.getSelection()
+            address = LibreOfficeBridge.get_selection_address(selection)
+            context_parts.append(f"Seçili Hücre: {address}")
+
+            if selection and hasattr(selection, 'getString'):
+                value = selection.getString() or selection.getValue()
+                formula = selection.getFormula()
+                if formula:
+                    context_parts.append(f"Seçili Formül: {formula}")
+                elif value:
+                    context_parts.append(f"Seçili Değer: {value}")
+
+        except Exception as e:
+            logger.debug("Seçili hücre bilgisi alınamadı: %s", e)
+
+        return "\n".join(context_parts), (doc_id, sheet_name, address, digest)
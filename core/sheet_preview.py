@@ -0,0 +1,188 @@
+"""Sayfa önizlemesi - Modelin sayfaya ilk bakışı için bütçeli temsil üretir.
+
+Model bir sayfayı "görmek" için tahmini aralıklarla ``read_cell_range``
+çağırır ve çoğu zaman gereğinden fazlasını okur. ``build_preview`` tek bir
+``CellBlock`` üzerinden başlıkları, sütun tür ipuçlarını, ilk/son satırları
+ve aradaki satırlardan katmanlı örneklemi içeren kompakt bir sözlük üretir.
+
+Örnekleme aynı blok için her zaman aynı satırları seçer (tohum aralık ve
+satır sayısından türetilir). Sonuç ``max_chars`` sınırını aşarsa örnek sayısı,
+metin uzunluğu, son/baş satırları ve sütun sayısı küçük adımlarla ve dönüşümlü
+olarak azaltılır; böylece 100 bin satırlık bir sayfanın önizlemesi de sabit
+boyutta kalır ve bütçenin gereksiz küçük bir kısmı kullanılmaz. En küçük
+önizleme de sığmazsa sonuca ``"truncated": true`` eklenir.
+"""
+
+import json
+import random
+
+from .address_utils import index_to_column
+from .cell_block import CellBlock
+
+PREVIEW_HEAD_ROWS = 5
+PREVIEW_TAIL_ROWS = 3
+PREVIEW_SAMPLE_ROWS = 10
+PREVIEW_TEXT_CHARS = 40
+PREVIEW_MAX_COLUMNS = 40
+# ~1500 token
+PREVIEW_MAX_CHARS = 5400
+
+# Bütçeye sığmayan önizlemede en az gösterilen: baş satırı, metin uzunluğu, sütun
+MIN_HEAD_ROWS = 1
+MIN_TEXT_CHARS = 8
+MIN_COLUMNS = 1
+
+
+def _cell(block: CellBlock, r: int, c: int, text_chars: int):
+    value = block.value(r, c)
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 6)
+    if isinstance(value, str) and len(value) > text_chars:
+        return value[:text_chars] + "…"
+    return value
+
+
+def _column_hint(block: CellBlock, c: int, data_start: int) -> dict:
+    """Sütunun veri satırlarına göre tür ipucu."""
+    empty, value, text, formula = block.kind_counts(c)
+    if data_start:
+        # Başlık hücresi sayımlardan çıkarılır
+        header_kind = ("empty", "value", "text", "formula").index(block.kind(0, c))
+        counts = [empty, value, text, formula]
+        counts[header_kind] -= 1
+        empty, value, text, formula = counts
+
+    filled = value + text + formula
+    total = filled + empty
+    if not filled:
+        kind = "empty"
+    elif formula * 2 >= filled:
+        kind = "formula"
+    elif value >= filled * 0.95:
+        kind = "number"
+    elif text >= filled * 0.95:
+        kind = "text"
+    else:
+        kind = "mixed"
+
+    hint = {"type": kind, "filled": round(filled / total, 3) if total else 0.0}
+    if formula:
+        for r in range(data_start, block.n_rows):
+            example = block.formula(r, c)
+            if example:
+                hint["formula"] = f"{block.address(r, c)}: {example}"
+                break
+    return hint
+
+
+def _sample_rows(n_rows: int, first: int, stop: int, count: int, seed: str) -> list[int]:
+    """[first, stop) aralığını ``count`` katmana bölüp her katmandan bir satır seçer."""
+    span = stop - first
+    if count <= 0 or span <= 0:
+        return []
+    count = min(count, span)
+    rng = random.Random(f"{seed}:{n_rows}")
+    rows = []
+    for i in range(count):
+        lo = first + span * i // count
+        hi = first + span * (i + 1) // count
+        rows.append(rng.randrange(lo, hi))
+    return rows
+
+
+def _render(block: CellBlock, has_header: bool, columns: list[dict], head: int, tail: int,
+            samples: int, text_chars: int, max_columns: int) -> dict:
+    data_start = 1 if has_header and block.n_rows else 0
+    shown = min(block.n_cols, max(1, max_columns))
+    data_rows = block.n_rows - data_start
+
+    def _row(r: int) -> list:
+        return [_cell(block, r, c, text_chars) for c in range(shown)]
+
+    preview = {
+        "range": block.range_name,
+        "rows": data_rows,
+        "header_row": block.origin_row + 1 if data_start else None,
+        "columns": columns[:shown],
+    }
+    if shown < block.n_cols:
+        preview["columns_omitted"] = block.n_cols - shown
+
+    if data_rows <= head + tail + samples:
+        head, tail, samples = data_rows, 0, 0
+    head_stop = data_start + head
+    tail_start = block.n_rows - tail
+    preview["head"] = {
+        "first_row": block.origin_row + data_start + 1,
+        "rows": [_row(r) for r in range(data_start, head_stop)],
+    }
+    sampled = _sample_rows(block.n_rows, head_stop, tail_start, samples, block.range_name)
+    if sampled:
+        # Her örnek satırın ilk elemanı satır numarasıdır
+        preview["sample"] = [[block.origin_row + r + 1] + _row(r) for r in sampled]
+    if tail:
+        preview["tail"] = {
+            "first_row": block.origin_row + tail_start + 1,
+            "rows": [_row(r) for r in range(tail_start, block.n_rows)],
+        }
+    return preview
+
+
+def build_preview(block: CellBlock, has_header: bool = True, max_chars: int = PREVIEW_MAX_CHARS) -> dict:
+    """Blok için bütçeli önizleme sözlüğü üretir.
+
+    Args:
+        block: Önizlenecek hücre bloğu.
+        has_header: İlk satır başlık mı?
+        max_chars: JSON çıktısının en fazla karakter sayısı.
+
+    Returns:
+        range, rows, header_row, columns (col, header, type, filled,
+        formula), head, sample ([satır no, değerler...]) ve tail alanlarını
+        içeren sözlük; en küçük önizleme de bütçeyi aşıyorsa truncated.
+    """
+    data_start = 1 if has_header and block.n_rows else 0
+    columns = []
+    for c in range(block.n_cols):
+        entry = {"col": index_to_column(block.origin_col + c)}
+        if data_start:
+            header = block.value(0, c)
+            entry["header"] = _cell(block, 0, c, PREVIEW_TEXT_CHARS) if header is not None else None
+        entry.update(_column_hint(block, c, data_start))
+        columns.append(entry)
+
+    sizes = {
+        "samples": PREVIEW_SAMPLE_ROWS,
+        "text_chars": PREVIEW_TEXT_CHARS,
+        "tail": PREVIEW_TAIL_ROWS,
+        "max_columns": min(block.n_cols, PREVIEW_MAX_COLUMNS),
+        "head": PREVIEW_HEAD_ROWS,
+    }
+    # Her turda her boyut bir adım küçültülür; sıra önceliği belirler
+    shrink_steps = (
+        ("samples", lambda n: max(0, n - 2)),
+        ("text_chars", lambda n: max(MIN_TEXT_CHARS, n - 8)),
+        ("tail", lambda n: max(0, n - 1)),
+        ("max_columns", lambda n: max(MIN_COLUMNS, n - max(1, n // 8))),
+        ("head", lambda n: max(MIN_HEAD_ROWS, n - 1)),
+    )
+
+    def _fits(preview: dict) -> bool:
+        return len(json.dumps(preview, ensure_ascii=False, separators=(",", ":"))) <= max_chars
+
+    preview = _render(block, has_header, columns, **sizes)
+    while not _fits(preview):
+        shrunk = False
+        for name, shrink in shrink_steps:
+            smaller = shrink(sizes[name])
+            if smaller == sizes[name]:
+                continue
+            sizes[name] = smaller
+            shrunk = True
+            preview = _render(block, has_header, columns, **sizes)
+            if _fits(preview):
+                break
+        if not shrunk:
+            preview["truncated"] = True
+            break
+    return preview
@@ -0,0 +1,397 @@
+"""Anlık görüntü önbelleği - Sayfa okumalarını diske eşlenmiş dosyalarda saklar.
+
+Asistan yeniden açıldığında veya bağlantı yenilendiğinde her sayfanın
+kullanılan alanı URP üzerinden baştan okunur. ``SnapshotCache`` bu toplu
+okumaları ``~/.config/libre_calc_ai/cache`` altında belge URL'si ve sayfa adı
+anahtarlı bir dizinde saklar:
+
+- ``kinds.u8``: hücre türü kodları (``CellBlock`` ile aynı düzen)
+- ``numbers.f64``: sayısal değerler
+- ``strings.json``: metin değerleri ve formüller (düz dizin anahtarlı)
+- ``meta.json``: sol üst köşe, boyut, belge değişiklik damgası ve karo özetleri
+
+Sayısal dosyalar ``mmap`` ile eşlenir ve eşlemeler ``close_all`` çağrılana
+kadar açık tutulur. Yenileme eşlenmiş belleğe yerinde yazdığı için çağırana
+her zaman bağımsız bir kopya verilir; daha önce dönen bloklar sonraki
+yenilemelerden etkilenmez.
+
+Her karo (``RangeFingerprinter`` ile aynı satır karoları) için saklanan özet,
+parmak izi önbelleğindeki güncel özetle karşılaştırılır; farklı olan karolar
+yeniden okunup dosyaya yerinde yazılır. Güncel özet bilinmiyorsa anlık görüntü
+yalnızca belge kaydedildikten sonra değişmemişse ve değişiklik damgası aynıysa
+güvenilir; aksi halde karolar okunup özetleri karşılaştırılır. Formül içeren
+karolar her zaman yeniden okunur; başka karodaki bir düzenleme sonuçlarını
+değişiklik olayı olmadan değiştirebilir.
+
+Anlık görüntüler sayfa içeriğini şifrelenmemiş olarak diske yazdığı için
+önbellek varsayılan olarak kapalıdır (``set_enabled``); kapatıldığında diskteki
+anlık görüntüler silinir. Kaydedilmemiş (URL'si olmayan) belgeler diske
+yazılmaz. Sayı, toplam boyut ve yaş sınırını aşan anlık görüntüler en eski
+kullanılandan başlayarak silinir.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from .cell_block import CellBlock
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path.home() / ".config" / "libre_calc_ai" / "cache"
+# Diskte tutulan en fazla sayfa anlık görüntüsü
+MAX_SNAPSHOTS = 64
+# Anlık görüntülerin diskte kaplayabileceği en fazla toplam boyut
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+# Bu süreden uzun kullanılmayan anlık görüntüler silinir
+MAX_AGE_SECONDS = 7 * 24 * 3600
+
+_META_FILE = "meta.json"
+_KINDS_FILE = "kinds.u8"
+_NUMBERS_FILE = "numbers.f64"
+_STRINGS_FILE = "strings.json"
+
+
+def _map_file(path: Path, fmt: str, length: int) -> memoryview:
+    """Dosyayı yazılabilir olarak eşler ve ``fmt`` biçiminde görünüm döndürür."""
+    itemsize = array(fmt).itemsize
+    if path.stat().st_size != length * itemsize:
+        raise ValueError(f"{path.name} boyutu beklenenden farklı")
+    with open(path, "r+b") as f:
+        mapped = mmap.mmap(f.fileno(), 0)
+    return memoryview(mapped).cast(fmt)
+
+
+def _close_view(view: memoryview) -> None:
+    """``_map_file`` görünümünü bırakıp eşlemeyi kapatır."""
+    mapped = view.obj
+    view.release()
+    mapped.close()
+
+
+def _dir_size(directory: Path) -> int:
+    try:
+        return sum(f.stat().st_size for f in directory.iterdir())
+    except OSError:
+        return 0
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotCache:
+    """Sayfa kullanılan alanlarının diske eşlenmiş anlık görüntülerini yöneten sınıf."""
+
+    def __init__(self, bridge, directory: Path = CACHE_DIR, max_snapshots: int = MAX_SNAPSHOTS,
+                 max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_AGE_SECONDS,
+                 enabled: bool = False):
+        """
+        SnapshotCache başlatıcı.
+
+        Args:
+            bridge: LibreOfficeBridge örneği.
+            directory: Anlık görüntülerin saklandığı dizin.
+            max_snapshots: Diskte tutulan en fazla sayfa anlık görüntüsü.
+            max_bytes: Anlık görüntülerin toplam en fazla boyutu (bayt).
+            max_age: Kullanılmayan anlık görüntünün saklanma süresi (saniye).
+            enabled: False ise sayfalar her seferinde doğrudan okunur.
+        """
+        self.bridge = bridge
+        self._directory = Path(directory)
+        self._max_snapshots = max_snapshots
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        # Anlık görüntü dizini -> açık eşlenmiş blok
+        self._mapped: dict[Path, CellBlock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Anlık görüntüler diske yazılıyorsa True."""
+        return self._enabled
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Önbelleği açar veya kapatır.
+
+        Kapatıldığında eşlemeler kapatılır ve diskteki anlık görüntüler
+        silinir; açıldığında süresi dolmuş anlık görüntüler budanır.
+        """
+        self._enabled = enabled
+        if not enabled:
+            self.clear()
+            return
+        with self._lock:
+            try:
+                self._prune()
+            except OSError as e:
+                logger.debug("Anlık görüntüler budanamadı: %s", e)
+
+    @staticmethod
+    def _stamp(doc) -> str:
+        """Belgenin son kaydedilme damgası; okunamazsa boş metin."""
+        try:
+            d = doc.getDocumentProperties().ModificationDate
+            return (
+                f"{d.Year:04d}-{d.Month:02d}-{d.Day:02d}T"
+                f"{d.Hours:02d}:{d.Minutes:02d}:{d.Seconds:02d}.{d.NanoSeconds}"
+            )
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _is_modified(doc) -> bool:
+        try:
+            return bool(doc.isModified())
+        except Exception:
+            return True
+
+    def _snapshot_dir(self, url: str, sheet_name: str) -> Path:
+        key = hashlib.sha1(f"{url}\n{sheet_name}".encode("utf-8")).hexdigest()
+        return self._directory / key
+
+    def load(self, sheet_name: str | None = None) -> CellBlock:
+        """Sayfanın kullanılan alanını anlık görüntüden (gerekirse yenileyerek) döndürür.
+
+        Args:
+            sheet_name: Sayfa adı (None ise aktif sayfa).
+
+        Returns:
+            Kullanılan alanın ``CellBlock`` gösterimi.
+        """
+        doc = self.bridge.get_active_document()
+        if sheet_name:
+            sheet = doc.getSheets().getByName(sheet_name)
+        else:
+            sheet = self.bridge.get_active_sheet()
+        cursor = sheet.createCursor()
+        cursor.gotoStartOfUsedArea(False)
+        cursor.gotoEndOfUsedArea(True)
+        addr = cursor.getRangeAddress()
+
+        url = doc.getURL()
+        if not url or not self._enabled:
+            return CellBlock.from_arrays(
+                addr.StartColumn, addr.StartRow, cursor.getDataArray(), cursor.getFormulaArray()
+            )
+
+        name = sheet.getName()
+        directory = self._snapshot_dir(url, name)
+        with self._lock:
+            meta = self._read_meta(directory)
+            if meta is not None and self._matches(meta, addr):
+                try:
+                    return self._refresh(doc, sheet, directory, meta, addr).copy()
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning("Anlık görüntü yenilenemedi (%s): %s", name, e)
+                    self._unmap(directory)
+            return self._rebuild(doc, sheet, cursor, directory, addr)
+
+    def _read_meta(self, directory: Path) -> dict | None:
+        try:
+            with open(directory / _META_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _matches(self, meta: dict, addr) -> bool:
+        """Anlık görüntü aynı alanı ve aynı karo düzenini kapsıyor mu?"""
+        tiles = [str(first) for first, _last in self.bridge.fingerprints.tile_bounds(addr.StartRow, addr.EndRow)]
+        return (
+            meta.get("origin") == [addr.StartColumn, addr.StartRow]
+            and meta.get("shape") == [addr.EndRow - addr.StartRow + 1, addr.EndColumn - addr.StartColumn + 1]
+            and list(meta.get("tiles", {})) == tiles
+        )
+
+    def _map(self, directory: Path, meta: dict) -> CellBlock:
+        """Anlık görüntünün açık eşlemesini döndürür; yoksa dosyaları eşler."""
+        n_rows, n_cols = meta["shape"]
+        origin_col, origin_row = meta["origin"]
+        block = self._mapped.get(directory)
+        if block is not None:
+            if block.shape == (n_rows, n_cols) and (block.origin_col, block.origin_row) == (origin_col, origin_row):
+                return block
+            self._unmap(directory)
+
+        size = n_rows * n_cols
+        kinds = _map_file(directory / _KINDS_FILE, "B", size)
+        numbers = None
+        try:
+            numbers = _map_file(directory / _NUMBERS_FILE, "d", size)
+            with open(directory / _STRINGS_FILE, "r", encoding="utf-8") as f:
+                strings = json.load(f)
+            intern = sys.intern
+            texts = {int(i): intern(text) for i, text in strings["texts"].items()}
+            formulas = {int(i): intern(formula) for i, formula in strings["formulas"].items()}
+        except (OSError, ValueError, KeyError):
+            for view in (kinds, numbers):
+                if view is not None:
+                    _close_view(view)
+            raise
+        block = CellBlock(origin_col, origin_row, n_rows, n_cols, kinds, numbers, texts, formulas)
+        self._mapped[directory] = block
+        return block
+
+    def _unmap(self, directory: Path) -> None:
+        """Dizinin açık eşlemesini kapatır."""
+        block = self._mapped.pop(directory, None)
+        if block is not None:
+            _close_view(block._kinds)
+            _close_view(block._numbers)
+
+    def close_all(self) -> None:
+        """Açık tüm eşlemeleri kapatır; sonraki ``load`` dosyaları yeniden eşler."""
+        with self._lock:
+            for directory in list(self._mapped):
+                self._unmap(directory)
+
+    def _refresh(self, doc, sheet, directory: Path, meta: dict, addr) -> CellBlock:
+        """Eşlenmiş anlık görüntünün eski karolarını yeniden okuyup yerinde yazar."""
+        fingerprints = self.bridge.fingerprints
+        doc_id = fingerprints.document_id(doc)
+        name = sheet.getName()
+        stamp = self._stamp(doc)
+        modified = self._is_modified(doc)
+        # Parmak izi bilinmeyen karolara yalnızca belge kaydedildiğinden beri
+        # değişmemişse ve anlık görüntü aynı kayıttan alınmışsa güvenilir
+        trusted = bool(stamp) and meta.get("stamp") == stamp and meta.get("clean") and not modified
+
+        block = self._map(directory, meta)
+        # Formül içeren satırlar (mutlak); bu satırların karoları her zaman okunur
+        formula_rows = sorted({addr.StartRow + i // block.n_cols for i in block._formulas})
+        tiles = meta["tiles"]
+        read = rewritten = 0
+        for first, last in fingerprints.tile_bounds(addr.StartRow, addr.EndRow):
+            key = (doc_id, name, addr.StartColumn, addr.EndColumn, first, last)
+            stored = tiles[str(first)]
+            at = bisect.bisect_left(formula_rows, first)
+            if at == len(formula_rows) or formula_rows[at] > last:
+                current = fingerprints.cached_tile(key)
+                if current == stored:
+                    continue
+                if current is None and trusted:
+                    fingerprints.remember_tile(key, stored)
+                    continue
+
+            tile = sheet.getCellRangeByPosition(addr.StartColumn, first, addr.EndColumn, last)
+            data, formulas = tile.getDataArray(), tile.getFormulaArray()
+            current = fingerprints.hash_block(data, formulas)
+            fingerprints.remember_tile(key, current, fingerprints.has_formulas(formulas))
+            read += 1
+            if current != stored:
+                block.write_rows(first - addr.StartRow, CellBlock.from_arrays(addr.StartColumn, first, data, formulas))
+                tiles[str(first)] = current
+                rewritten += 1
+
+        if rewritten:
+            block._kinds.obj.flush()
+            block._numbers.obj.flush()
+            self._write_strings(directory, block)
+        if rewritten or meta.get("stamp") != stamp or meta.get("clean") != (not modified):
+            meta.update(stamp=stamp, clean=not modified)
+            _write_file(directory / _META_FILE, json.dumps(meta).encode("utf-8"))
+        else:
+            # Budama en eski kullanılanı bulmak için dizin zamanına bakar
+            os.utime(directory)
+        logger.debug(
+            "Anlık görüntü: %s, %d karo okundu, %d karo yenilendi", name, read, rewritten
+        )
+        return block
+
+    def _rebuild(self, doc, sheet, cursor, directory: Path, addr) -> CellBlock:
+        """Kullanılan alanı tek seferde okuyup anlık görüntüyü baştan yazar."""
+        fingerprints = self.bridge.fingerprints
+        doc_id = fingerprints.document_id(doc)
+        name = sheet.getName()
+        data, formulas = cursor.getDataArray(), cursor.getFormulaArray()
+        block = CellBlock.from_arrays(addr.StartColumn, addr.StartRow, data, formulas)
+        if not block.n_rows or not block.n_cols:
+            return block
+
+        tiles = {}
+        for first, last in fingerprints.tile_bounds(addr.StartRow, addr.EndRow):
+            lo, hi = first - addr.StartRow, last - addr.StartRow + 1
+            tile_hash = fingerprints.hash_block(data[lo:hi], formulas[lo:hi])
+            fingerprints.remember_tile(
+                (doc_id, name, addr.StartColumn, addr.EndColumn, first, last), tile_hash,
+                fingerprints.has_formulas(formulas[lo:hi]),
+            )
+            tiles[str(first)] = tile_hash
+
+        # Dosyalar değiştirilmeden önce eski eşleme kapatılır
+        self._unmap(directory)
+        meta = {
+            "url": doc.getURL(),
+            "sheet": name,
+            "origin": [addr.StartColumn, addr.StartRow],
+            "shape": [block.n_rows, block.n_cols],
+            "stamp": self._stamp(doc),
+            "clean": not self._is_modified(doc),
+            "tiles": tiles,
+        }
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            # Yarım kalan yazmada eski özetler yeni verilerle eşleşmesin
+            (directory / _META_FILE).unlink(missing_ok=True)
+            _write_file(directory / _KINDS_FILE, array("B", block._kinds).tobytes())
+            _write_file(directory / _NUMBERS_FILE, array("d", block._numbers).tobytes())
+            self._write_strings(directory, block)
+            _write_file(directory / _META_FILE, json.dumps(meta).encode("utf-8"))
+            self._prune(directory)
+        except OSError as e:
+            logger.warning("Anlık görüntü yazılamadı (%s): %s", name, e)
+            return block
+        logger.debug("Anlık görüntü yazıldı: %s, %dx%d", name, block.n_rows, block.n_cols)
+        return block
+
+    @staticmethod
+    def _write_strings(directory: Path, block: CellBlock) -> None:
+        strings = {"texts": block._texts, "formulas": block._formulas}
+        _write_file(directory / _STRINGS_FILE, json.dumps(strings, ensure_ascii=False).encode("utf-8"))
+
+    def _prune(self, keep: Path | None = None) -> None:
+        """Süresi dolan ve sayı/boyut sınırını aşan anlık görüntüleri siler.
+
+        Args:
+            keep: Az önce yazılan, sınırlardan bağımsız korunan dizin.
+        """
+        if not self._directory.is_dir():
+            return
+        now = time.time()
+        snapshots = [d for d in self._directory.iterdir() if d.is_dir() and d != keep]
+        # En yeni kullanılan önce; sınırlar dolunca kalanlar silinir
+        snapshots.sort(key=lambda d: d.stat().st_mtime, reverse=True)
+        count = 1 if keep else 0
+        total = _dir_size(keep) if keep else 0
+        for directory in snapshots:
+            size = _dir_size(directory)
+            if (
+                now - directory.stat().st_mtime <= self._max_age
+                and count < self._max_snapshots
+                and total + size <= self._max_bytes
+            ):
+                count += 1
+                total += size
+                continue
+            self._unmap(directory)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Eşlemeleri kapatıp tüm anlık görüntüleri siler."""
+        with self._lock:
+            for directory in list(self._mapped):
+                self._unmap(directory)
+            shutil.rmtree(self._directory, ignore_errors=True)
@@ -0,0 +1,220 @@
+"""Tablo yardımcıları - Toplu okunan tablolar üzerinde ortak işlemler."""
+
+from .address_utils import column_to_index
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# group_aggregate'in desteklediği toplama fonksiyonları
+AGGREGATE_FUNCTIONS = ("sum", "count", "mean", "min", "max", "distinct")
+
+
+def resolve_columns(columns, start_col: int, headers) -> list[int]:
+    """
+    Sütun harflerini veya başlık adlarını tablo içindeki sütun konumlarına çevirir.
+
+    Sırasıyla birebir başlık adı, sütun harfi (tablonun içindeyse) ve büyük/
+    küçük harf duyarsız başlık adı olarak eşleştirilir; geniş bir tabloda
+    "Ad" başlığı AD sütunu sanılmaz, "AD" ise AD sütunudur.
+
+    Args:
+        columns: Sütun harfleri veya başlık adları (ör. ["A", "Tutar"]).
+        start_col: Tablonun ilk sütun indeksi (0 tabanlı).
+        headers: Tablonun başlık satırı değerleri.
+
+    Returns:
+        Tablonun ilk sütununa göre 0 tabanlı konumlar.
+
+    Raises:
+        ValueError: Bir sütun tabloda bulunamazsa.
+    """
+    n_cols = len(headers)
+    names = [str(h).strip() for h in headers]
+    folded = [name.casefold() for name in names]
+    positions = []
+    for column in columns:
+        column = str(column).strip()
+        if column and column in names:
+            positions.append(names.index(column))
+            continue
+        if column.isalpha() and len(column) <= 3 and column.isascii():
+            position = column_to_index(column.upper()) - start_col
+            if 0 <= position < n_cols:
+                positions.append(position)
+                continue
+        if column and column.casefold() in folded:
+            positions.append(folded.index(column.casefold()))
+            continue
+        raise ValueError(f"Sütun tabloda yok: {column}")
+    return positions
+
+
+def row_runs(rows: list[int]) -> list[tuple[int, int]]:
+    """
+    Sıralı satır numaralarını ardışık (ilk, son) koşularına indirger.
+
+    Args:
+        rows: Artan sırada satır numaraları.
+
+    Returns:
+        (ilk, son) ikilileri listesi; ör. [5, 9, 10, 11] -> [(5, 5), (9, 11)].
+    """
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return [tuple(run) for run in runs]
+
+
+def normalize_key(values, ignore_case: bool = False) -> tuple:
+    """
+    Anahtar hücre değerlerini karşılaştırma için normalize eder.
+
+    Args:
+        values: Anahtar hücre değerleri (``getDataArray`` öğeleri).
+        ignore_case: Metinlerde büyük/küçük harf ve baş/son boşluk yok sayılsın mı?
+
+    Returns:
+        Karma tablosunda kullanılabilir anahtar demeti.
+    """
+    if ignore_case:
+        return tuple(v.strip().casefold() if isinstance(v, str) else v for v in values)
+    return tuple(values)
+
+
+def _sort_key(value):
+    """Sayılar, metinler ve boşlar karışık sıralanabilsin diye sıralama anahtarı."""
+    if value == "":
+        return (2, "")
+    if isinstance(value, str):
+        return (1, value.casefold())
+    return (0, value)
+
+
+def _numeric_column(column: list):
+    """Sütunu (dolu maskesi, sayısal dizi) ikilisine çevirir; sayı olmayanlar NaN."""
+    filled = np.fromiter((v != "" for v in column), dtype=bool, count=len(column))
+    numeric = np.fromiter(
+        (v if isinstance(v, float) else np.nan for v in column), dtype=np.float64, count=len(column),
+    )
+    return filled, numeric
+
+
+def _aggregate_numpy(ids, n_groups: int, filled, numeric, func: str) -> list:
+    if func == "count":
+        return np.bincount(ids[filled], minlength=n_groups).tolist()
+
+    valid = ~np.isnan(numeric)
+    valid_ids = ids[valid]
+    if func in ("sum", "mean"):
+        sums = np.bincount(valid_ids, weights=numeric[valid], minlength=n_groups)
+        if func == "sum":
+            return sums.tolist()
+        counts = np.bincount(valid_ids, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        return [m if c else "" for m, c in zip(means.tolist(), counts.tolist())]
+
+    # min/max: grup sırasına dizip her grubun dilimini tek ufunc ile indirger
+    order = np.argsort(valid_ids, kind="stable")
+    sorted_ids = valid_ids[order]
+    sorted_values = numeric[valid][order]
+    result = [""] * n_groups
+    if len(sorted_ids):
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        reducer = np.minimum if func == "min" else np.maximum
+        reduced = reducer.reduceat(sorted_values, starts)
+        for group, value in zip(sorted_ids[starts].tolist(), reduced.tolist()):
+            result[group] = value
+    return result
+
+
+def _aggregate_python(group_ids, n_groups: int, column: list, func: str) -> list:
+    if func == "count":
+        counts = [0] * n_groups
+        for g, v in zip(group_ids, column):
+            if v != "":
+                counts[g] += 1
+        return counts
+    if func == "distinct":
+        seen = [set() for _ in range(n_groups)]
+        for g, v in zip(group_ids, column):
+            if v != "":
+                seen[g].add(v)
+        return [len(values) for values in seen]
+
+    sums = [0.0] * n_groups
+    counts = [0] * n_groups
+    extremes = [None] * n_groups
+    pick = min if func == "min" else max
+    for g, v in zip(group_ids, column):
+        if not isinstance(v, float):
+            continue
+        sums[g] += v
+        counts[g] += 1
+        extremes[g] = v if extremes[g] is None else pick(extremes[g], v)
+    if func == "sum":
+        return sums
+    if func == "mean":
+        return [s / c if c else "" for s, c in zip(sums, counts)]
+    return ["" if e is None else e for e in extremes]
+
+
+def group_aggregate(rows, key_positions: list[int], measures: list[tuple[int, str]]) -> tuple[list, list]:
+    """
+    Satırları anahtar sütunlarına göre gruplayıp ölçü sütunlarını toplar.
+
+    Gruplar tek geçişte karma tablosuyla numaralandırılır; toplamalar NumPy
+    varsa ``bincount``/``reduceat`` ile vektörel, yoksa saf Python ile
+    hesaplanır. Sayısal olmayan hücreler sum/mean/min/max'ta yok sayılır;
+    count boş olmayan hücreleri, distinct farklı boş olmayan değerleri sayar.
+
+    Args:
+        rows: Veri satırları (``getDataArray`` satırları, başlıksız).
+        key_positions: Grup anahtarı sütun konumları.
+        measures: (sütun konumu, fonksiyon) ikilileri.
+
+    Returns:
+        (anahtarlar, sonuçlar) ikilisi; anahtarlar sıralı grup anahtarı
+        demetleri, sonuçlar her grup için ölçü değerleri listesi.
+
+    Raises:
+        ValueError: Desteklenmeyen toplama fonksiyonunda.
+    """
+    for _position, func in measures:
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Desteklenmeyen toplama fonksiyonu: {func}")
+
+    groups: dict[tuple, int] = {}
+    group_ids = []
+    for row in rows:
+        key = tuple(row[p] for p in key_positions)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = len(groups)
+        group_ids.append(group)
+
+    n_groups = len(groups)
+    ids = np.asarray(group_ids, dtype=np.intp) if NUMPY_AVAILABLE else None
+    # Aynı sütun birden çok toplamada kullanılırsa bir kez dönüştürülür
+    converted = {}
+    columns = []
+    for position, func in measures:
+        if NUMPY_AVAILABLE and func != "distinct":
+            if position not in converted:
+                converted[position] = _numeric_column([row[position] for row in rows])
+            filled, numeric = converted[position]
+            columns.append(_aggregate_numpy(ids, n_groups, filled, numeric, func))
+        else:
+            column = [row[position] for row in rows]
+            columns.append(_aggregate_python(group_ids, n_groups, column, func))
+
+    keys = list(groups)
+    order = sorted(range(n_groups), key=lambda g: tuple(_sort_key(v) for v in keys[g]))
+    return [keys[g] for g in order], [[column[g] for column in columns] for g in order]
@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
 from .address_utils import (
@@ -148,6 +149,8 @@ class LibreOfficeBridge:
         self._connected = False
         self._max_retries = 3
         self._retry_delay = 1.0
+        self._fingerprints = None
+        self._snapshots = None
 
         # Bağlantı tipini ortam değişkenlerinden oku
         self._connect_type = os.environ.get("LO_CONNECT_TYPE", "socket")
@@ -158,6 +161,22 @@ class LibreOfficeBridge:
         """Bağlantı durumunu döndürür."""
         return self._connected
 
+    @property
+    def fingerprints(self):
+        """Bu bağlantıyı kullanan modüllerin paylaştığı RangeFingerprinter."""
+        if self._fingerprints is None:
+            from .range_fingerprint import RangeFingerprinter
+            self._fingerprints = RangeFingerprinter(self)
+        return self._fingerprints
+
+    @property
+    def snapshots(self):
+        """Bu bağlantıyı kullanan modüllerin paylaştığı SnapshotCache."""
+        if self._snapshots is None:
+            from .snapshot_cache import SnapshotCache
+            self._snapshots = SnapshotCache(self)
+        return self._snapshots
+
     # Geriye uyumluluk: eski kodda bridge/_class üstünden çağrılan yardımcılar.
     @staticmethod
     def _index_to_column(index: int) -> str:
@@ -453,6 +472,39 @@ class LibreOfficeBridge:
             return []
         return []
 
+    @contextmanager
+    def bulk_edit(self, title: str = "Toplu düzenleme"):
+        """Birden fazla değişikliği tek bir düzenleme oturumunda yapar.
+
+        Oturum boyunca ekran güncellemeleri ve yeniden hesaplama ertelenir;
+        tüm değişiklikler tek bir geri alma adımında toplanır.
+
+        Args:
+            title: Geri alma listesinde görünecek başlık.
+
+        Yields:
+            Aktif belge.
+        """
+        doc = self.get_active_document()
+        undo_manager = None
+        try:
+            undo_manager = doc.getUndoManager()
+            undo_manager.enterUndoContext(title)
+        except Exception as e:
+            logger.debug("Geri alma bağlamı açılamadı: %s", e)
+            undo_manager = None
+        doc.lockControllers()
+        doc.addActionLock()
+        try:
+            yield doc
+        finally:
+            try:
+                doc.removeActionLock()
+                doc.unlockControllers()
+            finally:
+                if undo_manager is not None:
+                    undo_manager.leaveUndoContext()
+
     def __enter__(self):
         """Context manager girişi - bağlantıyı açar."""
         self.connect()
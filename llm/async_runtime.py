@@ -0,0 +1,156 @@
+"""Asyncio çalışma zamanı - Tüm LLM istekleri için tek olay döngüsü iş parçacığı.
+
+Sağlayıcıların asıl uygulaması ``async`` metodlardır (``acompletion``,
+``astream_completion``). Bu modül, süreç genelinde tek bir arka plan
+iş parçacığında asyncio olay döngüsü çalıştırır; böylece paralel LLM
+çağrıları (hedging, arka plan özetleme vb.) aynı döngüde eşzamanlı yürür.
+Senkron API, ``run_sync`` ve ``iterate_sync`` ile bu döngü üzerine ince bir
+sarmalayıcıdır.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import threading
+from typing import AsyncIterator, Awaitable, Generator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ITEM = 0
+_DONE = 1
+_ERROR = 2
+
+
+class AsyncRuntime:
+    """Arka plan iş parçacığında çalışan tekil asyncio olay döngüsü."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Olay döngüsü çalışmıyorsa başlatır ve döndürür."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=_run, name="llm-asyncio", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            logger.debug("LLM asyncio döngüsü başlatıldı.")
+            return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Çalışan olay döngüsünü döndürür (gerekirse başlatır)."""
+        return self._ensure_started()
+
+    def in_loop_thread(self) -> bool:
+        """Çağıran kod olay döngüsü iş parçacığında mı çalışıyor?"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[T]) -> concurrent.futures.Future:
+        """Coroutine'i döngüye gönderir; iş parçacığı güvenli Future döndürür.
+
+        Future'ın ``cancel()`` metodu coroutine'i anında iptal eder.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Awaitable[T], timeout: float | None = None) -> T:
+        """Coroutine'i döngüde çalıştırır ve sonucunu senkron bekler.
+
+        Raises:
+            RuntimeError: Döngü iş parçacığının içinden çağrılırsa (kilitlenme).
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Senkron sarmalayıcı asyncio döngüsü içinden çağrılamaz.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator[T]) -> Generator[T, None, None]:
+        """Asenkron üreteci senkron üretece dönüştürür.
+
+        Tüketici üreteci erken kapatırsa (ör. iptal), alttaki asenkron görev
+        de iptal edilir ve HTTP akışı hemen kapanır.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("Senkron sarmalayıcı asyncio döngüsü içinden çağrılamaz.")
+
+        items: queue.Queue = queue.Queue()
+
+        async def _pump():
+            try:
+                async for item in agen:
+                    items.put((_ITEM, item))
+                items.put((_DONE, None))
+            except asyncio.CancelledError:
+                items.put((_DONE, None))
+                raise
+            except BaseException as exc:
+                items.put((_ERROR, exc))
+            finally:
+                aclose = getattr(agen, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(_pump())
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == _ITEM:
+                    yield value
+                elif kind == _DONE:
+                    return
+                else:
+                    raise value
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def stop(self) -> None:
+        """Olay döngüsünü durdurur (uygulama kapanışında)."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=2.0)
+
+
+_runtime = AsyncRuntime()
+
+
+def get_runtime() -> AsyncRuntime:
+    """Süreç genelindeki tekil asyncio çalışma zamanını döndürür."""
+    return _runtime
+
+
+def run_sync(coro: Awaitable[T], timeout: float | None = None) -> T:
+    """``get_runtime().run`` kısayolu."""
+    return _runtime.run(coro, timeout)
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Generator[T, None, None]:
+    """``get_runtime().iterate`` kısayolu."""
+    return _runtime.iterate(agen)
@@ -1,21 +1,36 @@
 """LLM sağlayıcıları için soyut temel sınıf."""
 
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import AsyncGenerator, Generator
+
+from .async_runtime import iterate_sync, run_sync
+from .context_budget import get_estimator
+from .prompt_cache import get_cache_stats, normalize_usage
+from .rate_limiter import RateLimiter, get_limiter
+
+logger = logging.getLogger(__name__)
 
 
 class BaseLLMProvider(ABC):
     """Tüm LLM sağlayıcılarının uygulaması gereken arayüz.
 
-    Alt sınıflar chat_completion, stream_completion, get_available_models
-    ve set_model metodlarını uygulamalıdır.
+    Alt sınıflar acompletion, astream_completion, aget_available_models
+    ve set_model metodlarını uygulamalıdır. Asıl uygulama asenkrondur
+    (httpx.AsyncClient); chat_completion, stream_completion ve
+    get_available_models bunların üzerinde ince senkron sarmalayıcılardır
+    ve tek asyncio döngüsünde (bkz. async_runtime) çalışır.
     """
 
+    # Ayarlar ve hız sınırlayıcı anahtarlarında kullanılan sağlayıcı adı
+    provider_name: str = ""
+
     @abstractmethod
-    def chat_completion(
+    async def acompletion(
         self, messages: list[dict], tools: list[dict] | None = None
     ) -> dict:
-        """Sohbet tamamlama isteği gönderir.
+        """Sohbet tamamlama isteği gönderir (asenkron).
 
         Args:
             messages: Mesaj listesi. Her mesaj {"role": "system"|"user"|"assistant"|"tool",
@@ -30,10 +45,10 @@ class BaseLLMProvider(ABC):
         """
 
     @abstractmethod
-    def stream_completion(
+    def astream_completion(
         self, messages: list[dict], tools: list[dict] | None = None
-    ) -> Generator[dict, None, None]:
-        """Akış (streaming) modunda sohbet tamamlama isteği gönderir.
+    ) -> AsyncGenerator[dict, None]:
+        """Akış (streaming) modunda sohbet tamamlama isteği gönderir (asenkron).
 
         Args:
             messages: Mesaj listesi.
@@ -44,11 +59,12 @@ class BaseLLMProvider(ABC):
             - "content": Metin parçası (veya None)
             - "tool_calls": Araç çağrısı parçası (veya None)
             - "done": Akışın tamamlanıp tamamlanmadığı
+            - "usage": (opsiyonel, son parçada) ``_record_usage`` çıktısı
         """
 
     @abstractmethod
-    def get_available_models(self) -> list[str]:
-        """Kullanılabilir model listesini döndürür.
+    async def aget_available_models(self) -> list[str]:
+        """Kullanılabilir model listesini döndürür (asenkron).
 
         Returns:
             Model isimlerinden oluşan liste.
@@ -62,6 +78,83 @@ class BaseLLMProvider(ABC):
             model_name: Kullanılacak model ismi.
         """
 
+    def chat_completion(
+        self, messages: list[dict], tools: list[dict] | None = None
+    ) -> dict:
+        """acompletion için senkron sarmalayıcı."""
+        return run_sync(self.acompletion(messages, tools))
+
+    def stream_completion(
+        self, messages: list[dict], tools: list[dict] | None = None
+    ) -> Generator[dict, None, None]:
+        """astream_completion için senkron sarmalayıcı.
+
+        Üreteç erken kapatılırsa alttaki asenkron istek iptal edilir.
+        """
+        yield from iterate_sync(self.astream_completion(messages, tools))
+
+    def get_available_models(self) -> list[str]:
+        """aget_available_models için senkron sarmalayıcı."""
+        return run_sync(self.aget_available_models())
+
+    async def awarm_up(self) -> float:
+        """Sağlayıcıya giden bağlantıyı önceden ısıtır.
+
+        Varsayılan uygulama temel URL'ye hafif bir HEAD isteği gönderir;
+        böylece DNS, TCP ve TLS kurulumu paylaşılan havuzda hazır bekler.
+        Yanıt durum kodu önemsizdir, yalnızca bağlantının açılması hedeflenir.
+
+        Returns:
+            Isınma için harcanan süre (saniye). İlk token süresinden
+            kazanılan yaklaşık süreye karşılık gelir. Başarısızsa 0.0.
+        """
+        client = getattr(self, "_client", None)
+        base_url = getattr(self, "_base_url", None)
+        if client is None or not base_url:
+            return 0.0
+
+        started = time.monotonic()
+        try:
+            await client.head(base_url)
+        except Exception as exc:
+            logger.debug("Bağlantı ön ısıtma başarısız (%s): %s", base_url, exc)
+            return 0.0
+        return time.monotonic() - started
+
+    def warm_up(self) -> float:
+        """awarm_up için senkron sarmalayıcı."""
+        return run_sync(self.awarm_up())
+
+    def _rate_limit(
+        self, messages: list[dict], tools: list[dict] | None = None
+    ) -> dict:
+        """Retry motoruna geçirilecek hız sınırlayıcı argümanlarını döndürür.
+
+        Returns:
+            {"limiter": ..., "tokens": ...} sözlüğü; request_with_retry ve
+            stream_with_retry çağrılarına ``**`` ile aktarılır.
+        """
+        limiter: RateLimiter | None = get_limiter(
+            self.provider_name, getattr(self, "_model", "")
+        )
+        tokens = 0
+        if limiter is not None:
+            tokens = get_estimator(self.provider_name).estimate_messages(messages, tools)
+        return {"limiter": limiter, "tokens": tokens}
+
+    def _record_usage(self, usage: dict | None) -> dict:
+        """Kullanım bilgisini normalize edip önbellek istatistiklerine işler.
+
+        Returns:
+            {"prompt_tokens", "completion_tokens", "cached_tokens"} sözlüğü.
+        """
+        normalized = normalize_usage(usage)
+        if normalized:
+            get_cache_stats().record(
+                (self.provider_name, getattr(self, "_model", "")), normalized
+            )
+        return normalized
+
     def close(self) -> None:
         """Kaynakları serbest bırakır (HTTP client vb.).
 
@@ -0,0 +1,221 @@
+"""Hızlı komut ayrıştırıcı - Basit komutları LLM'e gitmeden tek araca eşler.
+
+"A1'e 5 yaz", "B sütununu topla", "sort A1:D100 by column 2", "B sütununu
+kalın yap" gibi istekler doğrudan tek bir ``ToolDispatcher`` aracına karşılık
+gelir. Toplam istekleri sayfaya yazmaz, toplamı salt okunur hesaplar. ``parse_command`` yaygın Türkçe ve İngilizce kalıpları yalnızca tüm
+cümle bir kalıpla eşleştiğinde tanır; emin olunamayan her istek için None
+döner ve istek LLM'e gider.
+"""
+
+import re
+from typing import Callable
+
+from core.uno_bridge import LibreOfficeBridge
+
+_REF = r"\$?[A-Za-z]{1,3}\$?\d+"
+_RANGE = rf"{_REF}(?::{_REF})?"
+_COL = r"[A-Za-z]{1,3}"
+# Türkçe hal ekleri: A1'e, B2'yi, A1:D10'u ...
+_SUFFIX = r"(?:'[a-zçğıöşü]+)?"
+_COLUMN_TR = rf"(?P<col>{_COL})\s+s[üu]tun(?:u|unu|undaki)?"
+_COLUMN_EN = rf"column\s+(?P<col>{_COL})"
+
+# Tırnaksız yazıldığında değer mi işlem mi olduğu belirsiz kelimeler
+_AMBIGUOUS_WORDS = {
+    "toplam", "topla", "ortalama", "formül", "formul", "formula", "sum", "total",
+    "average", "tarih", "date", "bugün", "bugun", "today", "sonuç", "sonuc", "result",
+}
+
+# Yalnızca rakam, işaret ve ayraçlardan oluşan değer
+_NUMERAL_RE = re.compile(r"^[+-]?[\d.,]*\d[\d.,]*$")
+
+_PATTERNS = [
+    # Yazma
+    ("write", re.compile(
+        rf"^(?P<cell>{_REF}){_SUFFIX}(?:\s+h[üu]cresine)?\s+(?P<value>.+?)\s+yaz$", re.I)),
+    ("write", re.compile(
+        rf"^(?:write|put|enter)\s+(?P<value>.+?)\s+(?:in|into|to|at)\s+(?:cell\s+)?(?P<cell>{_REF})$", re.I)),
+    ("write", re.compile(rf"^set\s+(?:cell\s+)?(?P<cell>{_REF})\s+to\s+(?P<value>.+)$", re.I)),
+    # Sütun toplamı
+    ("sum_column", re.compile(rf"^{_COLUMN_TR}\s+topla$", re.I)),
+    ("sum_column", re.compile(rf"^(?:sum|total)\s+(?:up\s+)?{_COLUMN_EN}$", re.I)),
+    # Kalın / italik
+    ("style", re.compile(
+        rf"^(?:{_COLUMN_TR}|(?P<range>{_RANGE}){_SUFFIX}(?:\s+(?:aral[ıi][ğg][ıi]n[ıi]|h[üu]cresini))?)"
+        rf"\s+(?P<style>kal[ıi]n|italik)\s+yap$", re.I)),
+    ("style", re.compile(
+        rf"^(?:make\s+)?(?:{_COLUMN_EN}|(?P<range>{_RANGE}))\s+(?P<style>bold|italic)$", re.I)),
+    ("style", re.compile(rf"^(?P<style>bold|italicize)\s+(?:{_COLUMN_EN}|(?P<range>{_RANGE}))$", re.I)),
+    # Sıralama
+    ("sort", re.compile(
+        rf"^(?P<range>{_REF}:{_REF}){_SUFFIX}(?:\s+aral[ıi][ğg][ıi]n[ıi])?\s+"
+        rf"(?:(?P<num>\d+)\.?|(?P<letter>{_COL}))\s+s[üu]tun(?:una|a)?\s+g[öo]re\s+"
+        rf"(?:(?P<dir>artan|azalan)\s+)?s[ıi]rala$", re.I)),
+    ("sort", re.compile(
+        rf"^sort\s+(?P<range>{_REF}:{_REF})\s+by\s+column\s+(?:(?P<num>\d+)|(?P<letter>{_COL}))"
+        rf"(?:\s+(?P<dir>asc|ascending|desc|descending))?$", re.I)),
+    # Temizleme
+    ("clear", re.compile(
+        rf"^(?P<range>{_RANGE}){_SUFFIX}(?:\s+(?:aral[ıi][ğg][ıi]n[ıi]|h[üu]cresini))?\s+temizle$", re.I)),
+    ("clear", re.compile(rf"^clear\s+(?:cell\s+|range\s+)?(?P<range>{_RANGE})$", re.I)),
+    # Birleştirme
+    ("merge", re.compile(
+        rf"^(?P<range>{_REF}:{_REF}){_SUFFIX}(?:\s+aral[ıi][ğg][ıi]n[ıi])?\s+birle[şs]tir$", re.I)),
+    ("merge", re.compile(rf"^merge\s+(?:cells\s+)?(?P<range>{_REF}:{_REF})$", re.I)),
+    # Sayfa değiştirme
+    ("switch_sheet", re.compile(r"^(?P<name>.+?)\s+sayfas[ıi]na\s+ge[çc]$", re.I)),
+    ("switch_sheet", re.compile(r"^(?:switch|go)\s+to\s+sheet\s+(?P<name>.+)$", re.I)),
+]
+
+
+class FastCommand:
+    """Ayrıştırılmış hızlı komut: tek araç çağrısı.
+
+    Args:
+        tool_name: Çağrılacak araç.
+        arguments: Araç argümanları.
+        reply_key: Sonuç mesajının şablon anahtarı (arayüz ``msg_<reply_key>``
+            metnini argümanlar ve sonuç alanlarıyla biçimlendirir).
+    """
+
+    def __init__(self, tool_name: str, arguments: dict, reply_key: str):
+        self.tool_name = tool_name
+        self.arguments = arguments
+        self.reply_key = reply_key
+
+    def __repr__(self) -> str:
+        return f"FastCommand({self.tool_name!r}, {self.arguments!r}, {self.reply_key!r})"
+
+
+def _normalize(text: str) -> str:
+    text = (text or "").strip().replace("’", "'").replace("‘", "'")
+    text = re.sub(r"\s+", " ", text)
+    return text.rstrip(".!").strip()
+
+
+def _strip_quotes(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and (value[0] == value[-1] in "\"'" or (value[0], value[-1]) == ("“", "”")):
+        return value[1:-1]
+    return value
+
+
+def _write_value(raw: str) -> str | None:
+    """Yazılacak değeri döndürür; anlamı belirsizse None (istek LLM'e gider).
+
+    Sayı, ``=`` ile başlayan formül ve tırnaklı metin kabul edilir. Tırnaksız
+    metin yalnızca tek kelimeyse ve bir işlem adı (toplam, formül vb.) değilse
+    kabul edilir: "A1'e toplam yaz" bir formül isteği olabilir. Binlik
+    ayraçlı sayılar ("1,234,567", "1.234,5") ayraç anlamı belirsiz olduğundan
+    metin olarak yazılmaz.
+    """
+    value = raw.strip()
+    unquoted = _strip_quotes(value)
+    if unquoted != value:
+        return unquoted or None
+    if value.startswith("="):
+        return value
+    if _NUMERAL_RE.match(value):
+        # Türkçe ondalık virgül: "3,5" -> "3.5"
+        number = value.replace(",", ".") if value.count(",") == 1 and "." not in value else value
+        try:
+            float(number)
+            return number
+        except ValueError:
+            return None
+    if " " in value or value.lower() in _AMBIGUOUS_WORDS:
+        return None
+    return value
+
+
+def _ref(ref: str) -> str:
+    return ref.replace("$", "").upper()
+
+
+def _column_range(col: str, used_rows: Callable[[], tuple[int, int] | None]) -> str | None:
+    rows = used_rows()
+    if not rows:
+        return None
+    first, last = rows
+    col = col.upper()
+    return f"{col}{first}:{col}{last}"
+
+
+def parse_command(
+    text: str,
+    used_rows: Callable[[], tuple[int, int] | None] = lambda: None,
+) -> FastCommand | None:
+    """Kullanıcı metnini tek bir araç çağrısına çevirir.
+
+    Args:
+        text: Kullanıcı mesajı.
+        used_rows: Kullanılan alanın (ilk satır, son satır) numaralarını
+            (1 tabanlı) döndüren çağrılabilir; yalnızca sütun biçimlendirme
+            komutlarında çağrılır.
+
+    Returns:
+        FastCommand; metin bilinen bir kalıpla tam eşleşmiyorsa None.
+    """
+    text = _normalize(text)
+    if not text:
+        return None
+
+    for kind, pattern in _PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        groups = match.groupdict()
+
+        if kind == "write":
+            value = _write_value(groups["value"])
+            if value is None:
+                return None
+            return FastCommand(
+                "write_formula", {"cell": _ref(groups["cell"]), "formula": value}, "fast_write",
+            )
+
+        if kind == "sum_column":
+            # Sayfaya yazılmaz: toplam istatistiklerden okunup gösterilir
+            return FastCommand("get_column_statistics", {"col_letter": groups["col"].upper()}, "fast_sum")
+
+        if kind == "style":
+            if groups.get("range"):
+                target = _ref(groups["range"])
+            else:
+                target = _column_range(groups["col"], used_rows)
+            if not target:
+                return None
+            style = groups["style"].lower()
+            key = "italic" if style.startswith("italic") or style == "italik" else "bold"
+            return FastCommand("set_cell_style", {"range_name": target, key: True}, f"fast_{key}")
+
+        if kind == "sort":
+            range_name = _ref(groups["range"])
+            start, end = LibreOfficeBridge.parse_range_string(range_name)
+            if groups.get("num"):
+                position = int(groups["num"]) - 1
+            else:
+                position = LibreOfficeBridge._column_to_index(groups["letter"].upper()) - start[0]
+            if position < 0 or position > end[0] - start[0]:
+                return None
+            direction = (groups.get("dir") or "").lower()
+            ascending = direction not in ("azalan", "desc", "descending")
+            return FastCommand("sort_range", {
+                "range_name": range_name,
+                "sort_column": position,
+                "ascending": ascending,
+            }, "fast_sort_asc" if ascending else "fast_sort_desc")
+
+        if kind == "clear":
+            return FastCommand("clear_range", {"range_name": _ref(groups["range"])}, "fast_clear")
+
+        if kind == "merge":
+            return FastCommand("merge_cells", {"range_name": _ref(groups["range"])}, "fast_merge")
+
+        if kind == "switch_sheet":
+            name = _strip_quotes(groups["name"])
+            if not name or len(name.split()) > 3:
+                return None
+            return FastCommand("switch_sheet", {"sheet_name": name}, "fast_switch_sheet")
+
+    return None
@@ -0,0 +1,257 @@
+"""Bağlam bütçesi - Sohbet geçmişini token bütçesine sığdırır.
+
+Her turda tüm geçmiş (ham araç sonucu JSON'ları dahil) yeniden gönderildiği
+için gecikme ve maliyet tur sayısıyla doğrusal artar. ``ContextBudget``
+göndermeden önce, yalnızca bütçe aşılıyorsa:
+
+1. Eski turlardaki büyük araç sonuçlarını en eskiden başlayarak, bütçeye
+   sığana kadar kısa özetlerle (digest) değiştirir,
+2. Hâlâ bütçe aşılıyorsa en eski turları atıp yerine kısa bir özet bırakır.
+
+Kırpma yalnızca gönderilecek kopyaya uygulanır; asıl geçmiş değişmez, böylece
+bütçe altındaki isteklerde önceki turlar bayt bayt aynı kalır (önek önbelleği).
+
+``TokenEstimator`` sağlayıcı başına karakter/token oranıyla yerel tahmin
+yapar; hız sınırlayıcının TPM bütçesi de aynı tahmini kullanır.
+"""
+
+import json
+import logging
+import threading
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Sağlayıcı başına varsayılan karakter/token oranı. Llama tabanlı modeller
+# (Groq, Ollama) Türkçe metinde daha fazla token üretir.
+CHARS_PER_TOKEN = {
+    "openrouter": 3.8,
+    "gemini": 4.0,
+    "groq": 3.4,
+    "ollama": 3.4,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.6
+# Mesaj başına rol/ayraç ek yükü (token)
+MESSAGE_OVERHEAD = 4
+
+# Sağlayıcı başına varsayılan girdi bütçesi (token). Ayarlardaki
+# "llm_context_budget" > 0 ise o kullanılır.
+DEFAULT_BUDGETS = {
+    "openrouter": 16000,
+    "gemini": 30000,
+    "groq": 5000,  # ücretsiz katman TPM limiti ~6000
+    "ollama": 6000,
+}
+FALLBACK_BUDGET = 12000
+
+# Bu uzunluğu aşan eski araç sonuçları özetlenir (karakter)
+DIGEST_THRESHOLD = 600
+# Özet içinde korunacak önizleme uzunluğu (karakter)
+DIGEST_PREVIEW_CHARS = 160
+# Atılan turların özetinde kullanıcı isteği başına karakter
+SUMMARY_CHARS_PER_TURN = 80
+SUMMARY_MAX_TURNS = 12
+SUMMARY_MARKER = "[Önceki konuşmanın özeti]"
+
+
+class TokenEstimator:
+    """Sağlayıcıya özgü yerel token tahmincisi."""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self._chars_per_token = CHARS_PER_TOKEN.get(provider, DEFAULT_CHARS_PER_TOKEN)
+
+    @property
+    def chars_per_token(self) -> float:
+        return self._chars_per_token
+
+    def estimate_text(self, text: str | None) -> int:
+        if not text:
+            return 0
+        return int(len(text) / self._chars_per_token) + 1
+
+    def estimate_message(self, message: dict) -> int:
+        """Tek mesajın (içerik + araç çağrıları) token tahmini."""
+        tokens = MESSAGE_OVERHEAD + self.estimate_text(message.get("content"))
+        for tc in message.get("tool_calls") or []:
+            func = tc.get("function") or {}
+            tokens += self.estimate_text(func.get("name")) + self.estimate_text(func.get("arguments"))
+        return tokens
+
+    def estimate_messages(self, messages: list[dict], tools: list[dict] | None = None) -> int:
+        """Mesaj listesi ve araç şemalarının toplam token tahmini."""
+        total = sum(self.estimate_message(m) for m in messages)
+        if tools:
+            total += self.estimate_text(json.dumps(tools, ensure_ascii=False))
+        return total
+
+
+_estimators: dict[str, TokenEstimator] = {}
+_estimators_lock = threading.Lock()
+
+
+def get_estimator(provider: str) -> TokenEstimator:
+    """Sağlayıcı için paylaşılan token tahmincisini döndürür."""
+    with _estimators_lock:
+        estimator = _estimators.get(provider)
+        if estimator is None:
+            estimator = TokenEstimator(provider)
+            _estimators[provider] = estimator
+        return estimator
+
+
+def _split_turns(conversation: list[dict]) -> list[list[dict]]:
+    """Geçmişi kullanıcı mesajıyla başlayan turlara böler."""
+    turns: list[list[dict]] = []
+    for msg in conversation:
+        if msg.get("role") == "user" or not turns:
+            turns.append([msg])
+        else:
+            turns[-1].append(msg)
+    return turns
+
+
+def digest_tool_result(tool_name: str, content: str) -> str:
+    """Büyük araç sonucu JSON'unu kısa bir özetle değiştirir."""
+    size_kb = len(content) / 1024
+    try:
+        payload = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        payload = None
+
+    parts = [f"[özet] {tool_name or 'araç'} sonucu ({size_kb:.1f} KB) bağlamdan çıkarıldı."]
+    if isinstance(payload, dict):
+        if "error" in payload:
+            parts.append(f"Hata: {str(payload['error'])[:DIGEST_PREVIEW_CHARS]}")
+        result = payload.get("result", payload)
+        if isinstance(result, dict):
+            parts.append("Alanlar: " + ", ".join(list(result.keys())[:12]))
+        elif isinstance(result, list):
+            parts.append(f"{len(result)} öğe")
+    parts.append("Gerekirse aracı yeniden çağır.")
+    preview = content[:DIGEST_PREVIEW_CHARS].replace("\n", " ")
+    parts.append(f"Önizleme: {preview}...")
+    return " ".join(parts)
+
+
+class ContextBudget:
+    """Sohbet geçmişini sağlayıcının token bütçesine sığdırır."""
+
+    def __init__(self, provider: str, budget: int | None = None):
+        self.provider = provider
+        self.estimator = get_estimator(provider)
+        if budget is None:
+            configured = int(Settings().get("llm_context_budget", 0) or 0)
+            budget = configured or DEFAULT_BUDGETS.get(provider, FALLBACK_BUDGET)
+        self.budget = budget
+
+    def fit(
+        self,
+        conversation: list[dict],
+        fixed_tokens: int = 0,
+    ) -> tuple[list[dict], dict]:
+        """Geçmişi bütçeye sığdırır.
+
+        Geçmiş bütçe altındaysa olduğu gibi döner. Verilen liste ve mesajlar
+        değiştirilmez; kırpılmış geçmiş yeni bir listedir.
+
+        Args:
+            conversation: Sistem mesajı hariç sohbet geçmişi.
+            fixed_tokens: Her istekte sabit giden kısmın (sistem istemi, araç
+                şemaları) token tahmini.
+
+        Returns:
+            (yeni geçmiş, rapor) ikilisi. Rapor "before", "after", "budget",
+            "digested" ve "dropped_turns" alanlarını içerir.
+        """
+        estimate = self.estimator.estimate_messages
+        before = fixed_tokens + estimate(conversation)
+        report = {
+            "before": before,
+            "after": before,
+            "budget": self.budget,
+            "digested": 0,
+            "dropped_turns": 0,
+        }
+        if before <= self.budget:
+            return list(conversation), report
+        turns = _split_turns(conversation)
+
+        # 1) Eski turlardaki büyük araç sonuçlarını en eskiden başlayarak,
+        #    bütçeye sığana kadar özetle (son tur hariç)
+        tool_names = {}
+        for msg in conversation:
+            for tc in msg.get("tool_calls") or []:
+                tool_names[tc.get("id", "")] = (tc.get("function") or {}).get("name", "")
+
+        total = before
+        for turn in turns[:-1]:
+            for i, msg in enumerate(turn):
+                if total <= self.budget:
+                    break
+                content = msg.get("content") or ""
+                if msg.get("role") != "tool" or len(content) <= DIGEST_THRESHOLD:
+                    continue
+                if content.startswith("[özet]"):
+                    continue
+                name = tool_names.get(msg.get("tool_call_id", ""), "")
+                turn[i] = dict(msg, content=digest_tool_result(name, content))
+                total += self.estimator.estimate_message(turn[i]) - self.estimator.estimate_message(msg)
+                report["digested"] += 1
+
+        # 2) Hâlâ aşılıyorsa en eski turları at, yerine özet bırak
+        dropped: list[list[dict]] = []
+        while total > self.budget and len(turns) > 1:
+            turn = turns.pop(0)
+            dropped.append(turn)
+            total -= sum(self.estimator.estimate_message(m) for m in turn)
+
+        if dropped:
+            summary_turn = self._summarize_dropped(dropped)
+            turns.insert(0, summary_turn)
+            total += sum(self.estimator.estimate_message(m) for m in summary_turn)
+            report["dropped_turns"] = len(dropped)
+
+        new_conversation = [msg for turn in turns for msg in turn]
+        report["after"] = total
+        if report["digested"] or report["dropped_turns"]:
+            logger.info(
+                "Bağlam kırpıldı: ~%d -> ~%d token (bütçe %d, %d araç sonucu özetlendi, %d tur atıldı)",
+                before, total, self.budget, report["digested"], report["dropped_turns"],
+            )
+        return new_conversation, report
+
+    @staticmethod
+    def _summarize_dropped(turns: list[list[dict]]) -> list[dict]:
+        """Atılan turlar için kısa bir özet turu (kullanıcı + asistan) üretir.
+
+        Daha önce üretilmiş bir özet turu da atılıyorsa satırları korunur.
+        """
+        lines = []
+        for turn in turns:
+            first = turn[0]
+            content = first.get("content") or ""
+            if content.startswith(SUMMARY_MARKER):
+                lines.extend(content.split("\n")[1:])
+                continue
+            if first.get("role") != "user":
+                continue
+            text = content.replace("\n", " ")
+            if len(text) > SUMMARY_CHARS_PER_TURN:
+                text = text[:SUMMARY_CHARS_PER_TURN] + "..."
+            tools = sorted({
+                (tc.get("function") or {}).get("name", "")
+                for msg in turn for tc in (msg.get("tool_calls") or [])
+            } - {""})
+            line = f"- {text}"
+            if tools:
+                line += f" (araçlar: {', '.join(tools)})"
+            lines.append(line)
+
+        body = "\n".join(lines[-SUMMARY_MAX_TURNS:]) or "- (ayrıntı yok)"
+        # Rollerin sırayla gelmesi için özet, kısa bir asistan onayıyla eşlenir
+        return [
+            {"role": "user", "content": f"{SUMMARY_MARKER}\n{body}"},
+            {"role": "assistant", "content": "Anlaşıldı, önceki konuşmayı dikkate alacağım."},
+        ]
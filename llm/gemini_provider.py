@@ -2,20 +2,22 @@
 
 import json
 import logging
-import re
 import time
-from typing import Generator
+from typing import AsyncGenerator
 
 import httpx
 
 from config.settings import Settings
 from .base_provider import BaseLLMProvider
+from .http_transport import acquire_client, release_client
+from .retry import DEFAULT_POLICY, request_with_retry, stream_with_retry
 
 logger = logging.getLogger(__name__)
 
-# Rate limit için maksimum retry sayısı ve bekleme süresi
-MAX_RETRIES = 3
-DEFAULT_RETRY_DELAY = 30  # saniye
+QUOTA_EXCEEDED_MESSAGE = (
+    f"Gemini API kota limiti aşıldı. {DEFAULT_POLICY.max_retries} deneme sonrası başarısız.\n"
+    "Lütfen birkaç dakika bekleyin veya ücretli plana geçin."
+)
 
 
 def _to_camel_case(snake_str):
@@ -27,6 +29,8 @@ def _to_camel_case(snake_str):
 class GeminiProvider(BaseLLMProvider):
     """Gemini API üzerinden LLM erişimi sağlayan sınıf."""
 
+    provider_name = "gemini"
+
     def __init__(self):
         settings = Settings()
         self._api_key = settings.gemini_api_key
@@ -34,7 +38,7 @@ class GeminiProvider(BaseLLMProvider):
         self._model = settings.gemini_model
         self._temperature = settings.temperature
         self._max_tokens = settings.max_tokens
-        self._client = httpx.Client(timeout=60.0)
+        self._client = acquire_client(self._base_url)
 
     def _convert_tools_to_gemini_format(self, tools: list[dict]) -> list[dict] | None:
         """OpenAI tool formatını Gemini formatına çevirir."""
@@ -55,10 +59,13 @@ class GeminiProvider(BaseLLMProvider):
         return [{"functionDeclarations": declarations}]
 
     def _build_contents(self, messages: list[dict]) -> list[dict]:
-        """OpenAI tarzı mesajları Gemini contents'e dönüştürür."""
+        """OpenAI tarzı mesajları Gemini contents'e dönüştürür.
+
+        Sistem mesajı contents'e girmez; ``systemInstruction`` olarak ayrı
+        gönderilir (bkz. ``_build_payload``).
+        """
         contents = []
-        system_prefix = ""
-        
+
         # Tool call ID -> Function Name haritası (Function Response için gerekli)
         # Mesajları tarayıp function call'ları bulmamız gerekir.
         tool_id_to_name = {}
@@ -70,10 +77,7 @@ class GeminiProvider(BaseLLMProvider):
                     if "id" in tc and "function" in tc:
                         tool_id_to_name[tc["id"]] = tc["function"].get("name")
 
-        if messages and messages[0].get("role") == "system":
-            system_prefix = messages[0].get("content", "")
-
-        for m in messages[1:]:
+        for m in messages:
             role = m.get("role")
             content = m.get("content")
             tool_calls = m.get("tool_calls")
@@ -107,13 +111,9 @@ class GeminiProvider(BaseLLMProvider):
                 continue
 
             if role == "user":
-                text = content or ""
-                if system_prefix:
-                    text = f"{system_prefix}\n\n{text}"
-                    system_prefix = ""
                 contents.append({
                     "role": "user",
-                    "parts": [{"text": text}],
+                    "parts": [{"text": content or ""}],
                 })
             
             elif role == "assistant":
@@ -137,54 +137,34 @@ class GeminiProvider(BaseLLMProvider):
                         "parts": parts,
                     })
 
-        if system_prefix:
-            contents.insert(0, {
-                "role": "user",
-                "parts": [{"text": system_prefix}],
-            })
-
         return contents
 
-    def _parse_retry_delay(self, response_text: str) -> float:
-        """Hata mesajından retry süresini çıkarır."""
-        match = re.search(r"retry in ([\d.]+)s", response_text, re.IGNORECASE)
-        if match:
-            return float(match.group(1))
-        return DEFAULT_RETRY_DELAY
+    async def _make_request(
+        self, url: str, payload: dict, rate_limit: dict | None = None
+    ) -> httpx.Response:
+        """API isteği yapar; geçici hatalar ortak retry motoruyla tekrar denenir.
 
-    def _make_request(self, url: str, payload: dict, retry_count: int = 0) -> httpx.Response:
-        """API isteği yapar, rate limit durumunda otomatik retry uygular."""
+        Args:
+            rate_limit: ``_rate_limit`` çıktısı (hız sınırlayıcı ve token tahmini).
+        """
         try:
-            response = self._client.post(url, params={"key": self._api_key}, json=payload)
+            response = await request_with_retry(
+                lambda: self._client.post(url, params={"key": self._api_key}, json=payload),
+                endpoint=url,
+                label="Gemini",
+                **(rate_limit or {}),
+            )
         except httpx.ConnectError as exc:
             raise ConnectionError(f"Gemini'ye bağlanılamadı: {exc}") from exc
         except httpx.TimeoutException as exc:
             raise ConnectionError(f"Gemini isteği zaman aşımına uğradı: {exc}") from exc
 
-        # Rate limit hatası (429)
         if response.status_code == 429:
-            if retry_count >= MAX_RETRIES:
-                raise RuntimeError(
-                    f"Gemini API kota limiti aşıldı. {MAX_RETRIES} deneme sonrası başarısız.\n"
-                    "Lütfen birkaç dakika bekleyin veya ücretli plana geçin."
-                )
-
-            retry_delay = self._parse_retry_delay(response.text)
-            logger.warning(
-                "Gemini rate limit aşıldı. %d saniye sonra tekrar denenecek (deneme %d/%d)",
-                int(retry_delay), retry_count + 1, MAX_RETRIES
-            )
-            time.sleep(retry_delay)
-            return self._make_request(url, payload, retry_count + 1)
-
+            raise RuntimeError(QUOTA_EXCEEDED_MESSAGE)
         return response
 
-    def chat_completion(self, messages: list[dict], tools: list[dict] | None = None) -> dict:
-        if not self._api_key:
-            raise PermissionError("Gemini API anahtarı ayarlanmamış")
-
-        gemini_tools = self._convert_tools_to_gemini_format(tools)
-        
+    def _build_payload(self, messages: list[dict], tools: list[dict] | None = None) -> dict:
+        """generateContent / streamGenerateContent için JSON gövdesini oluşturur."""
         payload = {
             "contents": self._build_contents(messages),
             "generationConfig": {
@@ -192,14 +172,61 @@ class GeminiProvider(BaseLLMProvider):
                 "maxOutputTokens": self._max_tokens,
             },
         }
+        # Sabit sistem istemi ayrı alanda gider; araçlarla birlikte isteğin
+        # değişmeyen öneki olur ve Gemini'nin örtük önbelleğinden yararlanır
+        system_text = "\n\n".join(
+            m.get("content") or "" for m in messages if m.get("role") == "system"
+        )
+        if system_text:
+            payload["systemInstruction"] = {"parts": [{"text": system_text}]}
 
+        gemini_tools = self._convert_tools_to_gemini_format(tools)
         if gemini_tools:
             payload["tools"] = gemini_tools
             # Tool kullanımı için config: AUTO (model karar verir)
             payload["toolConfig"] = {"functionCallingConfig": {"mode": "AUTO"}}
+        return payload
+
+    @staticmethod
+    def _function_call_to_tool_call(fc: dict, index: int) -> dict:
+        """Gemini functionCall parçasını OpenAI tool_call formatına çevirir."""
+        args = fc.get("args", {})
+        # Args dict gelmeli, string ise parse etmeye çalışalım
+        if isinstance(args, str):
+            try:
+                args = json.loads(args)
+            except json.JSONDecodeError:
+                pass
+
+        return {
+            "id": f"call_{int(time.time())}_{index}",  # Gemini ID dönmez, biz üretelim
+            "type": "function",
+            "function": {
+                "name": fc.get("name"),
+                "arguments": json.dumps(args, ensure_ascii=False),
+            },
+        }
+
+    def _parse_usage(self, data: dict) -> dict:
+        """usageMetadata alanını ortak kullanım biçimine çevirip kaydeder."""
+        meta = data.get("usageMetadata") or {}
+        if not meta:
+            return {}
+        return self._record_usage({
+            "prompt_tokens": meta.get("promptTokenCount", 0),
+            "completion_tokens": meta.get("candidatesTokenCount", 0),
+            "total_tokens": meta.get("totalTokenCount", 0),
+            "prompt_tokens_details": {"cached_tokens": meta.get("cachedContentTokenCount", 0)},
+        })
+
+    async def acompletion(self, messages: list[dict], tools: list[dict] | None = None) -> dict:
+        if not self._api_key:
+            raise PermissionError("Gemini API anahtarı ayarlanmamış")
+
+        payload = self._build_payload(messages, tools)
 
         url = f"{self._base_url}/models/{self._model}:generateContent"
-        response = self._make_request(url, payload)
+        response = await self._make_request(url, payload, self._rate_limit(messages, tools))
 
         if response.status_code != 200:
             raise RuntimeError(f"Gemini API hatası ({response.status_code}): {response.text}")
@@ -224,75 +251,127 @@ class GeminiProvider(BaseLLMProvider):
             # Function calls
             f_calls = [p.get("functionCall") for p in parts if "functionCall" in p]
             if f_calls:
-                tool_calls = []
-                for i, fc in enumerate(f_calls):
-                    name = fc.get("name")
-                    args = fc.get("args", {})
-                    # Args dict gelmeli, string ise parse etmeye çalışalım
-                    if isinstance(args, str):
-                        try:
-                            args = json.loads(args)
-                        except:
-                            pass
-                            
-                    tool_calls.append({
-                        "id": f"call_{int(time.time())}_{i}", # Gemini ID dönmez, biz üretelim
-                        "type": "function",
-                        "function": {
-                            "name": name,
-                            "arguments": json.dumps(args, ensure_ascii=False)
-                        }
-                    })
+                tool_calls = [
+                    self._function_call_to_tool_call(fc, i) for i, fc in enumerate(f_calls)
+                ]
 
         return {
             "content": content,
             "tool_calls": tool_calls,
-            "usage": {},
+            "usage": self._parse_usage(data),
             "finish_reason": finish_reason,
         }
 
-    def stream_completion(self, messages: list[dict], tools: list[dict] | None = None) -> Generator[dict, None, None]:
-        """Stream desteklenmiyor; tek parça döndürür."""
-        # Tools parametresini geçiriyoruz
-        result = self.chat_completion(messages, tools=tools)
-        # Eğer tool_calls varsa onları da döndür
-        yield {
-            "content": result.get("content"), 
-            "tool_calls": result.get("tool_calls"), 
-            "done": True
-        }
+    async def astream_completion(
+        self, messages: list[dict], tools: list[dict] | None = None
+    ) -> AsyncGenerator[dict, None]:
+        """Akış modunda sohbet tamamlama isteği gönderir (streamGenerateContent, SSE).
+
+        Metin parçaları geldikçe "content" olarak, functionCall parçaları ise
+        diğer sağlayıcılarla aynı indeksli tool_call delta formatında iletilir.
+
+        Args:
+            messages: Mesaj listesi.
+            tools: Opsiyonel araç tanımları.
+
+        Yields:
+            Her SSE parçası için sözlük.
+        """
+        if not self._api_key:
+            raise PermissionError("Gemini API anahtarı ayarlanmamış")
+
+        payload = self._build_payload(messages, tools)
+        url = f"{self._base_url}/models/{self._model}:streamGenerateContent"
+        tool_index = 0
 
-    def _make_get_request(self, url: str, retry_count: int = 0) -> httpx.Response:
-        """GET isteği yapar, rate limit durumunda otomatik retry uygular."""
         try:
-            response = self._client.get(url, params={"key": self._api_key})
+            async with stream_with_retry(
+                self._client,
+                "POST",
+                url,
+                label="Gemini",
+                params={"key": self._api_key, "alt": "sse"},
+                json=payload,
+                **self._rate_limit(messages, tools),
+            ) as response:
+                if response.status_code == 429:
+                    raise RuntimeError(QUOTA_EXCEEDED_MESSAGE)
+
+                if response.status_code != 200:
+                    await response.aread()
+                    raise RuntimeError(
+                        f"Gemini API hatası ({response.status_code}): {response.text}"
+                    )
+
+                async for line in response.aiter_lines():
+                    if not line or not line.startswith("data: "):
+                        continue
+
+                    try:
+                        data = json.loads(line[len("data: "):])
+                    except json.JSONDecodeError:
+                        logger.warning("Gemini SSE JSON ayrıştırma hatası: %s", line)
+                        continue
+
+                    candidates = data.get("candidates", [])
+                    if not candidates:
+                        continue
+
+                    candidate = candidates[0]
+                    parts = candidate.get("content", {}).get("parts", [])
+
+                    texts = [p["text"] for p in parts if p.get("text")]
+                    tool_calls = []
+                    for p in parts:
+                        if "functionCall" in p:
+                            tc = self._function_call_to_tool_call(p["functionCall"], tool_index)
+                            tc["index"] = tool_index
+                            tool_calls.append(tc)
+                            tool_index += 1
+
+                    done = candidate.get("finishReason") is not None
+                    part = {
+                        "content": "".join(texts) or None,
+                        "tool_calls": tool_calls or None,
+                        "done": done,
+                    }
+                    if done:
+                        part["usage"] = self._parse_usage(data)
+                    yield part
+
+                    if done:
+                        return
+
+                # Akış finishReason olmadan kapandıysa tamamlandı işaretle
+                yield {"content": None, "tool_calls": None, "done": True}
+
         except httpx.ConnectError as exc:
             raise ConnectionError(f"Gemini'ye bağlanılamadı: {exc}") from exc
         except httpx.TimeoutException as exc:
             raise ConnectionError(f"Gemini isteği zaman aşımına uğradı: {exc}") from exc
 
-        if response.status_code == 429:
-            if retry_count >= MAX_RETRIES:
-                raise RuntimeError(
-                    f"Gemini API kota limiti aşıldı. {MAX_RETRIES} deneme sonrası başarısız.\n"
-                    "Lütfen birkaç dakika bekleyin veya ücretli plana geçin."
-                )
-
-            retry_delay = self._parse_retry_delay(response.text)
-            logger.warning(
-                "Gemini rate limit aşıldı. %d saniye sonra tekrar denenecek (deneme %d/%d)",
-                int(retry_delay), retry_count + 1, MAX_RETRIES
+    async def _make_get_request(self, url: str) -> httpx.Response:
+        """GET isteği yapar; geçici hatalar ortak retry motoruyla tekrar denenir."""
+        try:
+            response = await request_with_retry(
+                lambda: self._client.get(url, params={"key": self._api_key}),
+                endpoint=url,
+                label="Gemini",
             )
-            time.sleep(retry_delay)
-            return self._make_get_request(url, retry_count + 1)
+        except httpx.ConnectError as exc:
+            raise ConnectionError(f"Gemini'ye bağlanılamadı: {exc}") from exc
+        except httpx.TimeoutException as exc:
+            raise ConnectionError(f"Gemini isteği zaman aşımına uğradı: {exc}") from exc
 
+        if response.status_code == 429:
+            raise RuntimeError(QUOTA_EXCEEDED_MESSAGE)
         return response
 
-    def get_available_models(self) -> list[str]:
+    async def aget_available_models(self) -> list[str]:
         if not self._api_key:
             raise PermissionError("Gemini API anahtarı ayarlanmamış")
         url = f"{self._base_url}/models"
-        response = self._make_get_request(url)
+        response = await self._make_get_request(url)
         if response.status_code != 200:
             raise RuntimeError(f"Gemini API hatası ({response.status_code}): {response.text}")
         data = response.json()
@@ -311,7 +390,6 @@ class GeminiProvider(BaseLLMProvider):
         logger.info("Gemini modeli değiştirildi: %s", model_name)
 
     def close(self) -> None:
-        """HTTP client'ı kapatır."""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """Paylaşılan HTTP client'ı bırakır."""
+        release_client(self._client)
+        self._client = None
@@ -2,12 +2,14 @@
 
 import json
 import logging
-from typing import Generator
+from typing import AsyncGenerator
 
 import httpx
 
 from config.settings import Settings
 from .base_provider import BaseLLMProvider
+from .http_transport import acquire_client, release_client
+from .retry import request_with_retry, stream_with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,8 @@ logger = logging.getLogger(__name__)
 class GroqProvider(BaseLLMProvider):
     """Groq API üzerinden LLM erişimi sağlayan sınıf."""
 
+    provider_name = "groq"
+
     def __init__(self):
         settings = Settings()
         self._api_key = settings.groq_api_key
@@ -22,7 +26,7 @@ class GroqProvider(BaseLLMProvider):
         self._model = settings.groq_model
         self._temperature = settings.temperature
         self._max_tokens = settings.max_tokens
-        self._client = httpx.Client(timeout=60.0)
+        self._client = acquire_client(self._base_url)
 
     def _headers(self) -> dict:
         return {
@@ -40,6 +44,8 @@ class GroqProvider(BaseLLMProvider):
             "max_tokens": self._max_tokens,
             "stream": stream,
         }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
         if tools:
             payload["tools"] = tools
             payload["tool_choice"] = "auto"
@@ -67,21 +73,23 @@ class GroqProvider(BaseLLMProvider):
         return {
             "content": message.get("content"),
             "tool_calls": message.get("tool_calls"),
-            "usage": data.get("usage", {}),
+            "usage": self._record_usage(data.get("usage")),
             "finish_reason": choice.get("finish_reason"),
         }
 
-    def chat_completion(self, messages: list[dict], tools: list[dict] | None = None) -> dict:
+    async def acompletion(self, messages: list[dict], tools: list[dict] | None = None) -> dict:
         if not self._api_key:
             raise PermissionError("Groq API anahtarı ayarlanmamış")
 
         payload = self._build_payload(messages, tools, stream=False)
+        url = f"{self._base_url}/chat/completions"
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/chat/completions",
-                headers=self._headers(),
-                json=payload,
+            response = await request_with_retry(
+                lambda: self._client.post(url, headers=self._headers(), json=payload),
+                endpoint=url,
+                label="Groq",
+                **self._rate_limit(messages, tools),
             )
         except httpx.ConnectError as exc:
             raise ConnectionError(f"Groq'a bağlanılamadı: {exc}") from exc
@@ -93,32 +101,42 @@ class GroqProvider(BaseLLMProvider):
 
         return self._parse_response(response.json())
 
-    def stream_completion(
+    async def astream_completion(
         self, messages: list[dict], tools: list[dict] | None = None
-    ) -> Generator[dict, None, None]:
+    ) -> AsyncGenerator[dict, None]:
         if not self._api_key:
             raise PermissionError("Groq API anahtarı ayarlanmamış")
 
         payload = self._build_payload(messages, tools, stream=True)
 
         try:
-            with self._client.stream(
+            async with stream_with_retry(
+                self._client,
                 "POST",
                 f"{self._base_url}/chat/completions",
+                label="Groq",
                 headers=self._headers(),
                 json=payload,
+                **self._rate_limit(messages, tools),
             ) as response:
                 if response.status_code != 200:
-                    response.read()
+                    await response.aread()
                     self._handle_error_response(response)
 
-                for line in response.iter_lines():
+                # Kullanım bilgisi son parçada (usage veya x_groq.usage) gelir
+                raw_usage = None
+                async for line in response.aiter_lines():
                     if not line or not line.startswith("data: "):
                         continue
 
                     data_str = line[len("data: "):]
                     if data_str.strip() == "[DONE]":
-                        yield {"content": None, "tool_calls": None, "done": True}
+                        yield {
+                            "content": None,
+                            "tool_calls": None,
+                            "done": True,
+                            "usage": self._record_usage(raw_usage),
+                        }
                         return
 
                     try:
@@ -127,27 +145,41 @@ class GroqProvider(BaseLLMProvider):
                         logger.warning("Groq SSE JSON ayrıştırma hatası: %s", data_str)
                         continue
 
-                    choice = data.get("choices", [{}])[0]
-                    delta = choice.get("delta", {})
+                    raw_usage = (
+                        data.get("usage") or (data.get("x_groq") or {}).get("usage") or raw_usage
+                    )
+                    choices = data.get("choices") or []
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {})
                     yield {
                         "content": delta.get("content"),
                         "tool_calls": delta.get("tool_calls"),
-                        "done": choice.get("finish_reason") is not None,
+                        "done": False,
                     }
 
+                yield {
+                    "content": None,
+                    "tool_calls": None,
+                    "done": True,
+                    "usage": self._record_usage(raw_usage),
+                }
+
         except httpx.ConnectError as exc:
             raise ConnectionError(f"Groq'a bağlanılamadı: {exc}") from exc
         except httpx.TimeoutException as exc:
             raise ConnectionError(f"Groq isteği zaman aşımına uğradı: {exc}") from exc
 
-    def get_available_models(self) -> list[str]:
+    async def aget_available_models(self) -> list[str]:
         if not self._api_key:
             raise PermissionError("Groq API anahtarı ayarlanmamış")
 
+        url = f"{self._base_url}/models"
         try:
-            response = self._client.get(
-                f"{self._base_url}/models",
-                headers=self._headers(),
+            response = await request_with_retry(
+                lambda: self._client.get(url, headers=self._headers()),
+                endpoint=url,
+                label="Groq",
             )
         except httpx.ConnectError as exc:
             raise ConnectionError(f"Groq'a bağlanılamadı: {exc}") from exc
@@ -166,6 +198,5 @@ class GroqProvider(BaseLLMProvider):
         logger.info("Groq modeli değiştirildi: %s", model_name)
 
     def close(self) -> None:
-        if self._client:
-            self._client.close()
-            self._client = None
+        release_client(self._client)
+        self._client = None
@@ -0,0 +1,293 @@
+"""Hedged istekler - Yavaş kuyruk gecikmesine karşı ikincil sağlayıcıya yedekleme.
+
+Birincil sağlayıcıdan belirli bir süre (gözlenen ilk token süresinin
+yüzdeliği) içinde ilk parça gelmezse aynı istek ikincil sağlayıcıya/modele
+de gönderilir; ilk akmaya başlayan kazanır, diğeri iptal edilir.
+``LatencyTracker`` sağlayıcı başına ilk token süresini ve hata oranını
+tutar ve birincil sağlayıcının otomatik seçiminde kullanılır.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import AsyncGenerator
+
+logger = logging.getLogger(__name__)
+
+# Sağlayıcı başına saklanan en fazla ilk token örneği
+MAX_SAMPLES = 50
+# Yüzdelik hesaplamadan önce gereken en az örnek
+MIN_SAMPLES = 5
+# Hata oranı üstel hareketli ortalama katsayısı
+ERROR_ALPHA = 0.2
+# Hedge gecikmesi sınırları (saniye)
+MIN_HEDGE_DELAY = 0.3
+MAX_HEDGE_DELAY = 30.0
+
+_ITEM = 0
+_DONE = 1
+_ERROR = 2
+
+
+def _has_payload(part: dict) -> bool:
+    """Parça gerçek çıktı taşıyor mu?
+
+    OpenAI uyumlu akışlar genellikle içeriği boş, yalnızca ``role`` taşıyan
+    bir parçayla başlar; ilk token süresi ve hedge kazananı bu parçaya göre
+    ölçülürse token üretmeyen sağlayıcı kazanmış sayılır.
+    """
+    return bool(part.get("content") or part.get("tool_calls") or part.get("usage") or part.get("done"))
+
+
+class LatencyTracker:
+    """Sağlayıcı başına ilk token süresi ve hata oranı istatistikleri.
+
+    Anahtar (sağlayıcı adı, model) ikilisidir. İş parçacığı güvenlidir;
+    kayıtlar asyncio döngüsünden, sorgular arayüzden yapılabilir.
+    """
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self._max_samples = max_samples
+        self._ttft: dict[tuple, deque] = {}
+        self._error_rate: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def record_ttft(self, key: tuple, seconds: float) -> None:
+        """İlk token süresini kaydeder."""
+        with self._lock:
+            samples = self._ttft.setdefault(key, deque(maxlen=self._max_samples))
+            samples.append(seconds)
+
+    def record_success(self, key: tuple) -> None:
+        """Başarılı tamamlanan isteği hata oranına işler."""
+        self._update_error_rate(key, 0.0)
+
+    def record_error(self, key: tuple) -> None:
+        """Başarısız isteği (429/5xx, ağ hatası vb.) hata oranına işler."""
+        self._update_error_rate(key, 1.0)
+
+    def _update_error_rate(self, key: tuple, outcome: float) -> None:
+        with self._lock:
+            previous = self._error_rate.get(key, 0.0)
+            self._error_rate[key] = previous + ERROR_ALPHA * (outcome - previous)
+
+    def error_rate(self, key: tuple) -> float:
+        """Üstel ortalamalı hata oranı (0.0 - 1.0)."""
+        with self._lock:
+            return self._error_rate.get(key, 0.0)
+
+    def sample_count(self, key: tuple) -> int:
+        with self._lock:
+            return len(self._ttft.get(key, ()))
+
+    def percentile(self, key: tuple, pct: float) -> float | None:
+        """İlk token süresinin verilen yüzdeliğini döndürür.
+
+        Args:
+            key: Sağlayıcı anahtarı.
+            pct: Yüzdelik (0-100).
+
+        Returns:
+            Saniye cinsinden süre; yeterli örnek yoksa None.
+        """
+        with self._lock:
+            samples = sorted(self._ttft.get(key, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        rank = max(0, min(len(samples) - 1, math.ceil(pct / 100.0 * len(samples)) - 1))
+        return samples[rank]
+
+    def hedge_delay(self, key: tuple, pct: float, default: float) -> float:
+        """Hedge isteğinin ateşleneceği gecikmeyi hesaplar.
+
+        Yeterli örnek varsa ilk token süresinin ``pct`` yüzdeliği, yoksa
+        ``default`` kullanılır.
+        """
+        delay = self.percentile(key, pct)
+        if delay is None:
+            delay = default
+        return max(MIN_HEDGE_DELAY, min(MAX_HEDGE_DELAY, delay))
+
+    def score(self, key: tuple) -> float | None:
+        """Beklenen etkin ilk token süresi (düşük daha iyi).
+
+        Medyan ilk token süresi, hata oranıyla ölçeklenir; örnek yoksa None.
+        """
+        median = self.percentile(key, 50)
+        if median is None:
+            return None
+        return median / max(0.05, 1.0 - self.error_rate(key))
+
+    def choose_primary(self, keys: list[tuple]) -> int:
+        """Verilen anahtarlardan birincil olarak kullanılacak olanın indeksi.
+
+        Tüm anahtarlar için yeterli ölçüm yoksa yapılandırılmış sıra korunur.
+        """
+        scores = [self.score(key) for key in keys]
+        if not keys or any(score is None for score in scores):
+            return 0
+        return min(range(len(keys)), key=lambda i: scores[i])
+
+    def snapshot(self) -> dict:
+        """İstatistiklerin özetini döndürür (teşhis amaçlı)."""
+        with self._lock:
+            keys = set(self._ttft) | set(self._error_rate)
+        return {
+            key: {
+                "samples": self.sample_count(key),
+                "p50": self.percentile(key, 50),
+                "p95": self.percentile(key, 95),
+                "error_rate": self.error_rate(key),
+            }
+            for key in keys
+        }
+
+
+_tracker = LatencyTracker()
+
+
+def get_tracker() -> LatencyTracker:
+    """Süreç genelindeki gecikme izleyicisini döndürür."""
+    return _tracker
+
+
+async def tracked_stream(
+    key: tuple,
+    provider,
+    messages: list[dict],
+    tools: list[dict] | None = None,
+    tracker: LatencyTracker | None = None,
+) -> AsyncGenerator[dict, None]:
+    """Tek sağlayıcı akışı; ilk token süresini ve hatayı izleyiciye kaydeder."""
+    tracker = tracker or _tracker
+    started = time.monotonic()
+    first = True
+    succeeded = False
+    try:
+        async for part in provider.astream_completion(messages, tools):
+            if first and _has_payload(part):
+                first = False
+                tracker.record_ttft(key, time.monotonic() - started)
+            if part.get("done") and not succeeded:
+                # Tüketici "done" parçasından sonra akışı kapatabilir
+                succeeded = True
+                tracker.record_success(key)
+            yield part
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        tracker.record_error(key)
+        raise
+    if not succeeded:
+        tracker.record_success(key)
+
+
+async def hedged_stream(
+    candidates: list[tuple],
+    messages: list[dict],
+    tools: list[dict] | None = None,
+    delay: float = 2.0,
+    tracker: LatencyTracker | None = None,
+) -> AsyncGenerator[dict, None]:
+    """Aynı isteği gerektiğinde ikinci adaya da göndererek akış üretir.
+
+    İlk aday hemen başlatılır. ``delay`` saniye içinde çıktı taşıyan ilk
+    parça gelmezse veya ilk aday çıktı üretmeden hata verirse sıradaki aday
+    başlatılır. İçerik, araç çağrısı veya kullanım bilgisi taşıyan ilk
+    parçayı üreten aday kazanır; diğerleri iptal edilir. Kazanandan önce
+    gelen boş parçaları (ör. yalnızca rol bildiren delta) saklanıp kazanan
+    belli olunca sırasıyla iletilir.
+
+    Args:
+        candidates: (anahtar, sağlayıcı) ikilileri; öncelik sırasına göre.
+        messages: Mesaj listesi.
+        tools: Opsiyonel araç tanımları.
+        delay: Hedge isteği öncesi beklenecek süre (saniye).
+        tracker: Gecikme izleyicisi (varsayılan: süreç geneli).
+
+    Yields:
+        Kazanan sağlayıcının akış parçaları.
+    """
+    tracker = tracker or _tracker
+    queue: asyncio.Queue = asyncio.Queue()
+    tasks: dict[int, asyncio.Task] = {}
+    errors: list[Exception] = []
+    # Kazanan belli olmadan gelen boş parçalar (aday başına)
+    held: dict[int, list[dict]] = {}
+
+    async def _pump(idx: int, key: tuple, provider):
+        try:
+            async for part in tracked_stream(key, provider, messages, tools, tracker):
+                await queue.put((idx, _ITEM, part))
+            await queue.put((idx, _DONE, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put((idx, _ERROR, exc))
+
+    def _launch_next() -> bool:
+        idx = len(tasks)
+        if idx >= len(candidates):
+            return False
+        key, provider = candidates[idx]
+        if idx > 0:
+            logger.info("Hedge isteği başlatıldı: %s", key)
+        tasks[idx] = asyncio.ensure_future(_pump(idx, key, provider))
+        return True
+
+    _launch_next()
+    deadline = time.monotonic() + delay
+    winner = None
+    pending = 1
+    try:
+        while True:
+            timeout = None
+            if winner is None and len(tasks) < len(candidates):
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                idx, kind, value = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                _launch_next()
+                pending += 1
+                deadline = time.monotonic() + delay
+                continue
+
+            if winner is None:
+                if kind == _ERROR:
+                    errors.append(value)
+                    pending -= 1
+                    logger.warning("Hedge adayı başarısız (%s): %s", candidates[idx][0], value)
+                    if _launch_next():
+                        pending += 1
+                        deadline = time.monotonic() + delay
+                    elif pending == 0:
+                        raise errors[-1]
+                    continue
+                if kind == _ITEM and not _has_payload(value):
+                    held.setdefault(idx, []).append(value)
+                    continue
+                winner = idx
+                for other, task in tasks.items():
+                    if other != winner:
+                        task.cancel()
+                if idx > 0:
+                    logger.info("Hedge kazananı: %s", candidates[idx][0])
+                for part in held.pop(idx, ()):
+                    yield part
+                held.clear()
+
+            if idx != winner:
+                continue
+            if kind == _ITEM:
+                yield value
+            elif kind == _DONE:
+                return
+            else:
+                raise value
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
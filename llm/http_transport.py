@@ -0,0 +1,147 @@
+"""Paylaşılan HTTP taşıma katmanı - Tüm LLM sağlayıcıları için havuzlu client kaydı.
+
+Her sağlayıcı kendi ``httpx.AsyncClient`` nesnesini oluşturmak yerine bu
+modülden host başına tekil, keep-alive havuzlu bir client alır. Böylece
+sağlayıcı veya model değiştirildiğinde sıcak TLS bağlantıları yeniden
+kullanılır ve eski client'lar soket sızdırmaz. Client'lar yalnızca
+``async_runtime`` olay döngüsünde kullanılır.
+"""
+
+import importlib.util
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import Settings
+from .async_runtime import run_sync
+
+logger = logging.getLogger(__name__)
+
+# Havuz varsayılanları
+DEFAULT_TIMEOUT = 60.0  # saniye
+DEFAULT_CONNECT_TIMEOUT = 10.0  # saniye
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 120.0  # saniye
+
+_lock = threading.Lock()
+_clients: dict[tuple, httpx.AsyncClient] = {}
+_refcounts: dict[tuple, int] = {}
+_http2_flags: dict[tuple, bool] = {}
+
+
+def _origin(base_url: str) -> str:
+    """URL'den scheme://host:port kökenini çıkarır."""
+    parts = urlsplit(base_url)
+    scheme = parts.scheme or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 ayarı açık ve 'h2' paketi kuruluysa True döndürür."""
+    if not Settings().http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 istendi ama 'h2' paketi kurulu değil; HTTP/1.1 kullanılacak.")
+        return False
+    return True
+
+
+def _key(base_url: str, timeout: float, connect_timeout: float) -> tuple:
+    return (_origin(base_url), float(timeout), float(connect_timeout))
+
+
+def acquire_client(
+    base_url: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Verilen host için paylaşılan, keep-alive havuzlu client döndürür.
+
+    Aynı köken ve zaman aşımı değerleri için her çağrı aynı client'ı döndürür.
+    Her ``acquire_client`` çağrısı bir ``release_client`` ile eşlenmelidir.
+
+    Args:
+        base_url: Sağlayıcının temel URL'si (yalnızca kökeni kullanılır).
+        timeout: Okuma/yazma zaman aşımı (saniye).
+        connect_timeout: Bağlantı kurma zaman aşımı (saniye).
+
+    Returns:
+        Paylaşılan httpx.AsyncClient nesnesi.
+    """
+    key = _key(base_url, timeout, connect_timeout)
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            http2 = _http2_enabled()
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout=timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+                http2=http2,
+            )
+            _clients[key] = client
+            _refcounts[key] = 0
+            _http2_flags[key] = http2
+            logger.debug("Yeni HTTP havuzu oluşturuldu: %s", key[0])
+        _refcounts[key] += 1
+        return client
+
+
+def release_client(client: httpx.AsyncClient | None) -> None:
+    """``acquire_client`` ile alınan client'ı bırakır.
+
+    Havuz açık kalır; bağlantılar bir sonraki sağlayıcı tarafından yeniden
+    kullanılabilir. Havuzu gerçekten kapatmak için ``close_all`` kullanılır.
+    """
+    if client is None:
+        return
+    with _lock:
+        for key, pooled in _clients.items():
+            if pooled is client:
+                _refcounts[key] = max(0, _refcounts.get(key, 0) - 1)
+                return
+
+
+def close_all() -> None:
+    """Tüm paylaşılan client'ları kapatır (uygulama kapanışında çağrılır)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _refcounts.clear()
+        _http2_flags.clear()
+    if not clients:
+        return
+
+    async def _close():
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as exc:
+                logger.debug("HTTP client kapatılamadı: %s", exc)
+
+    try:
+        run_sync(_close(), timeout=5.0)
+    except Exception as exc:
+        logger.debug("HTTP havuzları kapatılamadı: %s", exc)
+    logger.info("%d paylaşılan HTTP havuzu kapatıldı.", len(clients))
+
+
+def pool_stats() -> list[dict]:
+    """Açık havuzların özetini döndürür (teşhis amaçlı)."""
+    with _lock:
+        return [
+            {
+                "origin": key[0],
+                "timeout": key[1],
+                "in_use": _refcounts.get(key, 0),
+                "http2": _http2_flags.get(key, False),
+            }
+            for key in _clients
+        ]
@@ -3,19 +3,34 @@
 import json
 import logging
 import time
-from typing import Generator
+from typing import AsyncGenerator
 
 import httpx
 
 from config.settings import Settings
+from .async_runtime import run_sync
 from .base_provider import BaseLLMProvider
+from .http_transport import acquire_client, release_client
+from .prompt_cache import OLLAMA_KEEP_ALIVE
+from .retry import RetryPolicy, request_with_retry, stream_with_retry
 
 logger = logging.getLogger(__name__)
 
 # Varsayılan timeout değerleri (saniye)
 DEFAULT_TIMEOUT = 300.0  # 5 dakika - büyük modeller için
 DEFAULT_CONNECT_TIMEOUT = 10.0  # Bağlantı için
-MAX_RETRIES = 2  # Maksimum yeniden deneme
+WARMUP_KEEP_ALIVE = "10m"  # Ön ısıtmada modelin bellekte kalma süresi
+
+# Yerel sunucu: yalnızca zaman aşımları tekrar denenir, bağlantı hatası
+# (Ollama çalışmıyor) kullanıcıya hemen bildirilir. Büyük modellerin
+# yüklenmesi uzun sürebildiğinden toplam süre sınırı yoktur.
+RETRY_POLICY = RetryPolicy(
+    max_retries=2,
+    base_delay=1.0,
+    max_delay=5.0,
+    deadline=None,
+    retry_exceptions=(httpx.TimeoutException,),
+)
 
 
 class OllamaProvider(BaseLLMProvider):
@@ -24,6 +39,8 @@ class OllamaProvider(BaseLLMProvider):
     Ollama'nın /api/chat ve /api/tags endpoint'lerini kullanır.
     """
 
+    provider_name = "ollama"
+
     def __init__(self, timeout: float = DEFAULT_TIMEOUT):
         """Ayarlardan base URL ve model bilgisini yükler.
 
@@ -35,17 +52,14 @@ class OllamaProvider(BaseLLMProvider):
         self._model = settings.ollama_model
         self._temperature = settings.temperature
         self._timeout = timeout
-        self._client = httpx.Client(
-            timeout=httpx.Timeout(
-                timeout=timeout,
-                connect=DEFAULT_CONNECT_TIMEOUT
-            )
+        self._client = acquire_client(
+            self._base_url, timeout=timeout, connect_timeout=DEFAULT_CONNECT_TIMEOUT
         )
 
-    def _check_connection(self) -> None:
+    async def _check_connection(self) -> None:
         """Ollama sunucusunun çalışıp çalışmadığını kontrol eder."""
         try:
-            self._client.get(f"{self._base_url}/api/tags")
+            await self._client.get(f"{self._base_url}/api/tags")
         except httpx.ConnectError as exc:
             raise ConnectionError(
                 f"Ollama sunucusuna bağlanılamadı ({self._base_url}). "
@@ -60,6 +74,9 @@ class OllamaProvider(BaseLLMProvider):
             "model": self._model,
             "messages": messages,
             "stream": stream,
+            # Model bellekte kalırsa sabit önekin KV önbelleği sonraki turda
+            # yeniden kullanılır
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": self._temperature,
             },
@@ -68,7 +85,7 @@ class OllamaProvider(BaseLLMProvider):
             payload["tools"] = tools
         return payload
 
-    def chat_completion(
+    async def acompletion(
         self, messages: list[dict], tools: list[dict] | None = None
     ) -> dict:
         """Ollama'ya sohbet tamamlama isteği gönderir.
@@ -84,19 +101,23 @@ class OllamaProvider(BaseLLMProvider):
             ConnectionError: Ollama sunucusu çalışmıyorsa.
             RuntimeError: API hatası durumunda.
         """
-        return self._do_chat_completion(messages, tools)
+        return await self._do_chat_completion(messages, tools)
 
-    def _do_chat_completion(
+    async def _do_chat_completion(
         self, messages: list[dict], tools: list[dict] | None = None,
-        retry_without_tools: bool = True, retry_count: int = 0
+        retry_without_tools: bool = True
     ) -> dict:
         """İç chat completion metodu - tool fallback ve retry desteği ile."""
         payload = self._build_payload(messages, tools, stream=False)
+        url = f"{self._base_url}/api/chat"
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/api/chat",
-                json=payload,
+            response = await request_with_retry(
+                lambda: self._client.post(url, json=payload),
+                endpoint=url,
+                label="Ollama",
+                policy=RETRY_POLICY,
+                **self._rate_limit(messages, tools),
             )
         except httpx.ConnectError as exc:
             raise ConnectionError(
@@ -104,16 +125,6 @@ class OllamaProvider(BaseLLMProvider):
                 "Ollama'nın çalıştığından emin olun: 'ollama serve'"
             ) from exc
         except httpx.TimeoutException as exc:
-            # Retry mekanizması
-            if retry_count < MAX_RETRIES:
-                logger.warning(
-                    "Ollama zaman aşımı, yeniden deneniyor (%d/%d)...",
-                    retry_count + 1, MAX_RETRIES
-                )
-                time.sleep(1)  # Kısa bekleme
-                return self._do_chat_completion(
-                    messages, tools, retry_without_tools, retry_count + 1
-                )
             raise ConnectionError(
                 f"Ollama isteği zaman aşımına uğradı ({self._timeout}s). "
                 f"Model '{self._model}' ilk kez yükleniyorsa bu normal olabilir. "
@@ -130,7 +141,9 @@ class OllamaProvider(BaseLLMProvider):
                         "Model '%s' tool desteği yok, tool'suz devam ediliyor.",
                         self._model
                     )
-                    return self._do_chat_completion(messages, tools=None, retry_without_tools=False)
+                    return await self._do_chat_completion(
+                        messages, tools=None, retry_without_tools=False
+                    )
             except (json.JSONDecodeError, KeyError):
                 pass
 
@@ -152,9 +165,9 @@ class OllamaProvider(BaseLLMProvider):
             "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
         }
 
-    def stream_completion(
+    async def astream_completion(
         self, messages: list[dict], tools: list[dict] | None = None
-    ) -> Generator[dict, None, None]:
+    ) -> AsyncGenerator[dict, None]:
         """Akış modunda sohbet tamamlama isteği gönderir (JSON Lines).
 
         Args:
@@ -164,24 +177,29 @@ class OllamaProvider(BaseLLMProvider):
         Yields:
             Her JSON satırı için sözlük.
         """
-        yield from self._do_stream_completion(messages, tools)
+        async for chunk in self._do_stream_completion(messages, tools):
+            yield chunk
 
-    def _do_stream_completion(
+    async def _do_stream_completion(
         self, messages: list[dict], tools: list[dict] | None = None,
-        retry_without_tools: bool = True, retry_count: int = 0
-    ) -> Generator[dict, None, None]:
+        retry_without_tools: bool = True
+    ) -> AsyncGenerator[dict, None]:
         """İç stream completion metodu - tool fallback ve retry desteği ile."""
         payload = self._build_payload(messages, tools, stream=True)
 
         try:
-            with self._client.stream(
+            async with stream_with_retry(
+                self._client,
                 "POST",
                 f"{self._base_url}/api/chat",
+                label="Ollama",
+                policy=RETRY_POLICY,
                 json=payload,
+                **self._rate_limit(messages, tools),
             ) as response:
                 # Tool desteklenmiyor hatası - tool'suz tekrar dene
                 if response.status_code == 400 and tools and retry_without_tools:
-                    response.read()
+                    await response.aread()
                     try:
                         error_data = json.loads(response.text)
                         error_msg = error_data.get("error", "")
@@ -190,20 +208,21 @@ class OllamaProvider(BaseLLMProvider):
                                 "Model '%s' tool desteği yok, tool'suz devam ediliyor.",
                                 self._model
                             )
-                            yield from self._do_stream_completion(
+                            async for chunk in self._do_stream_completion(
                                 messages, tools=None, retry_without_tools=False
-                            )
+                            ):
+                                yield chunk
                             return
                     except (json.JSONDecodeError, KeyError):
                         pass
 
                 if response.status_code != 200:
-                    response.read()
+                    await response.aread()
                     raise RuntimeError(
                         f"Ollama API hatası ({response.status_code}): {response.text}"
                     )
 
-                for line in response.iter_lines():
+                async for line in response.aiter_lines():
                     if not line:
                         continue
 
@@ -231,27 +250,22 @@ class OllamaProvider(BaseLLMProvider):
                 "Ollama'nın çalıştığından emin olun: 'ollama serve'"
             ) from exc
         except httpx.TimeoutException as exc:
-            # Retry mekanizması
-            if retry_count < MAX_RETRIES:
-                logger.warning(
-                    "Ollama stream zaman aşımı, yeniden deneniyor (%d/%d)...",
-                    retry_count + 1, MAX_RETRIES
-                )
-                time.sleep(1)
-                yield from self._do_stream_completion(
-                    messages, tools, retry_without_tools, retry_count + 1
-                )
-                return
             raise ConnectionError(
                 f"Ollama isteği zaman aşımına uğradı ({self._timeout}s). "
                 f"Model '{self._model}' ilk kez yükleniyorsa bu normal olabilir. "
                 "Lütfen tekrar deneyin veya daha küçük bir model kullanın."
             ) from exc
 
-    def get_available_models(self) -> list[str]:
+    async def aget_available_models(self) -> list[str]:
         """Ollama'da yüklü olan modellerin listesini döndürür."""
+        url = f"{self._base_url}/api/tags"
         try:
-            response = self._client.get(f"{self._base_url}/api/tags")
+            response = await request_with_retry(
+                lambda: self._client.get(url),
+                endpoint=url,
+                label="Ollama",
+                policy=RETRY_POLICY,
+            )
         except httpx.ConnectError as exc:
             raise ConnectionError(
                 f"Ollama sunucusuna bağlanılamadı ({self._base_url}). "
@@ -272,27 +286,54 @@ class OllamaProvider(BaseLLMProvider):
         models = data.get("models", [])
         return [m["name"] for m in models if "name" in m]
 
-    def ensure_model_loaded(self) -> bool:
+    def ensure_model_loaded(self, keep_alive: str | None = None) -> bool:
+        """aensure_model_loaded için senkron sarmalayıcı."""
+        return run_sync(self.aensure_model_loaded(keep_alive))
+
+    async def aensure_model_loaded(self, keep_alive: str | None = None) -> bool:
         """Modelin yüklü olduğunu kontrol eder, değilse bilgi verir.
 
+        Args:
+            keep_alive: Verilirse model boş bir /api/generate isteğiyle belleğe
+                alınır ve bu süre boyunca (ör. "10m") bellekte tutulur.
+
         Returns:
             True eğer model hazırsa.
         """
         try:
-            models = self.get_available_models()
+            models = await self.aget_available_models()
             model_base = self._model.split(":")[0]  # "llama3.2:latest" -> "llama3.2"
-            for m in models:
-                if model_base in m:
-                    return True
-            logger.warning(
-                "Model '%s' Ollama'da yüklü değil. 'ollama pull %s' ile yükleyin.",
-                self._model, self._model
-            )
-            return False
+            if not any(model_base in m for m in models):
+                logger.warning(
+                    "Model '%s' Ollama'da yüklü değil. 'ollama pull %s' ile yükleyin.",
+                    self._model, self._model
+                )
+                return False
+
+            if keep_alive:
+                # Prompt'suz generate isteği modeli yalnızca belleğe yükler
+                response = await self._client.post(
+                    f"{self._base_url}/api/generate",
+                    json={"model": self._model, "keep_alive": keep_alive},
+                )
+                if response.status_code != 200:
+                    logger.warning(
+                        "Ollama modeli belleğe alınamadı (%d): %s",
+                        response.status_code, response.text
+                    )
+                    return False
+            return True
         except Exception as e:
             logger.error("Model kontrolü başarısız: %s", e)
             return False
 
+    async def awarm_up(self) -> float:
+        """Modeli keep_alive ile belleğe alarak ilk token süresini kısaltır."""
+        started = time.monotonic()
+        if not await self.aensure_model_loaded(keep_alive=WARMUP_KEEP_ALIVE):
+            return 0.0
+        return time.monotonic() - started
+
     def set_model(self, model_name: str) -> None:
         """Aktif modeli değiştirir.
 
@@ -303,7 +344,6 @@ class OllamaProvider(BaseLLMProvider):
         logger.info("Ollama modeli değiştirildi: %s", model_name)
 
     def close(self) -> None:
-        """HTTP client'ı kapatır."""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """Paylaşılan HTTP client'ı bırakır."""
+        release_client(self._client)
+        self._client = None
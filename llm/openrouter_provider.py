@@ -2,21 +2,20 @@
 
 import json
 import logging
-import re
-import time
-from typing import Generator
+from typing import AsyncGenerator
 
 import httpx
 
 from config.settings import Settings
+from .async_runtime import run_sync
 from .base_provider import BaseLLMProvider
+from .http_transport import acquire_client, release_client
+from .prompt_cache import apply_cache_control, supports_cache_control
+from .retry import request_with_retry, stream_with_retry
+from .tool_router import needs_tools
 
 logger = logging.getLogger(__name__)
 
-# Rate limit için sabitler
-MAX_RETRIES = 3
-DEFAULT_RETRY_DELAY = 30  # saniye
-
 
 class OpenRouterProvider(BaseLLMProvider):
     """OpenRouter API üzerinden LLM erişimi sağlayan sınıf.
@@ -25,6 +24,8 @@ class OpenRouterProvider(BaseLLMProvider):
     Araç çağrıları (function calling) desteklenir.
     """
 
+    provider_name = "openrouter"
+
     def __init__(self):
         """Ayarlardan API anahtarı, base URL ve model bilgisini yükler."""
         settings = Settings()
@@ -33,7 +34,7 @@ class OpenRouterProvider(BaseLLMProvider):
         self._model = settings.openrouter_model
         self._temperature = settings.temperature
         self._max_tokens = settings.max_tokens
-        self._client = httpx.Client(timeout=60.0)
+        self._client = acquire_client(self._base_url)
 
     def _headers(self) -> dict:
         """API istekleri için gerekli HTTP başlıklarını döndürür."""
@@ -54,7 +55,13 @@ class OpenRouterProvider(BaseLLMProvider):
             "temperature": self._temperature,
             "max_tokens": self._max_tokens,
             "stream": stream,
+            # Önbellekten okunan token sayısı dahil kullanım bilgisini iste
+            "usage": {"include": True},
         }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        if supports_cache_control(self._model):
+            payload["messages"] = apply_cache_control(messages)
         if tools:
             payload["tools"] = tools
             # Sadece ilk turda tool_call zorla; tool sonucu sonrası auto'ya dön.
@@ -69,23 +76,7 @@ class OpenRouterProvider(BaseLLMProvider):
     @staticmethod
     def _needs_tools(messages: list[dict]) -> bool:
         """Son kullanıcı isteği Calc eylemi gerektiriyorsa True döndürür."""
-        last_user = ""
-        for msg in reversed(messages):
-            if msg.get("role") == "user":
-                last_user = (msg.get("content") or "").lower()
-                break
-        if not last_user:
-            return False
-
-        keywords = (
-            "tablo", "hesap", "hesapla", "formül", "formul", "uygulama",
-            "şablon", "sablon", "sütun", "sutun", "satır", "satir",
-            "birleştir", "birlestir", "renk", "biçim", "bicim", "format",
-            "düzenle", "duzenle", "başlık", "baslik", "hücre", "hucre",
-            "calc", "sayfa", "manning", "hidrolik", "dsi",
-            "oluştur", "olustur", "ekle", "yaz",
-        )
-        return any(k in last_user for k in keywords)
+        return needs_tools(messages)
 
     @staticmethod
     def _has_tool_response_after_last_user(messages: list[dict]) -> bool:
@@ -102,14 +93,7 @@ class OpenRouterProvider(BaseLLMProvider):
                 return True
         return False
 
-    def _parse_retry_delay(self, response_text: str) -> float:
-        """Hata mesajından retry süresini çıkarır."""
-        match = re.search(r"retry.{0,10}([\d.]+)\s*s", response_text, re.IGNORECASE)
-        if match:
-            return float(match.group(1))
-        return DEFAULT_RETRY_DELAY
-
-    def _handle_error_response(self, response: httpx.Response, raise_on_429: bool = True) -> None:
+    def _handle_error_response(self, response: httpx.Response) -> None:
         """HTTP hata yanıtlarını uygun istisna mesajlarıyla yükseltir."""
         status = response.status_code
         try:
@@ -121,9 +105,7 @@ class OpenRouterProvider(BaseLLMProvider):
         if status == 401:
             raise PermissionError(f"OpenRouter kimlik doğrulama hatası: {detail}")
         elif status == 429:
-            if raise_on_429:
-                raise RuntimeError(f"OpenRouter istek limiti aşıldı: {detail}")
-            return  # Rate limit için retry mekanizması tarafından işlenecek
+            raise RuntimeError(f"OpenRouter istek limiti aşıldı: {detail}")
         elif status >= 500:
             raise ConnectionError(f"OpenRouter sunucu hatası ({status}): {detail}")
         else:
@@ -136,11 +118,11 @@ class OpenRouterProvider(BaseLLMProvider):
         return {
             "content": message.get("content"),
             "tool_calls": message.get("tool_calls"),
-            "usage": data.get("usage", {}),
+            "usage": self._record_usage(data.get("usage")),
             "finish_reason": choice.get("finish_reason"),
         }
 
-    def chat_completion(
+    async def acompletion(
         self, messages: list[dict], tools: list[dict] | None = None
     ) -> dict:
         """OpenRouter'a sohbet tamamlama isteği gönderir.
@@ -157,48 +139,32 @@ class OpenRouterProvider(BaseLLMProvider):
             RuntimeError: İstek limiti aşıldıysa veya diğer API hataları.
             ConnectionError: Sunucu hatası veya bağlantı sorunu.
         """
-        return self._do_chat_completion(messages, tools, retry_count=0)
-
-    def _do_chat_completion(
-        self, messages: list[dict], tools: list[dict] | None, retry_count: int
-    ) -> dict:
-        """İç chat completion metodu - rate limit retry desteği ile."""
         if not self._api_key:
             raise PermissionError("OpenRouter API anahtarı ayarlanmamış")
 
         payload = self._build_payload(messages, tools, stream=False)
+        url = f"{self._base_url}/chat/completions"
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/chat/completions",
-                headers=self._headers(),
-                json=payload,
+            response = await request_with_retry(
+                lambda: self._client.post(url, headers=self._headers(), json=payload),
+                endpoint=url,
+                label="OpenRouter",
+                **self._rate_limit(messages, tools),
             )
         except httpx.ConnectError as exc:
             raise ConnectionError(f"OpenRouter'a bağlanılamadı: {exc}") from exc
         except httpx.TimeoutException as exc:
             raise ConnectionError(f"OpenRouter isteği zaman aşımına uğradı: {exc}") from exc
 
-        # Rate limit handling (429)
-        if response.status_code == 429:
-            if retry_count >= MAX_RETRIES:
-                self._handle_error_response(response)
-            retry_delay = self._parse_retry_delay(response.text)
-            logger.warning(
-                "OpenRouter rate limit aşıldı. %d saniye sonra tekrar denenecek (deneme %d/%d)",
-                int(retry_delay), retry_count + 1, MAX_RETRIES
-            )
-            time.sleep(retry_delay)
-            return self._do_chat_completion(messages, tools, retry_count + 1)
-
         if response.status_code != 200:
             self._handle_error_response(response)
 
         return self._parse_response(response.json())
 
-    def stream_completion(
+    async def astream_completion(
         self, messages: list[dict], tools: list[dict] | None = None
-    ) -> Generator[dict, None, None]:
+    ) -> AsyncGenerator[dict, None]:
         """Akış modunda sohbet tamamlama isteği gönderir (SSE).
 
         Args:
@@ -214,24 +180,35 @@ class OpenRouterProvider(BaseLLMProvider):
         payload = self._build_payload(messages, tools, stream=True)
 
         try:
-            with self._client.stream(
+            async with stream_with_retry(
+                self._client,
                 "POST",
                 f"{self._base_url}/chat/completions",
+                label="OpenRouter",
                 headers=self._headers(),
                 json=payload,
+                **self._rate_limit(messages, tools),
             ) as response:
                 if response.status_code != 200:
-                    response.read()
+                    await response.aread()
                     self._handle_error_response(response)
 
-                for line in response.iter_lines():
+                # Kullanım bilgisi finish_reason'dan sonraki parçada gelir;
+                # "done" bu yüzden [DONE] satırına kadar bekletilir
+                raw_usage = None
+                async for line in response.aiter_lines():
                     if not line or not line.startswith("data: "):
                         continue
 
                     data_str = line[len("data: "):]
 
                     if data_str.strip() == "[DONE]":
-                        yield {"content": None, "tool_calls": None, "done": True}
+                        yield {
+                            "content": None,
+                            "tool_calls": None,
+                            "done": True,
+                            "usage": self._record_usage(raw_usage),
+                        }
                         return
 
                     try:
@@ -240,33 +217,52 @@ class OpenRouterProvider(BaseLLMProvider):
                         logger.warning("SSE JSON ayrıştırma hatası: %s", data_str)
                         continue
 
-                    choice = data.get("choices", [{}])[0]
-                    delta = choice.get("delta", {})
+                    if data.get("usage"):
+                        raw_usage = data["usage"]
+                    choices = data.get("choices") or []
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {})
                     yield {
                         "content": delta.get("content"),
                         "tool_calls": delta.get("tool_calls"),
-                        "done": choice.get("finish_reason") is not None,
+                        "done": False,
                     }
 
+                yield {
+                    "content": None,
+                    "tool_calls": None,
+                    "done": True,
+                    "usage": self._record_usage(raw_usage),
+                }
+
         except httpx.ConnectError as exc:
             raise ConnectionError(f"OpenRouter'a bağlanılamadı: {exc}") from exc
         except httpx.TimeoutException as exc:
             raise ConnectionError(f"OpenRouter isteği zaman aşımına uğradı: {exc}") from exc
 
-    def get_available_models(self) -> list[str]:
+    async def aget_available_models(self) -> list[str]:
         """OpenRouter'daki kullanılabilir modellerin listesini döndürür."""
-        models, _prices = self.get_available_models_with_pricing()
+        models, _prices = await self.aget_available_models_with_pricing()
         return models
 
     def get_available_models_with_pricing(self) -> tuple[list[str], dict[str, dict]]:
+        """aget_available_models_with_pricing için senkron sarmalayıcı."""
+        return run_sync(self.aget_available_models_with_pricing())
+
+    async def aget_available_models_with_pricing(self) -> tuple[list[str], dict[str, dict]]:
         """OpenRouter model listesini ve 1k token fiyatlarını döndürür."""
+        url = f"{self._base_url}/models"
         try:
-            response = self._client.get(
-                f"{self._base_url}/models",
-                headers=self._headers(),
+            response = await request_with_retry(
+                lambda: self._client.get(url, headers=self._headers()),
+                endpoint=url,
+                label="OpenRouter",
             )
         except httpx.ConnectError as exc:
             raise ConnectionError(f"OpenRouter'a bağlanılamadı: {exc}") from exc
+        except httpx.TimeoutException as exc:
+            raise ConnectionError(f"OpenRouter isteği zaman aşımına uğradı: {exc}") from exc
 
         if response.status_code != 200:
             self._handle_error_response(response)
@@ -316,7 +312,6 @@ class OpenRouterProvider(BaseLLMProvider):
         logger.info("OpenRouter modeli değiştirildi: %s", model_name)
 
     def close(self) -> None:
-        """HTTP client'ı kapatır."""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """Paylaşılan HTTP client'ı bırakır."""
+        release_client(self._client)
+        self._client = None
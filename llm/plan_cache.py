@@ -0,0 +1,318 @@
+"""Plan önbelleği - Tekrarlanan istekler için araç planlarını diskte saklar.
+
+Kullanıcılar aynı düzendeki sayfalarda aynı istekleri ("toplam satırı ekle",
+"başlıkları biçimlendir") tekrar tekrar yapar. ``PlanCache`` bir turda
+başarıyla yürütülen araç çağrılarını, normalize edilmiş istek metni ve sayfa
+şeması parmak izi (başlıklar, kullanılan alan boyutu, sütun türleri)
+anahtarıyla saklar. İsabet durumunda plan, tablonun yeni konumuna göre
+adresleri kaydırılarak (``rebase_arguments``) LLM'e gitmeden yeniden oynatılır.
+
+Şema parmak izi verinin kendisini içermez. Model değiştirici adımlardan önce
+veri okuduysa adımların argümanları (hesaplanmış sabitler, bulunan satırlar)
+o veriden türemiş olabilir; böyle planlar turun başındaki sayfa içerik özetiyle
+birlikte saklanır ve yalnızca içerik aynıyken yeniden oynatılır.
+
+Kayıtlar TTL süresi dolunca ve kapasite aşılınca en eski kullanılan sırayla
+(LRU) atılır. ``plan_cache_enabled`` ayarı veya mesajın başına ``!``
+eklenmesi önbelleği atlar.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable
+
+from core.address_utils import column_to_index, index_to_column
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = Path.home() / ".config" / "libre_calc_ai" / "plan_cache.json"
+DEFAULT_CAPACITY = 200
+DEFAULT_TTL = 30 * 24 * 3600
+# Mesajın başına eklendiğinde önbelleği atlayan önek
+BYPASS_PREFIX = "!"
+# Önbellekten yeniden oynatılan plan çağrısının kimliği
+REPLAY_CALL_ID = "plan_cache"
+# Sonucu yalnızca şema parmak izinin kapsadığı bilgileri içeren okuma araçları
+SCHEMA_TOOLS = frozenset({"get_sheet_summary", "list_sheets"})
+
+# Değeri hücre/aralık adresi olan argümanlar
+_ADDRESS_KEYS = frozenset({
+    "cell", "range_name", "address", "source_range", "target_cell", "data_range", "position",
+})
+# Değeri "=" ile başlıyorsa formül olarak kaydırılan argümanlar
+_FORMULA_KEYS = frozenset({"formula", "condition", "value1", "value2"})
+
+# Fonksiyon adlarını (LOG10( gibi) ve sayfa adı içindeki harfleri yakalamaz
+_REF_RE = re.compile(r"(?<![A-Za-z0-9_\"])(\$?)([A-Za-z]{1,3})(\$?)(\d+)(?![A-Za-z0-9_(\"])")
+_PLAN_REF_RE = re.compile(r"(\$\{[^}]*\})")
+
+
+def normalize_request(text: str) -> str:
+    """İstek metnini önbellek anahtarı için normalize eder."""
+    text = (text or "").casefold().replace("’", "'")
+    return re.sub(r"[\s.,;!?]+", " ", text).strip()
+
+
+def _shift_refs(text: str, d_col: int, d_row: int) -> str:
+    def _shift(match):
+        col_abs, col, row_abs, row = match.groups()
+        col_index = column_to_index(col.upper()) + d_col
+        row_index = int(row) + d_row
+        if col_index < 0 or row_index < 1:
+            return match.group(0)
+        return f"{col_abs}{index_to_column(col_index)}{row_abs}{row_index}"
+
+    # ${s1.used_range} gibi plan başvuruları olduğu gibi bırakılır
+    parts = _PLAN_REF_RE.split(text)
+    return "".join(
+        part if i % 2 else _REF_RE.sub(_shift, part) for i, part in enumerate(parts)
+    )
+
+
+def rebase_arguments(arguments: dict, d_col: int, d_row: int) -> dict:
+    """Araç argümanlarındaki adresleri (d_col, d_row) kadar kaydırır.
+
+    Args:
+        arguments: Araç argümanları.
+        d_col: Sütun kayması.
+        d_row: Satır kayması.
+
+    Returns:
+        Adresleri kaydırılmış yeni argüman sözlüğü.
+    """
+    if not d_col and not d_row:
+        return dict(arguments)
+    rebased = {}
+    for key, value in arguments.items():
+        if isinstance(value, str) and (
+            key in _ADDRESS_KEYS or (key in _FORMULA_KEYS and value.startswith("="))
+        ):
+            value = _shift_refs(value, d_col, d_row)
+        elif key == "col_letter" and isinstance(value, str) and value.isalpha():
+            value = index_to_column(max(0, column_to_index(value.upper()) + d_col))
+        elif key == "row_num" and isinstance(value, int):
+            value = max(1, value + d_row)
+        rebased[key] = value
+    return rebased
+
+
+def turn_steps(turn: list[dict], plan_tool: str, read_only_tools) -> tuple[list[dict], bool] | None:
+    """Bir turda yürütülen değiştirici adımları plan adımlarına çevirir.
+
+    Doğrudan okuma çağrıları plana alınmaz; plan içindeki okuma adımları
+    ``${id.alan}`` başvuruları için korunur. Önbellekten yeniden oynatılan
+    ve yarıda kalan planın yalnızca başarılı adımları alınır.
+
+    Args:
+        turn: Son kullanıcı mesajından sonraki mesajlar.
+        plan_tool: Plan aracının adı.
+        read_only_tools: Sayfayı değiştirmeyen araç adları.
+
+    Returns:
+        (adımlar, veri okundu mu) ikilisi; ikinci değer, modelin bir
+        değiştirici adımdan önce veri okuma sonucu gördüğünü belirtir. Turda
+        hata varsa veya sayfa değişmediyse None.
+    """
+    payloads = {}
+    for msg in turn:
+        if msg.get("role") == "tool":
+            try:
+                payloads[msg.get("tool_call_id")] = json.loads(msg.get("content") or "{}")
+            except json.JSONDecodeError:
+                return None
+
+    steps = []
+    data_seen = False
+    reads_data = False
+    for msg in turn:
+        for tc in msg.get("tool_calls") or []:
+            func = tc.get("function", {})
+            name = func.get("name", "")
+            try:
+                arguments = json.loads(func.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                return None
+            payload = payloads.get(tc.get("id"))
+            if not isinstance(payload, dict):
+                return None
+            result = payload.get("result")
+            replay = tc.get("id") == REPLAY_CALL_ID
+
+            if name == plan_tool:
+                if not isinstance(result, dict):
+                    return None
+                if not replay and ("error" in payload or result.get("status") in ("failed", "invalid")):
+                    return None
+                executed = {s.get("id") for s in result.get("steps") or [] if s.get("status") == "ok"}
+                plan_steps = [s for s in arguments.get("steps") or [] if s.get("id") in executed]
+                if any(s.get("tool") not in read_only_tools for s in plan_steps):
+                    # Yeniden oynatılan kayıt veriden türemiş olabilir; içerik özeti istenir
+                    reads_data = reads_data or data_seen or replay
+                # inspect sonuçları yalnızca plan bittikten sonra modele gider
+                data_seen = data_seen or any(s.get("inspect") for s in plan_steps)
+                steps.extend({k: v for k, v in s.items() if k != "inspect"} for s in plan_steps)
+                continue
+
+            if "error" in payload:
+                return None
+            if name in read_only_tools:
+                data_seen = data_seen or name not in SCHEMA_TOOLS
+                continue
+            reads_data = reads_data or data_seen
+            steps.append({"id": f"c{len(steps) + 1}", "tool": name, "arguments": arguments})
+
+    ids = [step.get("id") for step in steps]
+    if len(set(ids)) != len(ids) or any(step.get("tool") == "fetch_tool_result" for step in steps):
+        return None
+    if not any(step.get("tool") not in read_only_tools for step in steps):
+        return None
+    return steps, reads_data
+
+
+class PlanCache:
+    """İstek + şema parmak izi anahtarlı, diskte kalıcı plan önbelleği."""
+
+    def __init__(self, path: Path = CACHE_FILE, capacity: int = DEFAULT_CAPACITY, ttl: float = DEFAULT_TTL):
+        """
+        PlanCache başlatıcı.
+
+        Args:
+            path: Önbellek dosyası.
+            capacity: En fazla kayıt sayısı.
+            ttl: Kayıt ömrü (saniye).
+        """
+        self._path = Path(path)
+        self._capacity = capacity
+        self._ttl = ttl
+        self._entries: dict[str, dict] | None = None
+
+    @staticmethod
+    def key(request: str, fingerprint: str) -> str:
+        """İstek ve şema parmak izinden önbellek anahtarı üretir."""
+        raw = f"{normalize_request(request)}\n{fingerprint}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self._path.exists():
+                try:
+                    with open(self._path, "r", encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning("Plan önbelleği okunamadı: %s", e)
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning("Plan önbelleği yazılamadı: %s", e)
+
+    def _evict(self, entries: dict[str, dict]) -> None:
+        now = time.time()
+        for key in [k for k, e in entries.items() if now - e["created"] > self._ttl]:
+            del entries[key]
+        if len(entries) > self._capacity:
+            oldest = sorted(entries, key=lambda k: entries[k]["last_used"])
+            for key in oldest[:len(entries) - self._capacity]:
+                del entries[key]
+
+    def get(self, request: str, schema: dict,
+            data_digest: Callable[[], str | None] | None = None) -> dict | None:
+        """İsabet varsa adresleri yeni konuma kaydırılmış planı döndürür.
+
+        Args:
+            request: Kullanıcı isteği.
+            schema: ``SheetAnalyzer.get_schema_fingerprint`` sonucu.
+            data_digest: Sayfanın güncel içerik özetini döndüren çağrılabilir.
+                Yalnızca kayıt veri okuyarak kaydedilmişse çağrılır; özet
+                farklıysa veya None dönerse plan kullanılmaz.
+
+        Returns:
+            {"steps", "summary"} sözlüğü; isabet yoksa None.
+        """
+        entries = self._load()
+        key = self.key(request, schema["fingerprint"])
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["created"] > self._ttl:
+            del entries[key]
+            self._save()
+            return None
+        if entry.get("data_digest"):
+            current = data_digest() if data_digest else None
+            if current != entry["data_digest"]:
+                logger.debug("Plan önbelleği: şema aynı, veri farklı; plan kullanılmadı")
+                return None
+
+        entry["last_used"] = time.time()
+        entry["hits"] = entry.get("hits", 0) + 1
+        self._save()
+
+        d_col = schema["origin"][0] - entry["origin"][0]
+        d_row = schema["origin"][1] - entry["origin"][1]
+        steps = [
+            dict(step, arguments=rebase_arguments(step.get("arguments") or {}, d_col, d_row))
+            for step in entry["steps"]
+        ]
+        logger.info("Plan önbelleği isabeti: %d adım (kayma %d sütun, %d satır)", len(steps), d_col, d_row)
+        return {"steps": steps, "summary": entry.get("summary", "")}
+
+    def put(self, request: str, schema: dict, steps: list[dict], summary: str = "",
+            data_digest: str | None = None) -> None:
+        """Başarıyla yürütülen planı saklar.
+
+        Args:
+            request: Kullanıcı isteği.
+            schema: ``SheetAnalyzer.get_schema_fingerprint`` sonucu.
+            steps: Plan adımları.
+            summary: Modelin tur sonu yanıtı.
+            data_digest: Adımlar okunan veriden türediyse turun başındaki
+                sayfa içerik özeti; plan yalnızca aynı içerikte yeniden oynatılır.
+        """
+        entries = self._load()
+        now = time.time()
+        entries[self.key(request, schema["fingerprint"])] = {
+            "steps": steps,
+            "summary": summary,
+            "data_digest": data_digest,
+            "origin": list(schema["origin"]),
+            "created": now,
+            "last_used": now,
+            "hits": 0,
+        }
+        self._evict(entries)
+        self._save()
+
+    def invalidate(self, request: str, schema: dict) -> None:
+        """İstek ve şemaya ait kaydı siler."""
+        entries = self._load()
+        if entries.pop(self.key(request, schema["fingerprint"]), None) is not None:
+            self._save()
+
+    def clear(self) -> None:
+        """Tüm kayıtları siler."""
+        self._entries = {}
+        self._save()
+
+
+_cache: PlanCache | None = None
+
+
+def get_plan_cache() -> PlanCache:
+    """Süreç genelindeki plan önbelleğini döndürür."""
+    global _cache
+    if _cache is None:
+        _cache = PlanCache()
+    return _cache
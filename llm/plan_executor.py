@@ -0,0 +1,225 @@
+"""Plan yürütücü - Modelin tek seferde ürettiği işlem planını yerelde çalıştırır.
+
+Çok adımlı isteklerde (ör. "biçimli özet tablo ve grafik yap") her araç
+grubu için ayrı bir LLM turu yapmak yerine model ``execute_plan`` aracıyla
+tüm adımları bağımlılıklarıyla birlikte bir kez gönderir. ``PlanExecutor``
+adımları bağımlılık sırasıyla tek bir toplu düzenleme oturumunda yürütür.
+LLM yalnızca bir adım başarısız olursa veya model bir adımın sonucunu
+görmek istediyse (``inspect``) yeniden çağrılır.
+
+Adım argümanlarında ``${s1}`` veya ``${s1.used_range}`` biçimindeki
+başvurular önceki adımların sonuçlarıyla değiştirilir. Değerin tamamı tek bir
+başvuruysa sonuç türü korunur; metin içindeki başvurular metne çevrilir.
+"""
+
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PLAN_TOOL_NAME = "execute_plan"
+# Tek planda yürütülebilecek en fazla adım sayısı
+MAX_PLAN_STEPS = 50
+
+_REF_RE = re.compile(r"\$\{([A-Za-z_][\w-]*)((?:\.[\w-]+)*)\}")
+
+
+class PlanError(ValueError):
+    """Plan geçersiz olduğunda (döngü, bilinmeyen bağımlılık vb.) fırlatılır."""
+
+
+def _references(value) -> set[str]:
+    """Argüman değerindeki adım başvurularını toplar."""
+    if isinstance(value, str):
+        return {m.group(1) for m in _REF_RE.finditer(value)}
+    if isinstance(value, dict):
+        refs = set()
+        for item in value.values():
+            refs |= _references(item)
+        return refs
+    if isinstance(value, list):
+        refs = set()
+        for item in value:
+            refs |= _references(item)
+        return refs
+    return set()
+
+
+def _lookup(results: dict, step_id: str, path: str):
+    if step_id not in results:
+        raise PlanError(f"'{step_id}' adımının sonucu yok")
+    value = results[step_id]
+    for key in filter(None, path.split(".")):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and key.lstrip("-").isdigit() and -len(value) <= int(key) < len(value):
+            value = value[int(key)]
+        else:
+            raise PlanError(f"'{step_id}{path}' başvurusu çözülemedi")
+    return value
+
+
+def _resolve(value, results: dict):
+    """Argüman değerindeki başvuruları önceki adım sonuçlarıyla değiştirir."""
+    if isinstance(value, str):
+        whole = _REF_RE.fullmatch(value)
+        if whole:
+            return _lookup(results, whole.group(1), whole.group(2))
+
+        def _text(match):
+            found = _lookup(results, match.group(1), match.group(2))
+            return found if isinstance(found, str) else json.dumps(found, ensure_ascii=False)
+
+        return _REF_RE.sub(_text, value)
+    if isinstance(value, dict):
+        return {k: _resolve(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, results) for v in value]
+    return value
+
+
+def order_steps(steps: list) -> list[dict]:
+    """Plan adımlarını doğrular ve bağımlılık sırasına dizer.
+
+    Bağımlılıklar ``depends_on`` alanından ve argümanlardaki başvurulardan
+    çıkarılır. Bağımsız adımlar plandaki sıralarını korur.
+
+    Args:
+        steps: Modelin gönderdiği adım listesi.
+
+    Returns:
+        Yürütme sırasına dizilmiş adımlar.
+
+    Raises:
+        PlanError: Plan boşsa, çok uzunsa, kimlikler yinelenmişse, bilinmeyen
+            bir adıma başvuruluyorsa veya bağımlılıklar döngü oluşturuyorsa.
+    """
+    if not isinstance(steps, list) or not steps:
+        raise PlanError("Plan en az bir adım içermelidir")
+    if len(steps) > MAX_PLAN_STEPS:
+        raise PlanError(f"Plan en fazla {MAX_PLAN_STEPS} adım içerebilir")
+
+    by_id: dict[str, dict] = {}
+    deps: dict[str, set[str]] = {}
+    for i, step in enumerate(steps):
+        if not isinstance(step, dict) or not step.get("tool"):
+            raise PlanError(f"{i + 1}. adımda 'tool' alanı eksik")
+        step_id = str(step.get("id") or f"s{i + 1}")
+        if step_id in by_id:
+            raise PlanError(f"Yinelenen adım kimliği: {step_id}")
+        if step["tool"] == PLAN_TOOL_NAME:
+            raise PlanError("Plan içinde execute_plan kullanılamaz")
+        step = dict(step, id=step_id)
+        by_id[step_id] = step
+        deps[step_id] = set(map(str, step.get("depends_on") or [])) | _references(step.get("arguments") or {})
+
+    for step_id, needed in deps.items():
+        unknown = needed - by_id.keys()
+        if unknown:
+            raise PlanError(f"'{step_id}' bilinmeyen adımlara bağlı: {', '.join(sorted(unknown))}")
+
+    ordered = []
+    done: set[str] = set()
+    pending = list(by_id)
+    while pending:
+        ready = [step_id for step_id in pending if deps[step_id] <= done]
+        if not ready:
+            raise PlanError(f"Bağımlılık döngüsü: {', '.join(pending)}")
+        # Plan sırası korunur: her turda hazır olan ilk adım alınır
+        step_id = ready[0]
+        pending.remove(step_id)
+        done.add(step_id)
+        ordered.append(by_id[step_id])
+    return ordered
+
+
+class PlanExecutor:
+    """``execute_plan`` adımlarını ``ToolDispatcher`` üzerinden yürüten sınıf."""
+
+    def __init__(self, dispatcher, bridge=None):
+        """
+        PlanExecutor başlatıcı.
+
+        Args:
+            dispatcher: Adımları çalıştıracak ToolDispatcher.
+            bridge: Toplu düzenleme oturumu için LibreOfficeBridge; None ise
+                adımlar oturum açılmadan yürütülür.
+        """
+        self._dispatcher = dispatcher
+        self._bridge = bridge
+
+    def run(self, steps: list, summary: str = "") -> dict:
+        """Planı yürütür.
+
+        İlk başarısız adımda durulur; kalan adımlar "skipped" olarak işaretlenir.
+
+        Args:
+            steps: Plan adımları.
+            summary: Plan başarıyla bittiğinde kullanıcıya gösterilecek özet.
+
+        Returns:
+            "status" (completed/failed/invalid), "steps", "needs_model" ve
+            "summary" alanlarını içeren sonuç sözlüğü.
+        """
+        try:
+            ordered = order_steps(steps)
+        except PlanError as exc:
+            return {"status": "invalid", "error": str(exc), "steps": [], "needs_model": True}
+
+        if self._bridge is not None:
+            with self._bridge.bulk_edit("ArasAI planı"):
+                report = self._run_steps(ordered)
+        else:
+            report = self._run_steps(ordered)
+
+        failed = any(step["status"] == "error" for step in report)
+        inspected = any(step.get("inspect") for step in ordered)
+        logger.info(
+            "Plan yürütüldü: %d adım, %s",
+            len(report), "başarısız" if failed else "tamamlandı",
+        )
+        result = {
+            "status": "failed" if failed else "completed",
+            "steps": report,
+            "needs_model": failed or inspected,
+        }
+        if summary and not failed:
+            result["summary"] = summary
+        return result
+
+    def _run_steps(self, ordered: list[dict]) -> list[dict]:
+        results: dict = {}
+        report = []
+        failed = False
+        for step in ordered:
+            entry = {"id": step["id"], "tool": step["tool"]}
+            report.append(entry)
+            if failed:
+                entry["status"] = "skipped"
+                continue
+
+            try:
+                arguments = _resolve(step.get("arguments") or {}, results)
+            except PlanError as exc:
+                entry.update(status="error", error=str(exc))
+                failed = True
+                continue
+
+            payload = self._dispatch(step["tool"], arguments)
+            if "error" in payload:
+                entry.update(status="error", error=payload["error"], arguments=arguments)
+                failed = True
+                continue
+
+            results[step["id"]] = payload.get("result")
+            entry["status"] = "ok"
+            if step.get("inspect"):
+                entry["result"] = payload.get("result")
+        return report
+
+    def _dispatch(self, tool_name: str, arguments: dict) -> dict:
+        try:
+            return json.loads(self._dispatcher.dispatch(tool_name, arguments))
+        except json.JSONDecodeError as exc:
+            return {"error": f"Geçersiz araç sonucu: {exc}"}
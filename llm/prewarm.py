@@ -0,0 +1,70 @@
+"""Bağlantı ön ısıtma - Kullanıcı yazmaya başladığında sağlayıcıyı hazırlar.
+
+Boşta geçen bir süreden sonraki ilk istek DNS, TCP ve TLS kurulumunu (Ollama
+için model yüklemeyi) ilk token'dan önce öder. ``PrewarmGate`` bu maliyetin
+kullanıcı yazarken arka planda ödenmesi için ne zaman ısıtma yapılacağına
+karar verir ve kazanılan süreyi takip eder.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Aynı sağlayıcı için iki ısıtma arasındaki minimum süre (saniye).
+# Paylaşılan havuzun keep-alive süresinden kısa tutulur ki bağlantı sıcak kalsın.
+DEFAULT_MIN_INTERVAL = 60.0
+
+
+class PrewarmGate:
+    """Sağlayıcı başına hız sınırlı ön ısıtma kapısı.
+
+    Anahtar genellikle (sağlayıcı adı, model) ikilisidir. Aynı anahtar için
+    ``min_interval`` saniye içinde ikinci bir ısıtma yapılmaz; gerçek bir
+    istek de bağlantıyı sıcak tuttuğundan ``mark_used`` ile bildirilir.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self._min_interval = min_interval
+        self._last_activity: dict[tuple, float] = {}
+        self._in_flight: set[tuple] = set()
+        self._pending_saving: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def try_begin(self, key: tuple) -> bool:
+        """Isıtma başlatılabilirse True döndürür ve anahtarı meşgul işaretler."""
+        now = time.monotonic()
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            last = self._last_activity.get(key)
+            if last is not None and now - last < self._min_interval:
+                return False
+            self._in_flight.add(key)
+            self._last_activity[key] = now
+            return True
+
+    def finish(self, key: tuple, elapsed: float) -> None:
+        """Isıtmanın bittiğini ve harcanan süreyi kaydeder."""
+        with self._lock:
+            self._in_flight.discard(key)
+            self._last_activity[key] = time.monotonic()
+            if elapsed > 0:
+                self._pending_saving[key] = elapsed
+        if elapsed > 0:
+            logger.info(
+                "Ön ısıtma tamamlandı %s: ilk token için ~%.0f ms kazanıldı.",
+                key, elapsed * 1000,
+            )
+
+    def mark_used(self, key: tuple) -> float:
+        """Gerçek bir istek gönderildiğini bildirir.
+
+        Returns:
+            Bu istekten önce yapılan ısıtmanın kazandırdığı süre (saniye);
+            ısıtma yapılmadıysa 0.0.
+        """
+        with self._lock:
+            self._last_activity[key] = time.monotonic()
+            return self._pending_saving.pop(key, 0.0)
@@ -0,0 +1,173 @@
+"""İstem önbelleği - Sabit istem öneki, sağlayıcı önbellek işaretleri ve isabet istatistikleri.
+
+Sağlayıcıların önek önbelleği (OpenAI/Groq otomatik önbellek, Anthropic ve
+Gemini ``cache_control``, Gemini örtük önbellek, Ollama KV yeniden kullanımı)
+ancak isteğin başı bayt bayt aynı kaldığında işe yarar. Bu yüzden:
+
+- Sistem mesajı yalnızca sabit ``SYSTEM_PROMPT``'tan oluşur; değişen sayfa ve
+  seçim bağlamı ``with_dynamic_context`` ile son kullanıcı mesajına, yalnızca
+  giden kopyada eklenir. Geçmişin önceki turları değişmeden kalır.
+- OpenRouter üzerinden Anthropic/Gemini modellerinde sistem mesajı açık bir
+  ``cache_control`` kesme noktasıyla işaretlenir.
+- Yanıtlardaki önbellekten okunan token sayıları ``CacheStats``'ta toplanır.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+# OpenRouter'da açık cache_control işareti gerektiren model aileleri
+EXPLICIT_CACHE_PREFIXES = ("anthropic/", "google/gemini")
+# Ollama'da modelin (ve KV önbelleğinin) istekler arasında bellekte kalma süresi
+OLLAMA_KEEP_ALIVE = "30m"
+# Dinamik bağlam bölümünün başlığı ve kullanıcı mesajından ayırıcısı
+CONTEXT_HEADER = "## MEVCUT DURUM"
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+def with_dynamic_context(conversation: list[dict], context: str) -> list[dict]:
+    """Dinamik bağlamı son kullanıcı mesajının başına ekler.
+
+    Geçmişin kendisi değiştirilmez; yalnızca gönderilecek kopyada son
+    kullanıcı mesajı yeni bir sözlükle değiştirilir.
+
+    Args:
+        conversation: Sistem mesajı hariç sohbet geçmişi.
+        context: ``## MEVCUT DURUM`` bölümü.
+
+    Returns:
+        Gönderilecek mesaj listesi.
+    """
+    context = (context or "").strip()
+    if not context:
+        return list(conversation)
+    messages = list(conversation)
+    for i in range(len(messages) - 1, -1, -1):
+        msg = messages[i]
+        if msg.get("role") == "user":
+            messages[i] = dict(msg, content=f"{context}{CONTEXT_SEPARATOR}{msg.get('content') or ''}")
+            break
+    return messages
+
+
+def strip_dynamic_context(text: str) -> str:
+    """``with_dynamic_context`` ile eklenen bağlam bölümünü metinden çıkarır.
+
+    Anahtar kelime eşleştirmesi yalnızca kullanıcının yazdığı metne
+    uygulanmalıdır; bağlamdaki "Sayfa:", "satır x sütun" gibi ifadeler
+    her isteği araç gerektiren istek gibi gösterir.
+
+    Args:
+        text: Kullanıcı mesajı içeriği.
+
+    Returns:
+        Bağlam bölümü olmadan kullanıcı metni.
+    """
+    if not text or not text.lstrip().startswith(CONTEXT_HEADER):
+        return text
+    _context, separator, rest = text.partition(CONTEXT_SEPARATOR)
+    return rest if separator else ""
+
+
+def supports_cache_control(model: str) -> bool:
+    """OpenRouter modeli açık ``cache_control`` işareti bekliyorsa True."""
+    return (model or "").lower().startswith(EXPLICIT_CACHE_PREFIXES)
+
+
+def apply_cache_control(messages: list[dict]) -> list[dict]:
+    """Sistem mesajını ``cache_control`` kesme noktalı içerik parçasına çevirir.
+
+    Anthropic sırasında araç şemaları sistem isteminden önce geldiğinden bu
+    kesme noktası araçları ve sistem istemini birlikte önbelleğe alır.
+    """
+    result = []
+    marked = False
+    for msg in messages:
+        content = msg.get("content")
+        if not marked and msg.get("role") == "system" and isinstance(content, str):
+            msg = dict(msg, content=[
+                {"type": "text", "text": content, "cache_control": CACHE_CONTROL},
+            ])
+            marked = True
+        result.append(msg)
+    return result
+
+
+def normalize_usage(usage: dict | None) -> dict:
+    """Sağlayıcı kullanım bilgisini ortak biçime çevirir.
+
+    OpenAI/OpenRouter/Groq ``prompt_tokens_details.cached_tokens`` ve
+    Anthropic ``cache_read_input_tokens`` alanlarını destekler.
+
+    Returns:
+        {"prompt_tokens", "completion_tokens", "cached_tokens"} sözlüğü;
+        kullanım bilgisi yoksa boş sözlük.
+    """
+    if not usage:
+        return {}
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens")
+    if cached is None:
+        cached = usage.get("cache_read_input_tokens", 0)
+    return {
+        "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+        "completion_tokens": int(usage.get("completion_tokens") or 0),
+        "cached_tokens": int(cached or 0),
+    }
+
+
+class CacheStats:
+    """Sağlayıcı/model başına önbellek isabet istatistikleri.
+
+    İş parçacığı güvenlidir; kayıtlar asyncio döngüsünden, sorgular
+    arayüzden yapılır.
+    """
+
+    def __init__(self):
+        self._totals: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: tuple, usage: dict) -> None:
+        """Normalize edilmiş kullanım bilgisini ekler."""
+        prompt = usage.get("prompt_tokens", 0)
+        if not prompt:
+            return
+        cached = min(usage.get("cached_tokens", 0), prompt)
+        with self._lock:
+            totals = self._totals.setdefault(key, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += prompt
+            totals[2] += cached
+        logger.debug("İstem önbelleği (%s): %d/%d token önbellekten", key, cached, prompt)
+
+    def hit_rate(self, key: tuple) -> float | None:
+        """Önbellekten okunan istem token oranı (0.0 - 1.0); kayıt yoksa None."""
+        with self._lock:
+            totals = self._totals.get(key)
+        if not totals or not totals[1]:
+            return None
+        return totals[2] / totals[1]
+
+    def snapshot(self) -> dict:
+        """İstatistiklerin özetini döndürür (teşhis amaçlı)."""
+        with self._lock:
+            items = {key: list(totals) for key, totals in self._totals.items()}
+        return {
+            key: {
+                "requests": requests,
+                "prompt_tokens": prompt,
+                "cached_tokens": cached,
+                "hit_rate": cached / prompt if prompt else 0.0,
+            }
+            for key, (requests, prompt, cached) in items.items()
+        }
+
+
+_stats = CacheStats()
+
+
+def get_cache_stats() -> CacheStats:
+    """Süreç genelindeki önbellek istatistiklerini döndürür."""
+    return _stats
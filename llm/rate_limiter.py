@@ -0,0 +1,265 @@
+"""İstemci tarafı hız sınırlayıcı - Sağlayıcı/model başına RPM ve TPM token kovaları.
+
+Araç döngülerinde bir sonraki tur, araçlar biter bitmez gönderilir; ücretsiz
+Gemini/Groq anahtarları bu yüzden sık sık 429 döndürür. Bu modül istekleri
+göndermeden önce yerel olarak hızlandırır/yavaşlatır: bütçe varsa istek hemen
+gider, yoksa gereken kısa süre kadar beklenir. Yanıtlardaki
+``x-ratelimit-*`` başlıklarından gerçek limitler öğrenilir.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Bilinen ücretsiz katman limitleri. Ayarlardaki "llm_rate_limits" ile
+# "sağlayıcı" veya "sağlayıcı/model" anahtarlarıyla ezilebilir. Yalnızca
+# başlangıç değeridir; sunucunun bildirdiği gerçek limitler bunların yerine geçer.
+DEFAULT_LIMITS = {
+    "gemini": {"rpm": 15, "tpm": 1_000_000},
+    "groq": {"rpm": 30, "tpm": 6_000},
+}
+
+# Başlıktan öğrenilen yeni kovalar için varsayılan pencere (saniye)
+LEARNED_WINDOW = 60.0
+# Bu sürenin altındaki beklemeler loglanmaz (saniye)
+LOG_WAIT_THRESHOLD = 0.5
+
+_DURATION_RE = re.compile(r"([\d.]+)(ms|h|m|s)")
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Sıfırlanma süresini saniyeye çevirir.
+
+    Groq "2m59.56s" / "120ms" biçiminde süre, OpenRouter ise milisaniye
+    cinsinden epoch zaman damgası döndürür.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        total = 0.0
+        matched = False
+        for amount, unit in _DURATION_RE.findall(value):
+            matched = True
+            amount = float(amount)
+            total += {"ms": amount / 1000.0, "s": amount, "m": amount * 60, "h": amount * 3600}[unit]
+        return total if matched else None
+
+    if number > 1e12:  # epoch milisaniye
+        return max(0.0, number / 1000.0 - time.time())
+    if number > 1e9:  # epoch saniye
+        return max(0.0, number - time.time())
+    return max(0.0, number)
+
+
+def _to_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Borçlanabilen token kovası.
+
+    Yetersiz bütçede istek reddedilmez; kova eksiye düşer ve çağırana
+    bütçe dolana kadar beklemesi gereken süre döndürülür. Böylece eşzamanlı
+    istekler sırayla ve adil şekilde yayılır.
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._level = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0 and self.refill_per_sec > 0:
+            self._level = min(self.capacity, self._level + elapsed * self.refill_per_sec)
+
+    def reserve(self, amount: float) -> float:
+        """``amount`` kadar bütçe ayırır; beklenmesi gereken süreyi döndürür."""
+        now = time.monotonic()
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        self._level -= amount
+        wait = 0.0
+        if self._level < 0 and self.refill_per_sec > 0:
+            wait = -self._level / self.refill_per_sec
+        return max(wait, self._blocked_until - now)
+
+    def refund(self, amount: float) -> None:
+        """Kullanılmayan (iptal edilen) ayırmayı geri verir."""
+        self._level = min(self.capacity, self._level + min(amount, self.capacity))
+
+    def observe(
+        self,
+        limit: float | None,
+        remaining: float | None,
+        reset: float | None,
+        adopt_limit: bool = True,
+    ) -> None:
+        """Sunucunun bildirdiği limit/kalan/sıfırlanma değerleriyle kovayı eşitler.
+
+        Args:
+            adopt_limit: False ise kapasite ve dolum hızı korunur (ayarlarda
+                açıkça verilmiş limitler); yalnızca kalan bütçe eşitlenir.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if adopt_limit and limit and limit > 0:
+            # Pencere süresi korunur: kapasite değişince dolum hızı da ölçeklenir
+            self.refill_per_sec *= limit / self.capacity
+            self.capacity = limit
+            if remaining is not None and reset and reset > 0 and limit > remaining:
+                # Sunucunun gerçek dolum hızı: eksik bütçe reset süresinde dolar
+                self.refill_per_sec = (limit - remaining) / reset
+        if remaining is not None:
+            self._level = min(self._level, remaining)
+            if remaining < 1 and reset:
+                self._blocked_until = max(self._blocked_until, now + reset)
+
+
+class RateLimiter:
+    """Tek bir sağlayıcı/model için RPM ve TPM sınırlayıcı.
+
+    Args:
+        name: Loglarda kullanılan ad ("sağlayıcı/model").
+        rpm: Dakikadaki istek limiti (None = başlıklardan öğrenilir).
+        tpm: Dakikadaki token limiti (None = başlıklardan öğrenilir).
+        configured: Limitler kullanıcı ayarlarından mı geliyor? True ise
+            başlıklar limitleri genişletemez, yalnızca kalan bütçeyi eşitler;
+            False ise (ör. ``DEFAULT_LIMITS``) başlıklardaki gerçek limitler
+            benimsenir.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        configured: bool = True,
+    ):
+        self.name = name
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(rpm, rpm / 60.0) if rpm else None
+        self._tokens = TokenBucket(tpm, tpm / 60.0) if tpm else None
+        # Ayarlardan gelen limitler başlıklarla genişletilmez, yalnızca sıkılaştırılır
+        self._configured = {"_requests": configured and bool(rpm), "_tokens": configured and bool(tpm)}
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """İstek göndermeden önce bütçe ayırır, gerekirse bekler.
+
+        Bekleme ``asyncio.sleep`` ile yapılır; görev iptal edilirse ayrılan
+        bütçe geri verilir.
+
+        Returns:
+            Beklenen süre (saniye).
+        """
+        with self._lock:
+            wait = 0.0
+            if self._requests:
+                wait = max(wait, self._requests.reserve(1))
+            if self._tokens and tokens:
+                wait = max(wait, self._tokens.reserve(tokens))
+        if wait <= 0:
+            return 0.0
+
+        log = logger.info if wait >= LOG_WAIT_THRESHOLD else logger.debug
+        log("%s: hız sınırı için istek %.1f sn bekletiliyor.", self.name, wait)
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            with self._lock:
+                if self._requests:
+                    self._requests.refund(1)
+                if self._tokens and tokens:
+                    self._tokens.refund(tokens)
+            raise
+        return wait
+
+    def observe_headers(self, headers) -> None:
+        """Yanıt başlıklarından gerçek limitleri öğrenir.
+
+        Groq/OpenAI tarzı ``x-ratelimit-{limit,remaining,reset}-{requests,tokens}``
+        ve OpenRouter tarzı ``x-ratelimit-{limit,remaining,reset}`` başlıklarını
+        destekler.
+        """
+        with self._lock:
+            for suffix, attr in (("requests", "_requests"), ("tokens", "_tokens")):
+                limit = _to_float(headers.get(f"x-ratelimit-limit-{suffix}"))
+                remaining = _to_float(headers.get(f"x-ratelimit-remaining-{suffix}"))
+                if limit is None and remaining is None:
+                    continue
+                reset = _parse_reset(headers.get(f"x-ratelimit-reset-{suffix}"))
+                self._observe(attr, limit, remaining, reset)
+
+            limit = _to_float(headers.get("x-ratelimit-limit"))
+            remaining = _to_float(headers.get("x-ratelimit-remaining"))
+            if limit is not None or remaining is not None:
+                reset = _parse_reset(headers.get("x-ratelimit-reset"))
+                self._observe("_requests", limit, remaining, reset)
+
+    def _observe(self, attr: str, limit, remaining, reset) -> None:
+        bucket = getattr(self, attr)
+        if bucket is None:
+            if not limit:
+                return
+            bucket = TokenBucket(limit, limit / LEARNED_WINDOW)
+            setattr(self, attr, bucket)
+            logger.debug("%s: sunucudan %s limiti öğrenildi: %s", self.name, attr.strip("_"), limit)
+        bucket.observe(limit, remaining, reset, adopt_limit=not self._configured[attr])
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_limits(provider: str, model: str) -> tuple[dict, bool]:
+    """Sağlayıcı/model için başlangıç limitlerini bulur.
+
+    Returns:
+        (limitler, ayarlardan_mı) ikilisi; ikinci değer limit kullanıcı
+        ayarlarından geldiyse True, ``DEFAULT_LIMITS`` veya hiçbirinden
+        gelmediyse False.
+    """
+    overrides = Settings().get("llm_rate_limits", {}) or {}
+    for source in (overrides, DEFAULT_LIMITS):
+        for key in (f"{provider}/{model}", provider):
+            if key in source:
+                return source[key] or {}, source is overrides
+    return {}, False
+
+
+def get_limiter(provider: str, model: str) -> RateLimiter | None:
+    """Sağlayıcı/model için paylaşılan sınırlayıcıyı döndürür.
+
+    Returns:
+        RateLimiter; hız sınırlama ayarlardan kapatıldıysa None.
+    """
+    if not Settings().get("llm_rate_limit_enabled", True):
+        return None
+    key = (provider, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limits, configured = _configured_limits(provider, model)
+            limiter = RateLimiter(
+                f"{provider}/{model}", rpm=limits.get("rpm"), tpm=limits.get("tpm"),
+                configured=configured,
+            )
+            _limiters[key] = limiter
+        return limiter
@@ -0,0 +1,239 @@
+"""Araç sonucu sıkıştırma - Sonuçlar sohbete girmeden önce kompakt kodlanır.
+
+``read_cell_range`` bir ``CellBlock``, ``get_all_formulas`` ise her formül
+için ayrı bir sözlük döndürür. Bu katman sonuçları kayıpsız ama çok daha az
+token tutan biçimlere çevirir:
+
+- Hücre tabloları ``CellBlock.to_compact`` ile kodlanır: sütun harfleri +
+  satır numarası + yalnızca değer matrisi; formüller ayrı bir haritada,
+  aşağı doğru kopyalanmış aynı göreli formüller tek bir aralık girdisiyle
+  ("D2:D100": "=B2*C2"); ardışık aynı satırlar {"repeat": n} ile kısaltılır.
+- Tekdüze sözlük listeleri sütunsal (columns + rows) kodlanır.
+- Uzun sonuçlar baş/son kısmı gösterilecek şekilde kesilir; tamamı
+  ``ResultStore``'da saklanır ve ``fetch_tool_result`` aracıyla devamı
+  istenebilir.
+- Sayfalı okuma araçları (``read_cell_range``, ``get_all_formulas``) büyük
+  blokları ``PAGE_ROWS``'luk sayfalarla ve opak bir ``next_cursor`` ile
+  döndürür; blok depoda tutulduğundan sonraki sayfalar yeni UNO okuması
+  gerektirmez.
+"""
+
+import re
+from collections import OrderedDict
+
+from core.cell_block import CellBlock
+
+# Kesme sınırları (satır/kayıt)
+MAX_ROWS = 60
+HEAD_ROWS = 40
+TAIL_ROWS = 10
+# Saklanan en fazla tam sonuç
+STORE_CAPACITY = 32
+# Sayfalı okuma araçlarının varsayılan sayfa boyu (satır/kayıt)
+PAGE_ROWS = 50
+
+_CURSOR_RE = re.compile(r"^(r\d+)\.(\d+)$")
+
+
+def _is_cell_table(result) -> bool:
+    if isinstance(result, CellBlock):
+        return len(result) > 0
+    return (
+        isinstance(result, list)
+        and result
+        and all(isinstance(row, list) for row in result)
+        and isinstance(result[0][0] if result[0] else None, dict)
+        and "address" in result[0][0]
+    )
+
+
+def _is_record_list(result) -> bool:
+    if not isinstance(result, list) or not result:
+        return False
+    if not all(isinstance(item, dict) for item in result):
+        return False
+    keys = list(result[0].keys())
+    return len(keys) > 1 and all(list(item.keys()) == keys for item in result)
+
+
+def _encode_cell_table(rows) -> dict:
+    """Hücre tablosunu (``CellBlock`` veya 2B sözlük listesi) kompakt tabloya çevirir."""
+    if not isinstance(rows, CellBlock):
+        rows = CellBlock.from_dicts(rows)
+    return rows.to_compact()
+
+
+def _encode_records(records: list[dict]) -> dict:
+    """Tekdüze sözlük listesini sütunsal biçime çevirir."""
+    columns = list(records[0].keys())
+    return {
+        "format": "records",
+        "columns": columns,
+        "rows": [[item.get(col) for col in columns] for item in records],
+    }
+
+
+def _count_items(result) -> int:
+    return len(result) if isinstance(result, (list, CellBlock)) else 0
+
+
+def compact_result(result, max_rows: int = MAX_ROWS) -> tuple[object, bool]:
+    """Araç sonucunu kompakt biçime çevirir.
+
+    Args:
+        result: Araç işleyicisinin döndürdüğü ham sonuç.
+        max_rows: Kesmeden önce izin verilen en fazla satır/kayıt.
+
+    Returns:
+        (kompakt sonuç, kesildi mi) ikilisi. Tanınmayan sonuçlar aynen döner.
+    """
+    if _is_cell_table(result):
+        total = len(result)
+        if total <= max_rows:
+            return _encode_cell_table(result), False
+        head = _encode_cell_table(result[:HEAD_ROWS])
+        tail = _encode_cell_table(result[-TAIL_ROWS:])
+        head["tail"] = {"first_row": tail["first_row"], "rows": tail["rows"]}
+        if "formulas" in tail:
+            head["tail"]["formulas"] = tail["formulas"]
+        head["range"] = f"{head['columns'][0]}{head['first_row']}:{head['columns'][-1]}{head['first_row'] + total - 1}"
+        head["total_rows"] = total
+        return head, True
+
+    if _is_record_list(result):
+        total = len(result)
+        if total <= max_rows:
+            return _encode_records(result), False
+        encoded = _encode_records(result[:HEAD_ROWS])
+        encoded["tail"] = _encode_records(result[-TAIL_ROWS:])["rows"]
+        encoded["total_rows"] = total
+        return encoded, True
+
+    return result, False
+
+
+class ResultStore:
+    """Kesilen araç sonuçlarının tamamını saklayan küçük LRU deposu."""
+
+    def __init__(self, capacity: int = STORE_CAPACITY):
+        self._capacity = capacity
+        self._items: OrderedDict[str, tuple[str, object]] = OrderedDict()
+        self._counter = 0
+
+    def put(self, tool_name: str, result) -> str:
+        """Sonucu saklar ve devam tanıtıcısını döndürür."""
+        self._counter += 1
+        handle = f"r{self._counter}"
+        self._items[handle] = (tool_name, result)
+        while len(self._items) > self._capacity:
+            self._items.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> tuple[str, object] | None:
+        item = self._items.get(handle)
+        if item is not None:
+            self._items.move_to_end(handle)
+        return item
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+def compact_for_tool(tool_name: str, result, store: ResultStore) -> object:
+    """Sonucu sıkıştırır; kesildiyse tamamını depolayıp devam bilgisi ekler."""
+    compact, truncated = compact_result(result)
+    if not truncated:
+        return compact
+    handle = store.put(tool_name, result)
+    total = _count_items(result)
+    compact["continuation"] = {
+        "handle": handle,
+        "omitted": f"{HEAD_ROWS}-{total - TAIL_ROWS}",
+        "hint": (
+            f"Atlanan satırlar için fetch_tool_result(handle='{handle}', "
+            f"offset={HEAD_ROWS}, limit={MAX_ROWS}) çağır."
+        ),
+    }
+    return compact
+
+
+def fetch_slice(store: ResultStore, handle: str, offset: int = 0, limit: int = MAX_ROWS) -> object:
+    """Saklanan sonucun bir dilimini kompakt biçimde döndürür.
+
+    Raises:
+        KeyError: Tanıtıcı bilinmiyorsa (ör. süresi dolmuş).
+    """
+    item = store.get(handle)
+    if item is None:
+        raise KeyError(f"Sonuç bulunamadı veya süresi doldu: {handle}")
+    tool_name, result = item
+    total = _count_items(result)
+    offset = max(0, int(offset))
+    limit = max(1, min(int(limit), MAX_ROWS))
+    part = result[offset:offset + limit] if isinstance(result, (list, CellBlock)) else result
+    compact, _truncated = compact_result(part, max_rows=limit)
+    next_offset = offset + limit
+    return {
+        "tool": tool_name,
+        "offset": offset,
+        "total_rows": total,
+        "next_offset": next_offset if next_offset < total else None,
+        "data": compact,
+    }
+
+
+def _page_size(page_size) -> int:
+    if page_size is None:
+        return PAGE_ROWS
+    return max(1, min(int(page_size), MAX_ROWS))
+
+
+def _make_page(handle: str, block: list, offset: int, size: int) -> dict:
+    total = len(block)
+    compact, _truncated = compact_result(block[offset:offset + size], max_rows=size)
+    if not isinstance(compact, dict):
+        compact = {"rows": compact}
+    next_offset = offset + size
+    compact["total_rows"] = total
+    compact["page"] = f"{offset}-{min(next_offset, total) - 1}"
+    compact["next_cursor"] = f"{handle}.{next_offset}" if next_offset < total else None
+    return compact
+
+
+def first_page(tool_name: str, block, store: ResultStore, page_size: int | None = None):
+    """Sayfalı bir okumanın ilk sayfasını döndürür.
+
+    Blok tek sayfaya sığıyorsa aynen döner (dispatcher sıkıştırır); sığmıyorsa
+    tamamı depoya konur ve ilk sayfa ``next_cursor`` ile döndürülür.
+
+    Args:
+        tool_name: Aracın adı.
+        block: Tek seferde okunmuş ham sonuç (satır veya kayıt listesi).
+        store: Blokların saklanacağı depo.
+        page_size: Sayfa boyu (varsayılan ``PAGE_ROWS``, en fazla ``MAX_ROWS``).
+    """
+    size = _page_size(page_size)
+    if not isinstance(block, (list, CellBlock)) or len(block) <= size:
+        return block
+    handle = store.put(tool_name, block)
+    return _make_page(handle, block, 0, size)
+
+
+def next_page(tool_name: str, cursor: str, store: ResultStore, page_size: int | None = None) -> dict:
+    """İmleçle belirtilen sonraki sayfayı depodaki bloktan döndürür.
+
+    Raises:
+        ValueError: İmleç geçersizse veya başka bir araca aitse.
+        KeyError: Blok depodan düşmüşse; araç imleçsiz yeniden çağrılmalıdır.
+    """
+    match = _CURSOR_RE.match(str(cursor or "").strip())
+    if not match:
+        raise ValueError(f"Geçersiz imleç: {cursor}")
+    handle, offset = match.group(1), int(match.group(2))
+    item = store.get(handle)
+    if item is None:
+        raise KeyError(f"İmlecin süresi doldu, aracı imleçsiz yeniden çağır: {cursor}")
+    stored_tool, block = item
+    if stored_tool != tool_name:
+        raise ValueError(f"İmleç {stored_tool} aracına ait: {cursor}")
+    return _make_page(handle, block, offset, _page_size(page_size))
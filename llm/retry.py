@@ -0,0 +1,373 @@
+"""Ortak yeniden deneme motoru - Tüm LLM sağlayıcıları için backoff ve devre kesici.
+
+Sağlayıcılar tekrar denemeyi kendi içlerinde özyineleme ve sabit beklemeyle
+yapmak yerine bu modülü kullanır:
+
+- Üstel backoff + tam jitter (eşzamanlı istemcilerin senkron tekrarını önler)
+- ``Retry-After`` / ``retry-after-ms`` başlıklarının ve gövdedeki
+  "retry in Xs" ipuçlarının ayrıştırılması
+- Toplam süre sınırı (deadline): sınırı aşacak bir bekleme yapılmaz
+- Uç nokta başına devre kesici: art arda hatalardan sonra istekler bir süre
+  ağa gitmeden hızlıca reddedilir
+- Anında iptal: beklemeler ``asyncio.sleep`` ile yapıldığından görev iptali
+  bekleme sırasında da hemen etkili olur
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Tekrar denenecek HTTP durum kodları
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+# Devre kesici için hata sayılan durum kodları (429 kota, sunucu arızası değildir)
+FAILURE_STATUS = frozenset({500, 502, 503, 504})
+
+# Devre kesici varsayılanları
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0  # saniye
+
+_RETRY_HINT_PATTERNS = (
+    re.compile(r'"retryDelay"\s*:\s*"([\d.]+)s"', re.IGNORECASE),
+    re.compile(r"retry.{0,10}?([\d.]+)\s*s", re.IGNORECASE),
+)
+
+
+class RetryPolicy:
+    """Yeniden deneme parametreleri.
+
+    Args:
+        max_retries: İlk denemeden sonra yapılacak en fazla tekrar sayısı.
+        base_delay: Backoff taban süresi (saniye).
+        max_delay: Tek bir backoff beklemesinin üst sınırı (saniye).
+        deadline: İlk denemeden itibaren toplam süre sınırı (saniye, None = sınırsız).
+        retry_exceptions: Tekrar denenecek taşıma katmanı istisnaları.
+        retry_status: Tekrar denenecek HTTP durum kodları.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: float | None = 90.0,
+        retry_exceptions: tuple = (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError),
+        retry_status: frozenset = RETRYABLE_STATUS,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_exceptions = retry_exceptions
+        self.retry_status = retry_status
+
+    def backoff(self, attempt: int) -> float:
+        """Tam jitter ile üstel backoff süresi (attempt 0'dan başlar)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Yanıttan sunucunun önerdiği bekleme süresini çıkarır.
+
+    Sırasıyla ``retry-after-ms``, ``Retry-After`` (saniye veya HTTP tarihi)
+    başlıklarına ve gövdedeki "retry in 30s" / "retryDelay" ipuçlarına bakar.
+
+    Returns:
+        Saniye cinsinden bekleme; ipucu yoksa None.
+    """
+    headers = response.headers
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                parsed = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                parsed = None
+            if parsed is not None:
+                return max(0.0, parsed.timestamp() - time.time())
+
+    try:
+        text = response.text
+    except httpx.ResponseNotRead:
+        return None
+    for pattern in _RETRY_HINT_PATTERNS:
+        match = pattern.search(text or "")
+        if match:
+            try:
+                return float(match.group(1))
+            except ValueError:
+                continue
+    return None
+
+
+class CircuitBreaker:
+    """Uç nokta başına basit devre kesici (kapalı / açık / yarı açık).
+
+    ``failure_threshold`` art arda hatadan sonra devre açılır ve
+    ``reset_timeout`` saniye boyunca istekler reddedilir. Süre dolunca tek
+    bir deneme isteğine izin verilir; başarılıysa devre kapanır.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def remaining(self) -> float:
+        """Devrenin yarı açık duruma geçmesine kalan süre (saniye)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self._reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """İstek gönderilebilirse True döndürür."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self._reset_timeout:
+                return False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Sonuçlanmadan biten (ör. iptal edilen) deneme isteğini bırakır."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Uç nokta için paylaşılan devre kesiciyi döndürür."""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            _breakers[endpoint] = breaker
+        return breaker
+
+
+class _Attempts:
+    """Tek bir mantıksal isteğin deneme durumunu tutar."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        policy: RetryPolicy,
+        label: str,
+        limiter: RateLimiter | None = None,
+        tokens: int = 0,
+    ):
+        self.policy = policy
+        self.label = label
+        self.breaker = get_breaker(endpoint)
+        self.limiter = limiter
+        self.tokens = tokens
+        self.attempt = 0
+        self.started = time.monotonic()
+
+    async def pace(self) -> None:
+        """Hız sınırlayıcı varsa bütçe ayırır (her deneme ayrı bir istektir)."""
+        if self.limiter is not None:
+            await self.limiter.acquire(self.tokens)
+
+    def observe(self, response: httpx.Response) -> None:
+        if self.limiter is not None:
+            self.limiter.observe_headers(response.headers)
+
+    def check_circuit(self) -> None:
+        if not self.breaker.allow():
+            raise ConnectionError(
+                f"{self.label} art arda başarısız oldu; "
+                f"{self.breaker.remaining():.0f} saniye sonra tekrar denenecek."
+            )
+
+    def record_status(self, status: int) -> None:
+        if status in FAILURE_STATUS:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def next_delay(self, hint: float | None) -> float | None:
+        """Bir sonraki denemeden önce beklenecek süre; denenmeyecekse None."""
+        if self.attempt >= self.policy.max_retries:
+            return None
+        delay = hint if hint is not None else self.policy.backoff(self.attempt)
+        if self.policy.deadline is not None:
+            elapsed = time.monotonic() - self.started
+            if elapsed + delay > self.policy.deadline:
+                logger.warning(
+                    "%s: %.1f sn bekleme toplam süre sınırını (%.0f sn) aşıyor, tekrar denenmeyecek.",
+                    self.label, delay, self.policy.deadline,
+                )
+                return None
+        self.attempt += 1
+        return delay
+
+    async def sleep(self, delay: float, reason: str) -> None:
+        logger.warning(
+            "%s: %s. %.1f saniye sonra tekrar denenecek (deneme %d/%d)",
+            self.label, reason, delay, self.attempt, self.policy.max_retries,
+        )
+        # asyncio.sleep iptal edilebilir; kullanıcı iptali beklemeyi hemen keser
+        await asyncio.sleep(delay)
+
+
+async def request_with_retry(
+    send: Callable[[], Awaitable[httpx.Response]],
+    *,
+    endpoint: str,
+    label: str,
+    policy: RetryPolicy | None = None,
+    limiter: RateLimiter | None = None,
+    tokens: int = 0,
+) -> httpx.Response:
+    """Tek seferlik (akışsız) isteği yeniden deneme politikasıyla gönderir.
+
+    Args:
+        send: Her denemede çağrılan ve yanıt döndüren coroutine fabrikası.
+        endpoint: Devre kesici anahtarı (genellikle tam URL).
+        label: Log ve hata mesajlarında kullanılacak sağlayıcı adı.
+        policy: Yeniden deneme politikası (varsayılan: DEFAULT_POLICY).
+        limiter: Her denemeden önce bütçe ayrılacak hız sınırlayıcı.
+        tokens: İsteğin tahmini token maliyeti (TPM bütçesi için).
+
+    Returns:
+        Son yanıt. Denemeler tükendiyse tekrar denenebilir durumdaki son
+        yanıt döndürülür; hata mesajını sağlayıcı üretir.
+
+    Raises:
+        ConnectionError: Devre kesici açıksa.
+        httpx.HTTPError: Taşıma hatası denemeler tükendikten sonra sürerse.
+    """
+    attempts = _Attempts(endpoint, policy or DEFAULT_POLICY, label, limiter, tokens)
+    while True:
+        attempts.check_circuit()
+        try:
+            await attempts.pace()
+            response = await send()
+        except attempts.policy.retry_exceptions as exc:
+            attempts.breaker.record_failure()
+            delay = attempts.next_delay(None)
+            if delay is None:
+                raise
+            await attempts.sleep(delay, f"bağlantı hatası ({type(exc).__name__})")
+            continue
+        except BaseException:
+            attempts.breaker.release_probe()
+            raise
+
+        attempts.observe(response)
+        attempts.record_status(response.status_code)
+        if response.status_code not in attempts.policy.retry_status:
+            return response
+        delay = attempts.next_delay(parse_retry_after(response))
+        if delay is None:
+            return response
+        await attempts.sleep(delay, f"HTTP {response.status_code}")
+
+
+@asynccontextmanager
+async def stream_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    label: str,
+    endpoint: str | None = None,
+    policy: RetryPolicy | None = None,
+    limiter: RateLimiter | None = None,
+    tokens: int = 0,
+    **kwargs,
+) -> AsyncIterator[httpx.Response]:
+    """``client.stream`` için yeniden denemeli context manager.
+
+    Yalnızca yanıt başlıkları alınmadan önceki hatalar ve tekrar denenebilir
+    durum kodları yeniden denenir; akış başladıktan sonraki hatalar çağırana
+    iletilir (kısmi çıktının tekrarlanmaması için).
+    """
+    attempts = _Attempts(endpoint or url, policy or DEFAULT_POLICY, label, limiter, tokens)
+    while True:
+        attempts.check_circuit()
+        streaming = False
+        try:
+            await attempts.pace()
+            async with client.stream(method, url, **kwargs) as response:
+                attempts.observe(response)
+                attempts.record_status(response.status_code)
+                delay = None
+                if response.status_code in attempts.policy.retry_status:
+                    await response.aread()
+                    delay = attempts.next_delay(parse_retry_after(response))
+                if delay is None:
+                    streaming = True
+                    yield response
+                    return
+        except attempts.policy.retry_exceptions as exc:
+            if streaming:
+                raise
+            attempts.breaker.record_failure()
+            delay = attempts.next_delay(None)
+            if delay is None:
+                raise
+            await attempts.sleep(delay, f"bağlantı hatası ({type(exc).__name__})")
+            continue
+        except BaseException:
+            if not streaming:
+                attempts.breaker.release_probe()
+            raise
+        await attempts.sleep(delay, f"HTTP {response.status_code}")
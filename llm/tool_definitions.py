@@ -9,20 +9,36 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# preview_sheet varsayılan ve en fazla token bütçesi
+PREVIEW_TOKENS = 1500
+PREVIEW_MAX_TOKENS = 4000
+# find_duplicates vurgulama rengi
+DUPLICATE_HIGHLIGHT_COLOR = "#FFC7CE"
+# Sonuçta aralık listesi olarak verilen en fazla yinelenen satır koşusu
+DUPLICATE_MAX_RANGES = 20
+
 
 TOOLS = [
     {
         "type": "function",
         "function": {
             "name": "read_cell_range",
-            "description": "Belirtilen hücre aralığındaki değerleri okur",
+            "description": "Belirtilen hücre aralığındaki değerleri okur. Büyük aralıklar sayfalı döner; next_cursor doluysa aynı range_name ve cursor ile sonraki sayfayı iste.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "range_name": {
                         "type": "string",
                         "description": "Hücre aralığı (ör: A1:D10, B2, Sheet1.A1:C5)",
-                    }
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Önceki sonucun next_cursor değeri; sonraki sayfayı yeni okuma yapmadan getirir",
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": "Sayfa başına satır/kayıt sayısı (varsayılan 50, en fazla 60)",
+                    },
                 },
                 "required": ["range_name"],
             },
@@ -127,6 +143,52 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "preview_sheet",
+            "description": "Sayfaya ilk bakış için tek çağrıda sabit boyutlu önizleme döndürür: başlıklar, sütun tür ipuçları, ilk/son satırlar ve aradan örnek satırlar (ilk eleman satır numarası). Büyük sayfalarda tahmini aralıkları read_cell_range ile okumak yerine önce bunu kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "range_name": {
+                        "type": "string",
+                        "description": "Önizlenecek aralık. Boş bırakılırsa kullanılan alan.",
+                    },
+                    "has_header": {
+                        "type": "boolean",
+                        "description": "İlk satır başlık mı? (varsayılan: true)",
+                    },
+                    "max_tokens": {
+                        "type": "integer",
+                        "description": f"Önizlemenin yaklaşık token bütçesi (varsayılan {PREVIEW_TOKENS}, en fazla {PREVIEW_MAX_TOKENS})",
+                    },
+                },
+                "required": [],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "profile_table",
+            "description": "Tablonun her sütununun profilini çıkarır: baskın tür, boş oranı, farklı değer sayısı, en küçük/en büyük, ortalama, çeyrekler ve en sık değerler. Formül yazmadan önce sütunları tanımak için kullan. Çok büyük tablolarda bazı değerler tahminidir (approximate).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "range_name": {
+                        "type": "string",
+                        "description": "Tablo aralığı (ör: A1:F5000). Boş bırakılırsa kullanılan alan profillenir.",
+                    },
+                    "has_header": {
+                        "type": "boolean",
+                        "description": "İlk satır başlık mı? (varsayılan: true)",
+                    },
+                },
+                "required": [],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -314,14 +376,22 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "get_all_formulas",
-            "description": "Sayfadaki tüm formülleri listeler. Her formülün adresi, içeriği, hesaplanan değeri ve bağımlı olduğu hücreleri gösterir.",
+            "description": "Sayfadaki tüm formülleri listeler. Her formülün adresi, içeriği, hesaplanan değeri ve bağımlı olduğu hücreleri gösterir. Çok formüllü sayfalarda sayfalı döner; next_cursor ile devam et.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "sheet_name": {
                         "type": "string",
                         "description": "Sayfa adı (boş bırakılırsa aktif sayfa)",
-                    }
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Önceki sonucun next_cursor değeri; sonraki sayfayı yeni okuma yapmadan getirir",
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": "Sayfa başına satır/kayıt sayısı (varsayılan 50, en fazla 60)",
+                    },
                 },
                 "required": [],
             },
@@ -425,6 +495,157 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_duplicates",
+            "description": "Tablodaki yinelenen satırları veya bir anahtarın (ör. müşteri no) benzersiz olup olmadığını tek okumada bulur; yinelenen grupları satır listeleriyle döndürür. highlight=true ile yinelenen satırları tek seferde renklendirir. Yinelenenleri bulmak için EĞERSAY/COUNTIF yardımcı sütunları yazma, bu aracı kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "range_name": {
+                        "type": "string",
+                        "description": "Tablo aralığı (ör: A1:F5000). Boş bırakılırsa kullanılan alan.",
+                    },
+                    "key_columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Karşılaştırılacak anahtar sütunlar (harf veya başlık adı). Boş bırakılırsa tüm satır karşılaştırılır.",
+                    },
+                    "has_header": {
+                        "type": "boolean",
+                        "description": "İlk satır başlık mı? (varsayılan: true)",
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "description": "Metinlerde büyük/küçük harf ve baş/son boşluk farkı yok sayılsın mı? (varsayılan: false)",
+                    },
+                    "highlight": {
+                        "type": "boolean",
+                        "description": "Yinelenen satırların arka planı renklendirilsin mi? (varsayılan: false)",
+                    },
+                    "color": {
+                        "type": "string",
+                        "description": f"Vurgulama rengi (varsayılan: {DUPLICATE_HIGHLIGHT_COLOR})",
+                    },
+                },
+                "required": [],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "join_ranges",
+            "description": "Kaynak tabloya başka bir tablodan anahtar eşleştirerek sütun getirir (DÜŞEYARA/VLOOKUP yerine). İki tablo tek seferde okunur, eşleştirme bellekte yapılır ve sonuç tek yazımla eklenir. Çok satırlı aramalar için hücre hücre DÜŞEYARA formülü yazma, bu aracı kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "source_range": {
+                        "type": "string",
+                        "description": "Kaynak tablo aralığı (ör: A1:D50000)",
+                    },
+                    "source_key": {
+                        "type": "string",
+                        "description": "Kaynak tablodaki anahtar sütun (harf veya başlık adı)",
+                    },
+                    "lookup_range": {
+                        "type": "string",
+                        "description": "Arama tablosu aralığı (ör: A1:C800)",
+                    },
+                    "lookup_key": {
+                        "type": "string",
+                        "description": "Arama tablosundaki anahtar sütun (harf veya başlık adı)",
+                    },
+                    "return_columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Getirilecek arama tablosu sütunları (harf veya başlık adı). Boş bırakılırsa anahtar dışındaki tüm sütunlar.",
+                    },
+                    "target_cell": {
+                        "type": "string",
+                        "description": "Sonucun yazılacağı sol üst hücre. Boş bırakılırsa kaynak tablonun hemen sağı.",
+                    },
+                    "lookup_sheet": {
+                        "type": "string",
+                        "description": "Arama tablosunun bulunduğu sayfa (boş bırakılırsa aktif sayfa)",
+                    },
+                    "has_header": {
+                        "type": "boolean",
+                        "description": "Tabloların ilk satırı başlık mı? (varsayılan: true)",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["values", "formula"],
+                        "description": "values: statik değerler (varsayılan); formula: her sütun için tek bir dizi formülü, kaynak değişince güncellenir",
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "description": "Metin anahtarlarında büyük/küçük harf farkı yok sayılsın mı? (varsayılan: false)",
+                    },
+                    "default": {
+                        "type": "string",
+                        "description": "Eşleşmeyen satırlara yazılacak değer (varsayılan: boş)",
+                    },
+                },
+                "required": ["source_range", "source_key", "lookup_range", "lookup_key"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "group_aggregate",
+            "description": "Tabloyu bir veya daha fazla sütuna göre gruplayıp toplam, adet, ortalama, min, maks veya farklı değer sayısı içeren özet tablosu oluşturur (ör. bölge ve aya göre satış toplamı). Tablo tek seferde okunur, hesaplama bellekte yapılır ve özet tek yazımla eklenir. Gruplu özetler için ETOPLA/SUMIFS formül ızgarası yazma, bu aracı kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "source_range": {
+                        "type": "string",
+                        "description": "Kaynak tablo aralığı (ör: A1:F200000)",
+                    },
+                    "group_by": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Gruplanacak sütunlar (harf veya başlık adı), ör: [\"Bölge\", \"Ay\"]",
+                    },
+                    "aggregations": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "column": {
+                                    "type": "string",
+                                    "description": "Toplanacak sütun (harf veya başlık adı)",
+                                },
+                                "func": {
+                                    "type": "string",
+                                    "enum": ["sum", "count", "mean", "min", "max", "distinct"],
+                                    "description": "sum: toplam, count: dolu hücre sayısı, mean: ortalama, min/max, distinct: farklı değer sayısı",
+                                },
+                            },
+                            "required": ["column", "func"],
+                        },
+                        "description": "Hesaplanacak toplamalar, ör: [{\"column\": \"Tutar\", \"func\": \"sum\"}]",
+                    },
+                    "target_cell": {
+                        "type": "string",
+                        "description": "Özetin yazılacağı sol üst hücre. Boş bırakılırsa kaynak tablonun bir sütun sağı.",
+                    },
+                    "has_header": {
+                        "type": "boolean",
+                        "description": "Kaynağın ilk satırı başlık mı? (varsayılan: true)",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["values", "pivot"],
+                        "description": "values: statik özet tablosu (varsayılan); pivot: yerel pivot tablo (DataPilot) oluşturur, distinct desteklenmez",
+                    },
+                },
+                "required": ["source_range", "group_by", "aggregations"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -658,10 +879,109 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "fetch_tool_result",
+            "description": "Kısaltılmış (continuation içeren) bir araç sonucunun atlanan satırlarını getirir. Sonuçtaki handle ve offset değerlerini kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "handle": {
+                        "type": "string",
+                        "description": "Sonuçtaki continuation.handle değeri (ör: r1)",
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Başlangıç satır/kayıt sırası (0 tabanlı)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Getirilecek satır/kayıt sayısı (en fazla 60)",
+                    },
+                },
+                "required": ["handle"],
+            },
+        },
+    },
 ]
 
+# Sayfayı değiştirmeyen araçlar; akış sürerken erken yürütülebilir
+READ_ONLY_TOOLS = frozenset({
+    "read_cell_range",
+    "get_sheet_summary",
+    "preview_sheet",
+    "profile_table",
+    "get_column_statistics",
+    "detect_and_explain_errors",
+    "get_all_formulas",
+    "analyze_spreadsheet_structure",
+    "get_cell_details",
+    "get_cell_precedents",
+    "get_cell_dependents",
+    "list_sheets",
+    "fetch_tool_result",
+})
+
+# Plan modu aracı; yalnızca llm_plan_mode açıkken araç listesine eklenir
+PLAN_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "execute_plan",
+        "description": (
+            "Çok adımlı bir işlemin tüm araç çağrılarını tek seferde gönderir; adımlar "
+            "yerelde tek bir düzenleme oturumunda sırayla yürütülür. Bir adım önceki "
+            "adımın sonucuna argümanda ${adım_id} veya ${adım_id.alan} yazarak başvurabilir."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "description": "Yürütülecek adımlar",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {
+                                "type": "string",
+                                "description": "Adım kimliği (ör: s1)",
+                            },
+                            "tool": {
+                                "type": "string",
+                                "description": "Çağrılacak araç adı",
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Araç argümanları",
+                            },
+                            "depends_on": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Önce tamamlanması gereken adım kimlikleri",
+                            },
+                            "inspect": {
+                                "type": "boolean",
+                                "description": "Sonucu görüp devam etmen gerekiyorsa true; plan bitince sonuç sana döner",
+                            },
+                        },
+                        "required": ["id", "tool", "arguments"],
+                    },
+                },
+                "summary": {
+                    "type": "string",
+                    "description": "Plan başarıyla bittiğinde kullanıcıya gösterilecek kısa açıklama",
+                },
+            },
+            "required": ["steps"],
+        },
+    },
+}
+
 
 from core.uno_bridge import LibreOfficeBridge
+from .context_budget import get_estimator
+from .plan_executor import PLAN_TOOL_NAME, PlanExecutor
+from .result_compaction import ResultStore, compact_for_tool, fetch_slice, first_page, next_page
 
 
 class ToolDispatcher:
@@ -685,12 +1005,17 @@ class ToolDispatcher:
         self._sheet_analyzer = sheet_analyzer
         self._error_detector = error_detector
         self._change_logger = change_logger
+        self._result_store = ResultStore()
 
         self._dispatch_map = {
             "read_cell_range": self._read_cell_range,
             "write_formula": self._write_formula,
             "set_cell_style": self._set_cell_style,
             "get_sheet_summary": self._get_sheet_summary,
+            "preview_sheet": self._preview_sheet,
+            "profile_table": self._profile_table,
+            # Şeması yok; yalnızca hızlı komutlar ("B sütununu topla") kullanır
+            "get_column_statistics": self._get_column_statistics,
             "detect_and_explain_errors": self._detect_and_explain_errors,
             "merge_cells": self._merge_cells,
             "set_column_width": self._set_column_width,
@@ -707,6 +1032,9 @@ class ToolDispatcher:
             "get_cell_dependents": self._get_cell_dependents,
             # Yeni Claude Excel özellikleri
             "sort_range": self._sort_range,
+            "find_duplicates": self._find_duplicates,
+            "join_ranges": self._join_ranges,
+            "group_aggregate": self._group_aggregate,
             "set_auto_filter": self._set_auto_filter,
             "set_conditional_format": self._set_conditional_format,
             "set_data_validation": self._set_data_validation,
@@ -717,12 +1045,35 @@ class ToolDispatcher:
             "copy_range": self._copy_range,
             "create_chart": self._create_chart,
             "clear_range": self._clear_range,
+            "fetch_tool_result": self._fetch_tool_result,
+            PLAN_TOOL_NAME: self._execute_plan,
         }
 
-    def _log_change(self, summary: str, cells: list | None = None, undoable: bool = True, partial: bool = False):
+    def _log_change(self, summary: str, cells: list | None = None, undoable: bool = True,
+                    partial: bool = False, range_name: str | None = None):
+        # Yazma sonrası saklanan bloklar/imleçler bayatlar
+        self._result_store.clear()
+        self._invalidate_fingerprints(range_name)
         if self._change_logger:
             self._change_logger(summary, cells=cells, undoable=undoable, partial=partial)
 
+    def _invalidate_fingerprints(self, range_name: str | None) -> None:
+        """Değişen aralığın karo özetlerini geçersiz kılar; aralık bilinmiyorsa tümünü."""
+        bridge = getattr(self._cell_inspector, "bridge", None)
+        if bridge is None:
+            return
+        fingerprints = bridge.fingerprints
+        if not range_name:
+            fingerprints.invalidate()
+            return
+        try:
+            start, end = LibreOfficeBridge.parse_range_string(range_name)
+            sheet_name = bridge.get_active_sheet().getName()
+        except Exception:
+            fingerprints.invalidate()
+            return
+        fingerprints.invalidate(sheet_name, start[1], end[1], start[0], end[0])
+
     def _snapshot_range(self, range_name: str, max_cells: int = 500) -> tuple[list | None, bool]:
         """Range için hücre snapshot alır."""
         if ":" in range_name:
@@ -775,6 +1126,9 @@ class ToolDispatcher:
 
         try:
             result = handler(arguments)
+            if tool_name != "fetch_tool_result":
+                # Tablo/liste sonuçları kompakt kodlanır, uzunlar kesilip saklanır
+                result = compact_for_tool(tool_name, result, self._result_store)
             return json.dumps({"result": result}, ensure_ascii=False, default=str)
         except Exception as exc:
             logger.exception("Araç çalıştırma hatası (%s): %s", tool_name, exc)
@@ -788,15 +1142,19 @@ class ToolDispatcher:
             )
 
     def _read_cell_range(self, args: dict):
-        """Hücre aralığını okur."""
-        return self._cell_inspector.read_range(args["range_name"])
+        """Hücre aralığını okur; büyük aralıkları sayfalar."""
+        page_size = args.get("page_size")
+        if args.get("cursor"):
+            return next_page("read_cell_range", args["cursor"], self._result_store, page_size)
+        block = self._cell_inspector.read_range(args["range_name"])
+        return first_page("read_cell_range", block, self._result_store, page_size)
 
     def _write_formula(self, args: dict):
         """Hücreye formül veya değer yazar."""
         cell = args["cell"]
         cells, _too_large = self._snapshot_range(cell, max_cells=1)
         result = self._cell_manipulator.write_formula(cell, args["formula"])
-        self._log_change(f"Hücre yazıldı: {cell}", cells=cells, undoable=True, partial=False)
+        self._log_change(f"Hücre yazıldı: {cell}", cells=cells, undoable=True, partial=False, range_name=cell)
         return result
 
     def _set_cell_style(self, args: dict):
@@ -830,9 +1188,9 @@ class ToolDispatcher:
                 self._cell_manipulator.set_number_format(range_name, number_format)
 
         if too_large:
-            self._log_change(f"Stil uygulandı: {range_name}", cells=None, undoable=False, partial=True)
+            self._log_change(f"Stil uygulandı: {range_name}", cells=None, undoable=False, partial=True, range_name=range_name)
         else:
-            self._log_change(f"Stil uygulandı: {range_name}", cells=cells, undoable=True, partial=True)
+            self._log_change(f"Stil uygulandı: {range_name}", cells=cells, undoable=True, partial=True, range_name=range_name)
         return result
 
     @staticmethod
@@ -856,6 +1214,26 @@ class ToolDispatcher:
         # SheetAnalyzer şu an sadece aktif sayfa özetini döndürüyor.
         return self._sheet_analyzer.get_sheet_summary()
 
+    def _preview_sheet(self, args: dict):
+        """Sayfanın token bütçeli önizlemesini döndürür."""
+        tokens = min(int(args.get("max_tokens") or PREVIEW_TOKENS), PREVIEW_MAX_TOKENS)
+        return self._sheet_analyzer.preview_sheet(
+            args.get("range_name") or None,
+            has_header=args.get("has_header", True),
+            max_chars=int(tokens * get_estimator("").chars_per_token),
+        )
+
+    def _profile_table(self, args: dict):
+        """Tablo sütunlarının profilini çıkarır."""
+        return self._sheet_analyzer.profile_table(
+            args.get("range_name") or None,
+            has_header=args.get("has_header", True),
+        )
+
+    def _get_column_statistics(self, args: dict):
+        """Sütunun sayısal istatistiklerini (toplam, ortalama vb.) döndürür."""
+        return self._sheet_analyzer.get_column_statistics(args["col_letter"])
+
     def _detect_and_explain_errors(self, args: dict):
         """Hataları tespit eder ve açıklar."""
         range_name = args.get("range_name")
@@ -866,7 +1244,7 @@ class ToolDispatcher:
         range_name = args.get("range_name")
         center = args.get("center", True)
         self._cell_manipulator.merge_cells(range_name, center)
-        self._log_change(f"Hücreler birleştirildi: {range_name}", cells=None, undoable=False)
+        self._log_change(f"Hücreler birleştirildi: {range_name}", cells=None, undoable=False, range_name=range_name)
         return f"{range_name} aralığı birleştirildi."
 
     def _set_column_width(self, args: dict):
@@ -925,8 +1303,12 @@ class ToolDispatcher:
 
     def _get_all_formulas(self, args: dict):
         """Sayfadaki tüm formülleri listeler."""
+        page_size = args.get("page_size")
+        if args.get("cursor"):
+            return next_page("get_all_formulas", args["cursor"], self._result_store, page_size)
         sheet_name = args.get("sheet_name")
-        return self._cell_inspector.get_all_formulas(sheet_name)
+        block = self._cell_inspector.get_all_formulas(sheet_name)
+        return first_page("get_all_formulas", block, self._result_store, page_size)
 
     def _analyze_spreadsheet_structure(self, args: dict):
         """Tablonun yapısını analiz eder."""
@@ -955,7 +1337,65 @@ class ToolDispatcher:
             args.get("ascending", True),
             args.get("has_header", True),
         )
-        self._log_change(f"Aralık sıralandı: {args['range_name']}", cells=None, undoable=False)
+        self._log_change(f"Aralık sıralandı: {args['range_name']}", cells=None, undoable=False, range_name=args["range_name"])
+        return result
+
+    def _find_duplicates(self, args: dict):
+        """Yinelenen satırları bulur; istenirse tek seferde vurgular."""
+        result = self._sheet_analyzer.find_duplicates(
+            args.get("range_name") or None,
+            key_columns=args.get("key_columns") or None,
+            has_header=args.get("has_header", True),
+            ignore_case=args.get("ignore_case", False),
+        )
+        ranges = result.pop("duplicate_ranges", [])
+        if args.get("highlight") and ranges:
+            color = self._parse_color(args.get("color") or DUPLICATE_HIGHLIGHT_COLOR)
+            self._cell_manipulator.set_ranges_style(ranges, bg_color=color)
+            self._log_change(
+                f"Yinelenen satırlar vurgulandı: {result['range']}",
+                cells=None, undoable=False, partial=True, range_name=result["range"],
+            )
+            result["highlighted_ranges"] = len(ranges)
+        if ranges and len(ranges) <= DUPLICATE_MAX_RANGES:
+            result["duplicate_ranges"] = ";".join(ranges)
+        return result
+
+    def _join_ranges(self, args: dict):
+        """Arama tablosundan sütunları karma birleştirmesiyle getirir."""
+        result = self._cell_manipulator.join_ranges(
+            args["source_range"],
+            args["source_key"],
+            args["lookup_range"],
+            args["lookup_key"],
+            return_columns=args.get("return_columns") or None,
+            target_cell=args.get("target_cell") or None,
+            lookup_sheet=args.get("lookup_sheet") or None,
+            has_header=args.get("has_header", True),
+            mode=args.get("mode") or "values",
+            ignore_case=args.get("ignore_case", False),
+            default=args.get("default", ""),
+        )
+        self._log_change(
+            f"Birleştirme yazıldı: {result['target']}",
+            cells=None, undoable=False, partial=False, range_name=result["target"],
+        )
+        return result
+
+    def _group_aggregate(self, args: dict):
+        """Gruplara göre özet tablosu veya pivot tablo oluşturur."""
+        result = self._cell_manipulator.group_aggregate(
+            args["source_range"],
+            args["group_by"],
+            args["aggregations"],
+            target_cell=args.get("target_cell") or None,
+            has_header=args.get("has_header", True),
+            mode=args.get("mode") or "values",
+        )
+        self._log_change(
+            f"Özet yazıldı: {result['target']}",
+            cells=None, undoable=False, partial=False, range_name=result["target"],
+        )
         return result
 
     def _set_auto_filter(self, args: dict):
@@ -964,7 +1404,7 @@ class ToolDispatcher:
             args["range_name"],
             args.get("enable", True),
         )
-        self._log_change(f"AutoFilter: {args['range_name']}", cells=None, undoable=False)
+        self._log_change(f"AutoFilter: {args['range_name']}", cells=None, undoable=False, range_name=args["range_name"])
         return result
 
     def _set_conditional_format(self, args: dict):
@@ -977,7 +1417,7 @@ class ToolDispatcher:
             args.get("value2"),
             args.get("color"),
         )
-        self._log_change(f"Koşullu biçim: {args['range_name']}", cells=None, undoable=False)
+        self._log_change(f"Koşullu biçim: {args['range_name']}", cells=None, undoable=False, range_name=args["range_name"])
         return result
 
     def _set_data_validation(self, args: dict):
@@ -988,7 +1428,7 @@ class ToolDispatcher:
             args["values"],
             args.get("error_message"),
         )
-        self._log_change(f"Veri doğrulama: {args['range_name']}", cells=None, undoable=False)
+        self._log_change(f"Veri doğrulama: {args['range_name']}", cells=None, undoable=False, range_name=args["range_name"])
         return result
 
     def _list_sheets(self, args: dict):
@@ -1043,5 +1483,20 @@ class ToolDispatcher:
     def _clear_range(self, args: dict):
         """Aralığı temizler."""
         self._cell_manipulator.clear_range(args["range_name"])
-        self._log_change(f"Temizlendi: {args['range_name']}", cells=None, undoable=False)
+        self._log_change(f"Temizlendi: {args['range_name']}", cells=None, undoable=False, range_name=args["range_name"])
         return f"{args['range_name']} aralığı temizlendi."
+
+    def _fetch_tool_result(self, args: dict):
+        """Kesilmiş bir araç sonucunun devamını döndürür."""
+        return fetch_slice(
+            self._result_store,
+            args["handle"],
+            offset=args.get("offset", 0),
+            limit=args.get("limit", 60),
+        )
+
+    def _execute_plan(self, args: dict):
+        """Plan adımlarını tek bir toplu düzenleme oturumunda yürütür."""
+        bridge = getattr(self._cell_manipulator, "bridge", None)
+        executor = PlanExecutor(self, bridge)
+        return executor.run(args.get("steps") or [], args.get("summary", ""))
@@ -0,0 +1,241 @@
+"""Araç yönlendirici - Her kullanıcı isteği için ilgili araç alt kümesini seçer.
+
+``TOOLS`` listesindeki ~30 ayrıntılı JSON şeması her istekte gönderildiğinde
+binlerce istem token'ı harcanır. ``ToolRouter`` son kullanıcı mesajındaki
+anahtar kelimelere (TR/EN) göre araç gruplarını seçer; çekirdek okuma/yazma
+araçları her zaman eklenir. Belirsiz isteklerde veya model sunulmayan bir
+aracı çağırdığında aynı tur için tam listeye geri dönülür.
+"""
+
+import json
+import logging
+import re
+
+from config.settings import Settings
+from .context_budget import get_estimator
+from .prompt_cache import strip_dynamic_context
+
+logger = logging.getLogger(__name__)
+
+# Her istekte gönderilen çekirdek araçlar
+CORE_TOOLS = (
+    "read_cell_range",
+    "get_sheet_summary",
+    "preview_sheet",
+    "write_formula",
+    "fetch_tool_result",
+)
+
+# Grup adı -> (anahtar kelimeler, araçlar). Anahtar kelimeler küçük harfle,
+# kelime başında önek olarak aranır (Türkçe ekler: "tablo" -> "tabloyu");
+# bir kelime birden fazla grupta yer alabilir.
+TOOL_GROUPS = {
+    "write": (
+        (
+            "yaz", "write", "temizle", "clear", "sil", "kopyala", "copy",
+            "taşı", "tasi", "move", "doldur", "fill", "hesap", "calculate",
+            "tablo", "table", "şablon", "sablon", "template", "oluştur",
+            "olustur", "create", "topla", "sum", "ortalama", "average",
+        ),
+        ("clear_range", "copy_range", "get_cell_details"),
+    ),
+    "style": (
+        (
+            "renk", "color", "colour", "biçim", "bicim", "format", "kalın",
+            "kalin", "bold", "italik", "italic", "yazı tipi", "font", "hizala",
+            "align", "kenarlık", "kenarlik", "border", "genişlik", "genislik",
+            "width", "yükseklik", "yukseklik", "height", "birleştir",
+            "birlestir", "merge", "koşullu", "kosullu", "conditional",
+            "vurgula", "highlight", "tablo", "table", "başlık", "baslik",
+            "header", "düzenle", "duzenle", "güzel", "guzel",
+        ),
+        (
+            "set_cell_style", "merge_cells", "set_column_width", "set_row_height",
+            "auto_fit_column", "set_conditional_format",
+        ),
+    ),
+    "structure": (
+        (
+            "satır", "satir", "row", "sütun", "sutun", "column", "ekle",
+            "insert", "sil", "delete", "kaldır", "kaldir", "remove",
+        ),
+        ("insert_rows", "insert_columns", "delete_rows", "delete_columns"),
+    ),
+    "analysis": (
+        (
+            "formül", "formul", "formula", "hata", "error", "#", "analiz",
+            "analy", "bağımlı", "bagimli", "depend", "precedent", "yapı",
+            "yapi", "structure", "kontrol", "check", "denetle", "audit",
+            "açıkla", "acikla", "explain", "neden", "why", "nasıl", "nasil",
+            "how", "hidrolik", "manning", "dsi", "profil", "profile",
+            "istatistik", "statistic", "dağılım", "dagilim", "distribution",
+            "benzersiz", "distinct", "unique",
+        ),
+        (
+            "profile_table", "get_all_formulas", "analyze_spreadsheet_structure", "get_cell_details",
+            "get_cell_precedents", "get_cell_dependents", "detect_and_explain_errors",
+        ),
+    ),
+    "data": (
+        (
+            "sırala", "sirala", "sort", "filtre", "filter", "doğrulama",
+            "dogrulama", "validation", "açılır", "acilir", "dropdown",
+            "liste", "list", "yinelen", "tekrar eden", "tekrarlanan",
+            "mükerrer", "mukerrer", "duplicate", "benzersiz", "unique",
+            "düşeyara", "duseyara", "vlookup", "lookup", "eşleştir", "eslestir",
+            "birleştir", "birlestir", "join", "getir", "grupla", "group",
+            "pivot", "özet tablo", "ozet tablo", "topla", "aggregate",
+            "etopla", "sumif",
+        ),
+        (
+            "sort_range", "find_duplicates", "join_ranges", "group_aggregate",
+            "set_auto_filter", "set_data_validation",
+        ),
+    ),
+    "sheets": (
+        ("sayfa", "sheet", "sekme", "tab"),
+        ("list_sheets", "switch_sheet", "create_sheet", "rename_sheet"),
+    ),
+    "chart": (
+        ("grafik", "chart", "diyagram", "diagram", "plot", "görselleştir", "gorsellestir"),
+        ("create_chart",),
+    ),
+}
+
+# Calc eylemi gerektiren (tool_choice="required" zorlanan) istek kelimeleri
+ACTION_KEYWORDS = (
+    "tablo", "hesap", "hesapla", "formül", "formul", "uygulama",
+    "şablon", "sablon", "sütun", "sutun", "satır", "satir",
+    "birleştir", "birlestir", "renk", "biçim", "bicim", "format",
+    "düzenle", "duzenle", "başlık", "baslik", "hücre", "hucre",
+    "calc", "sayfa", "manning", "hidrolik", "dsi",
+    "oluştur", "olustur", "ekle", "yaz",
+)
+
+
+# Önek olarak başka kelimeleri yakalayan kısa anahtar kelimeler yalnızca tam
+# kelime (veya İngilizce çoğul -s) olarak eşleşir: "tab" "tablo"yu, "sum"
+# "summary"yi, "nasıl" "nasılsın"ı yakalamaz.
+EXACT_KEYWORDS = frozenset({"tab", "row", "how", "why", "sum", "list", "nasıl", "nasil"})
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Anahtar kelimeleri kelime başında eşleşen tek bir düzenli ifadeye derler."""
+    parts = []
+    for keyword in keywords:
+        part = re.escape(keyword)
+        if keyword in EXACT_KEYWORDS:
+            part += r"s?\b"
+        parts.append(part)
+    return re.compile(r"(?<!\w)(?:" + "|".join(parts) + ")")
+
+
+_GROUP_PATTERNS = [
+    (_keyword_pattern(keywords), names) for keywords, names in TOOL_GROUPS.values()
+]
+_ACTION_PATTERN = _keyword_pattern(ACTION_KEYWORDS)
+
+
+def _current_turn(messages: list[dict]) -> tuple[str, list[dict]]:
+    """Son kullanıcı mesajının metnini ve ondan sonraki mesajları döndürür.
+
+    Mesaja eklenmiş dinamik sayfa bağlamı metinden çıkarılır.
+    """
+    for i in range(len(messages) - 1, -1, -1):
+        msg = messages[i]
+        if msg.get("role") == "user":
+            return strip_dynamic_context(msg.get("content") or "").lower(), messages[i + 1:]
+    return "", []
+
+
+def needs_tools(messages: list[dict]) -> bool:
+    """Son kullanıcı isteği Calc eylemi gerektiriyorsa True döndürür."""
+    text, _rest = _current_turn(messages)
+    if not text:
+        return False
+    return _ACTION_PATTERN.search(text) is not None
+
+
+class ToolRouter:
+    """Kullanıcı isteğine göre gönderilecek araç şemalarını seçer."""
+
+    def __init__(self, tools: list[dict], provider: str = ""):
+        """Yönlendiriciyi tam araç listesiyle başlatır.
+
+        Args:
+            tools: Tam araç listesi (``TOOLS``).
+            provider: Token tahmini için sağlayıcı adı.
+        """
+        self._tools = tools
+        self._names = [t["function"]["name"] for t in tools]
+        self._estimator = get_estimator(provider)
+        self._full_tokens = self._estimate(tools)
+
+    def _estimate(self, tools: list[dict]) -> int:
+        return self._estimator.estimate_text(json.dumps(tools, ensure_ascii=False))
+
+    def select_names(self, messages: list[dict]) -> set[str] | None:
+        """İlgili araç adlarını seçer.
+
+        Returns:
+            Araç adları kümesi; tam liste gönderilmeliyse None.
+        """
+        text, turn = _current_turn(messages)
+        if not text:
+            return None
+
+        selected = set(CORE_TOOLS)
+        matched = False
+        for pattern, names in _GROUP_PATTERNS:
+            if pattern.search(text):
+                selected.update(names)
+                matched = True
+        if not matched:
+            # Belirsiz istek: modeli kısıtlamamak için tam liste
+            return None
+
+        # Bu turda sunulmayan bir araç çağrıldıysa veya bilinmeyen araç
+        # hatası alındıysa turun geri kalanında tam listeye dön. Listede
+        # olmayan araçlar (ör. execute_plan) yönlendirmenin dışındadır.
+        for msg in turn:
+            for tc in msg.get("tool_calls") or []:
+                name = (tc.get("function") or {}).get("name", "")
+                if name in self._names and name not in selected:
+                    return None
+            if msg.get("role") == "tool" and "Bilinmeyen araç" in (msg.get("content") or ""):
+                return None
+        return selected
+
+    def select(self, messages: list[dict]) -> tuple[list[dict], dict]:
+        """İstek için araç listesini ve tasarruf raporunu döndürür.
+
+        Args:
+            messages: Sistem mesajı hariç sohbet geçmişi.
+
+        Returns:
+            (araçlar, rapor) ikilisi. Rapor "offered", "total",
+            "saved_tokens" ve "fallback" alanlarını içerir.
+        """
+        names = None
+        if Settings().get("llm_tool_routing_enabled", True):
+            names = self.select_names(messages)
+
+        if names is None:
+            tools = self._tools
+            saved = 0
+        else:
+            # TOOLS sırası korunur; aynı alt küme her seferinde aynı baytları üretir
+            tools = [t for t, name in zip(self._tools, self._names) if name in names]
+            saved = self._full_tokens - self._estimate(tools)
+
+        report = {
+            "offered": len(tools),
+            "total": len(self._tools),
+            "saved_tokens": saved,
+            "fallback": names is None,
+        }
+        logger.debug(
+            "Araç yönlendirme: %d/%d araç, ~%d token tasarruf",
+            report["offered"], report["total"], saved,
+        )
+        return tools, report
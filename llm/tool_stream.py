@@ -0,0 +1,163 @@
+"""Akış araç çağrıları - Argüman parçalarını artımlı birleştirir ve tamamlananları bildirir.
+
+Sağlayıcılar araç çağrılarını indeksli parçalar halinde akıtır; argüman JSON'u
+birçok parçaya bölünür. ``IncrementalJSONParser`` gelen parçaları tek geçişte
+tarayarak üst düzey JSON değerinin kapandığı anı tespit eder.
+``ToolCallAssembler`` çağrıları bu parçalardan birleştirir ve akış sürerken
+sırası gelen tamamlanmış çağrıyı (``next_ready``) verir; böylece ilk çağrı,
+diğerleri hâlâ akarken çalıştırılabilir.
+"""
+
+import json
+
+
+class IncrementalJSONParser:
+    """Parça parça gelen JSON metninin tamamlanıp tamamlanmadığını izler.
+
+    Yalnızca ayraç derinliği ve dize durumu tutulur; her karakter bir kez
+    taranır. Tamamlandığında metin ``json.loads`` ile doğrulanır.
+    """
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._value = None
+        self.complete = False
+
+    def feed(self, text: str) -> bool:
+        """Yeni parçayı ekler.
+
+        Returns:
+            Üst düzey JSON değeri bu parçayla (veya daha önce) kapandıysa True.
+        """
+        if not text:
+            return self.complete
+        self._parts.append(text)
+        if self.complete:
+            return True
+        for ch in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                self._started = True
+            elif ch in "}]":
+                self._depth -= 1
+                if self._started and self._depth == 0:
+                    self.complete = True
+                    break
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def value(self):
+        """Tamamlanan JSON değerini döndürür; geçersizse None."""
+        if not self.complete:
+            return None
+        if self._value is None:
+            try:
+                self._value = json.loads(self.text)
+            except json.JSONDecodeError:
+                return None
+        return self._value
+
+
+class ToolCallAssembler:
+    """Akış parçalarından araç çağrılarını birleştirir.
+
+    İndeksli parçalar (OpenAI/OpenRouter/Groq/Gemini) birleştirilir; indekssiz
+    tam çağrılar (Ollama) olduğu gibi eklenir. Çağrılar sırayla yürütülmek
+    üzere ``next_ready`` / ``mark_executed`` ile tüketilir: sıradaki çağrı
+    tamamlanmadan sonrakiler verilmez, böylece yazma/okuma sırası korunur.
+    """
+
+    def __init__(self):
+        self._indexed: dict[int, dict] = {}
+        self._parsers: dict[int, IncrementalJSONParser] = {}
+        self._full: list[dict] = []
+        self._executed = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._indexed or self._full)
+
+    def feed(self, tool_calls: list) -> None:
+        """Akıştan gelen tool_call parçalarını işler."""
+        for tc in tool_calls:
+            index = tc.get("index")
+            if index is None:
+                if "function" in tc:
+                    self._full.append(self._normalize_full(tc))
+                continue
+
+            existing = self._indexed.setdefault(index, {
+                "id": tc.get("id", ""),
+                "type": tc.get("type", "function"),
+                "function": {"name": "", "arguments": ""},
+            })
+            parser = self._parsers.setdefault(index, IncrementalJSONParser())
+
+            if "id" in tc and tc["id"]:
+                existing["id"] = tc["id"]
+            if "type" in tc and tc["type"]:
+                existing["type"] = tc["type"]
+
+            func = tc.get("function", {})
+            if "name" in func and func["name"]:
+                existing["function"]["name"] = func["name"]
+            arguments = func.get("arguments")
+            if isinstance(arguments, dict):
+                arguments = json.dumps(arguments, ensure_ascii=False)
+            if arguments:
+                existing["function"]["arguments"] += arguments
+                parser.feed(arguments)
+
+    @staticmethod
+    def _normalize_full(tc: dict) -> dict:
+        """Argümanları sözlük olarak gelen tam çağrıyı JSON metnine çevirir."""
+        func = tc.get("function") or {}
+        arguments = func.get("arguments")
+        if isinstance(arguments, dict):
+            tc = dict(tc, function=dict(func, arguments=json.dumps(arguments, ensure_ascii=False)))
+        return tc
+
+    def calls(self) -> list[dict]:
+        """Birleştirilmiş çağrıları sırayla döndürür."""
+        ordered = [self._indexed[idx] for idx in sorted(self._indexed)]
+        return ordered + self._full
+
+    def _is_complete(self, position: int) -> bool:
+        indexes = sorted(self._indexed)
+        if position >= len(indexes):
+            return True  # tam çağrılar
+        index = indexes[position]
+        call = self._indexed[index]
+        if not call["function"]["name"]:
+            return False
+        return self._parsers[index].value() is not None
+
+    def next_ready(self) -> tuple[int, dict] | None:
+        """Sırası gelen ve argümanları tamamlanmış çağrıyı döndürür.
+
+        Returns:
+            (sıra, çağrı) ikilisi; sıradaki çağrı henüz tamamlanmadıysa None.
+        """
+        calls = self.calls()
+        if self._executed >= len(calls) or not self._is_complete(self._executed):
+            return None
+        return self._executed, calls[self._executed]
+
+    def mark_executed(self) -> None:
+        """``next_ready`` ile alınan çağrının yürütüldüğünü işaretler."""
+        self._executed += 1
@@ -29,6 +29,9 @@ setup(
             "pytest>=7.0",
             "pytest-mock>=3.0",
         ],
+        "http2": [
+            "h2>=4.0",
+        ],
         "speech": [
             "SpeechRecognition>=3.10",
             "vosk>=0.3.45",
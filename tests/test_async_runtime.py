@@ -0,0 +1,89 @@
+"""Unit tests for llm.async_runtime and the Qt stream task."""
+
+import asyncio
+import threading
+
+import pytest
+
+from llm.async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime()
+    yield runtime
+    runtime.stop()
+
+
+def test_run_executes_on_one_loop_thread(runtime):
+    async def _thread_name():
+        return threading.current_thread().name
+
+    assert runtime.run(_thread_name()) == "llm-asyncio"
+    assert runtime.loop is runtime.loop
+
+
+def test_concurrent_coroutines_overlap(runtime):
+    async def _both():
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(asyncio.sleep(0.2), asyncio.sleep(0.2))
+        return asyncio.get_running_loop().time() - started
+
+    assert runtime.run(_both()) < 0.35
+
+
+def test_run_from_the_loop_thread_is_rejected(runtime):
+    async def _nested():
+        inner = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            runtime.run(inner)
+
+    runtime.run(_nested())
+
+
+def test_iterate_propagates_items_and_errors(runtime):
+    async def _parts():
+        yield 1
+        yield 2
+        raise ValueError("akış koptu")
+
+    received = []
+    with pytest.raises(ValueError):
+        for item in runtime.iterate(_parts()):
+            received.append(item)
+    assert received == [1, 2]
+
+
+def test_closing_the_iterator_cancels_the_stream(runtime):
+    closed = threading.Event()
+
+    async def _endless():
+        try:
+            while True:
+                yield "parça"
+                await asyncio.sleep(0.01)
+        finally:
+            closed.set()
+
+    iterator = runtime.iterate(_endless())
+    assert next(iterator) == "parça"
+    iterator.close()
+    assert closed.wait(2.0)
+
+
+def test_stream_task_emits_chunks_and_closes_the_stream():
+    pytest.importorskip("PyQt5")
+    from ui.main_window import LLMStreamTask
+
+    async def _stream():
+        yield {"content": "a", "done": False}
+        yield {"content": None, "done": True}
+        yield {"content": "never", "done": False}
+
+    task = LLMStreamTask(_stream())
+    chunks, finished = [], threading.Event()
+    task.chunk.connect(chunks.append)
+    task.finished.connect(finished.set)
+    task.start()
+    assert finished.wait(2.0)
+    assert [part["content"] for part in chunks] == ["a", None]
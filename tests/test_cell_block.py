@@ -0,0 +1,41 @@
+"""Unit tests for core.cell_block."""
+
+from core.cell_block import CellBlock
+
+DATA = (("Ad", "Tutar", "KDV"), ("Ali", 10.0, 2.0), ("", 20.0, 4.0))
+FORMULAS = (("Ad", "Tutar", "KDV"), ("Ali", "10", "=B2*0.2"), ("", "20", "=B3*0.2"))
+
+
+def _block():
+    return CellBlock.from_arrays(1, 4, DATA, FORMULAS)
+
+
+def test_cell_access():
+    block = _block()
+    assert block.shape == (3, 3)
+    assert block.range_name == "B5:D7"
+    assert block.kind(0, 0) == "text" and block.kind(1, 1) == "value"
+    assert block.kind(1, 2) == "formula" and block.formula(1, 2) == "=B2*0.2"
+    assert block.value(2, 0) is None and block.kind(2, 0) == "empty"
+    assert block.value(2, 2) == 4.0
+
+
+def test_column_helpers():
+    block = _block()
+    assert block.kind_counts(0) == [1, 0, 2, 0]
+    assert block.column_numbers(2) == [2.0, 4.0]
+    assert list(block.numeric_column(1)) == [0.0, 10.0, 20.0]
+    assert [address for address, _f, _v in block.formula_cells()] == ["D6", "D7"]
+
+
+def test_slicing_and_write_rows():
+    block = _block()
+    tail = block[1:]
+    assert tail.range_name == "B6:D7"
+    assert tail.formula(0, 2) == "=B2*0.2"
+
+    replacement = CellBlock.from_arrays(1, 6, (("Veli", 5.0, 1.0),), (("Veli", "5", "1"),))
+    block.write_rows(2, replacement)
+    assert block.value(2, 0) == "Veli"
+    assert block.formula(2, 2) is None
+    assert block.kind(2, 2) == "value"
@@ -0,0 +1,160 @@
+"""Unit tests for CellManipulator.join_ranges and group_aggregate on a fake sheet."""
+
+from contextlib import contextmanager
+
+import pytest
+
+from core.address_utils import parse_range_string
+from core.cell_manipulator import CellManipulator
+
+
+class _Addr:
+    def __init__(self, start_col, start_row, end_col, end_row):
+        self.StartColumn = start_col
+        self.StartRow = start_row
+        self.EndColumn = end_col
+        self.EndRow = end_row
+
+
+class _Range:
+    def __init__(self, sheet, start_col, start_row, end_col, end_row):
+        self._sheet = sheet
+        self._addr = _Addr(start_col, start_row, end_col, end_row)
+
+    def getRangeAddress(self):
+        return self._addr
+
+    def getDataArray(self):
+        a = self._addr
+        return tuple(
+            tuple(self._sheet.cells.get((c, r), "") for c in range(a.StartColumn, a.EndColumn + 1))
+            for r in range(a.StartRow, a.EndRow + 1)
+        )
+
+    def setDataArray(self, rows):
+        a = self._addr
+        assert len(rows) == a.EndRow - a.StartRow + 1
+        for r, row in enumerate(rows):
+            assert len(row) == a.EndColumn - a.StartColumn + 1
+            for c, value in enumerate(row):
+                self._sheet.cells[(a.StartColumn + c, a.StartRow + r)] = value
+        self._sheet.writes += 1
+
+    def setArrayFormula(self, formula):
+        self._sheet.formulas.append((self._addr.StartColumn, self._addr.StartRow, formula))
+
+
+class _Sheet:
+    def __init__(self, table, start_col=0, start_row=0):
+        self.cells = {}
+        self.writes = 0
+        self.formulas = []
+        for r, row in enumerate(table):
+            for c, value in enumerate(row):
+                self.cells[(start_col + c, start_row + r)] = value
+
+    def getCellRangeByPosition(self, start_col, start_row, end_col, end_row):
+        return _Range(self, start_col, start_row, end_col, end_row)
+
+    def row(self, row, start_col, end_col):
+        return [self.cells.get((c, row), "") for c in range(start_col, end_col + 1)]
+
+
+class _Bridge:
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.edits = []
+
+    def get_active_document(self):
+        return None
+
+    def get_active_sheet(self):
+        return self.sheet
+
+    def get_cell_range(self, sheet, range_str):
+        (start_col, start_row), (end_col, end_row) = parse_range_string(range_str)
+        return sheet.getCellRangeByPosition(start_col, start_row, end_col, end_row)
+
+    @contextmanager
+    def bulk_edit(self, name):
+        self.edits.append(name)
+        yield
+
+
+ORDERS = [
+    ("Kod", "Adet"),
+    ("P1", 3.0),
+    ("p2", 1.0),
+    ("P9", 4.0),
+    ("P1", 2.0),
+]
+PRODUCTS = [
+    ("Kod", "Ad", "Fiyat"),
+    ("P1", "Kalem", 5.0),
+    ("P2", "Defter", 12.0),
+    ("P1", "Kopya", 99.0),
+]
+
+
+def _manipulator():
+    sheet = _Sheet(ORDERS)
+    for r, row in enumerate(PRODUCTS):
+        for c, value in enumerate(row):
+            sheet.cells[(5 + c, r)] = value
+    return CellManipulator(_Bridge(sheet)), sheet
+
+
+def test_join_ranges_writes_first_match_in_one_call():
+    manipulator, sheet = _manipulator()
+    result = manipulator.join_ranges("A1:B5", "Kod", "F1:H4", "Kod", return_columns=["Ad", "Fiyat"])
+    assert result["target"] == "C1:D5"
+    assert (result["matched"], result["unmatched"]) == (2, 2)
+    assert result["unmatched_keys"] == ["p2", "P9"]
+    assert sheet.writes == 1 and manipulator.bridge.edits == ["ArasAI birleştirme"]
+    assert sheet.row(0, 2, 3) == ["Ad", "Fiyat"]
+    assert sheet.row(1, 2, 3) == ["Kalem", 5.0]
+    assert sheet.row(2, 2, 3) == ["", ""]
+
+
+def test_join_ranges_ignore_case_and_formula_mode():
+    manipulator, sheet = _manipulator()
+    result = manipulator.join_ranges("A1:B5", "A", "F1:H4", "F", return_columns=["G"], ignore_case=True)
+    assert result["matched"] == 3
+    assert sheet.row(2, 2, 2) == ["Defter"]
+
+    manipulator, sheet = _manipulator()
+    result = manipulator.join_ranges("A1:B5", "A", "F1:H4", "F", return_columns=["H"], mode="formula", default=0)
+    assert result["mode"] == "formula"
+    assert sheet.formulas == [(2, 1, "=IFERROR(INDEX($H$2:$H$4;MATCH($A$2:$A$5;$F$2:$F$4;0));0)")]
+
+
+def test_join_ranges_without_header_uses_letters():
+    manipulator, sheet = _manipulator()
+    result = manipulator.join_ranges("A2:B5", "A", "F2:H4", "F", return_columns=["G"], has_header=False, target_cell="J2")
+    assert result["rows"] == 4 and result["target"] == "J2:J5"
+    with pytest.raises(ValueError):
+        manipulator.join_ranges("A2:B5", "Kod", "F2:H4", "F", has_header=False)
+
+
+def test_group_aggregate_writes_summary_table():
+    manipulator, sheet = _manipulator()
+    result = manipulator.group_aggregate(
+        "A1:B5", ["Kod"], [{"column": "Adet", "func": "sum"}, {"column": "B", "func": "count"}],
+    )
+    assert result["target"] == "D1:F4"
+    assert result["groups"] == 3
+    assert result["preview"] == [
+        ["Kod", "sum(Adet)", "count(Adet)"],
+        ["P1", 5.0, 2],
+        # Text keys sort case-insensitively
+        ["p2", 1.0, 1],
+        ["P9", 4.0, 1],
+    ]
+    assert sheet.writes == 1
+
+
+def test_group_aggregate_without_header_labels_with_letters():
+    manipulator, _sheet = _manipulator()
+    result = manipulator.group_aggregate("A2:B5", ["A"], [{"column": "B", "func": "max"}], has_header=False, target_cell="J1")
+    assert result["preview"][0] == ["A", "max(B)"]
+    assert result["rows"] == 4
@@ -0,0 +1,61 @@
+"""Unit tests for core.column_profile sketches."""
+
+import random
+import statistics
+
+import pytest
+
+from core.column_profile import ColumnProfile, HyperLogLog, KLLSketch
+
+
+def test_exact_profile():
+    profile = ColumnProfile()
+    profile.add_many([1.0, 2.0, 2.0, "", "a", "12", 3.0])
+    result = profile.to_dict()
+    assert result["count"] == 6 and result["nulls"] == 1
+    assert result["numbers"] == 4 and result["texts"] == 2
+    assert result["numeric_texts"] == 1
+    assert result["distinct"] == 5
+    assert result["mean"] == 2.0 and result["min"] == 1 and result["max"] == 3
+    assert result["top"] == [[2, 2]]
+    assert "approximate" not in result
+
+
+def test_chunked_merge_matches_single_pass():
+    random.seed(7)
+    values = [float(random.randint(0, 500)) for _ in range(5000)]
+    whole = ColumnProfile()
+    whole.add_many(values)
+    merged = ColumnProfile()
+    for start in range(0, len(values), 700):
+        part = ColumnProfile()
+        part.add_many(values[start:start + 700])
+        merged.merge(part)
+    assert merged.to_dict() == whole.to_dict()
+
+
+def test_sketch_mode_is_close_to_exact():
+    random.seed(11)
+    values = [random.gauss(100, 15) for _ in range(20000)]
+    profile = ColumnProfile(exact_limit=1000)
+    for start in range(0, len(values), 5000):
+        profile.add_many(values[start:start + 5000])
+    result = profile.to_dict()
+    assert result["approximate"] is True
+    assert result["mean"] == pytest.approx(statistics.fmean(values), abs=1e-5)
+    assert result["distinct"] == pytest.approx(len(set(values)), rel=0.05)
+    assert result["quantiles"]["p50"] == pytest.approx(statistics.median(values), abs=2.0)
+
+
+def test_hll_and_kll_merge():
+    left, right = HyperLogLog(), HyperLogLog()
+    for i in range(5000):
+        (left if i % 2 else right).add(str(i))
+    left.merge(right)
+    assert left.estimate() == pytest.approx(5000, rel=0.05)
+
+    a, b = KLLSketch(seed=1), KLLSketch(seed=2)
+    a.update_many(range(0, 50000, 2))
+    b.update_many(range(1, 50000, 2))
+    a.merge(b)
+    assert a.quantiles([0.5])[0] == pytest.approx(25000, rel=0.03)
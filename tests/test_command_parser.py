@@ -0,0 +1,109 @@
+"""Unit tests for llm.command_parser fast commands."""
+
+import json
+
+import pytest
+
+from llm.command_parser import parse_command
+from llm.tool_definitions import READ_ONLY_TOOLS, ToolDispatcher
+
+
+def _used_rows():
+    return 1, 20
+
+
+@pytest.mark.parametrize("text, cell, value", [
+    ("A1'e 5 yaz", "A1", "5"),
+    ("B2 hücresine 3,5 yaz", "B2", "3.5"),
+    ("A1'e -12 yaz", "A1", "-12"),
+    ("C3'e \"merhaba dünya\" yaz", "C3", "merhaba dünya"),
+    ("write 42 in cell d4", "D4", "42"),
+    ("set A1 to =SUM(B1:B3)", "A1", "=SUM(B1:B3)"),
+])
+def test_write(text, cell, value):
+    command = parse_command(text)
+    assert command.tool_name == "write_formula"
+    assert command.arguments == {"cell": cell, "formula": value}
+
+
+@pytest.mark.parametrize("text", [
+    "A1'e toplam yaz",
+    "A1'e iki kelime yaz",
+    "A1'e 1,234,567 yaz",
+    "A1'e 1.234,5 yaz",
+])
+def test_ambiguous_writes_go_to_llm(text):
+    assert parse_command(text) is None
+
+
+@pytest.mark.parametrize("text, column, ascending", [
+    ("A1:D10 B sütununa göre sırala", 1, True),
+    ("A1:D10 aralığını B sütununa göre azalan sırala", 1, False),
+    ("A1:D10 2. sütuna göre sırala", 1, True),
+    ("A1:D10'u C sütuna göre artan sırala", 2, True),
+    ("sort A1:D10 by column 3 desc", 2, False),
+    ("sort B1:D10 by column C", 1, True),
+])
+def test_sort(text, column, ascending):
+    command = parse_command(text)
+    assert command.tool_name == "sort_range"
+    assert command.arguments["sort_column"] == column
+    assert command.arguments["ascending"] is ascending
+
+
+def test_sort_column_outside_range_is_rejected():
+    assert parse_command("A1:D10 F sütununa göre sırala") is None
+
+
+def test_sum_column_is_read_only():
+    command = parse_command("B sütununu topla", _used_rows)
+    assert command.tool_name == "get_column_statistics"
+    assert command.arguments == {"col_letter": "B"}
+    assert command.reply_key == "fast_sum"
+    assert parse_command("sum up column c").arguments == {"col_letter": "C"}
+
+
+def test_sum_column_tool_is_dispatched_read_only():
+    class _Analyzer:
+        def get_column_statistics(self, col_letter):
+            return {"column": col_letter, "count": 2, "sum": 3.0}
+
+    command = parse_command("B sütununu topla")
+    assert command.tool_name in READ_ONLY_TOOLS
+    result = ToolDispatcher(None, None, _Analyzer(), None).dispatch(command.tool_name, command.arguments)
+    assert json.loads(result) == {"result": {"column": "B", "count": 2, "sum": 3.0}}
+
+
+@pytest.mark.parametrize("text", [
+    "A1'e 5 yaz",
+    "B sütununu topla",
+    "B sütununu kalın yap",
+    "italicize A1:B2",
+    "A1:D10 B sütununa göre sırala",
+    "sort A1:D10 by column 3 desc",
+    "A1:C3 aralığını temizle",
+    "merge cells A1:C1",
+    "Ocak sayfasına geç",
+])
+def test_every_command_has_reply_templates(text):
+    pytest.importorskip("PyQt5")
+    from ui.i18n import TRANSLATIONS
+
+    command = parse_command(text, _used_rows)
+    for lang in ("tr", "en"):
+        template = TRANSLATIONS[lang][f"msg_{command.reply_key}"]
+        fields = dict(command.arguments, column=1, sum=3, count=2)
+        assert template.format(**fields)
+
+
+def test_style_clear_merge_and_sheet_switch():
+    assert parse_command("B sütununu kalın yap", _used_rows).arguments == {"range_name": "B1:B20", "bold": True}
+    assert parse_command("italicize A1:B2").arguments == {"range_name": "A1:B2", "italic": True}
+    assert parse_command("A1:C3 aralığını temizle").tool_name == "clear_range"
+    assert parse_command("merge cells A1:C1").arguments == {"range_name": "A1:C1"}
+    assert parse_command("Ocak sayfasına geç").arguments == {"sheet_name": "Ocak"}
+
+
+def test_unknown_requests_return_none():
+    assert parse_command("bu tabloyu analiz et ve bir grafik öner") is None
+    assert parse_command("") is None
@@ -0,0 +1,61 @@
+"""Unit tests for llm.context_budget trimming."""
+
+import copy
+import json
+
+from llm.context_budget import SUMMARY_MARKER, ContextBudget, digest_tool_result
+
+
+def _turn(index, result_chars):
+    call_id = f"call{index}"
+    return [
+        {"role": "user", "content": f"istek {index}"},
+        {"role": "assistant", "content": None, "tool_calls": [{
+            "id": call_id, "type": "function",
+            "function": {"name": "read_cell_range", "arguments": "{}"},
+        }]},
+        {"role": "tool", "tool_call_id": call_id, "content": json.dumps({"result": "x" * result_chars})},
+        {"role": "assistant", "content": f"yanıt {index}"},
+    ]
+
+
+def _conversation(turns, result_chars=2000):
+    return [msg for i in range(turns) for msg in _turn(i, result_chars)]
+
+
+def test_under_budget_history_is_sent_unchanged():
+    conversation = _conversation(3)
+    fitted, report = ContextBudget("openrouter", budget=100000).fit(conversation)
+    assert fitted == conversation
+    assert fitted is not conversation
+    assert report["digested"] == 0 and report["dropped_turns"] == 0
+
+
+def test_over_budget_digests_oldest_results_first_and_stops():
+    conversation = _conversation(4)
+    original = copy.deepcopy(conversation)
+    budget = ContextBudget("openrouter", budget=1800)
+    fitted, report = budget.fit(conversation)
+
+    assert conversation == original
+    assert report["after"] <= budget.budget
+    assert 0 < report["digested"] < 3
+    tool_contents = [m["content"] for m in fitted if m["role"] == "tool"]
+    assert tool_contents[0].startswith("[özet]")
+    # The last turn is never digested
+    assert not tool_contents[-1].startswith("[özet]")
+
+
+def test_drops_oldest_turns_into_summary_when_digests_are_not_enough():
+    conversation = _conversation(6, result_chars=100)
+    fitted, report = ContextBudget("openrouter", budget=120).fit(conversation)
+    assert report["dropped_turns"] > 0
+    assert fitted[0]["content"].startswith(SUMMARY_MARKER)
+    assert fitted[-1] == conversation[-1]
+
+
+def test_digest_keeps_result_fields():
+    content = json.dumps({"result": {"range": "A1:B2", "rows": 2}})
+    digest = digest_tool_result("profile_table", content)
+    assert digest.startswith("[özet] profile_table")
+    assert "range, rows" in digest
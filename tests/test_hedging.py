@@ -0,0 +1,110 @@
+"""Unit tests for llm.hedging latency tracking and hedged streams."""
+
+import asyncio
+
+import pytest
+
+from llm.hedging import MAX_HEDGE_DELAY, MIN_HEDGE_DELAY, LatencyTracker, hedged_stream, tracked_stream
+
+FAST = ("groq", "fast")
+SLOW = ("openrouter", "slow")
+
+
+class _Provider:
+    """Streams a role-only delta at once, then content after ``delay`` seconds."""
+
+    def __init__(self, text, delay=0.0, error=None):
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def astream_completion(self, messages, tools=None):
+        try:
+            yield {"content": "", "tool_calls": None, "done": False}
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            yield {"content": self.text, "tool_calls": None, "done": False}
+            yield {"content": None, "tool_calls": None, "done": True}
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def _collect(stream):
+    return [part async for part in stream]
+
+
+def _text(parts):
+    return "".join(part["content"] or "" for part in parts)
+
+
+def test_percentiles_need_enough_samples():
+    tracker = LatencyTracker()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        tracker.record_ttft(FAST, seconds)
+    assert tracker.percentile(FAST, 50) is None
+    assert tracker.hedge_delay(FAST, 90, default=2.0) == 2.0
+    tracker.record_ttft(FAST, 10.0)
+    assert tracker.percentile(FAST, 50) == 0.3
+    assert tracker.percentile(FAST, 90) == 10.0
+    assert tracker.hedge_delay(FAST, 10, default=2.0) == MIN_HEDGE_DELAY
+    tracker.record_ttft(FAST, 100.0)
+    assert tracker.hedge_delay(FAST, 100, default=2.0) == MAX_HEDGE_DELAY
+
+
+def test_choose_primary_weighs_errors():
+    tracker = LatencyTracker()
+    assert tracker.choose_primary([SLOW, FAST]) == 0
+    for _ in range(5):
+        tracker.record_ttft(SLOW, 1.0)
+        tracker.record_ttft(FAST, 0.5)
+    assert tracker.choose_primary([SLOW, FAST]) == 1
+    for _ in range(10):
+        tracker.record_error(FAST)
+    assert tracker.choose_primary([SLOW, FAST]) == 0
+
+
+def test_ttft_is_measured_on_the_first_token_not_the_role_delta():
+    tracker = LatencyTracker(max_samples=5)
+    for _ in range(5):
+        asyncio.run(_collect(tracked_stream(FAST, _Provider("x", delay=0.05), [], tracker=tracker)))
+    assert tracker.percentile(FAST, 50) >= 0.05
+    assert tracker.error_rate(FAST) == 0.0
+
+
+def test_hedge_wins_when_primary_only_sends_an_empty_delta():
+    primary = _Provider("yavaş", delay=1.0)
+    secondary = _Provider("hızlı", delay=0.05)
+    parts = asyncio.run(_collect(hedged_stream(
+        [(SLOW, primary), (FAST, secondary)], [], delay=0.1, tracker=LatencyTracker(),
+    )))
+    assert _text(parts) == "hızlı"
+    # The winner's held role delta is still forwarded first
+    assert parts[0]["content"] == ""
+    assert parts[-1]["done"]
+    assert primary.cancelled
+
+
+def test_fast_primary_is_not_hedged():
+    secondary = _Provider("yedek")
+    parts = asyncio.run(_collect(hedged_stream(
+        [(FAST, _Provider("birincil", delay=0.01)), (SLOW, secondary)], [], delay=0.5, tracker=LatencyTracker(),
+    )))
+    assert _text(parts) == "birincil"
+
+
+def test_failed_primary_falls_back_and_last_error_is_raised():
+    tracker = LatencyTracker()
+    parts = asyncio.run(_collect(hedged_stream(
+        [(SLOW, _Provider("x", error=ConnectionError("kapalı"))), (FAST, _Provider("yedek"))],
+        [], delay=5.0, tracker=tracker,
+    )))
+    assert _text(parts) == "yedek"
+    assert tracker.error_rate(SLOW) > 0
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(_collect(hedged_stream(
+            [(SLOW, _Provider("x", error=ConnectionError("kapalı")))], [], delay=5.0, tracker=tracker,
+        )))
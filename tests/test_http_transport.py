@@ -0,0 +1,49 @@
+"""Unit tests for llm.http_transport shared client pooling."""
+
+import pytest
+
+from llm import http_transport
+
+
+@pytest.fixture(autouse=True)
+def _clean_pool(monkeypatch):
+    monkeypatch.setattr(http_transport, "_http2_enabled", lambda: False)
+    http_transport.close_all()
+    yield
+    http_transport.close_all()
+
+
+def test_same_origin_shares_one_client():
+    first = http_transport.acquire_client("https://API.groq.com/openai/v1")
+    second = http_transport.acquire_client("https://api.groq.com:443/other")
+    assert first is second
+    assert http_transport.pool_stats() == [
+        {"origin": "https://api.groq.com:443", "timeout": 60.0, "in_use": 2, "http2": False},
+    ]
+
+
+def test_origin_and_timeouts_select_separate_pools():
+    groq = http_transport.acquire_client("https://api.groq.com/openai/v1")
+    ollama = http_transport.acquire_client("http://localhost:11434")
+    slow = http_transport.acquire_client("https://api.groq.com/openai/v1", timeout=300.0)
+    assert len({id(groq), id(ollama), id(slow)}) == 3
+    assert {stats["origin"] for stats in http_transport.pool_stats()} == {
+        "https://api.groq.com:443", "http://localhost:11434",
+    }
+
+
+def test_release_keeps_the_pool_warm():
+    client = http_transport.acquire_client("https://openrouter.ai/api/v1")
+    http_transport.release_client(client)
+    http_transport.release_client(client)
+    http_transport.release_client(None)
+    assert http_transport.pool_stats()[0]["in_use"] == 0
+    assert http_transport.acquire_client("https://openrouter.ai/api/v1") is client
+
+
+def test_close_all_closes_and_recreates():
+    client = http_transport.acquire_client("https://openrouter.ai/api/v1")
+    http_transport.close_all()
+    assert client.is_closed
+    assert http_transport.pool_stats() == []
+    assert http_transport.acquire_client("https://openrouter.ai/api/v1") is not client
@@ -0,0 +1,84 @@
+"""Unit tests for llm.plan_cache turn extraction and data-digest keyed entries."""
+
+import json
+
+from llm.plan_cache import REPLAY_CALL_ID, PlanCache, turn_steps
+
+PLAN_TOOL = "execute_plan"
+READ_ONLY = frozenset({"read_cell_range", "get_sheet_summary", "preview_sheet"})
+SCHEMA = {"fingerprint": "abc", "origin": (0, 0), "shape": (10, 3)}
+
+
+def _call(call_id, name, arguments, result):
+    return [
+        {"role": "assistant", "content": None, "tool_calls": [{
+            "id": call_id, "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }]},
+        {"role": "tool", "tool_call_id": call_id, "content": json.dumps({"result": result})},
+    ]
+
+
+def test_write_without_reads_does_not_need_data_digest():
+    turn = _call("1", "get_sheet_summary", {}, {"used_range": "A1:C10"})
+    turn += _call("2", "write_formula", {"cell": "C11", "formula": "=SUM(C2:C10)"}, "ok")
+    steps, reads_data = turn_steps(turn, PLAN_TOOL, READ_ONLY)
+    assert [s["tool"] for s in steps] == ["write_formula"]
+    assert not reads_data
+
+
+def test_write_after_data_read_is_marked_data_derived():
+    turn = _call("1", "read_cell_range", {"range_name": "B2:B10"}, [[1], [2]])
+    turn += _call("2", "write_formula", {"cell": "D1", "formula": "3"}, "ok")
+    _steps, reads_data = turn_steps(turn, PLAN_TOOL, READ_ONLY)
+    assert reads_data
+
+
+def test_failed_tool_discards_turn():
+    turn = _call("1", "write_formula", {"cell": "A1", "formula": "x"}, "ok")
+    turn[-1]["content"] = json.dumps({"error": "boom"})
+    assert turn_steps(turn, PLAN_TOOL, READ_ONLY) is None
+
+
+def test_failed_replay_keeps_executed_steps_and_model_corrections():
+    plan = {"steps": [
+        {"id": "s1", "tool": "write_formula", "arguments": {"cell": "A1", "formula": "1"}},
+        {"id": "s2", "tool": "write_formula", "arguments": {"cell": "A2", "formula": "bad"}},
+    ]}
+    report = {"status": "failed", "needs_model": True, "steps": [
+        {"id": "s1", "status": "ok"}, {"id": "s2", "status": "error"},
+    ]}
+    turn = _call(REPLAY_CALL_ID, PLAN_TOOL, plan, report)
+    turn += _call("m1", "write_formula", {"cell": "A2", "formula": "2"}, "ok")
+    steps, reads_data = turn_steps(turn, PLAN_TOOL, READ_ONLY)
+    assert [s["arguments"]["formula"] for s in steps] == ["1", "2"]
+    assert reads_data
+
+
+def test_data_derived_entry_requires_matching_digest(tmp_path):
+    cache = PlanCache(path=tmp_path / "plans.json")
+    steps = [{"id": "c1", "tool": "write_formula", "arguments": {"cell": "D1", "formula": "3"}}]
+    cache.put("topla", SCHEMA, steps, "tamam", data_digest="d1")
+    assert cache.get("topla", SCHEMA, lambda: "d2") is None
+    assert cache.get("topla", SCHEMA, lambda: None) is None
+    assert cache.get("topla", SCHEMA) is None
+    assert cache.get("topla", SCHEMA, lambda: "d1")["steps"] == steps
+
+
+def test_digest_is_computed_only_for_data_derived_entries(tmp_path):
+    cache = PlanCache(path=tmp_path / "plans.json")
+    steps = [{"id": "c1", "tool": "write_formula", "arguments": {"cell": "D1", "formula": "3"}}]
+    calls = []
+
+    def digest():
+        calls.append(1)
+        return "d1"
+
+    assert cache.get("başlık", SCHEMA, digest) is None
+    cache.put("başlık", SCHEMA, steps)
+    assert cache.get("başlık", SCHEMA, digest) is not None
+    assert calls == []
+
+    cache.put("topla", SCHEMA, steps, data_digest="d1")
+    assert cache.get("topla", SCHEMA, digest) is not None
+    assert calls == [1]
@@ -0,0 +1,148 @@
+"""Unit tests for llm.plan_executor and the bridge bulk-edit session."""
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from core.uno_bridge import LibreOfficeBridge
+from llm.plan_executor import PlanError, PlanExecutor, order_steps
+
+
+class _Dispatcher:
+    def __init__(self, results=None, fail=()):
+        self.results = results or {}
+        self.fail = set(fail)
+        self.calls = []
+
+    def dispatch(self, tool, arguments):
+        self.calls.append((tool, arguments))
+        if tool in self.fail:
+            return json.dumps({"error": f"{tool} başarısız"})
+        return json.dumps({"result": self.results.get(tool, "ok")})
+
+
+class _Bridge:
+    def __init__(self):
+        self.sessions = []
+
+    @contextmanager
+    def bulk_edit(self, title):
+        self.sessions.append(title)
+        yield
+
+
+def test_order_follows_references_and_keeps_plan_order():
+    steps = [
+        {"id": "chart", "tool": "create_chart", "arguments": {"range": "${sum.range}"}},
+        {"id": "sum", "tool": "write_formula", "arguments": {}},
+        {"id": "style", "tool": "set_cell_style", "depends_on": ["sum"]},
+    ]
+    assert [step["id"] for step in order_steps(steps)] == ["sum", "chart", "style"]
+    assert order_steps([{"tool": "list_sheets"}])[0]["id"] == "s1"
+
+
+@pytest.mark.parametrize("steps", [
+    [],
+    [{"id": "a"}],
+    [{"id": "a", "tool": "x"}, {"id": "a", "tool": "y"}],
+    [{"id": "a", "tool": "x", "depends_on": ["b"]}],
+    [{"id": "a", "tool": "x", "depends_on": ["b"]}, {"id": "b", "tool": "y", "arguments": {"v": "${a}"}}],
+    [{"id": "a", "tool": "execute_plan"}],
+])
+def test_invalid_plans_are_rejected(steps):
+    with pytest.raises(PlanError):
+        order_steps(steps)
+
+
+def test_results_are_substituted_into_later_arguments():
+    dispatcher = _Dispatcher({"get_sheet_summary": {"used_range": "A1:C9", "rows": 9}})
+    result = PlanExecutor(dispatcher).run([
+        {"id": "s1", "tool": "get_sheet_summary"},
+        {"id": "s2", "tool": "set_cell_style", "arguments": {"range_name": "${s1.used_range}", "rows": "${s1.rows}"}},
+        {"id": "s3", "tool": "write_formula", "arguments": {"cell": "A10", "formula": "=ROWS(${s1.used_range})"}},
+    ], summary="Bitti")
+    assert result["status"] == "completed" and not result["needs_model"]
+    assert result["summary"] == "Bitti"
+    assert dispatcher.calls[1][1] == {"range_name": "A1:C9", "rows": 9}
+    assert dispatcher.calls[2][1]["formula"] == "=ROWS(A1:C9)"
+
+
+def test_failure_stops_the_plan_inside_one_edit_session():
+    bridge = _Bridge()
+    dispatcher = _Dispatcher(fail={"merge_cells"})
+    result = PlanExecutor(dispatcher, bridge).run([
+        {"id": "a", "tool": "write_formula"},
+        {"id": "b", "tool": "merge_cells"},
+        {"id": "c", "tool": "create_chart"},
+    ], summary="Bitti")
+    assert bridge.sessions == ["ArasAI planı"]
+    assert [step["status"] for step in result["steps"]] == ["ok", "error", "skipped"]
+    assert result["status"] == "failed" and result["needs_model"]
+    assert "summary" not in result
+    assert [tool for tool, _ in dispatcher.calls] == ["write_formula", "merge_cells"]
+
+
+def test_inspect_returns_the_result_to_the_model():
+    result = PlanExecutor(_Dispatcher({"list_sheets": ["Ocak"]})).run(
+        [{"id": "a", "tool": "list_sheets", "inspect": True}]
+    )
+    assert result["needs_model"]
+    assert result["steps"][0]["result"] == ["Ocak"]
+
+
+def test_invalid_plan_runs_nothing():
+    dispatcher = _Dispatcher()
+    result = PlanExecutor(dispatcher, _Bridge()).run([{"id": "a", "tool": "x", "depends_on": ["z"]}])
+    assert result["status"] == "invalid"
+    assert dispatcher.calls == []
+
+
+class _UndoManager:
+    def __init__(self, log):
+        self.log = log
+
+    def enterUndoContext(self, title):
+        self.log.append(("enter", title))
+
+    def leaveUndoContext(self):
+        self.log.append(("leave",))
+
+
+class _Doc:
+    def __init__(self):
+        self.log = []
+
+    def getUndoManager(self):
+        return _UndoManager(self.log)
+
+    def lockControllers(self):
+        self.log.append(("lock",))
+
+    def unlockControllers(self):
+        self.log.append(("unlock",))
+
+    def addActionLock(self):
+        self.log.append(("action_lock",))
+
+    def removeActionLock(self):
+        self.log.append(("action_unlock",))
+
+
+class _FakeBridge:
+    def __init__(self):
+        self.doc = _Doc()
+
+    def get_active_document(self):
+        return self.doc
+
+
+def test_bulk_edit_is_one_undo_step_and_always_unlocks():
+    bridge = _FakeBridge()
+    with pytest.raises(RuntimeError):
+        with LibreOfficeBridge.bulk_edit(bridge, "ArasAI planı"):
+            raise RuntimeError("adım hatası")
+    assert bridge.doc.log == [
+        ("enter", "ArasAI planı"), ("lock",), ("action_lock",),
+        ("action_unlock",), ("unlock",), ("leave",),
+    ]
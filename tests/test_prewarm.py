@@ -0,0 +1,101 @@
+"""Unit tests for llm.prewarm and the provider warm-up request."""
+
+import asyncio
+
+import pytest
+
+from llm import prewarm
+from llm.base_provider import BaseLLMProvider
+from llm.prewarm import PrewarmGate
+
+KEY = ("groq", "llama-3.1-8b-instant")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(prewarm.time, "monotonic", clock)
+    return clock
+
+
+def test_gate_rate_limits_per_key(clock):
+    gate = PrewarmGate(min_interval=60.0)
+    assert gate.try_begin(KEY)
+    # Still in flight, and later within the interval
+    assert not gate.try_begin(KEY)
+    gate.finish(KEY, 0.25)
+    clock.now += 30
+    assert not gate.try_begin(KEY)
+    assert gate.try_begin(("ollama", "llama3.1"))
+    clock.now += 31
+    assert gate.try_begin(KEY)
+
+
+def test_real_requests_keep_the_connection_warm(clock):
+    gate = PrewarmGate(min_interval=60.0)
+    assert gate.try_begin(KEY)
+    gate.finish(KEY, 0.25)
+    assert gate.mark_used(KEY) == 0.25
+    # The saving is reported once
+    assert gate.mark_used(KEY) == 0.0
+    clock.now += 59
+    gate.mark_used(KEY)
+    clock.now += 59
+    assert not gate.try_begin(KEY)
+
+
+def test_failed_warm_up_records_no_saving(clock):
+    gate = PrewarmGate()
+    gate.try_begin(KEY)
+    gate.finish(KEY, 0.0)
+    assert gate.mark_used(KEY) == 0.0
+
+
+class _Client:
+    def __init__(self, error=None):
+        self.error = error
+        self.heads = []
+
+    async def head(self, url):
+        self.heads.append(url)
+        if self.error:
+            raise self.error
+
+
+class _Provider(BaseLLMProvider):
+    provider_name = "test"
+
+    def __init__(self, client):
+        self._client = client
+        self._base_url = "https://example.invalid/v1"
+
+    async def acompletion(self, messages, tools=None):
+        raise NotImplementedError
+
+    async def astream_completion(self, messages, tools=None):
+        yield {}
+
+    async def aget_available_models(self):
+        return []
+
+    def set_model(self, model_name):
+        pass
+
+
+def test_awarm_up_sends_a_head_request():
+    client = _Client()
+    assert asyncio.run(_Provider(client).awarm_up()) >= 0.0
+    assert client.heads == ["https://example.invalid/v1"]
+
+
+def test_awarm_up_failure_returns_zero():
+    assert asyncio.run(_Provider(_Client(OSError("dns"))).awarm_up()) == 0.0
+    assert asyncio.run(_Provider(None).awarm_up()) == 0.0
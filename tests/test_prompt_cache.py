@@ -0,0 +1,40 @@
+"""Unit tests for llm.prompt_cache and the tool-need check on injected context."""
+
+from core.sheet_context import NO_CONNECTION_CONTEXT
+from llm.prompt_cache import strip_dynamic_context, with_dynamic_context
+from llm.tool_router import needs_tools
+
+CONTEXT = (
+    "\n\n## MEVCUT DURUM\nSayfa: Sayfa1\nKullanılan Aralık: A1:C10\n"
+    "Boyut: 10 satır x 3 sütun\nBaşlıklar: Ad, Tutar, Tarih"
+)
+
+
+def _conversation(text):
+    return [
+        {"role": "user", "content": "önceki"},
+        {"role": "assistant", "content": "tamam"},
+        {"role": "user", "content": text},
+    ]
+
+
+def test_context_is_added_to_outgoing_copy_only():
+    conversation = _conversation("merhaba")
+    messages = with_dynamic_context(conversation, CONTEXT)
+    assert conversation[-1]["content"] == "merhaba"
+    assert messages[-1]["content"].startswith(CONTEXT.strip())
+    assert messages[0] is conversation[0]
+
+
+def test_strip_dynamic_context_restores_user_text():
+    messages = with_dynamic_context(_conversation("B sütununu topla"), CONTEXT)
+    assert strip_dynamic_context(messages[-1]["content"]) == "B sütununu topla"
+    assert strip_dynamic_context("düz metin") == "düz metin"
+
+
+def test_needs_tools_ignores_injected_context():
+    for context in (CONTEXT, NO_CONNECTION_CONTEXT):
+        chat = with_dynamic_context(_conversation("merhaba, nasılsın?"), context)
+        assert not needs_tools(chat)
+        action = with_dynamic_context(_conversation("A sütununa formül yaz"), context)
+        assert needs_tools(action)
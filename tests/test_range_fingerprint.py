@@ -0,0 +1,154 @@
+"""Unit tests for core.range_fingerprint tile caching with formula dependents."""
+
+from core.range_fingerprint import RangeFingerprinter
+
+
+class _Range:
+    def __init__(self, sheet, bounds):
+        self._sheet = sheet
+        self._bounds = bounds
+
+    def _cells(self, getter):
+        c0, r0, c1, r1 = self._bounds
+        return tuple(tuple(getter(c, r) for c in range(c0, c1 + 1)) for r in range(r0, r1 + 1))
+
+    def getDataArray(self):
+        self._sheet.reads += 1
+        return self._cells(self._sheet.value)
+
+    def getFormulaArray(self):
+        return self._cells(self._sheet.formula)
+
+
+class _Sheet:
+    """Column A holds values; B1 = A600 * 2 lives in another tile."""
+
+    def __init__(self):
+        self.values = {r: float(r) for r in range(1000)}
+        self.reads = 0
+
+    def value(self, c, r):
+        if c == 1:
+            return self.values[599] * 2 if r == 0 else ""
+        return self.values[r]
+
+    def formula(self, c, r):
+        if c == 1:
+            return "=A600*2" if r == 0 else ""
+        return repr(self.values[r])
+
+    def getName(self):
+        return "Sheet1"
+
+    def getCellRangeByPosition(self, *bounds):
+        return _Range(self, bounds)
+
+
+class _Doc:
+    def getURL(self):
+        return "file:///tmp/test.ods"
+
+
+class _Bridge:
+    def __init__(self, sheet):
+        self._sheet = sheet
+
+    def get_active_sheet(self):
+        return self._sheet
+
+    def get_active_document(self):
+        return _Doc()
+
+
+def test_formula_tiles_are_rehashed_after_dependency_change():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    fingerprints.set_listening(True)
+    before = fingerprints.range_digest("A1:B1000")
+
+    # Only the edited cell is reported; the dependent B1 sits in tile 0
+    sheet.values[599] = -1.0
+    fingerprints.invalidate("Sheet1", 599, 599, 0, 0)
+    sheet.reads = 0
+    after = fingerprints.range_digest("A1:B1000")
+    assert after != before
+    # Tile 0 (formulas) and tile 2 (edited) are read; tiles 1 and 3 come from cache
+    assert sheet.reads == 2
+
+
+def test_value_only_tiles_stay_cached():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+    sheet.reads = 0
+    fingerprints.range_digest("A1:A1000")
+    assert sheet.reads == 0
+
+
+def _cached_reads(fingerprints, sheet, range_name):
+    sheet.reads = 0
+    fingerprints.range_digest(range_name)
+    return sheet.reads
+
+
+def test_invalidate_drops_only_intersecting_tiles():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+
+    fingerprints.invalidate("Sheet1", 300, 520, 0, 0)
+    # Rows 300-520 span tiles 1 (256-511) and 2 (512-767)
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 2
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 0
+
+
+def test_invalidate_ignores_other_sheets_and_columns():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+
+    fingerprints.invalidate("Sheet2", 0, 999, 0, 0)
+    fingerprints.invalidate("Sheet1", 0, 999, 3, 5)
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 0
+
+    fingerprints.invalidate("Sheet1")
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 4
+
+
+def test_invalidate_address_uses_uno_bounds():
+    class _Address:
+        StartRow, EndRow, StartColumn, EndColumn = 0, 10, 0, 0
+
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+
+    fingerprints.invalidate_address("Sheet1", _Address())
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 1
+
+
+def test_tiles_are_not_cached_without_listener():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256)
+    assert not fingerprints.listening
+    fingerprints.range_digest("A1:A1000")
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 4
+
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+    fingerprints.set_listening(False)
+    assert _cached_reads(fingerprints, sheet, "A1:A1000") == 4
+
+
+def test_capacity_evicts_least_recently_used_tiles():
+    sheet = _Sheet()
+    fingerprints = RangeFingerprinter(_Bridge(sheet), tile_rows=256, capacity=2)
+    fingerprints.set_listening(True)
+    fingerprints.range_digest("A1:A1000")
+    # Only the last two tiles survive
+    assert _cached_reads(fingerprints, sheet, "A513:A1000") == 0
+    assert _cached_reads(fingerprints, sheet, "A1:A512") == 2
@@ -0,0 +1,86 @@
+"""Unit tests for llm.rate_limiter."""
+
+import asyncio
+
+import pytest
+
+from llm import rate_limiter
+from llm.rate_limiter import RateLimiter, TokenBucket, _parse_reset, get_limiter
+
+
+def test_parse_reset_durations():
+    assert _parse_reset("2m59.56s") == pytest.approx(179.56)
+    assert _parse_reset("120ms") == pytest.approx(0.12)
+    assert _parse_reset("1.5") == 1.5
+    assert _parse_reset("") is None
+    assert _parse_reset("soon") is None
+
+
+def test_bucket_borrows_and_reports_wait():
+    bucket = TokenBucket(capacity=10, refill_per_sec=10)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.05)
+    bucket.refund(5)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.05)
+
+
+def test_bucket_observes_server_limits():
+    bucket = TokenBucket(capacity=100, refill_per_sec=100 / 60)
+    bucket.observe(limit=30, remaining=0, reset=2.0)
+    assert bucket.capacity == 30
+    assert bucket.refill_per_sec == pytest.approx(15.0)
+    assert bucket.reserve(1) >= 1.9
+
+
+def test_configured_limits_are_not_widened():
+    bucket = TokenBucket(capacity=10, refill_per_sec=1)
+    bucket.observe(limit=1000, remaining=500, reset=1.0, adopt_limit=False)
+    assert bucket.capacity == 10
+
+
+def test_limiter_acquire_without_limits_does_not_wait():
+    limiter = RateLimiter("test")
+    assert asyncio.run(limiter.acquire(tokens=1000)) == 0.0
+
+
+class _Settings:
+    def __init__(self, limits):
+        self._values = {"llm_rate_limit_enabled": True, "llm_rate_limits": limits}
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    def _use(limits):
+        monkeypatch.setattr(rate_limiter, "Settings", lambda: _Settings(limits))
+        monkeypatch.setattr(rate_limiter, "_limiters", {})
+    return _use
+
+
+GROQ_HEADERS = {
+    "x-ratelimit-limit-tokens": "30000",
+    "x-ratelimit-remaining-tokens": "30000",
+    "x-ratelimit-reset-tokens": "0s",
+}
+
+
+def test_default_limits_are_replaced_by_server_limits(settings):
+    settings({})
+    limiter = get_limiter("groq", "llama-3.3-70b-versatile")
+    assert limiter._tokens.capacity == 6000
+    limiter.observe_headers(GROQ_HEADERS)
+    assert limiter._tokens.capacity == 30000
+    assert limiter._tokens.refill_per_sec == pytest.approx(500.0)
+
+
+def test_limits_from_settings_stay_locked(settings):
+    settings({"groq/llama-3.3-70b-versatile": {"tpm": 6000}})
+    limiter = get_limiter("groq", "llama-3.3-70b-versatile")
+    limiter.observe_headers(GROQ_HEADERS)
+    assert limiter._tokens.capacity == 6000
+    # Other models of the provider still start from the defaults and learn
+    other = get_limiter("groq", "llama-3.1-8b-instant")
+    other.observe_headers(GROQ_HEADERS)
+    assert other._tokens.capacity == 30000
@@ -0,0 +1,64 @@
+"""Unit tests for llm.result_compaction compact encodings and continuation."""
+
+from core.cell_block import CellBlock
+from llm.result_compaction import HEAD_ROWS, MAX_ROWS, TAIL_ROWS, ResultStore, compact_for_tool, compact_result, fetch_slice
+
+
+def _priced_block(n_rows):
+    data = [("Ad", "Adet", "Fiyat", "Tutar")]
+    formulas = [("Ad", "Adet", "Fiyat", "Tutar")]
+    for r in range(2, n_rows + 2):
+        data.append(("x", float(r), 2.0, float(2 * r)))
+        formulas.append(("x", str(r), "2", f"=B{r}*C{r}"))
+    return CellBlock.from_arrays(0, 0, data, formulas)
+
+
+def _records(n):
+    return [{"address": f"A{i + 1}", "formula": "=1"} for i in range(n)]
+
+
+def test_copied_formulas_and_repeated_rows_collapse():
+    data = [("a", 1.0), ("a", 1.0), ("a", 1.0), ("b", 2.0)]
+    block = CellBlock.from_arrays(1, 4, data, [("a", "1"), ("a", "1"), ("a", "1"), ("b", "2")])
+    compact, truncated = compact_result(block)
+    assert not truncated
+    assert compact["range"] == "B5:C8"
+    assert compact["rows"] == [["a", 1], {"repeat": 2}, ["b", 2]]
+
+    compact, _ = compact_result(_priced_block(4))
+    assert compact["formulas"] == {"D2:D5": "=B2*C2"}
+
+
+def test_records_become_columnar():
+    compact, truncated = compact_result(_records(3))
+    assert not truncated
+    assert compact == {
+        "format": "records",
+        "columns": ["address", "formula"],
+        "rows": [["A1", "=1"], ["A2", "=1"], ["A3", "=1"]],
+    }
+    assert compact_result({"sum": 3}) == ({"sum": 3}, False)
+
+
+def test_long_table_keeps_head_and_tail_and_stores_the_rest():
+    store = ResultStore()
+    block = _priced_block(100)
+    compact = compact_for_tool("read_cell_range", block, store)
+    assert len(compact["rows"]) == HEAD_ROWS
+    assert compact["tail"]["first_row"] == 92
+    assert compact["total_rows"] == 101
+    assert compact["range"] == "A1:D101"
+    handle = compact["continuation"]["handle"]
+    assert compact["continuation"]["omitted"] == f"{HEAD_ROWS}-{101 - TAIL_ROWS}"
+
+    page = fetch_slice(store, handle, offset=HEAD_ROWS, limit=1000)
+    assert page["total_rows"] == 101
+    assert page["next_offset"] == HEAD_ROWS + MAX_ROWS
+    assert page["data"]["first_row"] == HEAD_ROWS + 1
+    assert fetch_slice(store, handle, offset=100)["next_offset"] is None
+
+
+def test_short_results_are_not_stored():
+    store = ResultStore()
+    compact_for_tool("get_all_formulas", _records(MAX_ROWS), store)
+    assert store.get("r1") is None
@@ -0,0 +1,82 @@
+"""Unit tests for cursor pagination of read_cell_range and get_all_formulas."""
+
+import json
+
+import pytest
+
+from core.cell_block import CellBlock
+from llm.result_compaction import ResultStore, first_page, next_page
+from llm.tool_definitions import ToolDispatcher
+
+
+def _block(n_rows):
+    data = [(f"k{r}", float(r)) for r in range(n_rows)]
+    return CellBlock.from_arrays(0, 0, data, [(f"k{r}", str(r)) for r in range(n_rows)])
+
+
+class _Inspector:
+    bridge = None
+
+    def __init__(self, block):
+        self.block = block
+        self.reads = 0
+
+    def read_range(self, range_name):
+        self.reads += 1
+        return self.block
+
+    def get_cell_details(self, address):
+        return {}
+
+
+class _Manipulator:
+    def write_formula(self, cell, formula):
+        return f"{cell} yazıldı"
+
+
+def _dispatch(dispatcher, tool, **arguments):
+    return json.loads(dispatcher.dispatch(tool, arguments))
+
+
+def test_small_blocks_are_returned_whole():
+    store = ResultStore()
+    block = _block(10)
+    assert first_page("read_cell_range", block, store) is block
+    assert store.get("r1") is None
+
+
+def test_pages_walk_the_stored_block():
+    store = ResultStore()
+    page = first_page("read_cell_range", _block(120), store, page_size=50)
+    assert page["page"] == "0-49" and page["total_rows"] == 120
+    assert page["next_cursor"] == "r1.50"
+    page = next_page("read_cell_range", page["next_cursor"], store, page_size=50)
+    assert page["first_row"] == 51 and page["next_cursor"] == "r1.100"
+    page = next_page("read_cell_range", page["next_cursor"], store, page_size=50)
+    assert page["page"] == "100-119" and page["next_cursor"] is None
+
+
+def test_bad_foreign_and_expired_cursors():
+    store = ResultStore(capacity=1)
+    first_page("read_cell_range", _block(120), store)
+    with pytest.raises(ValueError):
+        next_page("read_cell_range", "sonraki", store)
+    with pytest.raises(ValueError):
+        next_page("get_all_formulas", "r1.50", store)
+    first_page("read_cell_range", _block(120), store)
+    with pytest.raises(KeyError):
+        next_page("read_cell_range", "r1.50", store)
+
+
+def test_dispatcher_serves_later_pages_without_rereading():
+    inspector = _Inspector(_block(120))
+    dispatcher = ToolDispatcher(inspector, _Manipulator(), None, None)
+    first = _dispatch(dispatcher, "read_cell_range", range_name="A1:B120")["result"]
+    second = _dispatch(dispatcher, "read_cell_range", cursor=first["next_cursor"])["result"]
+    assert inspector.reads == 1
+    assert second["first_row"] == 51
+
+    # A write makes stored blocks stale, so the cursor expires
+    _dispatch(dispatcher, "write_formula", cell="C1", formula="1")
+    error = _dispatch(dispatcher, "read_cell_range", cursor=second["next_cursor"])["error"]
+    assert "imleçsiz" in error
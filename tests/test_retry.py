@@ -0,0 +1,44 @@
+"""Unit tests for llm.retry backoff, Retry-After parsing and the circuit breaker."""
+
+import httpx
+
+from llm.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+def _response(headers=None, text=""):
+    return httpx.Response(429, headers=headers or {}, text=text)
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt in range(10):
+        assert 0.0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+
+
+def test_parse_retry_after_headers_and_body():
+    assert parse_retry_after(_response({"retry-after-ms": "1500"})) == 1.5
+    assert parse_retry_after(_response({"retry-after": "7"})) == 7.0
+    assert parse_retry_after(_response(text='{"retryDelay": "12s"}')) == 12.0
+    assert parse_retry_after(_response(text="Please retry in 3.5s")) == 3.5
+    assert parse_retry_after(_response(text="rate limited")) is None
+
+
+def test_circuit_breaker_opens_and_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_open_circuit_rejects_until_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.remaining() > 0
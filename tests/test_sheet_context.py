@@ -0,0 +1,81 @@
+"""Unit tests for core.sheet_context cache freshness across sheet switches."""
+
+from core.sheet_context import SheetContextCache
+
+
+class _Addr:
+    StartColumn = 0
+    StartRow = 0
+    EndColumn = 1
+    EndRow = 4
+
+
+class _Range:
+    def __init__(self, headers):
+        self._headers = headers
+
+    def gotoStartOfUsedArea(self, _expand):
+        pass
+
+    def gotoEndOfUsedArea(self, _expand):
+        pass
+
+    def getRangeAddress(self):
+        return _Addr()
+
+    def getDataArray(self):
+        return (self._headers,)
+
+
+class _Sheet:
+    def __init__(self, name, headers):
+        self._name = name
+        self._headers = headers
+
+    def getName(self):
+        return self._name
+
+    def createCursor(self):
+        return _Range(self._headers)
+
+    def getCellRangeByPosition(self, *_bounds):
+        return _Range(self._headers)
+
+
+class _Doc:
+    def getURL(self):
+        return "file:///tmp/test.ods"
+
+    def getCurrentController(self):
+        raise RuntimeError("no controller")
+
+
+class _Bridge:
+    is_connected = True
+
+    def __init__(self):
+        self.doc = _Doc()
+        self.sheet = _Sheet("Ocak", ("Ad", "Tutar"))
+
+    def get_active_document(self):
+        return self.doc
+
+    def get_active_sheet(self):
+        return self.sheet
+
+
+def test_sheet_switch_rebuilds_context_synchronously():
+    bridge = _Bridge()
+    cache = SheetContextCache(bridge)
+    cache.set_listening(True)
+    try:
+        assert "Sayfa: Ocak" in cache.get()
+
+        # A listener-less switch leaves the cache "fresh" for the old sheet
+        bridge.sheet = _Sheet("Şubat", ("Ürün", "Adet"))
+        context = cache.get()
+        assert "Sayfa: Şubat" in context
+        assert "Başlıklar: Ürün, Adet" in context
+        assert cache.key[1] == "Şubat"
+    finally:
+        cache.close()
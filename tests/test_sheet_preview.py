@@ -0,0 +1,53 @@
+"""Unit tests for core.sheet_preview budgeting."""
+
+import json
+
+import pytest
+
+from core.cell_block import CellBlock
+from core.sheet_preview import PREVIEW_MAX_CHARS, build_preview
+
+
+def _size(preview):
+    return len(json.dumps(preview, ensure_ascii=False, separators=(",", ":")))
+
+
+def _block(rows, cols):
+    data = [tuple(f"h{c}" for c in range(cols))]
+    data += [tuple(float(r * cols + c) for c in range(cols)) for r in range(rows)]
+    return CellBlock.from_arrays(0, 0, data, [tuple(map(str, row)) for row in data])
+
+
+def test_preview_is_deterministic_and_sampled():
+    block = _block(1000, 4)
+    preview = build_preview(block)
+    assert preview == build_preview(block)
+    assert preview["rows"] == 1000
+    assert len(preview["head"]["rows"]) == 5
+    assert len(preview["sample"]) == 10
+    assert preview["tail"]["first_row"] == 999
+    assert "truncated" not in preview
+
+
+@pytest.mark.parametrize("max_chars", [300, 1500, 3000, PREVIEW_MAX_CHARS])
+def test_wide_sheet_uses_most_of_the_budget(max_chars):
+    preview = build_preview(_block(500, 120), max_chars=max_chars)
+    size = _size(preview)
+    assert size <= max_chars
+    assert size >= max_chars * 0.8
+    assert "truncated" not in preview
+
+
+def test_unreachable_budget_is_reported():
+    preview = build_preview(_block(50, 10), max_chars=40)
+    assert preview["truncated"] is True
+    assert len(preview["columns"]) == 1
+    assert len(preview["head"]["rows"]) == 1
+
+
+def test_small_table_is_shown_whole():
+    data = [("a", "b"), (1.0, "x"), (2.0, "")]
+    preview = build_preview(CellBlock.from_arrays(2, 4, data, [("a", "b"), ("1", "x"), ("2", "")]))
+    assert preview["range"] == "C5:D7"
+    assert preview["head"]["rows"] == [[1, "x"], [2, None]]
+    assert [c["type"] for c in preview["columns"]] == ["number", "text"]
@@ -0,0 +1,186 @@
+"""Unit tests for core.snapshot_cache refresh, eviction and opt-in behaviour."""
+
+import os
+import time
+
+from core.range_fingerprint import RangeFingerprinter
+from core.snapshot_cache import SnapshotCache
+
+
+class _Address:
+    def __init__(self, start_col, start_row, end_col, end_row):
+        self.StartColumn, self.StartRow = start_col, start_row
+        self.EndColumn, self.EndRow = end_col, end_row
+
+
+class _Range:
+    def __init__(self, sheet, bounds):
+        self._sheet = sheet
+        self._bounds = bounds
+
+    def _cells(self, getter):
+        c0, r0, c1, r1 = self._bounds
+        return tuple(tuple(getter(c, r) for c in range(c0, c1 + 1)) for r in range(r0, r1 + 1))
+
+    def getDataArray(self):
+        self._sheet.reads += 1
+        return self._cells(self._sheet.value)
+
+    def getFormulaArray(self):
+        return self._cells(self._sheet.formula)
+
+    def getRangeAddress(self):
+        return _Address(*self._bounds)
+
+
+class _Cursor(_Range):
+    def gotoStartOfUsedArea(self, _expand):
+        pass
+
+    def gotoEndOfUsedArea(self, _expand):
+        pass
+
+
+class _Sheet:
+    """Two value columns over 600 rows (three 256-row tiles)."""
+
+    def __init__(self, name="Sheet1"):
+        self.name = name
+        self.values = {(c, r): float(r * 10 + c) for r in range(600) for c in range(2)}
+        self.reads = 0
+
+    def value(self, c, r):
+        return self.values[(c, r)]
+
+    def formula(self, c, r):
+        return repr(self.values[(c, r)])
+
+    def getName(self):
+        return self.name
+
+    def createCursor(self):
+        return _Cursor(self, (0, 0, 1, 599))
+
+    def getCellRangeByPosition(self, *bounds):
+        return _Range(self, bounds)
+
+
+class _Doc:
+    def __init__(self, sheet, url="file:///tmp/test.ods"):
+        self._sheet = sheet
+        self._url = url
+
+    def getURL(self):
+        return self._url
+
+    def isModified(self):
+        return True
+
+
+class _Bridge:
+    def __init__(self, sheet, url="file:///tmp/test.ods"):
+        self._sheet = sheet
+        self._doc = _Doc(sheet, url)
+        self.fingerprints = RangeFingerprinter(self)
+        self.fingerprints.set_listening(True)
+
+    def get_active_sheet(self):
+        return self._sheet
+
+    def get_active_document(self):
+        return self._doc
+
+
+def _cache(bridge, tmp_path, **kwargs):
+    return SnapshotCache(bridge, directory=tmp_path / "cache", enabled=True, **kwargs)
+
+
+def test_disabled_cache_reads_directly_and_writes_nothing(tmp_path):
+    sheet = _Sheet()
+    cache = SnapshotCache(_Bridge(sheet), directory=tmp_path / "cache")
+    block = cache.load()
+    assert block.value(599, 1) == 5991.0
+    assert not (tmp_path / "cache").exists()
+
+
+def test_refresh_rereads_only_invalidated_tiles(tmp_path):
+    sheet = _Sheet()
+    bridge = _Bridge(sheet)
+    cache = _cache(bridge, tmp_path)
+    cache.load()
+
+    sheet.values[(1, 300)] = -1.0
+    bridge.fingerprints.invalidate("Sheet1", 300, 300, 1, 1)
+    sheet.reads = 0
+    block = cache.load()
+    assert sheet.reads == 1
+    assert block.value(300, 1) == -1.0
+
+
+def test_refresh_does_not_mutate_blocks_already_handed_out(tmp_path):
+    sheet = _Sheet()
+    bridge = _Bridge(sheet)
+    cache = _cache(bridge, tmp_path)
+    cache.load()
+    first = cache.load()
+
+    sheet.values[(0, 10)] = 42.0
+    bridge.fingerprints.invalidate("Sheet1", 10, 10, 0, 0)
+    second = cache.load()
+    assert second.value(10, 0) == 42.0
+    assert first.value(10, 0) == 100.0
+
+
+def test_close_all_releases_maps_and_next_load_remaps(tmp_path):
+    sheet = _Sheet()
+    cache = _cache(_Bridge(sheet), tmp_path)
+    cache.load()
+    cache.load()
+    assert cache._mapped
+    cache.close_all()
+    assert not cache._mapped
+    assert cache.load().value(5, 1) == 51.0
+
+
+def test_disabling_removes_snapshots_from_disk(tmp_path):
+    cache = _cache(_Bridge(_Sheet()), tmp_path)
+    cache.load()
+    cache.load()
+    assert any((tmp_path / "cache").iterdir())
+    cache.set_enabled(False)
+    assert not (tmp_path / "cache").exists()
+    assert not cache._mapped
+
+
+def test_prune_enforces_count_and_age(tmp_path):
+    sheets = [_Sheet(f"S{i}") for i in range(3)]
+    cache = _cache(_Bridge(sheets[0]), tmp_path, max_snapshots=2)
+    for sheet in sheets:
+        cache.bridge._sheet = sheet
+        cache.load()
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    old = time.time() - 30 * 24 * 3600
+    for directory in (tmp_path / "cache").iterdir():
+        os.utime(directory, (old, old))
+    cache.set_enabled(True)
+    assert not any((tmp_path / "cache").iterdir())
+
+
+def test_prune_enforces_total_size(tmp_path):
+    sheets = [_Sheet(f"S{i}") for i in range(2)]
+    cache = _cache(_Bridge(sheets[0]), tmp_path)
+    cache.load()
+    size = sum(f.stat().st_size for d in (tmp_path / "cache").iterdir() for f in d.iterdir())
+
+    cache._max_bytes = size + size // 2
+    cache.bridge._sheet = sheets[1]
+    cache.load()
+    # The older snapshot no longer fits next to the one just written
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_unsaved_documents_are_not_persisted(tmp_path):
+    cache = _cache(_Bridge(_Sheet(), url=""), tmp_path)
+    cache.load()
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,70 @@
+"""Unit tests for core.table_utils."""
+
+import pytest
+
+from core.table_utils import group_aggregate, normalize_key, resolve_columns, row_runs
+
+WIDE_HEADERS = [f"Sütun {i}" for i in range(40)]
+WIDE_HEADERS[5] = "Ad"
+WIDE_HEADERS[7] = "Tutar"
+
+
+def test_header_name_wins_over_column_letter():
+    # "Ad" is also column AD (index 29) in a 40-column table
+    assert resolve_columns(["Ad"], 0, WIDE_HEADERS) == [5]
+    assert resolve_columns([" tutar "], 0, WIDE_HEADERS) == [7]
+
+
+def test_column_letters_are_relative_to_the_table():
+    assert resolve_columns(["AD", "c"], 0, WIDE_HEADERS) == [29, 2]
+    assert resolve_columns(["C"], 2, ["x", "y", "z"]) == [0]
+
+
+def test_unknown_column_raises():
+    with pytest.raises(ValueError):
+        resolve_columns(["Z"], 0, ["a", "b"])
+    with pytest.raises(ValueError):
+        resolve_columns(["Yok"], 0, ["a", "b"])
+
+
+def test_row_runs():
+    assert row_runs([5, 9, 10, 11, 14]) == [(5, 5), (9, 11), (14, 14)]
+    assert row_runs([]) == []
+
+
+def test_normalize_key():
+    assert normalize_key([" Ali ", 1.0]) == (" Ali ", 1.0)
+    assert normalize_key([" Ali ", 1.0], ignore_case=True) == ("ali", 1.0)
+
+
+SALES = [
+    ("Ankara", "A", 10.0),
+    ("İzmir", "B", 5.0),
+    ("Ankara", "B", ""),
+    ("Ankara", "A", 2.5),
+    ("İzmir", "B", "yok"),
+]
+MEASURES = [(2, "sum"), (2, "count"), (2, "mean"), (2, "min"), (2, "max"), (1, "distinct")]
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_group_aggregate(monkeypatch, numpy_available):
+    import core.table_utils as table_utils
+
+    if numpy_available and not table_utils.NUMPY_AVAILABLE:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(table_utils, "NUMPY_AVAILABLE", numpy_available)
+    keys, results = group_aggregate(SALES, [0], MEASURES)
+    assert keys == [("Ankara",), ("İzmir",)]
+    assert results[0] == [12.5, 2, 6.25, 2.5, 10.0, 2]
+    # Non-numeric cells are ignored by sum/mean/min/max but counted
+    assert results[1] == [5.0, 2, 5.0, 5.0, 5.0, 1]
+
+
+def test_group_aggregate_edge_cases():
+    assert group_aggregate([], [0], [(1, "sum")]) == ([], [])
+    keys, results = group_aggregate([("b", 1.0), ("a", 2.0), (1.0, 3.0)], [0], [(1, "sum")])
+    assert keys == [(1.0,), ("a",), ("b",)]
+    assert results == [[3.0], [2.0], [1.0]]
+    with pytest.raises(ValueError):
+        group_aggregate(SALES, [0], [(2, "median")])
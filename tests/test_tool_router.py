@@ -0,0 +1,51 @@
+"""Unit tests for llm.tool_router keyword routing."""
+
+import pytest
+
+from llm.tool_definitions import TOOLS
+from llm.tool_router import CORE_TOOLS, ToolRouter, needs_tools
+
+
+def _user(text):
+    return [{"role": "user", "content": text}]
+
+
+@pytest.fixture
+def router():
+    return ToolRouter(TOOLS, "openrouter")
+
+
+def test_turkish_suffixes_still_match(router):
+    names = router.select_names(_user("B sütununu tabloya göre sırala"))
+    assert {"sort_range", "insert_columns"} <= names
+    assert needs_tools(_user("tabloyu düzenle"))
+
+
+@pytest.mark.parametrize("text, absent", [
+    ("bu tabloyu analiz et", "list_sheets"),  # "tab" in "tablo"
+    ("show me the summary", "find_duplicates"),  # "how" in "show", "sum" in "summary"
+    ("draw an arrow", "insert_rows"),  # "row" in "arrow"
+])
+def test_short_keywords_match_whole_words_only(router, text, absent):
+    names = router.select_names(_user(text))
+    assert names is None or absent not in names
+
+
+def test_short_keywords_still_match_as_words(router):
+    assert "list_sheets" in router.select_names(_user("rename this tab"))
+    assert "insert_rows" in router.select_names(_user("insert two rows"))
+    assert "copy_range" in router.select_names(_user("sum these cells"))
+
+
+def test_ambiguous_request_falls_back_to_all_tools(router):
+    assert router.select_names(_user("merhaba, nasılsın?")) is None
+    assert not needs_tools(_user("merhaba, nasılsın?"))
+
+
+def test_unoffered_tool_call_falls_back_for_the_turn(router):
+    messages = _user("A1'e yaz") + [{
+        "role": "assistant", "content": None,
+        "tool_calls": [{"id": "c1", "function": {"name": "create_chart", "arguments": "{}"}}],
+    }]
+    assert set(CORE_TOOLS) <= router.select_names(_user("A1'e yaz"))
+    assert router.select_names(messages) is None
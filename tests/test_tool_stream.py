@@ -0,0 +1,47 @@
+"""Unit tests for llm.tool_stream incremental tool-call assembly."""
+
+from llm.tool_stream import IncrementalJSONParser, ToolCallAssembler
+
+
+def test_parser_detects_completion_across_chunks():
+    parser = IncrementalJSONParser()
+    assert not parser.feed('{"cell": "A1", "formula": "=\\"}')
+    assert not parser.feed('x\\"" , "n": [1, {')
+    assert parser.feed('}]}')
+    assert parser.value() == {"cell": "A1", "formula": '="}x"', "n": [1, {}]}
+
+
+def _chunk(index, name=None, arguments=None, call_id=None):
+    function = {}
+    if name:
+        function["name"] = name
+    if arguments is not None:
+        function["arguments"] = arguments
+    chunk = {"index": index, "function": function}
+    if call_id:
+        chunk["id"] = call_id
+    return chunk
+
+
+def test_assembler_releases_calls_in_order_as_they_complete():
+    assembler = ToolCallAssembler()
+    assembler.feed([_chunk(0, "write_formula", '{"cell": "A1", ', "c0")])
+    assert assembler.next_ready() is None
+
+    assembler.feed([_chunk(0, arguments='"formula": "1"}'), _chunk(1, "read_cell_range", '{"range', "c1")])
+    position, call = assembler.next_ready()
+    assert position == 0 and call["id"] == "c0"
+    assembler.mark_executed()
+    assert assembler.next_ready() is None
+
+    assembler.feed([_chunk(1, arguments='_name": "A1:B2"}')])
+    position, call = assembler.next_ready()
+    assert position == 1 and call["function"]["arguments"] == '{"range_name": "A1:B2"}'
+
+
+def test_full_calls_with_dict_arguments_are_normalized():
+    assembler = ToolCallAssembler()
+    assembler.feed([{"function": {"name": "list_sheets", "arguments": {"x": 1}}}])
+    position, call = assembler.next_ready()
+    assert position == 0
+    assert call["function"]["arguments"] == '{"x": 1}'
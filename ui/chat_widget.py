@@ -159,6 +159,8 @@ class ChatWidget(QWidget):
 
     message_sent = pyqtSignal(str)
     cancel_requested = pyqtSignal()
+    # Kullanici yazmaya basladiginda (baglanti on isitma icin)
+    input_activity = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -245,6 +247,7 @@ class ChatWidget(QWidget):
         self._input_edit.setFixedHeight(74)
         self._input_edit.setFrameShape(QFrame.NoFrame)
         self._input_edit.setAcceptRichText(False)
+        self._input_edit.textChanged.connect(self._on_input_changed)
         input_v_layout.addWidget(self._input_edit)
 
         # Bottom bar with chips and buttons
@@ -304,6 +307,11 @@ class ChatWidget(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def _on_input_changed(self):
+        """Giris alanina yazildiginda aktivite sinyali yayar."""
+        if not self._is_generating and self._input_edit.toPlainText().strip():
+            self.input_activity.emit()
+
     def _on_send(self):
         """Kullanici mesajini gonderir."""
         text = self._input_edit.toPlainText().strip()
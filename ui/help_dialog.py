@@ -187,10 +187,10 @@ class HelpDialog(QDialog):
     def _get_tools_text(self) -> str:
         if self._lang == "tr":
             return """
-            <b>Okuma:</b> read_cell_range, get_sheet_summary, get_all_formulas, analyze_spreadsheet_structure<br><br>
+            <b>Okuma:</b> read_cell_range, get_sheet_summary, preview_sheet, profile_table, get_all_formulas, analyze_spreadsheet_structure<br><br>
             <b>Yazma:</b> write_formula, set_cell_style, merge_cells, clear_range<br><br>
             <b>Satır/Sütun:</b> insert_rows, insert_columns, delete_rows, delete_columns, set_column_width, set_row_height<br><br>
-            <b>Veri:</b> sort_range, set_auto_filter, set_data_validation, copy_range<br><br>
+            <b>Veri:</b> sort_range, find_duplicates, join_ranges, group_aggregate, set_auto_filter, set_data_validation, copy_range<br><br>
             <b>Biçim:</b> set_conditional_format<br><br>
             <b>Grafik:</b> create_chart<br><br>
             <b>Sayfa:</b> list_sheets, switch_sheet, create_sheet, rename_sheet<br><br>
@@ -198,10 +198,10 @@ class HelpDialog(QDialog):
             """
         else:
             return """
-            <b>Reading:</b> read_cell_range, get_sheet_summary, get_all_formulas, analyze_spreadsheet_structure<br><br>
+            <b>Reading:</b> read_cell_range, get_sheet_summary, preview_sheet, profile_table, get_all_formulas, analyze_spreadsheet_structure<br><br>
             <b>Writing:</b> write_formula, set_cell_style, merge_cells, clear_range<br><br>
             <b>Row/Column:</b> insert_rows, insert_columns, delete_rows, delete_columns, set_column_width, set_row_height<br><br>
-            <b>Data:</b> sort_range, set_auto_filter, set_data_validation, copy_range<br><br>
+            <b>Data:</b> sort_range, find_duplicates, join_ranges, group_aggregate, set_auto_filter, set_data_validation, copy_range<br><br>
             <b>Formatting:</b> set_conditional_format<br><br>
             <b>Charts:</b> create_chart<br><br>
             <b>Sheets:</b> list_sheets, switch_sheet, create_sheet, rename_sheet<br><br>
@@ -216,6 +216,8 @@ class HelpDialog(QDialog):
             <li>Türkçe formül isimleri: TOPLA, EĞER, DÜŞEYARA vb.</li>
             <li>Karmaşık işlemler için adım adım talimat verin</li>
             <li>Hata aldığınızda "hataları tespit et" diyebilirsiniz</li>
+            <li>Plan önbelleği açıksa tekrarlanan istekler kayıtlı plandan yeniden oynatılır;
+            önbelleği atlayıp modele sormak için mesajın başına "!" ekleyin: "!B sütununu topla"</li>
             </ul>
             """
         else:
@@ -225,5 +227,7 @@ class HelpDialog(QDialog):
             <li>LibreOffice formula names: SUM, IF, VLOOKUP etc.</li>
             <li>For complex operations, give step-by-step instructions</li>
             <li>When you get errors, you can say "detect errors"</li>
+            <li>With the plan cache enabled, repeated requests replay a stored plan;
+            start your message with "!" to skip the cache and ask the model: "!Sum column B"</li>
             </ul>
             """
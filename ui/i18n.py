@@ -22,6 +22,10 @@ TRANSLATIONS = {
         "status_lo_connected": "LO: Bağlı",
         "status_lo_disconnected": "LO: Bağlı Değil",
         "status_llm_error": "(hata)",
+        "status_tokens": "Son istek: ~{} token (bütçe {})",
+        "status_tokens_trimmed": "{} araç sonucu özetlendi, {} eski tur çıkarıldı",
+        "status_tools_routed": "{}/{} araç gönderildi (~{} token tasarruf)",
+        "status_cache": "İstem önbelleği: {}/{} token (%{:.0f}), oturum ortalaması %{:.0f}",
         # Themes
         "theme_light": "Açık",
         "theme_dark": "Koyu",
@@ -66,6 +70,18 @@ TRANSLATIONS = {
         "msg_lo_connect_required_for_tool": "Bu işlemi gerçekleştirmek için LibreOffice'e bağlanmam gerekiyor ama bağlantı kurulamadı.\n\nLibreOffice'i şu komutla başlatın:\n`libreoffice --calc --accept=\"socket,host=localhost,port=2002;urp;\"`",
         "msg_llm_error": "Hata oluştu: {}",
         "msg_generation_cancelled": "Yanıt durduruldu.",
+        "msg_plan_completed": "Plan tamamlandı ({} adım).",
+        "msg_plan_replayed": "Önbellekteki plan yeniden oynatıldı ({} adım); model kullanılmadı. Modele yeniden sormak için mesajın başına \"!\" ekleyin.",
+        # Hizli komutlar
+        "msg_fast_write": "{cell} hücresine yazıldı: {formula}",
+        "msg_fast_sum": "{column} sütununun toplamı: {sum} ({count} sayısal hücre). Sayfaya yazılmadı.",
+        "msg_fast_bold": "{range_name} kalın yapıldı.",
+        "msg_fast_italic": "{range_name} italik yapıldı.",
+        "msg_fast_sort_asc": "{range_name} aralığı {column}. sütuna göre artan sıralandı.",
+        "msg_fast_sort_desc": "{range_name} aralığı {column}. sütuna göre azalan sıralandı.",
+        "msg_fast_clear": "{range_name} temizlendi.",
+        "msg_fast_merge": "{range_name} birleştirildi.",
+        "msg_fast_switch_sheet": "{sheet_name} sayfasına geçildi.",
         # Chat Widget
         "chat_placeholder": "ArasAI ile konuşun... (Ctrl+Enter)",
         "chat_send": "Gönder",
@@ -92,6 +108,10 @@ TRANSLATIONS = {
         "status_lo_connected": "LO: Connected",
         "status_lo_disconnected": "LO: Disconnected",
         "status_llm_error": "(error)",
+        "status_tokens": "Last request: ~{} tokens (budget {})",
+        "status_tokens_trimmed": "{} tool results digested, {} old turns dropped",
+        "status_tools_routed": "{}/{} tools sent (~{} tokens saved)",
+        "status_cache": "Prompt cache: {}/{} tokens ({:.0f}%), session average {:.0f}%",
         # Themes
         "theme_light": "Light",
         "theme_dark": "Dark",
@@ -136,6 +156,18 @@ TRANSLATIONS = {
         "msg_lo_connect_required_for_tool": "I need to connect to LibreOffice to perform this action but the connection failed.\n\nPlease start LibreOffice with:\n`libreoffice --calc --accept=\"socket,host=localhost,port=2002;urp;\"`",
         "msg_llm_error": "An error occurred: {}",
         "msg_generation_cancelled": "Response stopped.",
+        "msg_plan_completed": "Plan completed ({} steps).",
+        "msg_plan_replayed": "Replayed a cached plan ({} steps); the model was not used. Start your message with \"!\" to ask the model again.",
+        # Fast commands
+        "msg_fast_write": "Wrote {formula} to {cell}.",
+        "msg_fast_sum": "Sum of column {column}: {sum} ({count} numeric cells). Nothing was written to the sheet.",
+        "msg_fast_bold": "Made {range_name} bold.",
+        "msg_fast_italic": "Made {range_name} italic.",
+        "msg_fast_sort_asc": "Sorted {range_name} by column {column}, ascending.",
+        "msg_fast_sort_desc": "Sorted {range_name} by column {column}, descending.",
+        "msg_fast_clear": "Cleared {range_name}.",
+        "msg_fast_merge": "Merged {range_name}.",
+        "msg_fast_switch_sheet": "Switched to sheet {sheet_name}.",
         # Chat Widget
         "chat_placeholder": "Talk to ArasAI... (Ctrl+Enter)",
         "chat_send": "Send",
@@ -1,9 +1,11 @@
 """Ana uygulama penceresi - Minimal chat arayuzu (Claude Excel benzeri)."""
 
+import asyncio
 import json
 import logging
+import time
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from PyQt5.QtWidgets import (
     QMainWindow,
     QAction,
@@ -21,9 +23,21 @@ from PyQt5.QtWidgets import (
 
 from config.settings import Settings
 from core import LibreOfficeBridge, CellInspector, CellManipulator, SheetAnalyzer, ErrorDetector
+from core import SheetContextCache, get_event_listener_class
+from core.sheet_context import NO_CONNECTION_CONTEXT
 from llm import OpenRouterProvider, OllamaProvider, GeminiProvider, GroqProvider
-from llm.tool_definitions import TOOLS, ToolDispatcher
-from llm.prompt_templates import SYSTEM_PROMPT
+from llm import http_transport
+from llm.async_runtime import get_runtime
+from llm.command_parser import parse_command
+from llm.context_budget import ContextBudget
+from llm.hedging import get_tracker, hedged_stream, tracked_stream
+from llm.plan_cache import BYPASS_PREFIX, REPLAY_CALL_ID, get_plan_cache, turn_steps
+from llm.prewarm import PrewarmGate
+from llm.prompt_cache import get_cache_stats, with_dynamic_context
+from llm.tool_definitions import PLAN_TOOL, READ_ONLY_TOOLS, TOOLS, ToolDispatcher
+from llm.tool_router import ToolRouter
+from llm.tool_stream import ToolCallAssembler
+from llm.prompt_templates import PLAN_MODE_PROMPT, SYSTEM_PROMPT
 
 from .chat_widget import ChatWidget
 from .settings_dialog import SettingsDialog
@@ -35,34 +49,46 @@ from .i18n import get_text
 logger = logging.getLogger(__name__)
 
 
-class LLMStreamWorker(QThread):
-    """Arka plan is parcaciginda LLM stream isteklerini calistirir."""
+class LLMStreamTask(QObject):
+    """LLM stream istegini ortak asyncio dongusunde calistirir.
+
+    Her istek icin ayri QThread yerine tek olay dongusu kullanilir; parcalar
+    Qt sinyalleriyle arayuz is parcacigina aktarilir. cancel() HTTP akisini
+    aninda keser.
+    """
 
     chunk = pyqtSignal(dict)
     finished = pyqtSignal()
     error = pyqtSignal(str)
 
-    def __init__(self, provider, messages, tools=None, parent=None):
+    def __init__(self, stream, parent=None):
         super().__init__(parent)
-        self._provider = provider
-        self._messages = messages
-        self._tools = tools
+        self._stream = stream
+        self._future = None
+
+    def start(self):
+        self._future = get_runtime().submit(self._run())
+
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def cancel(self):
+        if self._future is not None:
+            self._future.cancel()
 
-    def run(self):
+    async def _run(self):
         try:
-            if self.isInterruptionRequested():
-                self.finished.emit()
-                return
-            for part in self._provider.stream_completion(self._messages, self._tools):
-                if self.isInterruptionRequested():
-                    self.finished.emit()
-                    return
+            async for part in self._stream:
                 self.chunk.emit(part)
                 if part.get("done"):
                     break
             self.finished.emit()
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:
             self.error.emit(str(exc))
+        finally:
+            await self._stream.aclose()
 
 
 class MainWindow(QMainWindow):
@@ -73,16 +99,28 @@ class MainWindow(QMainWindow):
         self._settings = Settings()
         self._bridge = None
         self._provider = None
+        self._hedge_provider = None
         self._dispatcher = None
+        self._sheet_context = None
+        self._event_listener = None
         self._conversation = []
         self._stream_worker = None
         self._skip_lo_connect = skip_lo_connect
         self._stream_content = ""
-        self._stream_tool_calls_indexed = {}
-        self._stream_tool_calls_full = []
+        self._tool_assembler = ToolCallAssembler()
+        self._early_results = {}
         self._stream_has_tool_calls = False
         self._stream_started = False
         self._stop_requested = False
+        self._prewarm_gate = PrewarmGate()
+        self._warmup_future = None
+        self._stream_started_at = 0.0
+        self._stream_warm_saving = 0.0
+        self._last_token_report = None
+        self._last_usage = None
+        # Plan onbellegine kaydedilecek tur: (istek, sema parmak izi)
+        self._turn_cache = None
+        self._plan_replayed = False
 
         self._current_lang = self._settings.language
 
@@ -249,6 +287,7 @@ class MainWindow(QMainWindow):
         self._chat_widget = ChatWidget()
         self._chat_widget.message_sent.connect(self._on_message_sent)
         self._chat_widget.cancel_requested.connect(self._on_cancel_requested)
+        self._chat_widget.input_activity.connect(self._on_input_activity)
         main_layout.addWidget(self._chat_widget, 1)
 
         status_frame = QFrame()
@@ -444,17 +483,27 @@ class MainWindow(QMainWindow):
         self._update_status_bar()
         self._update_provider_model_label()
 
+    @staticmethod
+    def _create_provider(name: str):
+        """Isimden LLM saglayici nesnesi olusturur."""
+        if name == "ollama":
+            return OllamaProvider()
+        if name == "gemini":
+            return GeminiProvider()
+        if name == "groq":
+            return GroqProvider()
+        return OpenRouterProvider()
+
     def _init_provider(self):
         """Aktif LLM saglayicisini baslatir."""
+        # Eski saglayiciyi birak; paylasilan HTTP havuzu acik kalir ve
+        # yeni saglayici sicak baglantilari yeniden kullanir.
+        if self._provider:
+            self._provider.close()
+            self._provider = None
+        self._init_hedge_provider()
         try:
-            if self._settings.provider == "ollama":
-                self._provider = OllamaProvider()
-            elif self._settings.provider == "gemini":
-                self._provider = GeminiProvider()
-            elif self._settings.provider == "groq":
-                self._provider = GroqProvider()
-            else:
-                self._provider = OpenRouterProvider()
+            self._provider = self._create_provider(self._settings.provider)
             self._update_status_bar()
             self._update_provider_model_label()
         except Exception as exc:
@@ -463,6 +512,48 @@ class MainWindow(QMainWindow):
             self._update_status_bar()
             self._update_provider_model_label()
 
+    def _init_hedge_provider(self):
+        """Hedging aciksa ikincil (yedek) saglayiciyi baslatir."""
+        if self._hedge_provider:
+            self._hedge_provider.close()
+            self._hedge_provider = None
+        if not self._settings.hedging_enabled or not self._settings.hedge_provider:
+            return
+        try:
+            self._hedge_provider = self._create_provider(self._settings.hedge_provider)
+            if self._settings.hedge_model:
+                self._hedge_provider.set_model(self._settings.hedge_model)
+        except Exception as exc:
+            logger.warning("Hedge saglayicisi baslatilamadi: %s", exc)
+            self._hedge_provider = None
+
+    def _hedge_key(self) -> tuple:
+        """Ikincil saglayici icin istatistik anahtari."""
+        provider = self._settings.hedge_provider
+        model = self._settings.hedge_model or self._settings.get(f"{provider}_default_model", "")
+        return (provider, model)
+
+    def _build_stream(self, messages, tools):
+        """Aktif ayarlara gore (gerekirse hedge edilmis) asenkron akis olusturur."""
+        primary_key = self._provider_key()
+        if not self._hedge_provider:
+            return tracked_stream(primary_key, self._provider, messages, tools)
+
+        tracker = get_tracker()
+        candidates = [
+            (primary_key, self._provider),
+            (self._hedge_key(), self._hedge_provider),
+        ]
+        if self._settings.hedge_auto_primary:
+            best = tracker.choose_primary([key for key, _ in candidates])
+            if best:
+                candidates.reverse()
+                logger.info("Olcumlere gore birincil saglayici: %s", candidates[0][0])
+        delay = tracker.hedge_delay(
+            candidates[0][0], self._settings.hedge_percentile, self._settings.hedge_delay
+        )
+        return hedged_stream(candidates, messages, tools, delay=delay, tracker=tracker)
+
     def _update_provider_model_label(self):
         """Saglayici ve model bilgisini sohbet giris alaninda gunceller."""
         if not hasattr(self, "_chat_widget"):
@@ -542,10 +633,45 @@ class MainWindow(QMainWindow):
         if hasattr(self, "_chat_widget"):
             self._chat_widget.clear_chat()
 
+    def _provider_key(self) -> tuple:
+        """On isitma kapisi icin aktif saglayici/model anahtari."""
+        provider = self._settings.provider
+        model = self._settings.get(f"{provider}_default_model", "")
+        return (provider, model)
+
+    def _on_input_activity(self):
+        """Kullanici yazarken aktif saglayiciyi arka planda isitir."""
+        if not self._provider:
+            return
+        if self._warmup_future and not self._warmup_future.done():
+            return
+        key = self._provider_key()
+        if not self._prewarm_gate.try_begin(key):
+            return
+
+        def _on_done(future):
+            failed = future.cancelled() or future.exception() is not None
+            self._prewarm_gate.finish(key, 0.0 if failed else future.result())
+
+        # Isitma istek akisiyla ayni dongude eszamanli calisir
+        self._warmup_future = get_runtime().submit(self._provider.awarm_up())
+        self._warmup_future.add_done_callback(_on_done)
+
     def _on_message_sent(self, text: str):
         """Kullanici mesaji gonderildiginde cagirilir."""
+        # "!" ile baslayan mesajlar plan onbellegini atlar
+        bypass_cache = text.startswith(BYPASS_PREFIX)
+        if bypass_cache:
+            text = text[len(BYPASS_PREFIX):].strip() or text
         self._chat_widget.add_message("user", text)
         self._conversation.append({"role": "user", "content": text})
+        self._turn_cache = None
+        self._plan_replayed = False
+
+        if self._try_fast_command(text):
+            return
+        if not bypass_cache and self._try_plan_cache(text):
+            return
 
         self._chat_widget.set_input_enabled(False)
         self._chat_widget.set_generating(True)
@@ -554,6 +680,172 @@ class MainWindow(QMainWindow):
 
         self._send_to_llm()
 
+    def _used_rows(self) -> tuple[int, int] | None:
+        """Aktif sayfanin kullanilan alaninin (ilk satir, son satir) numaralari."""
+        try:
+            used_range = SheetAnalyzer(self._bridge).get_sheet_summary()["used_range"]
+            start, end = LibreOfficeBridge.parse_range_string(used_range)
+        except Exception as exc:
+            logger.debug("Kullanilan alan okunamadi: %s", exc)
+            return None
+        return start[1] + 1, end[1] + 1
+
+    def _try_fast_command(self, text: str) -> bool:
+        """Basit komutlari LLM'ye gitmeden dogrudan yurutur.
+
+        Metin bilinen bir kaliba tam uyuyorsa tek arac cagrisi yapilir ve
+        sonuc komutun sablonuyla asistan mesaji olarak eklenir. Kalip taninmazsa veya arac hata
+        dondururse False doner ve istek her zamanki gibi LLM'ye gider.
+
+        Returns:
+            Komut yerel olarak islendiyse True.
+        """
+        if not self._dispatcher or not self._settings.get("fast_commands_enabled", True):
+            return False
+        command = parse_command(text, self._used_rows)
+        if command is None:
+            return False
+
+        started = time.perf_counter()
+        tool_result = self._dispatcher.dispatch(command.tool_name, command.arguments)
+        try:
+            payload = json.loads(tool_result)
+        except json.JSONDecodeError:
+            payload = {}
+        if "error" in payload or "result" not in payload:
+            logger.debug("Hizli komut basarisiz, LLM'ye yonlendiriliyor: %s", payload.get("error"))
+            return False
+
+        reply = self._fast_reply(command, payload["result"])
+        self._chat_widget.add_message("assistant", reply)
+        self._conversation.append({"role": "assistant", "content": reply})
+        logger.debug(
+            "Hizli komut (%s) %.1f ms'de yurutuldu",
+            command.tool_name, (time.perf_counter() - started) * 1000,
+        )
+        return True
+
+    def _fast_reply(self, command, result) -> str:
+        """Hizli komut sonucunu komutun i18n sablonuyla metne cevirir."""
+        fields = dict(command.arguments)
+        if isinstance(result, dict):
+            fields.update(result)
+        if "sort_column" in fields:
+            # Kullaniciya 1 tabanli sutun sirasi gosterilir
+            fields["column"] = fields["sort_column"] + 1
+        for key, value in fields.items():
+            if isinstance(value, float) and value.is_integer():
+                fields[key] = int(value)
+        return get_text(f"msg_{command.reply_key}", self._current_lang).format(**fields)
+
+    def _try_plan_cache(self, text: str) -> bool:
+        """Ayni duzendeki sayfada daha once yurutulen plani yeniden oynatir.
+
+        Once yalnizca sema parmak izi alinir. Sayfa icerik ozeti tum sayfayi
+        okudugu icin yalnizca eslesen kayit veri okuyarak kaydedilmisse ve
+        degisiklik dinleyicisi karo ozetlerini onbellege aliyorsa hesaplanir;
+        dinleyici yoksa boyle kayitlar yeniden oynatilmaz. Isabet yoksa turun
+        sonunda kaydedilmek uzere istek, sema ve (yalnizca dinleyici varsa,
+        karo onbellegiyle ucuz olan) icerik ozeti saklanir. Yeniden oynatma
+        basarisiz olursa kayit silinir, model sonucu gorerek devam eder ve
+        duzeltilmis tur kaydedilir.
+
+        Returns:
+            Plan onbellekten basariyla yurutulduyse True.
+        """
+        if not self._dispatcher or not self._settings.get("plan_cache_enabled", False):
+            return False
+        try:
+            analyzer = SheetAnalyzer(self._bridge)
+            schema = analyzer.get_schema_fingerprint()
+        except Exception as exc:
+            logger.debug("Sema parmak izi alinamadi: %s", exc)
+            return False
+
+        digests = []
+
+        def current_digest() -> str | None:
+            if not digests:
+                digest = None
+                if self._bridge.fingerprints.listening:
+                    try:
+                        digest = analyzer.get_sheet_digest()["digest"]
+                    except Exception as exc:
+                        logger.debug("Sayfa ozeti hesaplanamadi: %s", exc)
+                digests.append(digest)
+            return digests[0]
+
+        cache = get_plan_cache()
+        cached = cache.get(text, schema, current_digest)
+        if cached is None:
+            # Turda veri okunursa kayit icin tur oncesi ozet gerekir; dinleyici
+            # yokken None kalir ve veriden turemis plan kaydedilmez
+            self._turn_cache = (text, schema, current_digest())
+            return False
+        # Yeniden oynatma sayfayi degistirir; ozet bundan sonra alinmaz
+        self._turn_cache = (text, schema, digests[0] if digests else None)
+
+        plan_tool = PLAN_TOOL["function"]["name"]
+        tool_result = self._dispatcher.dispatch(plan_tool, cached)
+        self._conversation.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": REPLAY_CALL_ID,
+                "type": "function",
+                "function": {"name": plan_tool, "arguments": json.dumps(cached, ensure_ascii=False)},
+            }],
+        })
+        self._conversation.append({"role": "tool", "tool_call_id": REPLAY_CALL_ID, "content": tool_result})
+        self._plan_replayed = True
+
+        try:
+            result = json.loads(tool_result).get("result")
+        except json.JSONDecodeError:
+            result = None
+        if not isinstance(result, dict) or result.get("needs_model", True):
+            cache.invalidate(text, schema)
+            return False
+
+        self._turn_cache = None
+        # Yeniden oynatilan yazmalar kullaniciya her zaman belirtilir
+        reply = get_text("msg_plan_replayed", self._current_lang).format(len(result.get("steps") or []))
+        if cached["summary"]:
+            reply = f"{reply}\n\n{cached['summary']}"
+        self._chat_widget.add_message("assistant", reply)
+        self._conversation.append({"role": "assistant", "content": reply})
+        return True
+
+    def _turn_steps(self) -> tuple[list[dict], bool] | None:
+        """Son kullanici mesajindan bu yana yurutulen degistirici adimlari toplar.
+
+        Returns:
+            (adimlar, veri okundu mu) ikilisi; turda hata varsa veya sayfa
+            degismediyse None.
+        """
+        start = max(
+            (i for i, msg in enumerate(self._conversation) if msg.get("role") == "user"),
+            default=-1,
+        )
+        return turn_steps(self._conversation[start + 1:], PLAN_TOOL["function"]["name"], READ_ONLY_TOOLS)
+
+    def _remember_plan(self, reply: str):
+        """Basariyla biten turun adimlarini plan onbellegine kaydeder."""
+        if not self._turn_cache:
+            return
+        request, schema, digest = self._turn_cache
+        self._turn_cache = None
+        turn = self._turn_steps()
+        if not turn:
+            return
+        steps, reads_data = turn
+        # Veriden turemis adimlar yalnizca ayni icerikte yeniden oynatilir
+        if reads_data and digest is None:
+            logger.debug("Sayfa ozeti yok; veriden turemis plan kaydedilmedi")
+            return
+        get_plan_cache().put(request, schema, steps, reply, data_digest=digest if reads_data else None)
+        logger.debug("Plan onbellege kaydedildi: %d adim", len(steps))
+
     def _send_to_llm(self):
         """Mevcut sohbet gecmisini LLM'ye gonderir."""
         if self._stop_requested:
@@ -571,71 +863,82 @@ class MainWindow(QMainWindow):
             )
             return
 
+        # Sistem istemi sabit tutulur (saglayici onek onbellegi); degisen
+        # sayfa/secim baglami son kullanici mesajina eklenir
         dynamic_context = self._build_dynamic_context()
-        full_system_prompt = SYSTEM_PROMPT + dynamic_context
-
-        messages = [{"role": "system", "content": full_system_prompt}] + self._conversation
-
-        tools = TOOLS
+        plan_mode = self._settings.get("llm_plan_mode", False)
+        system_prompt = SYSTEM_PROMPT + PLAN_MODE_PROMPT if plan_mode else SYSTEM_PROMPT
+        system_message = {"role": "system", "content": system_prompt}
+        # Yalnizca istekle ilgili arac semalari gonderilir
+        router = ToolRouter(TOOLS, self._settings.provider)
+        tools, tool_report = router.select(self._conversation)
+        if plan_mode or self._plan_replayed:
+            # Plan araci yonlendirmeden bagimsiz olarak her zaman sunulur
+            tools = tools + [PLAN_TOOL]
+
+        # Giden kopya token butcesine sigdirilir; butce asilirsa eski buyuk
+        # arac sonuclari ozetlenir. Asil gecmis degismez (onek onbellegi).
+        budget = ContextBudget(self._settings.provider)
+        fixed_tokens = budget.estimator.estimate_messages([system_message], tools)
+        fixed_tokens += budget.estimator.estimate_text(dynamic_context)
+        outgoing, report = budget.fit(self._conversation, fixed_tokens)
+        report["tools"] = tool_report
+        self._last_token_report = report
+        self._update_token_tooltip()
+
+        messages = [system_message] + with_dynamic_context(outgoing, dynamic_context)
         self._start_stream(messages, tools)
 
-    def _build_dynamic_context(self) -> str:
-        """LLM için dinamik bağlam bilgisi oluşturur."""
-        if not self._bridge or not self._bridge.is_connected:
-            return "\n\n## MEVCUT DURUM\nLibreOffice bağlantısı yok."
-
-        context_parts = ["\n\n## MEVCUT DURUM"]
-
-        try:
-            analyzer = SheetAnalyzer(self._bridge)
-            summary = analyzer.get_sheet_summary()
-
-            context_parts.append(f"Sayfa: {summary.get('sheet_name', 'Bilinmiyor')}")
-            context_parts.append(f"Kullanılan Aralık: {summary.get('used_range', '-')}")
-            context_parts.append(f"Boyut: {summary.get('row_count', 0)} satır x {summary.get('col_count', 0)} sütun")
-
-            headers = summary.get('headers', [])
-            if headers and any(headers):
-                header_str = ", ".join([h or "(boş)" for h in headers[:10]])
-                if len(headers) > 10:
-                    header_str += f"... (+{len(headers)-10} sütun)"
-                context_parts.append(f"Başlıklar: {header_str}")
-
-        except Exception as e:
-            logger.debug("Sayfa özeti alınamadı: %s", e)
-            context_parts.append("Sayfa bilgisi alınamadı.")
-
-        try:
-            doc = self._bridge.get_active_document()
-            controller = doc.getCurrentController()
-            selection = controller.getSelection()
-            address = LibreOfficeBridge.get_selection_address(selection)
-            context_parts.append(f"Seçili Hücre: {address}")
-
-            if selection and hasattr(selection, 'getString'):
-                value = selection.getString() or selection.getValue()
-                formula = selection.getFormula()
-                if formula:
-                    context_parts.append(f"Seçili Formül: {formula}")
-                elif value:
-                    context_parts.append(f"Seçili Değer: {value}")
+    def _update_token_tooltip(self):
+        """Son istegin token tahminini durum cubugu ipucunda gosterir."""
+        report = self._last_token_report
+        if not report or not hasattr(self, "_llm_status_label"):
+            return
+        lang = self._current_lang
+        text = get_text("status_tokens", lang).format(report["after"], report["budget"])
+        if report["digested"] or report["dropped_turns"]:
+            text += "\n" + get_text("status_tokens_trimmed", lang).format(
+                report["digested"], report["dropped_turns"]
+            )
+        usage = self._last_usage
+        if usage and usage.get("prompt_tokens"):
+            cached = usage.get("cached_tokens", 0)
+            session_rate = get_cache_stats().hit_rate(self._provider_key())
+            text += "\n" + get_text("status_cache", lang).format(
+                cached, usage["prompt_tokens"],
+                100.0 * cached / usage["prompt_tokens"],
+                100.0 * (session_rate or 0.0),
+            )
+        tool_report = report.get("tools")
+        if tool_report and not tool_report["fallback"]:
+            text += "\n" + get_text("status_tools_routed", lang).format(
+                tool_report["offered"], tool_report["total"], tool_report["saved_tokens"]
+            )
+        self._llm_status_label.setToolTip(text)
 
-        except Exception as e:
-            logger.debug("Seçili hücre bilgisi alınamadı: %s", e)
+    def _build_dynamic_context(self) -> str:
+        """LLM için dinamik bağlam bilgisi oluşturur.
 
-        return "\n".join(context_parts)
+        Bağlam önbellekten gelir; dinleyiciler geçersiz kıldığında arka planda
+        yenilenir, gönderim yenilemeyi beklemez.
+        """
+        if not self._sheet_context or not self._bridge or not self._bridge.is_connected:
+            return NO_CONNECTION_CONTEXT
+        return self._sheet_context.get()
 
     def _start_stream(self, messages, tools):
         """LLM stream istegini baslatir."""
         self._stream_content = ""
-        self._stream_tool_calls_indexed = {}
-        self._stream_tool_calls_full = []
+        self._tool_assembler = ToolCallAssembler()
+        self._early_results = {}
         self._stream_has_tool_calls = False
         self._stream_started = False
+        self._stream_started_at = time.monotonic()
+        self._stream_warm_saving = self._prewarm_gate.mark_used(self._provider_key())
 
         self._chat_widget.start_stream_message("assistant")
 
-        self._stream_worker = LLMStreamWorker(self._provider, messages, tools, self)
+        self._stream_worker = LLMStreamTask(self._build_stream(messages, tools), self)
         self._stream_worker.chunk.connect(self._on_llm_stream_chunk)
         self._stream_worker.finished.connect(self._on_llm_stream_finished)
         self._stream_worker.error.connect(self._on_llm_stream_error)
@@ -643,15 +946,31 @@ class MainWindow(QMainWindow):
 
     def _on_llm_stream_chunk(self, part: dict):
         """Stream parçası geldiğinde çağrılır."""
+        if self._stop_requested:
+            # Iptalden once kuyruga girmis parcalar
+            return
         if not self._stream_started:
             self._stream_started = True
+            ttft_ms = (time.monotonic() - self._stream_started_at) * 1000
+            if self._stream_warm_saving:
+                logger.info(
+                    "Ilk token: %.0f ms (on isitma ~%.0f ms kazandirdi)",
+                    ttft_ms, self._stream_warm_saving * 1000,
+                )
+            else:
+                logger.debug("Ilk token: %.0f ms", ttft_ms)
+
+        if part.get("usage"):
+            self._last_usage = part["usage"]
+            self._update_token_tooltip()
 
         content = part.get("content") or ""
         tool_calls = part.get("tool_calls")
 
         if tool_calls:
             self._stream_has_tool_calls = True
-            self._accumulate_tool_calls(tool_calls)
+            self._tool_assembler.feed(tool_calls)
+            self._run_early_tools()
             names = []
             for tc in tool_calls:
                 name = (tc.get("function") or {}).get("name")
@@ -676,6 +995,7 @@ class MainWindow(QMainWindow):
 
     def _on_llm_stream_error(self, error_msg: str):
         """Stream hatası alındığında çağrılır."""
+        self._commit_early_results()
         self._chat_widget.hide_loading()
         self._chat_widget.set_generating(False)
         self._chat_widget.set_input_enabled(True)
@@ -684,43 +1004,63 @@ class MainWindow(QMainWindow):
             "assistant", get_text("msg_llm_error", self._current_lang).format(error_msg)
         )
 
-    def _accumulate_tool_calls(self, tool_calls: list):
-        """Stream sırasında tool_call parçalarını birleştirir."""
-        for tc in tool_calls:
-            index = tc.get("index")
-            if index is None:
-                if "function" in tc:
-                    self._stream_tool_calls_full.append(tc)
-                continue
-
-            existing = self._stream_tool_calls_indexed.setdefault(index, {
-                "id": tc.get("id", ""),
-                "type": tc.get("type", "function"),
-                "function": {"name": "", "arguments": ""},
-            })
+    def _run_early_tools(self):
+        """Akis surerken tamamlanan arac cagrilarini sirayla yurutur.
+
+        Yalnizca okuma araclari erken yurutulur. Sonuclar ``_early_results``'ta
+        saklanir ve ``_handle_tool_calls`` tarafindan yeniden yurutulmeden
+        kullanilir. Siradaki cagri tamamlanmadan veya bir yazma aracina
+        gelindiginde durulur; boylece cagrilarin sirasi korunur. Yazma araclari
+        akis bitmeden yurutulmez: akis hata verirse kullanici yalnizca hata
+        mesajini gorur, sayfada yapilmis degisikligi gormezdi.
+        """
+        # Eski "all" degeri de "read" gibi davranir
+        mode = self._settings.get("llm_early_tool_execution", "read")
+        if mode not in ("read", "all") or not self._dispatcher or self._stop_requested:
+            return
+        while True:
+            ready = self._tool_assembler.next_ready()
+            if ready is None:
+                return
+            position, tc = ready
+            func = tc.get("function", {})
+            tool_name = func.get("name", "")
+            if tool_name not in READ_ONLY_TOOLS:
+                return
+            try:
+                arguments = json.loads(func.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                return
+            logger.debug("Arac akis sirasinda erken yurutuluyor: %s", tool_name)
+            self._early_results[position] = self._dispatcher.dispatch(tool_name, arguments)
+            self._tool_assembler.mark_executed()
 
-            if "id" in tc and tc["id"]:
-                existing["id"] = tc["id"]
-            if "type" in tc and tc["type"]:
-                existing["type"] = tc["type"]
+    def _commit_early_results(self):
+        """Akis yarida kaldiginda erken yurutulen okuma cagrilarini gecmise isler.
 
-            func = tc.get("function", {})
-            if "name" in func and func["name"]:
-                existing["function"]["name"] = func["name"]
-            if "arguments" in func and func["arguments"]:
-                existing["function"]["arguments"] += func["arguments"]
+        Sonuclar zaten alinmistir; model bir sonraki turda ayni okumalari
+        tekrarlamak zorunda kalmaz.
+        """
+        if not self._early_results:
+            return
+        calls = self._tool_assembler.calls()
+        executed = [calls[i] for i in sorted(self._early_results)]
+        self._conversation.append({"role": "assistant", "content": None, "tool_calls": executed})
+        for position in sorted(self._early_results):
+            self._conversation.append({
+                "role": "tool",
+                "tool_call_id": calls[position].get("id", ""),
+                "content": self._early_results[position],
+            })
+        self._early_results = {}
 
     def _finalize_stream(self):
         """Stream bitince sohbeti finalize eder."""
-        tool_calls = []
-        if self._stream_tool_calls_indexed:
-            for idx in sorted(self._stream_tool_calls_indexed.keys()):
-                tool_calls.append(self._stream_tool_calls_indexed[idx])
-        if self._stream_tool_calls_full:
-            tool_calls.extend(self._stream_tool_calls_full)
+        tool_calls = self._tool_assembler.calls()
 
         if tool_calls:
             if self._stop_requested:
+                self._commit_early_results()
                 self._chat_widget.hide_loading()
                 self._chat_widget.set_generating(False)
                 self._chat_widget.set_input_enabled(True)
@@ -760,6 +1100,7 @@ class MainWindow(QMainWindow):
 
         if self._stream_content:
             self._conversation.append({"role": "assistant", "content": self._stream_content})
+            self._remember_plan(self._stream_content)
             self._chat_widget.end_stream_message()
             self._chat_widget.hide_loading()
             self._chat_widget.set_generating(False)
@@ -773,10 +1114,9 @@ class MainWindow(QMainWindow):
     def _on_cancel_requested(self):
         """Kullanıcı üretimi iptal etmek istedi."""
         self._stop_requested = True
-        if self._stream_worker and self._stream_worker.isRunning():
-            self._stream_worker.requestInterruption()
-            self._stream_worker.quit()
-            self._stream_worker.wait(300)
+        self._commit_early_results()
+        if self._stream_worker and self._stream_worker.is_running():
+            self._stream_worker.cancel()
 
         self._chat_widget.hide_loading()
         self._chat_widget.set_generating(False)
@@ -798,8 +1138,13 @@ class MainWindow(QMainWindow):
             "content": None,
             "tool_calls": tool_calls,
         })
+        # Akis sirasinda yurutulmus cagrilarin sonuclari
+        early_results, self._early_results = self._early_results, {}
+        # Yalnizca basariyla biten planlar varsa LLM'ye geri donulmez
+        plan_summaries = []
+        needs_model = False
 
-        for tc in tool_calls:
+        for position, tc in enumerate(tool_calls):
             if self._stop_requested:
                 self._chat_widget.hide_loading()
                 self._chat_widget.set_generating(False)
@@ -811,12 +1156,13 @@ class MainWindow(QMainWindow):
 
             func = tc.get("function", {})
             tool_name = func.get("name", "")
-            try:
-                arguments = json.loads(func.get("arguments", "{}"))
-            except json.JSONDecodeError:
-                arguments = {}
-
-            tool_result = self._dispatcher.dispatch(tool_name, arguments)
+            tool_result = early_results.get(position)
+            if tool_result is None:
+                try:
+                    arguments = json.loads(func.get("arguments") or "{}")
+                except json.JSONDecodeError:
+                    arguments = {}
+                tool_result = self._dispatcher.dispatch(tool_name, arguments)
 
             try:
                 tool_payload = json.loads(tool_result)
@@ -826,6 +1172,14 @@ class MainWindow(QMainWindow):
                 err_msg = tool_payload.get("error", "Bilinmeyen tool hatası")
                 logger.error("Tool hatası (%s): %s", tool_name, err_msg)
 
+            plan = tool_payload.get("result") if tool_name == PLAN_TOOL["function"]["name"] else None
+            if isinstance(plan, dict) and not plan.get("needs_model", True):
+                plan_summaries.append(plan.get("summary") or get_text(
+                    "msg_plan_completed", self._current_lang
+                ).format(len(plan.get("steps") or [])))
+            else:
+                needs_model = True
+
             self._conversation.append({
                 "role": "tool",
                 "tool_call_id": tc.get("id", ""),
@@ -837,8 +1191,81 @@ class MainWindow(QMainWindow):
             self._chat_widget.set_generating(False)
             self._chat_widget.set_input_enabled(True)
             return
+        if not needs_model:
+            reply = "\n\n".join(plan_summaries)
+            self._conversation.append({"role": "assistant", "content": reply})
+            self._remember_plan(reply)
+            self._chat_widget.hide_loading()
+            self._chat_widget.set_generating(False)
+            self._chat_widget.set_input_enabled(True)
+            self._chat_widget.add_message("assistant", reply)
+            return
         self._send_to_llm()
 
+    def closeEvent(self, event):
+        """Pencere kapanirken saglayiciyi, anlik goruntu eslemelerini ve HTTP havuzlarini kapatir."""
+        if self._stream_worker and self._stream_worker.is_running():
+            self._stream_worker.cancel()
+        if self._warmup_future and not self._warmup_future.done():
+            self._warmup_future.cancel()
+        if self._provider:
+            self._provider.close()
+            self._provider = None
+        if self._hedge_provider:
+            self._hedge_provider.close()
+            self._hedge_provider = None
+        self._stop_context_cache()
+        if self._bridge:
+            self._bridge.snapshots.close_all()
+        http_transport.close_all()
+        get_runtime().stop()
+        super().closeEvent(event)
+
+    def _start_context_cache(self):
+        """Sayfa baglami onbellegini ve onu gecersiz kilan dinleyicileri baslatir."""
+        self._stop_context_cache()
+        self._bridge.snapshots.set_enabled(self._settings.get("snapshot_cache_enabled", False))
+        self._sheet_context = SheetContextCache(self._bridge)
+        listening = False
+        try:
+            listener = get_event_listener_class()(self._bridge)
+            listener.selection_changed.connect(self._sheet_context.invalidate)
+            listener.content_modified.connect(self._sheet_context.invalidate)
+            listener.cells_changed.connect(self._on_cells_changed)
+            listener.start()
+            self._event_listener = listener
+            listening = listener.is_listening
+            self._sheet_context.set_listening(listening)
+            # Karo ozetleri yalnizca degisen araliklar bildiriliyorsa onbellege alinir
+            self._bridge.fingerprints.set_listening(listener.has_change_details)
+        except Exception as exc:
+            logger.debug("Olay dinleyicisi baslatilamadi: %s", exc)
+        if listening:
+            # Ilk istegi beklemeden baglami arka planda hazirla
+            self._sheet_context.invalidate()
+
+    def _on_cells_changed(self, changes: list):
+        """Degisen araliklarin karo ozetlerini gecersiz kilar."""
+        fingerprints = self._bridge.fingerprints
+        for sheet_name, addr in changes:
+            if sheet_name is None:
+                fingerprints.invalidate()
+            elif addr is None:
+                fingerprints.invalidate(sheet_name)
+            else:
+                fingerprints.invalidate_address(sheet_name, addr)
+
+    def _stop_context_cache(self):
+        """Dinleyicileri ve baglam onbellegini kapatir."""
+        if self._event_listener:
+            self._event_listener.stop()
+            self._event_listener = None
+            if self._bridge:
+                self._bridge.fingerprints.set_listening(False)
+        if self._sheet_context:
+            self._sheet_context.close()
+            self._sheet_context = None
+
     def _connect_lo_silent(self) -> bool:
         """LibreOffice'e sessizce baglanir."""
         try:
@@ -855,6 +1282,7 @@ class MainWindow(QMainWindow):
                 self._dispatcher = ToolDispatcher(
                     inspector, manipulator, analyzer, detector
                 )
+                self._start_context_cache()
                 self._update_status_bar()
                 return True
         except Exception as exc:
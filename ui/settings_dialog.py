@@ -604,25 +604,25 @@ class SettingsDialog(QDialog):
                 # Ollama URL'sini geçici olarak kaydet
                 self._settings.set("ollama_base_url", self._ollama_url_edit.text().strip())
 
-                provider = OllamaProvider()
-                models = provider.get_available_models()
+                with OllamaProvider() as provider:
+                    models = provider.get_available_models()
                 cache_key = "ollama_models"
             elif is_gemini:
                 self._settings.set("gemini_api_key", self._gemini_key_edit.text().strip())
-                provider = GeminiProvider()
-                models = provider.get_available_models()
+                with GeminiProvider() as provider:
+                    models = provider.get_available_models()
                 cache_key = "gemini_models"
             elif is_groq:
                 self._settings.set("groq_api_key", self._groq_key_edit.text().strip())
-                provider = GroqProvider()
-                models = provider.get_available_models()
+                with GroqProvider() as provider:
+                    models = provider.get_available_models()
                 cache_key = "groq_models"
             else:
                 # OpenRouter API anahtarını geçici olarak kaydet
                 self._settings.set("openrouter_api_key", self._api_key_edit.text().strip())
 
-                provider = OpenRouterProvider()
-                models, prices = provider.get_available_models_with_pricing()
+                with OpenRouterProvider() as provider:
+                    models, prices = provider.get_available_models_with_pricing()
                 # API'den gelen fiyatları (varsa) önbelleğe yaz
                 if prices:
                     self._price_cache_openrouter.update(prices)